@@ -7,11 +7,13 @@ without importing the full worker codebase.
 
 import os
 import logging
-from typing import Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from celery import Celery
 import redis
 from .celery_constants import TASK_MAPPING_TTL_SECONDS
 from shared.utils.priority_mapping import get_celery_queue
+from shared.utils.queue_telemetry import ENQUEUED_AT_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,8 @@ if CELERY_ENABLED:
         logger.error(f"Failed to connect to Redis for mappings: {e}")
         redis_client = None
 
+EVALUATE_TASK_NAME = "celery_worker.tasks.evaluate_code"
+
 # Create minimal Celery app for task submission only
 celery_app = None
 if CELERY_ENABLED:
@@ -77,37 +81,27 @@ def submit_evaluation_to_celery(
 
     try:
         # Call evaluate_code directly - it now uses the dispatcher service
-        task_name = "celery_worker.tasks.evaluate_code"
         # Map numeric priority to appropriate queue
         queue = get_celery_queue(priority)
-        # Pass numeric priority directly to dispatcher
-        priority_level = priority
         
-        logger.info(f"Sending Celery task with args: eval_id={eval_id}, language={language}, timeout={timeout}, priority={priority_level}, executor_image={executor_image}, memory_limit={memory_limit}, cpu_limit={cpu_limit}, debug={debug}, expect_failure={expect_failure}")
+        logger.info(f"Sending Celery task with args: eval_id={eval_id}, language={language}, timeout={timeout}, priority={priority}, executor_image={executor_image}, memory_limit={memory_limit}, cpu_limit={cpu_limit}, debug={debug}, expect_failure={expect_failure}")
 
         result = celery_app.send_task(
-            task_name,
-            args=[eval_id, code, language, timeout, priority_level, executor_image, memory_limit, cpu_limit, debug, expect_failure],
+            EVALUATE_TASK_NAME,
+            args=_evaluate_task_args(
+                eval_id, code, language, priority, timeout,
+                executor_image, memory_limit, cpu_limit, debug, expect_failure,
+            ),
             queue=queue,
             # Note: priority parameter doesn't work with Redis broker
             # We use separate queues instead
+            headers=_enqueue_headers(),
         )
         
         task_id = result.id
         
         # Store bidirectional mapping between eval_id and task_id
-        if redis_client:
-            try:
-                # TTL from constants - configurable for longer evaluations
-                ttl = TASK_MAPPING_TTL_SECONDS
-                # eval_id -> task_id (for cancellation/status checks)
-                redis_client.setex(f"task_mapping:{eval_id}", ttl, task_id)
-                # task_id -> eval_id (for reverse lookups if needed)
-                redis_client.setex(f"eval_mapping:{task_id}", ttl, eval_id)
-                logger.debug(f"Stored mapping: {eval_id} <-> {task_id}")
-            except Exception as e:
-                # Log but don't fail - the task will still run
-                logger.error(f"Failed to store task mapping: {e}")
+        _store_task_mappings([(eval_id, task_id)])
 
         logger.info(
             f"Submitted evaluation {eval_id} to Celery queue '{queue}', task_id: {task_id}"
@@ -122,24 +116,86 @@ def submit_evaluation_to_celery(
         return None
 
 
-def get_celery_status() -> dict:
-    """Get Celery connection status for health checks."""
-    if not CELERY_ENABLED:
-        return {"enabled": False, "connected": False}
+def _evaluate_task_args(
+    eval_id: str, code: str, language: str = "python", priority: int = 0, timeout: int = 300,
+    executor_image: Optional[str] = None, memory_limit: Optional[str] = None, cpu_limit: Optional[str] = None,
+    debug: bool = False, expect_failure: bool = False
+) -> list:
+    """Positional arguments of celery_worker.tasks.evaluate_code"""
+    # Numeric priority is passed straight through to the dispatcher
+    return [eval_id, code, language, timeout, priority, executor_image, memory_limit, cpu_limit, debug, expect_failure]
+
+
+def _enqueue_headers() -> Dict[str, float]:
+    """Message headers read back by queue telemetry for oldest-message age"""
+    return {ENQUEUED_AT_HEADER: time.time()}
 
+
+def _store_task_mappings(mappings: List[Tuple[str, str]]):
+    """Store eval_id <-> task_id mappings for a group of tasks in one Redis round trip."""
+    if not redis_client or not mappings:
+        return
     try:
-        # Try to inspect workers
-        inspect = celery_app.control.inspect()
-        stats = inspect.stats()
-
-        return {
-            "enabled": True,
-            "connected": bool(stats),
-            "workers": len(stats) if stats else 0,
-            "broker_url": CELERY_BROKER_URL,
-        }
+        # TTL from constants - configurable for longer evaluations
+        ttl = TASK_MAPPING_TTL_SECONDS
+        pipe = redis_client.pipeline(transaction=False)
+        for eval_id, task_id in mappings:
+            # eval_id -> task_id (for cancellation/status checks)
+            pipe.setex(f"task_mapping:{eval_id}", ttl, task_id)
+            # task_id -> eval_id (for reverse lookups if needed)
+            pipe.setex(f"eval_mapping:{task_id}", ttl, eval_id)
+        pipe.execute()
+        logger.debug(f"Stored {len(mappings)} task mappings")
+    except Exception as e:
+        # Log but don't fail - the tasks will still run
+        logger.error(f"Failed to store task mappings: {e}")
+
+
+def submit_evaluations_to_celery_batch(submissions: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Submit many evaluation tasks over a single broker connection.
+
+    Each submission holds the keyword arguments of submit_evaluation_to_celery.
+    All messages are published back to back on one producer rather than
+    acquiring a connection per task, and the eval<->task mappings for the
+    whole group are written with one Redis pipeline. Blocking; call it off
+    the event loop.
+
+    Returns:
+        Celery task IDs in submission order, None for any that failed to publish
+    """
+    if not CELERY_ENABLED or not celery_app:
+        return [None] * len(submissions)
+
+    task_ids: List[Optional[str]] = []
+    try:
+        with celery_app.producer_or_acquire() as producer:
+            for submission in submissions:
+                try:
+                    result = celery_app.send_task(
+                        EVALUATE_TASK_NAME,
+                        args=_evaluate_task_args(**submission),
+                        queue=get_celery_queue(submission.get("priority", 0)),
+                        producer=producer,
+                        headers=_enqueue_headers(),
+                    )
+                    task_ids.append(result.id)
+                except Exception as e:
+                    logger.error(f"Failed to submit {submission['eval_id']} to Celery: {e}")
+                    task_ids.append(None)
     except Exception as e:
-        return {"enabled": True, "connected": False, "error": str(e)}
+        logger.error(f"Failed to acquire Celery producer: {e}")
+    task_ids.extend([None] * (len(submissions) - len(task_ids)))
+
+    _store_task_mappings([
+        (submission["eval_id"], task_id)
+        for submission, task_id in zip(submissions, task_ids)
+        if task_id
+    ])
+    logger.info(
+        f"Submitted {sum(1 for task_id in task_ids if task_id)}/{len(submissions)} evaluations to Celery"
+    )
+    return task_ids
 
 
 def cancel_celery_task(eval_id: str, terminate: bool = False) -> dict:
@@ -0,0 +1,162 @@
+"""
+Non-blocking Celery submission for the gateway.
+
+Publishing with celery_app.send_task and writing the task mappings are
+blocking calls, and the broker can take anywhere from microseconds to
+seconds to answer. CeleryPublisher runs them on one dedicated thread:
+request handlers put their submissions on a bounded queue and await a
+future that the thread resolves with the task ID once the broker has
+accepted the message. Submissions that pile up while a publish is in
+flight are sent together on one producer connection.
+
+Routing (get_celery_queue), the eval <-> task mappings and the return
+value are those of submit_evaluations_to_celery_batch: a task ID per
+submission, or None if it could not be published.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from .celery_client import CELERY_ENABLED, submit_evaluations_to_celery_batch
+
+logger = logging.getLogger(__name__)
+
+# Submission groups waiting for the publisher thread; beyond this, fail fast
+CELERY_PUBLISH_QUEUE_SIZE = int(os.getenv("CELERY_PUBLISH_QUEUE_SIZE", "1000"))
+# Most messages sent on one producer connection per publish round
+CELERY_PUBLISH_MAX_GROUP = int(os.getenv("CELERY_PUBLISH_MAX_GROUP", "500"))
+
+_STOP = object()
+
+
+class CeleryPublisher:
+    """Dedicated publisher thread fed by a bounded queue, with per-submission confirms."""
+
+    def __init__(
+        self,
+        max_queue: int = CELERY_PUBLISH_QUEUE_SIZE,
+        max_group: int = CELERY_PUBLISH_MAX_GROUP,
+        publish=submit_evaluations_to_celery_batch,
+    ):
+        self.max_group = max_group
+        self.publish = publish
+        self.published = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the publisher thread (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="celery-publisher", daemon=True
+                )
+                self._thread.start()
+
+    async def stop(self, timeout: float = 5.0):
+        """Publish what is already queued, then stop the thread."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Celery publisher queue full at shutdown; abandoning queued submissions")
+        await asyncio.to_thread(self._thread.join, timeout)
+        self._thread = None
+
+    async def submit(self, **submission) -> Optional[str]:
+        """
+        Publish one evaluation task without blocking the event loop.
+
+        Takes the keyword arguments of submit_evaluation_to_celery.
+        Returns the Celery task ID, or None if it was not published.
+        """
+        return (await self.submit_many([submission]))[0]
+
+    async def submit_many(self, submissions: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Publish a group of evaluation tasks; task IDs in order, None for failures."""
+        if not submissions:
+            return []
+        if not CELERY_ENABLED:
+            return [None] * len(submissions)
+
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((submissions, future))
+        except queue.Full:
+            # Same outcome as a broker error: the caller reports it and nothing is queued
+            self.rejected += len(submissions)
+            logger.error(
+                f"Celery publisher backlog full ({self._queue.maxsize} groups); "
+                f"rejecting {len(submissions)} submissions"
+            )
+            return [None] * len(submissions)
+        return await future
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "backlog": self._queue.qsize(),
+            "published": self.published,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def _next_round(self) -> List[Any]:
+        """Block for one group, then take whatever else is already waiting."""
+        groups = [self._queue.get()]
+        size = len(groups[0][0]) if groups[0] is not _STOP else 0
+        while groups[-1] is not _STOP and size < self.max_group:
+            try:
+                group = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            groups.append(group)
+            if group is not _STOP:
+                size += len(group[0])
+        return groups
+
+    def _run(self):
+        while True:
+            groups = self._next_round()
+            stopping = groups[-1] is _STOP
+            if stopping:
+                groups.pop()
+            if groups:
+                self._publish_round(groups)
+            if stopping:
+                return
+
+    def _publish_round(self, groups: List[Any]):
+        submissions = [submission for group, _ in groups for submission in group]
+        try:
+            task_ids = self.publish(submissions)
+        except Exception as e:
+            logger.error(f"Celery publish round of {len(submissions)} failed: {e}")
+            task_ids = [None] * len(submissions)
+
+        published = sum(1 for task_id in task_ids if task_id)
+        self.published += published
+        self.failed += len(submissions) - published
+
+        offset = 0
+        for group, future in groups:
+            result = task_ids[offset:offset + len(group)]
+            offset += len(group)
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future, result)
+            except RuntimeError:
+                pass  # Event loop already closed (shutdown)
+
+
+def _resolve(future: asyncio.Future, result: List[Optional[str]]):
+    # The waiting request may have been cancelled (client went away)
+    if not future.done():
+        future.set_result(result)
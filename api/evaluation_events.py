@@ -0,0 +1,252 @@
+"""
+In-process fan-out of evaluation status updates and log chunks.
+
+The gateway holds one Redis subscription to the storage worker's
+confirmation channels (storage:evaluation:*) and the live log channels
+(evaluation:*:logs) and multiplexes it across every waiting request and
+streaming connection, so clients cost no upstream calls until their
+evaluation actually changes.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Storage worker confirmation channels, published after the database write
+STORAGE_EVENTS_PATTERN = "storage:evaluation:*"
+# Incremental log chunks streamed by the dispatcher while a pod runs
+LOG_EVENTS_PATTERN = "evaluation:*:logs"
+
+# Undelivered messages buffered per streaming connection
+DEFAULT_QUEUE_SIZE = 256
+
+# Channels whose payload has no "status" field map to the status they confirm
+CHANNEL_STATUS = {
+    "storage:evaluation:queued": "queued",
+    "storage:evaluation:running": "running",
+}
+
+
+class Subscription:
+    """
+    One streaming connection's bounded outbox.
+
+    Status updates coalesce: while an evaluation's update is undelivered,
+    a newer one replaces it in place. Log chunks are dropped when the
+    outbox is full, and the client is told how many it missed. A status
+    update arriving at a full outbox evicts the oldest log chunk instead.
+    """
+
+    def __init__(
+        self,
+        eval_ids: Optional[Iterable[str]] = None,
+        all_events: bool = False,
+        include_logs: bool = True,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        batch_ids: Optional[Iterable[str]] = None,
+    ):
+        self.eval_ids: Set[str] = set(eval_ids or [])
+        self.batch_ids: Set[str] = set(batch_ids or [])
+        self.all_events = all_events
+        self.include_logs = include_logs
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._items: Deque[Tuple[str, Any]] = deque()  # ("status", eval_id) or ("log", update)
+        self._latest_status: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, update: Dict[str, Any]):
+        """Queue an update without ever blocking the shared listener."""
+        if update.get("type") == "log":
+            if not self.include_logs:
+                return
+            if len(self._items) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._items.append(("log", update))
+        else:
+            eval_id = update["eval_id"]
+            if eval_id in self._latest_status:
+                self._latest_status[eval_id] = update  # Coalesce with the undelivered update
+                return
+            if len(self._items) >= self.max_queue:
+                self._evict_one()
+            self._latest_status[eval_id] = update
+            self._items.append(("status", eval_id))
+        self._ready.set()
+
+    def _evict_one(self):
+        for index, (kind, _) in enumerate(self._items):
+            if kind == "log":
+                del self._items[index]
+                self.dropped += 1
+                return
+        # Outbox is all status updates; drop the oldest
+        _, eval_id = self._items.popleft()
+        self._latest_status.pop(eval_id, None)
+        self.dropped += 1
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next message for the client, or None if nothing arrived within timeout."""
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "dropped", "count": dropped}
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+            if self.dropped:
+                return await self.get()
+
+        kind, item = self._items.popleft()
+        if kind == "status":
+            return self._latest_status.pop(item)
+        return item
+
+
+class EvaluationEventHub:
+    """Single Redis subscription shared by all long-polls and streams in this process."""
+
+    def __init__(self, redis_client, reconnect_delay: float = 1.0):
+        self.redis = redis_client
+        self.reconnect_delay = reconnect_delay
+        self.subscriptions_by_eval: Dict[str, Set[Subscription]] = {}
+        self.subscriptions_by_batch: Dict[str, Set[Subscription]] = {}
+        self.all_subscriptions: Set[Subscription] = set()
+        self.subscription_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background listener."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the listener."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, subscription: Subscription):
+        """Start fanning out matching updates to a streaming connection."""
+        self.subscription_count += 1
+        if subscription.all_events:
+            self.all_subscriptions.add(subscription)
+        for eval_id in subscription.eval_ids:
+            self.subscriptions_by_eval.setdefault(eval_id, set()).add(subscription)
+        for batch_id in subscription.batch_ids:
+            self.subscriptions_by_batch.setdefault(batch_id, set()).add(subscription)
+
+    def add_interest(
+        self, subscription: Subscription, eval_ids: Iterable[str], batch_ids: Iterable[str] = ()
+    ):
+        """Add evaluations or batches to a live subscription."""
+        for eval_id in eval_ids:
+            subscription.eval_ids.add(eval_id)
+            self.subscriptions_by_eval.setdefault(eval_id, set()).add(subscription)
+        for batch_id in batch_ids:
+            subscription.batch_ids.add(batch_id)
+            self.subscriptions_by_batch.setdefault(batch_id, set()).add(subscription)
+
+    def remove_interest(
+        self, subscription: Subscription, eval_ids: Iterable[str], batch_ids: Iterable[str] = ()
+    ):
+        """Remove evaluations or batches from a live subscription."""
+        for eval_id in list(eval_ids):
+            subscription.eval_ids.discard(eval_id)
+            self._discard(self.subscriptions_by_eval, eval_id, subscription)
+        for batch_id in list(batch_ids):
+            subscription.batch_ids.discard(batch_id)
+            self._discard(self.subscriptions_by_batch, batch_id, subscription)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[Subscription]], key: str, subscription: Subscription):
+        subscribers = index.get(key)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del index[key]
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a closed connection."""
+        self.subscription_count -= 1
+        self.all_subscriptions.discard(subscription)
+        self.remove_interest(subscription, subscription.eval_ids, subscription.batch_ids)
+
+    def publish_local(self, eval_id: str, update: Dict[str, Any]):
+        """Deliver an update to matching subscriptions."""
+        delivered = set()
+        for subscription in self.subscriptions_by_eval.get(eval_id, ()):
+            subscription.offer(update)
+            delivered.add(subscription)
+        # Log chunks carry no batch_id, so batch subscribers see status updates only
+        for subscription in self.subscriptions_by_batch.get(update.get("batch_id"), ()):
+            if subscription not in delivered:
+                subscription.offer(update)
+                delivered.add(subscription)
+        for subscription in self.all_subscriptions:
+            if subscription not in delivered:
+                subscription.offer(update)
+
+    def has_listeners(self, eval_id: str, batch_id: Optional[str] = None) -> bool:
+        return bool(
+            self.all_subscriptions
+            or eval_id in self.subscriptions_by_eval
+            or (batch_id and batch_id in self.subscriptions_by_batch)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscriptions": self.subscription_count,
+            "watched_evaluations": len(self.subscriptions_by_eval),
+            "watched_batches": len(self.subscriptions_by_batch),
+        }
+
+    def _parse(self, channel: str, data: str) -> Optional[Dict[str, Any]]:
+        try:
+            update = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if not isinstance(update, dict) or not update.get("eval_id"):
+            return None
+        if channel.endswith(":logs"):
+            update["type"] = "log"
+            return update
+        update["type"] = "status"
+        if "status" not in update and channel in CHANNEL_STATUS:
+            update["status"] = CHANNEL_STATUS[channel]
+        return update
+
+    async def _listen(self):
+        """Consume storage confirmations forever, resubscribing after errors."""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(STORAGE_EVENTS_PATTERN, LOG_EVENTS_PATTERN)
+                logger.info(f"Evaluation event hub subscribed to {STORAGE_EVENTS_PATTERN}, {LOG_EVENTS_PATTERN}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    update = self._parse(message["channel"], message["data"])
+                    if update and self.has_listeners(update["eval_id"], update.get("batch_id")):
+                        self.publish_local(update["eval_id"], update)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Evaluation event hub subscription lost: {e}; resubscribing")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
@@ -6,8 +6,10 @@ This replaces the monolithic app.py when running in microservices mode
 import os
 import sys
 import json
+import math
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Literal, Tuple
 from datetime import datetime, timezone
 import httpx
 import asyncio
@@ -17,9 +19,10 @@ import traceback
 
 # Import shared types
 from shared.generated.python import EvaluationStatus, EvaluationResponse
+from shared.utils.metrics import LatencyTracker
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Response, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Response, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 import uvicorn
@@ -31,6 +34,10 @@ from .models import (
     BatchEvaluationRequest,
     BatchEvaluationResponse,
     EvaluationStatusResponse,
+    EvaluationStatusBatchRequest,
+    EvaluationStatusBatchResponse,
+    BatchProgressResponse,
+    BatchResultsResponse,
     QueueStatusResponse,
     StatusResponse,
     HealthResponse,
@@ -41,7 +48,19 @@ from .models import (
 import redis.asyncio as redis
 
 # Import Celery client for dual-write
-from api.celery_client import submit_evaluation_to_celery, CELERY_ENABLED, cancel_celery_task
+from api.celery_client import (
+    CELERY_BROKER_URL,
+    CELERY_ENABLED,
+    cancel_celery_task,
+)
+from api.celery_publisher import CeleryPublisher
+from shared.utils.priority_mapping import get_celery_queue
+from shared.utils.queue_telemetry import QueueTelemetry
+from shared.utils.fair_share import FairShareQueue
+
+# Shared subscription to storage confirmation events
+from api.evaluation_events import EvaluationEventHub, Subscription
+from shared.state_machine import is_terminal_status
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,6 +82,15 @@ class Settings(BaseSettings):
     redis_url: str
     internal_api_key: str
 
+    # Upstream HTTP client pools
+    storage_timeout: float = 30.0
+    dispatcher_timeout: float = 30.0
+    upstream_connect_timeout: float = 5.0
+    http_max_connections: int = 100  # Per upstream
+    http_max_keepalive_connections: int = 20  # Per upstream
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = False  # Negotiated via ALPN, so only effective for TLS upstreams
+
 # Create settings instance - lazy initialization for OpenAPI generation
 try:
     settings = Settings()
@@ -79,6 +107,37 @@ MAX_CODE_SIZE = 1 * 1024 * 1024  # 1MB limit - prevents memory exhaustion
 MIN_TIMEOUT = 1  # 1 second minimum - prevents instant timeout abuse
 MAX_TIMEOUT = 900  # 15 minutes maximum - prevents long-running resource locks
 SUPPORTED_LANGUAGES = ["python"]  # Explicitly allowlist supported languages
+MAX_WAIT_TIMEOUT = 60  # Longest a /wait request may be parked, in seconds
+MAX_STATUS_BATCH_IDS = 5000  # Matches the storage service's batch-get limit
+REDIS_MGET_CHUNK_SIZE = 1000  # Keys per MGET in the status batch pipeline
+BATCH_RESULTS_PAGE_SIZE = 500  # Finished evaluations fetched per storage batch-get
+
+# Batch ingestion: chunks are enqueued as fast as the Celery queues drain, each
+# waiting for room under MAX_QUEUE_SIZE. Members also hold the client's
+# concurrency slots, so batches are capped by MAX_EVALUATIONS_PER_USER as well.
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+BATCH_INGEST_CHUNK_SIZE = int(os.getenv("BATCH_INGEST_CHUNK_SIZE", "200"))
+# Queue depth at which ingestion waits, normally and when the dispatcher is at capacity
+BATCH_INGEST_MAX_QUEUE_DEPTH = int(os.getenv("BATCH_INGEST_MAX_QUEUE_DEPTH", "2000"))
+BATCH_INGEST_SATURATED_QUEUE_DEPTH = int(os.getenv("BATCH_INGEST_SATURATED_QUEUE_DEPTH", "200"))
+BATCH_INGEST_MIN_POLL = 0.1  # Seconds between queue depth checks while waiting, doubling up to the max
+BATCH_INGEST_MAX_POLL = 2.0
+BATCH_INGEST_MAX_RETRIES = 3
+BATCH_INGEST_RETRY_DELAY = 0.2  # Seconds before the first retry of failed submissions
+# "indexed" hands batch chunks straight to the dispatcher, which packs them into Indexed Jobs;
+# this skips the Celery queues (and fair share). Anything it can't start falls back to Celery.
+# "packed" does the same, also running up to BATCH_EVALUATIONS_PER_POD short evaluations per pod.
+BATCH_EXECUTION_MODE = os.getenv("BATCH_EXECUTION_MODE", "celery").lower()
+BATCH_EVALUATIONS_PER_POD = int(os.getenv("BATCH_EVALUATIONS_PER_POD", "8"))
+BATCH_DISPATCH_TIMEOUT = 60.0  # Seconds for the dispatcher to create a chunk's Jobs
+# Fair-share stage: park submissions per tenant and feed Celery in DRR order
+FAIR_SHARE_ENABLED = os.getenv("FAIR_SHARE_ENABLED", "false").lower() == "true"
+FAIR_SHARE_TARGET_DEPTH = int(os.getenv("FAIR_SHARE_TARGET_DEPTH", "50"))  # Celery backlog the pump maintains
+FAIR_SHARE_PUMP_INTERVAL = 0.25  # Seconds between pump rounds when Celery is full or nothing is parked
+FAIR_SHARE_LEASE_MS = 5000  # Pump lease; another gateway takes over if this one stops renewing
+FAIR_SHARE_PARKED = "fair-share"  # Stands in for a Celery task ID until the pump publishes
+STREAM_HEARTBEAT_INTERVAL = 10  # Seconds of silence before a stream sends a heartbeat
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "256"))  # Buffered messages per stream
 
 # Create FastAPI app
 app = FastAPI(
@@ -125,20 +184,105 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
 # Add request size limiting
 app.add_middleware(RequestSizeLimitMiddleware, max_size=2 * 1024 * 1024)
 
-# Create HTTP client factory function instead of global client
-def create_http_client(timeout: float = 30.0) -> httpx.AsyncClient:
-    """Create an HTTP client with proper headers and timeout"""
+# Optional HTTP/2 support for upstream clients (requires the h2 package)
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Long-lived pooled HTTP clients, one per upstream service, created on startup
+http_clients: Dict[str, httpx.AsyncClient] = {}
+http_client_metrics: Dict[str, LatencyTracker] = {}
+
+
+def create_http_client(upstream: str) -> httpx.AsyncClient:
+    """Create a pooled HTTP client for an upstream service with its own timeout and metrics"""
+    read_timeout = settings.dispatcher_timeout if upstream == "dispatcher" else settings.storage_timeout
+    metrics = http_client_metrics.setdefault(upstream, LatencyTracker())
+
+    async def mark_start(request: httpx.Request):
+        request.extensions["gateway_start"] = time.monotonic()
+
+    async def record_latency(response: httpx.Response):
+        started = response.request.extensions.get("gateway_start")
+        if started is not None:
+            metrics.record((time.monotonic() - started) * 1000, success=response.status_code < 500)
+
     return httpx.AsyncClient(
         headers={"X-API-Key": settings.internal_api_key} if settings.internal_api_key else {},
-        timeout=timeout
+        timeout=httpx.Timeout(read_timeout, connect=settings.upstream_connect_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        http2=settings.http2_enabled and HTTP2_AVAILABLE,
+        event_hooks={"request": [mark_start], "response": [record_latency]},
     )
 
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """Get the shared client for an upstream ("storage" or "dispatcher")"""
+    client = http_clients.get(upstream)
+    if client is None or client.is_closed:
+        client = http_clients[upstream] = create_http_client(upstream)
+    return client
+
+
+async def close_http_clients():
+    """Close all pooled upstream clients"""
+    for client in http_clients.values():
+        await client.aclose()
+    http_clients.clear()
+
+
+def get_http_pool_stats(upstream: str) -> Dict[str, Any]:
+    """Connection pool occupancy and request latency for one upstream"""
+    stats: Dict[str, Any] = {"requests": http_client_metrics.get(upstream, LatencyTracker()).snapshot()}
+    client = http_clients.get(upstream)
+    # httpx doesn't expose its pool; read httpcore's when available
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    stats["connections"] = {
+        "open": len(connections),
+        "idle": sum(1 for conn in connections if conn.is_idle()),
+        "max": settings.http_max_connections,
+        "max_keepalive": settings.http_max_keepalive_connections,
+    }
+    stats["http2"] = settings.http2_enabled and HTTP2_AVAILABLE
+    return stats
+
 # Redis client will be initialized in startup event
 redis_client = None
 
+# Evaluation update fan-out, started in startup event
+event_hub: Optional[EvaluationEventHub] = None
+# Broker publishes run on this publisher's thread, never on the event loop
+celery_publisher = CeleryPublisher()
+# Fair-share virtual queues, created in startup event when FAIR_SHARE_ENABLED
+fair_share: Optional[FairShareQueue] = None
+# Queue depths and worker heartbeats read from the broker, cached briefly
+queue_telemetry: Optional[QueueTelemetry] = (
+    QueueTelemetry(redis.from_url(CELERY_BROKER_URL, decode_responses=True)) if CELERY_ENABLED else None
+)
+
 # Import resilient connection utilities
 from shared.utils.resilient_connections import get_async_redis_client
-from shared.utils import generate_evaluation_id
+from shared.utils import generate_evaluation_id, generate_batch_id
+from shared.utils.batch_tracking import create_batch, get_batch_progress, get_batch_results
+from shared.utils.admission import (
+    ADMITTED,
+    MAX_EVALUATIONS_PER_USER,
+    MAX_QUEUE_SIZE,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMITED,
+    admit,
+    get_drain_rate,
+    release_evaluation,
+    retry_after_seconds,
+)
 
 logger.info(f"Storage service URL: {settings.storage_service_url}")
 
@@ -198,6 +342,23 @@ async def startup():
     # Initialize async Redis client with retry logic
     redis_client = await get_async_redis_client(settings.redis_url)
     logger.info("Connected to async Redis for event publishing with retry logic")
+
+    # Pooled upstream clients, reused across requests
+    for upstream in ("storage", "dispatcher"):
+        get_http_client(upstream)
+
+    # One Redis subscription per process for all /wait requests
+    global event_hub
+    event_hub = EvaluationEventHub(redis_client)
+    event_hub.start()
+
+    celery_publisher.start()
+
+    global fair_share
+    if FAIR_SHARE_ENABLED and queue_telemetry is not None:
+        fair_share = FairShareQueue(redis_client)
+        asyncio.create_task(fair_share_pump())
+        logger.info("Fair-share scheduling enabled")
     
     # Start background tasks (no health checks - let failures happen naturally)
     asyncio.create_task(poll_completed_evaluations())
@@ -214,6 +375,12 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup on shutdown"""
+    if event_hub:
+        await event_hub.stop()
+    await celery_publisher.stop()
+    if queue_telemetry:
+        await queue_telemetry.broker.aclose()
+    await close_http_clients()
     await redis_client.close()
 
 
@@ -264,7 +431,92 @@ async def health():
     }
 
 
-async def _submit_evaluation(request: EvaluationRequest, eval_id: Optional[str] = None) -> EvaluationResponse:
+def _celery_submission(request: EvaluationRequest, eval_id: str) -> Dict[str, Any]:
+    """Keyword arguments of submit_evaluation_to_celery for a request"""
+    return {
+        "eval_id": eval_id,
+        "code": request.code,
+        "language": request.language,
+        "priority": request.priority,
+        "timeout": request.timeout,
+        "executor_image": request.executor_image,
+        "memory_limit": request.memory_limit,
+        "cpu_limit": request.cpu_limit,
+        "debug": request.debug,
+        "expect_failure": request.expect_failure,
+    }
+
+
+async def _enqueue_submissions(submissions: List[Dict[str, Any]], tenant: str) -> List[Optional[str]]:
+    """
+    Publish submissions to Celery, or park them for the fair-share pump.
+    Returns a task ID (or FAIR_SHARE_PARKED) per submission, None for failures.
+    """
+    if fair_share is None:
+        return await celery_publisher.submit_many(submissions)
+    try:
+        await fair_share.enqueue(tenant, submissions)
+        return [FAIR_SHARE_PARKED] * len(submissions)
+    except Exception as e:
+        logger.error(f"Failed to park {len(submissions)} submissions for fair-share scheduling: {e}")
+        return [None] * len(submissions)
+
+
+async def _fail_lost_fair_share(eval_ids: List[str]):
+    """Fail evaluations whose parked submission expired before the pump published it"""
+    if eval_ids:
+        logger.error(f"Fair-share pump: {len(eval_ids)} parked submissions expired, failing them")
+        await publish_evaluation_events(
+            "evaluation:failed",
+            [
+                {"eval_id": eval_id, "error": "Parked submission expired before dispatch", "failed_at": "fair_share"}
+                for eval_id in eval_ids
+            ],
+        )
+
+
+async def fair_share_pump():
+    """
+    Move parked evaluations into Celery in fair-share order, keeping about
+    FAIR_SHARE_TARGET_DEPTH waiting there. One gateway holds the pump lease.
+    """
+    owner = f"{os.getenv('HOSTNAME', 'gateway')}:{os.getpid()}"
+    holding_lease = False
+    while True:
+        try:
+            budget = 0
+            if await fair_share.acquire_pump_lease(owner, FAIR_SHARE_LEASE_MS):
+                if not holding_lease:
+                    # Whatever the previous holder took but never published goes back in line
+                    await _fail_lost_fair_share(await fair_share.recover())
+                    holding_lease = True
+                snapshot = await queue_telemetry.snapshot(max_age=0)
+                budget = FAIR_SHARE_TARGET_DEPTH - snapshot["queued"]
+            else:
+                holding_lease = False
+            entries, lost = await fair_share.take(budget) if budget > 0 else ([], [])
+            await _fail_lost_fair_share(lost)
+            if entries:
+                task_ids = await celery_publisher.submit_many([entry["submission"] for entry in entries])
+                await fair_share.complete([entry for entry, task_id in zip(entries, task_ids) if task_id])
+                failed = [entry for entry, task_id in zip(entries, task_ids) if not task_id]
+                if failed:
+                    logger.warning(f"Fair-share pump: {len(failed)} publishes failed, requeued")
+                    await fair_share.requeue(failed)
+                    await asyncio.sleep(FAIR_SHARE_PUMP_INTERVAL)
+                continue  # Celery may still have room
+            await asyncio.sleep(FAIR_SHARE_PUMP_INTERVAL)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Fair-share pump error: {e}")
+            holding_lease = False  # Recover anything this round left in flight
+            await asyncio.sleep(FAIR_SHARE_PUMP_INTERVAL * 4)
+
+
+async def _submit_evaluation(
+    request: EvaluationRequest, eval_id: Optional[str] = None, tenant: str = "anonymous"
+) -> EvaluationResponse:
     """Core evaluation submission logic - shared between single and batch endpoints"""
 
     # Generate eval ID if not provided
@@ -289,17 +541,8 @@ async def _submit_evaluation(request: EvaluationRequest, eval_id: Optional[str]
 
         # Submit to Celery (100% traffic now)
         logger.info(f"Submitting to Celery with timeout={request.timeout}")
-        celery_task_id = submit_evaluation_to_celery(
-            eval_id=eval_id,
-            code=request.code,
-            language=request.language,
-            priority=request.priority,
-            timeout=request.timeout,
-            executor_image=request.executor_image,
-            memory_limit=request.memory_limit,
-            cpu_limit=request.cpu_limit,
-            debug=request.debug,
-            expect_failure=request.expect_failure,
+        [celery_task_id] = await _enqueue_submissions(
+            [_celery_submission(request, eval_id)], tenant
         )
         if celery_task_id:
             logger.info(f"Submitted evaluation {eval_id} to Celery: {celery_task_id}")
@@ -347,59 +590,149 @@ async def validate_resource_limits(memory_limit: Optional[str], cpu_limit: Optio
         requested_cpu_mc = parse_cpu(cpu_limit)
     
     # Check with dispatcher's capacity endpoint
-    async with create_http_client() as client:
-        try:
-            response = await client.post(
-                f"{settings.dispatcher_service_url}/capacity/check",
-                json={
-                    "memory_limit": memory_limit,
-                    "cpu_limit": cpu_limit
-                }
-            )
+    client = get_http_client("dispatcher")
+    try:
+        response = await client.post(
+            f"{settings.dispatcher_service_url}/capacity/check",
+            json={
+                "memory_limit": memory_limit,
+                "cpu_limit": cpu_limit
+            }
+        )
+        
+        if response.status_code == 200:
+            capacity_data = response.json()
             
-            if response.status_code == 200:
-                capacity_data = response.json()
+            # Only validate limits if explicitly specified
+            if memory_limit is not None and cpu_limit is not None:
+                # Check if request exceeds total cluster limits
+                total_memory_mb = capacity_data.get("total_memory_mb", 0)
+                total_cpu_mc = capacity_data.get("total_cpu_millicores", 0)
                 
-                # Only validate limits if explicitly specified
-                if memory_limit is not None and cpu_limit is not None:
-                    # Check if request exceeds total cluster limits
-                    total_memory_mb = capacity_data.get("total_memory_mb", 0)
-                    total_cpu_mc = capacity_data.get("total_cpu_millicores", 0)
-                    
-                    # If request exceeds total cluster limits, reject immediately
-                    if requested_memory_mb > total_memory_mb:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Requested memory ({memory_limit}) exceeds total cluster limit ({total_memory_mb}MB)"
-                        )
-                    
-                    if requested_cpu_mc > total_cpu_mc:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Requested CPU ({cpu_limit}) exceeds total cluster limit ({total_cpu_mc}m)"
-                        )
-                
-                # Note: We don't check available capacity here - that's for the dispatcher/scheduler
-                # We only validate that the request is theoretically possible
+                # If request exceeds total cluster limits, reject immediately
+                if requested_memory_mb > total_memory_mb:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Requested memory ({memory_limit}) exceeds total cluster limit ({total_memory_mb}MB)"
+                    )
                 
-        except httpx.HTTPError:
-            # If we can't validate, log but don't block submission
-            logger.warning("Failed to validate resource limits with dispatcher")
+                if requested_cpu_mc > total_cpu_mc:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Requested CPU ({cpu_limit}) exceeds total cluster limit ({total_cpu_mc}m)"
+                    )
+            
+            # Note: We don't check available capacity here - that's for the dispatcher/scheduler
+            # We only validate that the request is theoretically possible
+            
+    except httpx.HTTPError:
+        # If we can't validate, log but don't block submission
+        logger.warning("Failed to validate resource limits with dispatcher")
+    except HTTPException:
+        # Re-raise validation errors
+        raise
+
+
+def client_identity(http_request: Request) -> str:
+    """Admission control key: the caller's API key (hashed) or else its IP"""
+    api_key = http_request.headers.get("x-api-key")
+    if api_key:
+        return f"key:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+    return f"ip:{http_request.client.host if http_request.client else 'unknown'}"
+
+
+def _too_many_requests(detail: str, retry_after: int) -> HTTPException:
+    return HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+async def _drain_rate() -> float:
+    try:
+        return await get_drain_rate(redis_client)
+    except Exception as e:
+        logger.warning(f"Could not read evaluation drain rate: {e}")
+        return 0.0
+
+
+async def _queue_backlog(max_age: Optional[float] = None) -> Tuple[int, int]:
+    """Evaluations waiting to be picked up, and those also in flight (queued + unacked)"""
+    snapshot = await queue_telemetry.snapshot(max_age)
+    # Evaluations parked for fair-share scheduling are waiting too
+    queued = snapshot["queued"] + (await fair_share.size() if fair_share is not None else 0)
+    return queued, queued + snapshot["unacked"]
+
+
+async def admit_submission(http_request: Request, eval_ids: List[str], queued_now: Optional[int] = None):
+    """
+    Refuse a submission with 429 when queueing it would push the Celery
+    backlog past its limit, or the client is over its rate limit or its
+    concurrent evaluation limit. Every evaluation in eval_ids costs a token
+    and a concurrency slot; queued_now is how many of them go to the queue
+    right away (default: all). Retry-After is estimated from how fast
+    evaluations are finishing right now. If Redis can't answer, the request
+    is admitted.
+    """
+    queued_now = len(eval_ids) if queued_now is None else queued_now
+    in_flight = None
+    if queue_telemetry is not None:
+        try:
+            queued, in_flight = await _queue_backlog()
+            if MAX_QUEUE_SIZE and queued + queued_now > MAX_QUEUE_SIZE:
+                raise _too_many_requests(
+                    f"Evaluation queue is full ({queued} waiting)",
+                    retry_after_seconds(queued + queued_now - MAX_QUEUE_SIZE, await _drain_rate()),
+                )
         except HTTPException:
-            # Re-raise validation errors
             raise
+        except Exception as e:
+            logger.warning(f"Queue depth unavailable, skipping queue admission gate: {e}")
+
+    try:
+        outcome, detail = await admit(redis_client, client_identity(http_request), eval_ids)
+    except Exception as e:
+        logger.warning(f"Admission check failed, admitting: {e}")
+        return
+
+    if outcome == ADMITTED:
+        return
+    if outcome == RATE_LIMITED:
+        raise _too_many_requests(
+            f"Rate limit of {RATE_LIMIT_PER_MINUTE} evaluations per minute exceeded",
+            max(1, math.ceil(detail)),
+        )
+    # Too many unfinished evaluations. If finishes are spread evenly over
+    # everything in flight, one of this client's comes every in_flight/active finishes.
+    active = max(1, int(detail))
+    needed = max(1, active + len(eval_ids) - MAX_EVALUATIONS_PER_USER)
+    raise _too_many_requests(
+        f"Too many unfinished evaluations ({active}); wait for {needed} to finish",
+        retry_after_seconds(needed * max(in_flight or 0, active) / active, await _drain_rate()),
+    )
+
+
+async def _release_admission(eval_id: str):
+    """Give back the client slot of a submission that never reached the queue"""
+    try:
+        await release_evaluation(redis_client, eval_id, drained=False)
+    except Exception as e:
+        logger.warning(f"Failed to release admission slot for {eval_id}: {e}")
 
 
 @app.post("/api/eval", response_model=EvaluationSubmitResponse)
-async def evaluate(request: EvaluationRequest):
+async def evaluate(request: EvaluationRequest, http_request: Request):
     """Submit code for evaluation"""
-    
-    # Validate resource limits don't exceed cluster capacity
-    await validate_resource_limits(request.memory_limit, request.cpu_limit)
 
-    # Generate eval ID and immediately acknowledge with "submitted" status
+    # Generate eval ID and admit it before doing any upstream work
     eval_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
-    
+    await admit_submission(http_request, [eval_id])
+
+    # Validate resource limits don't exceed cluster capacity
+    try:
+        await validate_resource_limits(request.memory_limit, request.cpu_limit)
+    except Exception:
+        await _release_admission(eval_id)
+        raise
+
+    # Immediately acknowledge with "submitted" status
     # Publish submitted event first
     await publish_evaluation_event(
         "evaluation:submitted",
@@ -418,9 +751,10 @@ async def evaluate(request: EvaluationRequest):
     
     # Now attempt to queue in Celery
     try:
-        return await _submit_evaluation(request, eval_id)
+        return await _submit_evaluation(request, eval_id, client_identity(http_request))
     except Exception as e:
         # If submission fails, update status to failed
+        await _release_admission(eval_id)
         await publish_evaluation_event(
             "evaluation:failed", 
             {"eval_id": eval_id, "error": str(e), "failed_at": "submission"}
@@ -428,111 +762,314 @@ async def evaluate(request: EvaluationRequest):
         raise
 
 
-async def _process_batch_async(evaluations: List[EvaluationRequest], eval_ids: List[str]):
-    """Process batch evaluations asynchronously in the background"""
-    # Rate limiting configuration
-    BATCH_SIZE = 5  # Process 5 at a time
-    BASE_DELAY = 0.1  # 100ms between items (10/second baseline)
-    BATCH_DELAY = 0.5  # 500ms between batches
-    MAX_RETRIES = 3
-    BACKOFF_FACTOR = 2.0  # Exponential backoff multiplier
+async def publish_evaluation_events(channel: str, events: List[Dict[str, Any]]):
+    """Publish many events to one channel in a single Redis round trip"""
+    if not events:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for data in events:
+            pipe.publish(channel, json.dumps(data))
+        await pipe.execute()
+        logger.info(f"Published {len(events)} events to {channel}")
+    except Exception as e:
+        logger.error(f"Failed to publish {len(events)} events to {channel}: {e}")
 
-    # Process evaluations in sub-batches with rate limiting
-    for batch_idx in range(0, len(evaluations), BATCH_SIZE):
-        batch = evaluations[batch_idx:batch_idx + BATCH_SIZE]
-        batch_eval_ids = eval_ids[batch_idx:batch_idx + BATCH_SIZE]
-        
-        for item_idx, (eval_request, eval_id) in enumerate(zip(batch, batch_eval_ids)):
-            # Retry loop with exponential backoff
-            retry_count = 0
-            delay = BASE_DELAY
-            
-            while retry_count <= MAX_RETRIES:
-                try:
-                    # Submit to Celery
-                    await _submit_evaluation(eval_request, eval_id)
-                    break  # Success, exit retry loop
-
-                except Exception as e:
-                    retry_count += 1
-                    if retry_count <= MAX_RETRIES:
-                        backoff_delay = delay * (BACKOFF_FACTOR ** (retry_count - 1))
-                        logger.warning(
-                            f"Error submitting {eval_id}: {e}, "
-                            f"retry {retry_count}/{MAX_RETRIES} in {backoff_delay:.2f}s"
-                        )
-                        await asyncio.sleep(backoff_delay)
-                        continue
-                    else:
-                        # Max retries exceeded - publish failure event
-                        logger.error(f"Failed to queue {eval_id} after {MAX_RETRIES} retries: {e}")
-                        await publish_evaluation_event(
-                            "evaluation:failed",
-                            {
-                                "eval_id": eval_id, 
-                                "error": str(e), 
-                                "failed_at": "batch_submission"
-                            },
-                        )
-                        break  # Exit retry loop
-            
-            # Rate limit between items in batch
-            if item_idx < len(batch) - 1:
-                await asyncio.sleep(delay)
-        
-        # Delay between batches
-        if batch_idx + BATCH_SIZE < len(evaluations):
-            await asyncio.sleep(BATCH_DELAY)
+
+async def _dispatcher_has_capacity() -> bool:
+    """Whether the dispatcher can start another evaluation now (assume yes if unknown)"""
+    try:
+        client = get_http_client("dispatcher")
+        response = await client.post(f"{settings.dispatcher_service_url}/capacity/check", json={})
+        if response.status_code == 200:
+            return response.json().get("has_capacity", True)
+    except httpx.HTTPError as e:
+        logger.debug(f"Dispatcher capacity check failed: {e}")
+    return True
 
 
-@app.post("/api/eval-batch", response_model=BatchEvaluationResponse, status_code=202)
-async def evaluate_batch(request: BatchEvaluationRequest, response: Response):
-    """Submit multiple evaluations as a batch - returns immediately with 202 Accepted"""
-    # Validate batch size
-    MAX_BATCH_SIZE = 100
-    if len(request.evaluations) > MAX_BATCH_SIZE:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Batch size {len(request.evaluations)} exceeds maximum of {MAX_BATCH_SIZE}"
+async def _wait_for_ingest_capacity(queues: set):
+    """
+    Hold batch ingestion while the target Celery queues are deep.
+
+    The allowed depth shrinks when the dispatcher reports no capacity, since
+    anything enqueued then only waits in the broker. Polls back off
+    exponentially while waiting; without a broker signal, ingestion proceeds.
+    """
+    if queue_telemetry is None:
+        return
+    delay = BATCH_INGEST_MIN_POLL
+    while True:
+        limit = (
+            BATCH_INGEST_MAX_QUEUE_DEPTH
+            if await _dispatcher_has_capacity()
+            else BATCH_INGEST_SATURATED_QUEUE_DEPTH
+        )
+        try:
+            depths = await queue_telemetry.queue_depths(queues, max_age=delay)
+        except Exception as e:
+            logger.warning(f"Could not read Celery queue depth, not pacing batch: {e}")
+            return
+        deepest = max(depths.values(), default=0)
+        if deepest < limit:
+            return
+        logger.info(f"Batch ingestion waiting: queue depth {deepest} >= {limit}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_INGEST_MAX_POLL)
+
+
+async def _wait_for_queue_room(count: int):
+    """
+    Hold a batch chunk until count more evaluations fit under MAX_QUEUE_SIZE,
+    the backlog limit single submissions are admitted against.
+    """
+    if not MAX_QUEUE_SIZE or queue_telemetry is None:
+        return
+    count = min(count, MAX_QUEUE_SIZE)
+    delay = BATCH_INGEST_MIN_POLL
+    while True:
+        try:
+            queued, _ = await _queue_backlog(max_age=delay)
+        except Exception as e:
+            logger.warning(f"Queue depth unavailable, not holding batch for queue room: {e}")
+            return
+        if queued + count <= MAX_QUEUE_SIZE:
+            return
+        logger.info(f"Batch ingestion waiting: {queued} queued + {count} > {MAX_QUEUE_SIZE}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_INGEST_MAX_POLL)
+
+
+async def _ingest_batch_chunk(chunk: List[tuple], tenant: str = "anonymous") -> int:
+    """
+    Enqueue one chunk of (request, eval_id) pairs; returns how many failed.
+
+    Queued events, Celery messages and pending keys each go out as one
+    group per chunk. Items whose publish fails are retried with backoff.
+    """
+    submitted_at = datetime.now(timezone.utc).isoformat()
+    await publish_evaluation_events(
+        "evaluation:queued",
+        [
+            {
+                "eval_id": eval_id,
+                "code": eval_request.code,
+                "language": eval_request.language,
+                "engine": eval_request.engine,
+                "metadata": {"submitted_at": submitted_at, "timeout": eval_request.timeout},
+            }
+            for eval_request, eval_id in chunk
+        ],
+    )
+
+    remaining = chunk
+    for attempt in range(BATCH_INGEST_MAX_RETRIES + 1):
+        task_ids = await _enqueue_submissions(
+            [_celery_submission(eval_request, eval_id) for eval_request, eval_id in remaining], tenant
         )
 
-    # Generate eval IDs and publish submitted events for all evaluations
-    results = []
-    eval_ids = []
-    
-    for eval_request in request.evaluations:
-        eval_id = generate_evaluation_id()
-        eval_ids.append(eval_id)
-        
-        # Publish submitted event
-        await publish_evaluation_event(
-            "evaluation:submitted",
+        # Pending keys bridge the gap until the storage worker records "queued"
+        submitted = [eval_id for (_, eval_id), task_id in zip(remaining, task_ids) if task_id]
+        if submitted:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for eval_id in submitted:
+                    pipe.setex(f"pending:{eval_id}", 600, "queued")  # 10 minutes
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to set pending keys for {len(submitted)} evaluations: {e}")
+
+        remaining = [item for item, task_id in zip(remaining, task_ids) if not task_id]
+        if not remaining:
+            return 0
+        if attempt < BATCH_INGEST_MAX_RETRIES:
+            backoff = BATCH_INGEST_RETRY_DELAY * (2 ** attempt)
+            logger.warning(
+                f"{len(remaining)} batch submissions failed, "
+                f"retry {attempt + 1}/{BATCH_INGEST_MAX_RETRIES} in {backoff:.2f}s"
+            )
+            await asyncio.sleep(backoff)
+
+    logger.error(f"Failed to queue {len(remaining)} evaluations after {BATCH_INGEST_MAX_RETRIES} retries")
+    await publish_evaluation_events(
+        "evaluation:failed",
+        [
+            {"eval_id": eval_id, "error": "Failed to submit to processing queue", "failed_at": "batch_submission"}
+            for _, eval_id in remaining
+        ],
+    )
+    return len(remaining)
+
+
+async def _dispatch_indexed_chunk(
+    chunk: List[tuple], batch_id: str, tenant: str = "anonymous", evaluations_per_pod: int = 1
+) -> List[tuple]:
+    """
+    Hand a chunk of (request, eval_id) pairs to the dispatcher's batch mode,
+    which runs evaluations sharing an image and resource profile as one
+    Indexed Job, evaluations_per_pod of the short ones to a pod.
+    Returns the pairs it didn't start, for the Celery path.
+    """
+    evaluations = []
+    for eval_request, eval_id in chunk:
+        submission = _celery_submission(eval_request, eval_id)
+        evaluations.append({key: value for key, value in submission.items() if value is not None})
+
+    try:
+        client = get_http_client("dispatcher")
+        response = await client.post(
+            f"{settings.dispatcher_service_url}/execute-batch",
+            json={
+                "batch_id": batch_id,
+                "evaluations": evaluations,
+                "evaluations_per_pod": evaluations_per_pod,
+                "tenant": tenant,
+            },
+            timeout=BATCH_DISPATCH_TIMEOUT,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Dispatcher batch mode failed for {len(chunk)} evaluations, using Celery: {e}")
+        return chunk
+
+    started = {
+        result["eval_id"]: result["job_name"]
+        for result in response.json()["evaluations"]
+        if result["status"] == "created"
+    }
+    submitted_at = datetime.now(timezone.utc).isoformat()
+    await publish_evaluation_events(
+        "evaluation:queued",
+        [
             {
                 "eval_id": eval_id,
                 "code": eval_request.code,
                 "language": eval_request.language,
                 "engine": eval_request.engine,
                 "metadata": {
-                    "submitted_at": datetime.now(timezone.utc).isoformat(),
+                    "submitted_at": submitted_at,
                     "timeout": eval_request.timeout,
-                    "priority": eval_request.priority,
-                    "batch": True,
+                    "job_name": started[eval_id],
                 },
-            },
+            }
+            for eval_request, eval_id in chunk
+            if eval_id in started
+        ],
+    )
+    return [item for item in chunk if item[1] not in started]
+
+
+async def _process_batch_async(
+    evaluations: List[EvaluationRequest], eval_ids: List[str], tenant: str = "anonymous",
+    batch_id: Optional[str] = None
+):
+    """
+    Enqueue a batch in the background, one chunk at a time, paced by the
+    depth of the Celery queues it targets and the dispatcher's capacity.
+    In indexed and packed batch modes chunks go to the dispatcher first.
+    """
+    started = time.perf_counter()
+    failed = 0
+    for start in range(0, len(evaluations), BATCH_INGEST_CHUNK_SIZE):
+        chunk = list(zip(
+            evaluations[start:start + BATCH_INGEST_CHUNK_SIZE],
+            eval_ids[start:start + BATCH_INGEST_CHUNK_SIZE],
+        ))
+        if BATCH_EXECUTION_MODE in ("indexed", "packed") and batch_id:
+            per_pod = BATCH_EVALUATIONS_PER_POD if BATCH_EXECUTION_MODE == "packed" else 1
+            chunk = await _dispatch_indexed_chunk(chunk, batch_id, tenant, per_pod)
+            if not chunk:
+                continue
+        # With fair share the pump paces Celery; parking up to the queue limit lets DRR see the backlog
+        await _wait_for_queue_room(len(chunk))
+        if fair_share is None:
+            await _wait_for_ingest_capacity({get_celery_queue(request.priority) for request, _ in chunk})
+        failed += await _ingest_batch_chunk(chunk, tenant)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Enqueued batch of {len(evaluations)} in {elapsed:.2f}s "
+        f"({len(evaluations) / elapsed if elapsed else 0:.0f}/s, {failed} failed)"
+    )
+
+
+@app.post("/api/eval-batch", response_model=BatchEvaluationResponse, status_code=202)
+async def evaluate_batch(request: BatchEvaluationRequest, response: Response, http_request: Request):
+    """Submit multiple evaluations as a batch - returns immediately with 202 Accepted"""
+    # Validate batch size
+    if len(request.evaluations) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Batch size {len(request.evaluations)} exceeds maximum of {MAX_BATCH_SIZE}"
         )
-        
-        # Add to results with submitted status
-        results.append(
-            EvaluationSubmitResponse(
-                eval_id=eval_id,
-                status=EvaluationStatus.SUBMITTED,
-                message="Evaluation accepted for processing",
-                queue_position=None,
-            )
+
+    # A batch holds a concurrency slot per member, so one bigger than the
+    # client's limit could never be admitted
+    if MAX_EVALUATIONS_PER_USER and len(request.evaluations) > MAX_EVALUATIONS_PER_USER:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Batch size {len(request.evaluations)} exceeds the limit of "
+                f"{MAX_EVALUATIONS_PER_USER} unfinished evaluations per client"
+            ),
         )
-    
+
+    # Every member costs a token and a slot; only the first chunk is queued
+    # now, later ones wait for room in _process_batch_async
+    eval_ids = [generate_evaluation_id() for _ in request.evaluations]
+    await admit_submission(http_request, eval_ids, queued_now=min(len(eval_ids), BATCH_INGEST_CHUNK_SIZE))
+
+    # Register the batch before any member can change state
+    batch_id = generate_batch_id()
+    try:
+        await create_batch(redis_client, batch_id, eval_ids)
+    except Exception as e:
+        logger.error(f"Failed to create batch {batch_id}: {e}")
+        for eval_id in eval_ids:
+            await _release_admission(eval_id)
+        raise HTTPException(status_code=503, detail="Failed to create batch")
+
+    # Publish submitted events for all evaluations, one pipeline per chunk
+    submitted_at = datetime.now(timezone.utc).isoformat()
+    for start in range(0, len(eval_ids), BATCH_INGEST_CHUNK_SIZE):
+        await publish_evaluation_events(
+            "evaluation:submitted",
+            [
+                {
+                    "eval_id": eval_id,
+                    "code": eval_request.code,
+                    "language": eval_request.language,
+                    "engine": eval_request.engine,
+                    "metadata": {
+                        "submitted_at": submitted_at,
+                        "timeout": eval_request.timeout,
+                        "priority": eval_request.priority,
+                        "batch": True,
+                        "batch_id": batch_id,
+                    },
+                }
+                for eval_request, eval_id in zip(
+                    request.evaluations[start:start + BATCH_INGEST_CHUNK_SIZE],
+                    eval_ids[start:start + BATCH_INGEST_CHUNK_SIZE],
+                )
+            ],
+        )
+
+    # Add to results with submitted status
+    results = [
+        EvaluationSubmitResponse(
+            eval_id=eval_id,
+            status=EvaluationStatus.SUBMITTED,
+            message="Evaluation accepted for processing",
+            queue_position=None,
+        )
+        for eval_id in eval_ids
+    ]
+
     # Process batch asynchronously in background
-    asyncio.create_task(_process_batch_async(request.evaluations, eval_ids))
+    asyncio.create_task(
+        _process_batch_async(request.evaluations, eval_ids, client_identity(http_request), batch_id)
+    )
     
     # Return 202 Accepted immediately
     response.status_code = 202
@@ -541,6 +1078,7 @@ async def evaluate_batch(request: BatchEvaluationRequest, response: Response):
         total=len(request.evaluations),
         queued=0,  # None queued yet, all are submitted
         failed=0,  # No failures yet
+        batch_id=batch_id,
     )
 
 
@@ -570,24 +1108,24 @@ async def get_evaluation_status(eval_id: str, response: Response):
     try:
         # First, try to get running info from Redis (real-time)
         try:
-            async with create_http_client() as redis_client_http:
-                response = await redis_client_http.get(
-                    f"{settings.storage_service_url}/evaluations/{eval_id}/running"
+            redis_client_http = get_http_client("storage")
+            response = await redis_client_http.get(
+                f"{settings.storage_service_url}/evaluations/{eval_id}/running"
+            )
+            if response.status_code == 200:
+                running_info = response.json()
+                # If it's in Redis, it's running
+                # Return 202 for running evaluations
+                response.status_code = 202
+                return EvaluationStatusResponse(
+                    eval_id=eval_id,
+                    status=EvaluationStatus.RUNNING,
+                    created_at=running_info.get("started_at"),
+                    completed_at=None,
+                    output="",
+                    error="",
+                    success=False,
                 )
-                if response.status_code == 200:
-                    running_info = response.json()
-                    # If it's in Redis, it's running
-                    # Return 202 for running evaluations
-                    response.status_code = 202
-                    return EvaluationStatusResponse(
-                        eval_id=eval_id,
-                        status=EvaluationStatus.RUNNING,
-                        created_at=running_info.get("started_at"),
-                        completed_at=None,
-                        output="",
-                        error="",
-                        success=False,
-                    )
         except httpx.HTTPStatusError as e:
             if e.response.status_code != 404:
                 logger.warning(f"Error checking Redis for {eval_id}: {e}")
@@ -595,33 +1133,33 @@ async def get_evaluation_status(eval_id: str, response: Response):
         
         # Fall back to database for completed/failed evaluations
         logger.info(f"Evaluation {eval_id} not in Redis, checking database")
-        async with create_http_client() as db_client:
-            response = await db_client.get(
-                f"{settings.storage_service_url}/evaluations/{eval_id}"
-            )
-            response.raise_for_status()
-            
-            eval_data = response.json()
-            
-            # Check pending status in Redis if not found in DB
-            if eval_data.get("status") == "queued":
-                try:
-                    pending_status = await redis_client.get(f"pending:{eval_id}")
-                    if pending_status:
-                        response.status_code = 202
-                except Exception as e:
-                    logger.debug(f"Failed to check Redis pending status: {e}")
-            
-            # Return typed response
-            return EvaluationStatusResponse(
-                eval_id=eval_data.get("id", eval_id),
-                status=eval_data.get("status", "unknown"),
-                created_at=eval_data.get("created_at"),
-                completed_at=eval_data.get("completed_at"),
-                output=eval_data.get("output") or "",
-                error=eval_data.get("error") or "",
-                success=eval_data.get("status") == EvaluationStatus.COMPLETED.value,
-            )
+        db_client = get_http_client("storage")
+        response = await db_client.get(
+            f"{settings.storage_service_url}/evaluations/{eval_id}"
+        )
+        response.raise_for_status()
+        
+        eval_data = response.json()
+        
+        # Check pending status in Redis if not found in DB
+        if eval_data.get("status") == "queued":
+            try:
+                pending_status = await redis_client.get(f"pending:{eval_id}")
+                if pending_status:
+                    response.status_code = 202
+            except Exception as e:
+                logger.debug(f"Failed to check Redis pending status: {e}")
+        
+        # Return typed response
+        return EvaluationStatusResponse(
+            eval_id=eval_data.get("id", eval_id),
+            status=eval_data.get("status", "unknown"),
+            created_at=eval_data.get("created_at"),
+            completed_at=eval_data.get("completed_at"),
+            output=eval_data.get("output") or "",
+            error=eval_data.get("error") or "",
+            success=eval_data.get("status") == EvaluationStatus.COMPLETED.value,
+        )
             
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
@@ -634,6 +1172,288 @@ async def get_evaluation_status(eval_id: str, response: Response):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get(
+    "/api/eval/{eval_id}/wait",
+    response_model=EvaluationStatusResponse,
+    responses={
+        200: {"model": EvaluationStatusResponse, "description": "Evaluation status after waiting"},
+        404: {"description": "Evaluation not found"},
+        503: {"description": "Event subscription unavailable"},
+    },
+)
+async def wait_for_evaluation(
+    eval_id: str,
+    response: Response,
+    timeout: float = 30,
+    until: Literal["terminal", "change"] = "terminal",
+):
+    """
+    Long-poll an evaluation's status instead of polling /status.
+
+    The request is parked on the gateway's shared event subscription and
+    returns as soon as the evaluation reaches a terminal state
+    (until=terminal) or leaves its current state (until=change), or when
+    the timeout expires. The status is read from storage once before
+    parking and once on return.
+    """
+    if event_hub is None:
+        raise HTTPException(status_code=503, detail="Event subscription unavailable")
+    timeout = min(max(timeout, 0), MAX_WAIT_TIMEOUT)
+
+    # Subscribe before reading so an update between the read and the wait isn't lost.
+    # The subscription stays for the whole wait: updates arriving back to back
+    # (running, then completed) queue up instead of slipping between waits.
+    subscription = Subscription(eval_ids=[eval_id], include_logs=False)
+    event_hub.subscribe(subscription)
+    try:
+        current = await get_evaluation_status(eval_id, response)
+        initial_status = getattr(current.status, "value", current.status)
+        if until == "terminal" and is_terminal_status(initial_status):
+            return current
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            update = await subscription.get(timeout=remaining)
+            if update is None:
+                break
+            if update.get("type") != "status":
+                continue
+
+            status = update.get("status")
+            if until == "change" and status != initial_status:
+                break
+            if until == "terminal" and status and is_terminal_status(status):
+                break
+            # Intermediate update (e.g. queued -> running); keep waiting
+    finally:
+        event_hub.unsubscribe(subscription)
+
+    return await get_evaluation_status(eval_id, response)
+
+
+async def _batch_get_statuses(eval_ids: List[str], include_output: bool) -> Dict[str, Dict[str, Any]]:
+    """Fetch status fields for many evaluations with one storage batch-get"""
+    if not eval_ids:
+        return {}
+    fields = ["status", "created_at", "completed_at"]
+    if include_output:
+        fields += ["output", "error"]
+    try:
+        client = get_http_client("storage")
+        storage_response = await client.post(
+            f"{settings.storage_service_url}/evaluations/batch-get",
+            json={"eval_ids": eval_ids, "fields": fields},
+        )
+        storage_response.raise_for_status()
+        return storage_response.json().get("evaluations", {})
+    except httpx.HTTPError as e:
+        logger.error(f"Storage batch-get failed for {len(eval_ids)} evaluations: {e}")
+        raise HTTPException(status_code=503, detail="Storage service unavailable")
+
+
+def _stored_status_response(eval_id: str, eval_data: Dict[str, Any]) -> EvaluationStatusResponse:
+    return EvaluationStatusResponse(
+        eval_id=eval_id,
+        status=eval_data.get("status", "unknown"),
+        created_at=eval_data.get("created_at"),
+        completed_at=eval_data.get("completed_at"),
+        output=eval_data.get("output") or "",
+        error=eval_data.get("error") or "",
+        success=eval_data.get("status") == EvaluationStatus.COMPLETED.value,
+    )
+
+
+@app.post(
+    "/api/eval/status:batch",
+    response_model=EvaluationStatusBatchResponse,
+    responses={
+        400: {"description": "Too many evaluation IDs"},
+        503: {"description": "Storage service unavailable"},
+    },
+)
+async def get_evaluation_status_batch(request: EvaluationStatusBatchRequest):
+    """
+    Get the status of many evaluations in one call.
+
+    Running and pending markers for every ID come from one pipelined
+    round trip to Redis; everything else is answered by a single
+    storage batch-get that selects only the status fields. Outputs are
+    omitted unless include_output is set.
+    """
+    eval_ids = list(dict.fromkeys(request.eval_ids))
+    if len(eval_ids) > MAX_STATUS_BATCH_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size {len(eval_ids)} exceeds maximum of {MAX_STATUS_BATCH_IDS}",
+        )
+
+    # Redis: eval:{id}:running and pending:{id} for every ID in one pipeline
+    running: Dict[str, Dict[str, Any]] = {}
+    pending: set = set()
+    try:
+        keys = [key for eval_id in eval_ids for key in (f"eval:{eval_id}:running", f"pending:{eval_id}")]
+        pipe = redis_client.pipeline(transaction=False)
+        for start in range(0, len(keys), REDIS_MGET_CHUNK_SIZE):
+            pipe.mget(keys[start:start + REDIS_MGET_CHUNK_SIZE])
+        values = [value for chunk in await pipe.execute() for value in chunk]
+        for index, eval_id in enumerate(eval_ids):
+            running_data, pending_status = values[2 * index], values[2 * index + 1]
+            if running_data:
+                try:
+                    running[eval_id] = json.loads(running_data)
+                except json.JSONDecodeError:
+                    running[eval_id] = {}
+            elif pending_status:
+                pending.add(eval_id)
+    except Exception as e:
+        logger.warning(f"Redis status lookup failed for batch of {len(eval_ids)}: {e}")
+
+    # Storage: one projected query for everything not currently running
+    lookup_ids = [eval_id for eval_id in eval_ids if eval_id not in running]
+    stored = await _batch_get_statuses(lookup_ids, request.include_output)
+
+    evaluations = []
+    not_found = []
+    for eval_id in eval_ids:
+        if eval_id in running:
+            evaluations.append(
+                EvaluationStatusResponse(
+                    eval_id=eval_id,
+                    status=EvaluationStatus.RUNNING,
+                    created_at=running[eval_id].get("started_at"),
+                )
+            )
+        elif eval_id in stored:
+            evaluations.append(_stored_status_response(eval_id, stored[eval_id]))
+        elif eval_id in pending:
+            # Accepted by the gateway but not yet written by the storage worker
+            evaluations.append(
+                EvaluationStatusResponse(eval_id=eval_id, status=EvaluationStatus.QUEUED)
+            )
+        else:
+            not_found.append(eval_id)
+
+    return EvaluationStatusBatchResponse(
+        evaluations=evaluations, not_found=not_found, total=len(eval_ids)
+    )
+
+
+@app.get(
+    "/api/batch/{batch_id}",
+    response_model=BatchProgressResponse,
+    responses={404: {"description": "Batch not found or expired"}},
+)
+async def get_batch(batch_id: str):
+    """
+    Get a batch's progress. Counters are maintained by the storage worker
+    as members change state, so this is one Redis read at any batch size.
+    """
+    progress = await get_batch_progress(redis_client, batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return BatchProgressResponse(**progress)
+
+
+async def _fetch_batch_results(
+    batch_id: str, offset: int, limit: int, include_output: bool
+) -> List[EvaluationStatusResponse]:
+    """Finished members from offset, in finish order, with their stored status"""
+    entries = await get_batch_results(redis_client, batch_id, offset, limit)
+    stored = await _batch_get_statuses([entry["eval_id"] for entry in entries], include_output)
+    return [
+        _stored_status_response(entry["eval_id"], stored.get(entry["eval_id"], entry))
+        for entry in entries
+    ]
+
+
+@app.get(
+    "/api/batch/{batch_id}/results",
+    response_model=BatchResultsResponse,
+    responses={
+        404: {"description": "Batch not found or expired"},
+        503: {"description": "Storage service unavailable"},
+    },
+)
+async def get_batch_results_page(
+    batch_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=BATCH_RESULTS_PAGE_SIZE),
+    include_output: bool = False,
+):
+    """Page through a batch's finished evaluations in the order they finished"""
+    progress = await get_batch_progress(redis_client, batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    results = await _fetch_batch_results(batch_id, offset, limit, include_output)
+    next_offset = offset + len(results)
+    return BatchResultsResponse(
+        batch_id=batch_id,
+        results=results,
+        next_offset=next_offset,
+        done=progress["done"] and next_offset >= progress["finished"],
+    )
+
+
+@app.get("/api/batch/{batch_id}/stream")
+async def stream_batch_results(
+    request: Request,
+    batch_id: str,
+    offset: int = Query(0, ge=0),
+    include_output: bool = False,
+):
+    """
+    Server-Sent Events stream of a batch's evaluations as they finish.
+
+    Sends a "result" event per finished evaluation (starting at offset, so a
+    reconnecting client can resume) and a final "done" event with the
+    batch's progress. Batch status updates from the shared event
+    subscription wake the stream; the stored results list is what is sent.
+    """
+    if event_hub is None:
+        raise HTTPException(status_code=503, detail="Event subscription unavailable")
+    if await get_batch_progress(redis_client, batch_id) is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    # Subscribe before the first read so no finish is missed in between
+    subscription = Subscription(batch_ids=[batch_id], include_logs=False, max_queue=STREAM_QUEUE_SIZE)
+    event_hub.subscribe(subscription)
+
+    async def event_stream():
+        cursor = offset
+        try:
+            while not await request.is_disconnected():
+                try:
+                    results = await _fetch_batch_results(
+                        batch_id, cursor, BATCH_RESULTS_PAGE_SIZE, include_output
+                    )
+                except HTTPException as e:
+                    yield f"event: error\ndata: {json.dumps({'detail': e.detail})}\n\n"
+                    return
+                for result in results:
+                    yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+                cursor += len(results)
+
+                progress = await get_batch_progress(redis_client, batch_id)
+                if progress is None or (progress["done"] and cursor >= progress["finished"]):
+                    yield f"event: done\ndata: {json.dumps(progress)}\n\n"
+                    return
+                if len(results) == BATCH_RESULTS_PAGE_SIZE:
+                    continue  # Backlog left; keep draining before waiting
+
+                if await subscription.get(timeout=STREAM_HEARTBEAT_INTERVAL) is None:
+                    yield ": keepalive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get(
     "/api/eval/{eval_id}",
     response_model=EvaluationResponse,
@@ -653,29 +1473,29 @@ async def get_evaluation(eval_id: str):
     """
     logger.info(f"Getting full evaluation details for {eval_id}")
     try:
-        async with create_http_client() as client:
-            response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
-            response.raise_for_status()
-            
-            eval_data = response.json()
-            
-            # Map storage service response to our detail response
-            return EvaluationResponse(
-                eval_id=eval_data.get("id", eval_id),
-                code=eval_data.get("code", ""),
-                language=eval_data.get("language", "python"),
-                status=eval_data.get("status", "unknown"),
-                created_at=eval_data.get("created_at"),
-                started_at=eval_data.get("started_at"),
-                completed_at=eval_data.get("completed_at"),
-                output=eval_data.get("output", ""),
-                error=eval_data.get("error", ""),
-                exit_code=eval_data.get("exit_code"),
-                runtime_ms=eval_data.get("runtime_ms"),
-                output_truncated=eval_data.get("output_truncated", False),
-                error_truncated=eval_data.get("error_truncated", False),
-                metadata=eval_data.get("metadata", {}),
-            )
+        client = get_http_client("storage")
+        response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
+        response.raise_for_status()
+        
+        eval_data = response.json()
+        
+        # Map storage service response to our detail response
+        return EvaluationResponse(
+            eval_id=eval_data.get("id", eval_id),
+            code=eval_data.get("code", ""),
+            language=eval_data.get("language", "python"),
+            status=eval_data.get("status", "unknown"),
+            created_at=eval_data.get("created_at"),
+            started_at=eval_data.get("started_at"),
+            completed_at=eval_data.get("completed_at"),
+            output=eval_data.get("output", ""),
+            error=eval_data.get("error", ""),
+            exit_code=eval_data.get("exit_code"),
+            runtime_ms=eval_data.get("runtime_ms"),
+            output_truncated=eval_data.get("output_truncated", False),
+            error_truncated=eval_data.get("error_truncated", False),
+            metadata=eval_data.get("metadata", {}),
+        )
             
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
@@ -698,19 +1518,19 @@ async def update_evaluation_status(eval_id: str, status: str, reason: Optional[s
 
     try:
         # Update in storage service (uses PUT, not PATCH)
-        async with create_http_client() as update_client:
-            response = await update_client.put(
-                f"{settings.storage_service_url}/evaluations/{eval_id}",
-                json={
-                    "status": status,
-                    "metadata": {
-                        "admin_update": True,
-                        "admin_updated_at": datetime.now(timezone.utc).isoformat(),
-                        "admin_reason": reason or f"Manually set to {status}",
-                        "admin_update_type": "status_change",
-                    },
+        update_client = get_http_client("storage")
+        response = await update_client.put(
+            f"{settings.storage_service_url}/evaluations/{eval_id}",
+            json={
+                "status": status,
+                "metadata": {
+                    "admin_update": True,
+                    "admin_updated_at": datetime.now(timezone.utc).isoformat(),
+                    "admin_reason": reason or f"Manually set to {status}",
+                    "admin_update_type": "status_change",
                 },
-            )
+            },
+        )
 
         if response.status_code == 200:
             # Publish event for other services
@@ -732,47 +1552,74 @@ async def update_evaluation_status(eval_id: str, status: str, reason: Optional[s
 @app.get("/api/eval/{eval_id}/logs")
 async def get_evaluation_logs(eval_id: str):
     """Get logs for any evaluation - routes through storage service"""
-    async with create_http_client() as client:
-        try:
-            # Route to storage service which handles Redis cache and DB fallback
-            response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}/logs")
+    client = get_http_client("storage")
+    try:
+        # Route to storage service which handles Redis cache and DB fallback
+        response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}/logs")
 
-            if response.status_code == 404:
-                return JSONResponse(content={"error": "Evaluation not found"}, status_code=404)
+        if response.status_code == 404:
+            return JSONResponse(content={"error": "Evaluation not found"}, status_code=404)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Storage service returned {response.status_code} for logs")
-                return JSONResponse(
-                    content={"error": "Failed to get evaluation logs"},
-                    status_code=response.status_code,
-                )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error(f"Storage service returned {response.status_code} for logs")
+            return JSONResponse(
+                content={"error": "Failed to get evaluation logs"},
+                status_code=response.status_code,
+            )
 
-        except Exception as e:
-            logger.error(f"Failed to get evaluation logs for {eval_id}: {e}")
-            return JSONResponse(content={"error": "Failed to get evaluation logs"}, status_code=500)
+    except Exception as e:
+        logger.error(f"Failed to get evaluation logs for {eval_id}: {e}")
+        return JSONResponse(content={"error": "Failed to get evaluation logs"}, status_code=500)
+
+
+async def _remove_pending_dispatch(eval_id: str) -> Optional[Dict[str, Any]]:
+    """Remove an evaluation the dispatcher is holding until capacity frees up."""
+    dispatcher_url = os.getenv("DISPATCHER_SERVICE_URL")
+    if not dispatcher_url:
+        return None
+    try:
+        response = await get_http_client("dispatcher").delete(f"{dispatcher_url}/pending/{eval_id}")
+        if response.status_code == 200:
+            return response.json()
+    except Exception as e:
+        logger.error(f"Failed to remove {eval_id} from the dispatcher's pending queue: {e}")
+    return None
 
 
 @app.post("/api/eval/{eval_id}/kill")
 async def kill_evaluation(eval_id: str):
     """Kill a running evaluation (Kubernetes version)"""
     # Step 1: Get running info from storage to find the job name
-    async with create_http_client() as client:
-        try:
-            response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}/running")
-            if response.status_code == 404:
-                return JSONResponse(content={"error": "Evaluation not running"}, status_code=404)
+    client = get_http_client("storage")
+    try:
+        response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}/running")
+        if response.status_code == 404:
+            running_info = None
+        else:
             running_info = response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return JSONResponse(content={"error": "Evaluation not running"}, status_code=404)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404:
             raise
-        except Exception as e:
-            logger.error(f"Failed to get running info for {eval_id}: {e}")
-            return JSONResponse(
-                content={"error": "Failed to get evaluation status"}, status_code=500
-            )
+        running_info = None
+    except Exception as e:
+        logger.error(f"Failed to get running info for {eval_id}: {e}")
+        return JSONResponse(
+            content={"error": "Failed to get evaluation status"}, status_code=500
+        )
+
+    if running_info is None:
+        # Not running yet, but the dispatcher may be holding it until capacity frees up
+        removed = await _remove_pending_dispatch(eval_id)
+        if removed:
+            return {
+                "eval_id": eval_id,
+                "job_name": removed.get("job_name"),
+                "status": "killed",
+                "message": "Evaluation removed before its job was created"
+            }
+        return JSONResponse(content={"error": "Evaluation not running"}, status_code=404)
 
     # Step 2: Delete the Kubernetes job through dispatcher
     job_name = running_info.get("executor_id")  # In K8s, executor_id is the job name
@@ -787,31 +1634,31 @@ async def kill_evaluation(eval_id: str):
             status_code=500
         )
     
-    async with create_http_client() as dispatcher_client:
-        try:
-            # Call dispatcher to delete the job
-            delete_response = await dispatcher_client.delete(f"{dispatcher_url}/job/{job_name}")
-            delete_response.raise_for_status()
-            
-            result = delete_response.json()
-            return {
-                "eval_id": eval_id,
-                "job_name": result.get("job_name"),
-                "status": "killed",
-                "message": "Evaluation job deleted successfully"
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return JSONResponse(content={"error": "Job not found"}, status_code=404)
-            logger.error(f"Failed to delete job {job_name}: {e}")
-            return JSONResponse(
-                content={"error": f"Failed to kill evaluation: {str(e)}"}, status_code=500
-            )
-        except Exception as e:
-            logger.error(f"Failed to delete job {job_name}: {e}")
-            return JSONResponse(
-                content={"error": f"Failed to kill evaluation: {str(e)}"}, status_code=500
-            )
+    dispatcher_client = get_http_client("dispatcher")
+    try:
+        # Call dispatcher to delete the job
+        delete_response = await dispatcher_client.delete(f"{dispatcher_url}/job/{job_name}")
+        delete_response.raise_for_status()
+        
+        result = delete_response.json()
+        return {
+            "eval_id": eval_id,
+            "job_name": result.get("job_name"),
+            "status": "killed",
+            "message": "Evaluation job deleted successfully"
+        }
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return JSONResponse(content={"error": "Job not found"}, status_code=404)
+        logger.error(f"Failed to delete job {job_name}: {e}")
+        return JSONResponse(
+            content={"error": f"Failed to kill evaluation: {str(e)}"}, status_code=500
+        )
+    except Exception as e:
+        logger.error(f"Failed to delete job {job_name}: {e}")
+        return JSONResponse(
+            content={"error": f"Failed to kill evaluation: {str(e)}"}, status_code=500
+        )
 
 
 @app.post("/api/eval/{eval_id}/cancel")
@@ -828,36 +1675,40 @@ async def cancel_evaluation(eval_id: str):
     Handles race conditions by checking status after queue operations.
     """
     # Step 1: Get evaluation status
-    async with create_http_client() as client:
-        try:
-            # Check if evaluation exists
-            response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
-            if response.status_code == 404:
-                return JSONResponse(content={"error": "Evaluation not found"}, status_code=404)
-            
-            eval_data = response.json()
-            status = eval_data.get("status")
+    client = get_http_client("storage")
+    try:
+        # Check if evaluation exists
+        response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
+        if response.status_code == 404:
+            return JSONResponse(content={"error": "Evaluation not found"}, status_code=404)
+        
+        eval_data = response.json()
+        status = eval_data.get("status")
+        
+        # If already in terminal state, just return success
+        if status in ["completed", "failed", "cancelled"]:
+            return {
+                "eval_id": eval_id,
+                "status": status,
+                "message": f"Evaluation already in terminal state: {status}"
+            }
             
-            # If already in terminal state, just return success
-            if status in ["completed", "failed", "cancelled"]:
-                return {
-                    "eval_id": eval_id,
-                    "status": status,
-                    "message": f"Evaluation already in terminal state: {status}"
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to get evaluation info for {eval_id}: {e}")
-            return JSONResponse(
-                content={"error": "Failed to get evaluation status"}, status_code=500
-            )
+    except Exception as e:
+        logger.error(f"Failed to get evaluation info for {eval_id}: {e}")
+        return JSONResponse(
+            content={"error": "Failed to get evaluation status"}, status_code=500
+        )
 
     # Step 2: If using Celery and evaluation is queued, try to cancel from queue
     if CELERY_ENABLED and status in ["submitted", "queued"]:
         try:
-            result = cancel_celery_task(eval_id, terminate=True)
-            if not result.get("cancelled"):
-                logger.warning(f"Failed to cancel Celery task for {eval_id}: {result}")
+            # Still parked for fair-share scheduling: nothing reached Celery yet
+            if fair_share is not None and await fair_share.cancel(eval_id):
+                logger.info(f"Removed {eval_id} from its fair-share queue")
+            else:
+                result = cancel_celery_task(eval_id, terminate=True)
+                if not result.get("cancelled"):
+                    logger.warning(f"Failed to cancel Celery task for {eval_id}: {result}")
         except Exception as e:
             logger.error(f"Error cancelling Celery task: {e}")
         
@@ -910,29 +1761,33 @@ async def cancel_evaluation(eval_id: str):
     
     # Step 5: Update status to cancelled (if not already terminal)
     # This handles cases where: job wasn't found, job deletion failed, or evaluation was just queued
-    async with create_http_client() as client:
-        try:
-            # Final status check to avoid overwriting terminal states
-            response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
-            eval_data = response.json()
-            current_status = eval_data.get("status")
-            
-            if current_status not in ["completed", "failed", "cancelled"]:
-                await client.put(
-                    f"{settings.storage_service_url}/evaluations/{eval_id}",
-                    json={"status": "cancelled", "error": "Cancelled by user"},
-                )
-            
-            return {
-                "eval_id": eval_id,
-                "status": "cancelled",
-                "message": "Evaluation cancelled successfully"
-            }
-        except Exception as e:
-            logger.error(f"Failed to update evaluation status: {e}")
-            return JSONResponse(
-                content={"error": "Failed to update evaluation status"}, status_code=500
+    try:
+        # Final status check to avoid overwriting terminal states
+        response = await client.get(f"{settings.storage_service_url}/evaluations/{eval_id}")
+        eval_data = response.json()
+        current_status = eval_data.get("status")
+        
+        if current_status not in ["completed", "failed", "cancelled"]:
+            # Through the storage worker, which also counts batch progress and frees the client's slot
+            await publish_evaluation_event(
+                "evaluation:cancelled",
+                {
+                    "eval_id": eval_id,
+                    "cancelled_at": datetime.now(timezone.utc).isoformat(),
+                    "reason": "Cancelled by user",
+                },
             )
+        
+        return {
+            "eval_id": eval_id,
+            "status": "cancelled",
+            "message": "Evaluation cancelled successfully"
+        }
+    except Exception as e:
+        logger.error(f"Failed to update evaluation status: {e}")
+        return JSONResponse(
+            content={"error": "Failed to update evaluation status"}, status_code=500
+        )
 
 
 @app.get("/api/evaluations")
@@ -942,50 +1797,54 @@ async def get_evaluations(limit: int = 100, offset: int = 0, status: Optional[st
     try:
         # Special handling for running status - use Redis for real-time data
         if status == "running":
-            async with create_http_client() as running_client:
-                response = await running_client.get(f"{settings.storage_service_url}/evaluations/running")
-                if response.status_code == 200:
-                    data = response.json()
-                    # Transform to match expected format
-                    evaluations = []
-                    for eval_info in data.get("running_evaluations", []):
-                        # Get additional details from DB if needed
-                        try:
-                            async with create_http_client() as db_client:
-                                db_response = await db_client.get(
-                                    f"{settings.storage_service_url}/evaluations/{eval_info['eval_id']}"
-                                )
-                            if db_response.status_code == 200:
-                                eval_data = db_response.json()
-                                evaluations.append({
-                                    "eval_id": eval_info['eval_id'],
-                                    "status": "running",
-                                    "created_at": eval_data.get("created_at"),
-                                    "started_at": eval_info.get("started_at"),
-                                    "executor_id": eval_info.get("executor_id"),
-                                    "code_preview": (eval_data.get("code") or "")[:100] + "..."
-                                    if eval_data.get("code") and len(eval_data.get("code")) > 100
-                                    else (eval_data.get("code") or ""),
-                                    "success": False,
-                                })
-                        except Exception as e:
-                            logger.warning(f"Failed to get details for {eval_info['eval_id']}: {e}")
-                            # Use minimal info from Redis
-                            evaluations.append({
+            running_client = get_http_client("storage")
+            response = await running_client.get(f"{settings.storage_service_url}/evaluations/running")
+            if response.status_code == 200:
+                data = response.json()
+                # Transform to match expected format, fetching DB details concurrently
+                # over the pooled storage connections
+                async def running_details(eval_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                    try:
+                        db_response = await running_client.get(
+                            f"{settings.storage_service_url}/evaluations/{eval_info['eval_id']}"
+                        )
+                        if db_response.status_code == 200:
+                            eval_data = db_response.json()
+                            return {
                                 "eval_id": eval_info['eval_id'],
                                 "status": "running",
+                                "created_at": eval_data.get("created_at"),
                                 "started_at": eval_info.get("started_at"),
                                 "executor_id": eval_info.get("executor_id"),
+                                "code_preview": (eval_data.get("code") or "")[:100] + "..."
+                                if eval_data.get("code") and len(eval_data.get("code")) > 100
+                                else (eval_data.get("code") or ""),
                                 "success": False,
-                            })
-                    
-                    return {
-                        "evaluations": evaluations,
-                        "count": len(evaluations),
-                        "limit": limit,
-                        "offset": 0,  # Redis doesn't support pagination
-                        "has_more": False,
-                    }
+                            }
+                        return None
+                    except Exception as e:
+                        logger.warning(f"Failed to get details for {eval_info['eval_id']}: {e}")
+                        # Use minimal info from Redis
+                        return {
+                            "eval_id": eval_info['eval_id'],
+                            "status": "running",
+                            "started_at": eval_info.get("started_at"),
+                            "executor_id": eval_info.get("executor_id"),
+                            "success": False,
+                        }
+
+                details = await asyncio.gather(
+                    *(running_details(eval_info) for eval_info in data.get("running_evaluations", []))
+                )
+                evaluations = [detail for detail in details if detail is not None]
+                
+                return {
+                    "evaluations": evaluations,
+                    "count": len(evaluations),
+                    "limit": limit,
+                    "offset": 0,  # Redis doesn't support pagination
+                    "has_more": False,
+                }
         
         # For all other statuses, use the database
         # Build query parameters
@@ -994,8 +1853,8 @@ async def get_evaluations(limit: int = 100, offset: int = 0, status: Optional[st
             params["status"] = status
 
         # Proxy to storage service
-        async with create_http_client() as storage_client:
-            response = await storage_client.get(f"{settings.storage_service_url}/evaluations", params=params)
+        storage_client = get_http_client("storage")
+        response = await storage_client.get(f"{settings.storage_service_url}/evaluations", params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -1034,10 +1893,8 @@ async def get_evaluations(limit: int = 100, offset: int = 0, status: Optional[st
 
 @app.get("/api/queue/status", response_model=QueueStatusResponse)
 async def get_queue_status():
-    """Get actual queue status from Celery."""
-    from api.celery_client import celery_app, CELERY_ENABLED
-    
-    if not CELERY_ENABLED:
+    """Queue status read from the Celery broker (no worker broadcast)."""
+    if queue_telemetry is None:
         return QueueStatusResponse(
             queued=0,
             processing=0,
@@ -1045,32 +1902,9 @@ async def get_queue_status():
             total_tasks=0,
             error="Celery is not enabled"
         )
-    
+
     try:
-        # Get queue information from Celery
-        inspect = celery_app.control.inspect()
-        
-        # Get active tasks (currently processing)
-        active = inspect.active()
-        active_count = sum(len(tasks) for tasks in (active or {}).values())
-        
-        # Get reserved tasks (queued but not yet processing)
-        reserved = inspect.reserved()
-        reserved_count = sum(len(tasks) for tasks in (reserved or {}).values())
-        
-        # Get scheduled tasks
-        scheduled = inspect.scheduled()
-        scheduled_count = sum(len(tasks) for tasks in (scheduled or {}).values())
-        
-        queued_count = reserved_count + scheduled_count
-        
-        return QueueStatusResponse(
-            queued=queued_count,
-            processing=active_count,
-            queue_length=queued_count,  # Same as queued for backward compatibility
-            total_tasks=queued_count + active_count,
-            error=None
-        )
+        snapshot = await queue_telemetry.snapshot()
     except Exception as e:
         logger.error(f"Failed to get queue status: {e}")
         return QueueStatusResponse(
@@ -1081,56 +1915,64 @@ async def get_queue_status():
             error=str(e)
         )
 
+    # Waiting in the evaluation queues vs. delivered to a worker and not yet acked
+    queued_count = snapshot["queued"]
+    processing_count = snapshot["unacked"]
+    return QueueStatusResponse(
+        queued=queued_count,
+        processing=processing_count,
+        queue_length=queued_count,  # Same as queued for backward compatibility
+        total_tasks=queued_count + processing_count,
+        queues=snapshot["queues"],
+        workers_online=snapshot["workers_online"],
+        error=None
+    )
+
+
+def _celery_summary(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Connection summary for health checks, from a telemetry snapshot."""
+    return {
+        "enabled": True,
+        "connected": snapshot["workers_online"] > 0,
+        "workers": snapshot["workers_online"],
+        "broker_url": CELERY_BROKER_URL,
+    }
+
 
 @app.get("/api/celery-status")
 async def get_celery_status_endpoint():
     """Get Celery cluster status including workers, queues, and tasks."""
-    from api.celery_client import get_celery_status, CELERY_ENABLED, celery_app
-
-    if not CELERY_ENABLED:
+    if queue_telemetry is None:
         return {
             "enabled": False,
             "message": "Celery is not enabled. Set CELERY_ENABLED=true to use Celery.",
         }
 
     try:
-        # Get basic status
-        status = get_celery_status()
-
-        # Get more detailed info if connected
-        if status.get("connected"):
-            inspect = celery_app.control.inspect()
-
-            # Get active tasks
-            active_tasks = inspect.active()
-            active_count = sum(len(tasks) for tasks in (active_tasks or {}).values())
-
-            # Get scheduled tasks
-            scheduled_tasks = inspect.scheduled()
-            scheduled_count = sum(len(tasks) for tasks in (scheduled_tasks or {}).values())
-
-            # Get registered tasks
-            registered = inspect.registered()
-
-            # Get stats
-            stats = inspect.stats()
-
-            status.update(
-                {
-                    "active_tasks": active_count,
-                    "scheduled_tasks": scheduled_count,
-                    "registered_tasks": list(registered.values())[0] if registered else [],
-                    "worker_stats": stats,
-                    "queue_details": {"active": active_tasks, "scheduled": scheduled_tasks},
-                }
-            )
-
-        return status
-
+        snapshot = await queue_telemetry.snapshot()
     except Exception as e:
         logger.error(f"Failed to get Celery status: {e}")
         return {"enabled": True, "connected": False, "error": str(e)}
 
+    online = [worker for worker in snapshot["workers"] if worker["online"]]
+    status = _celery_summary(snapshot)
+    status.update(
+        {
+            "active_tasks": sum(worker.get("active", 0) for worker in online),
+            "reserved_tasks": sum(worker.get("reserved", 0) for worker in online),
+            "unacked_tasks": snapshot["unacked"],
+            "queues": snapshot["queues"],
+            "worker_details": snapshot["workers"],
+            "publisher": celery_publisher.stats(),
+        }
+    )
+    if fair_share is not None:
+        try:
+            status["fair_share"] = await fair_share.stats()
+        except Exception as e:
+            logger.warning(f"Failed to read fair-share queues: {e}")
+    return status
+
 
 @app.get("/api/status", response_model=StatusResponse)
 async def platform_status():
@@ -1140,28 +1982,26 @@ async def platform_status():
     # Get storage stats from storage service
     storage_stats = {}
     try:
-        async with create_http_client() as stats_client:
-            response = await stats_client.get(f"{settings.storage_service_url}/statistics")
-            if response.status_code == 200:
-                stats_data = response.json()
-                storage_stats = {
-                    "total_evaluations": stats_data.get("total_evaluations", 0),
-                    "by_status": stats_data.get("by_status", {}),
-                    "storage_info": stats_data.get("storage_info", {}),
-                }
+        stats_client = get_http_client("storage")
+        response = await stats_client.get(f"{settings.storage_service_url}/statistics")
+        if response.status_code == 200:
+            stats_data = response.json()
+            storage_stats = {
+                "total_evaluations": stats_data.get("total_evaluations", 0),
+                "by_status": stats_data.get("by_status", {}),
+                "storage_info": stats_data.get("storage_info", {}),
+            }
     except Exception as e:
         logger.error(f"Failed to get storage statistics: {e}")
 
-    # Get Celery status
+    # Get Celery status (same cached snapshot get_queue_status just used)
     celery_info = {}
-    try:
-        from api.celery_client import get_celery_status, CELERY_ENABLED
-
-        if CELERY_ENABLED:
-            celery_info = get_celery_status()
-    except Exception as e:
-        logger.error(f"Failed to get Celery status: {e}")
-        celery_info = {"enabled": False, "error": str(e)}
+    if queue_telemetry is not None:
+        try:
+            celery_info = _celery_summary(await queue_telemetry.snapshot())
+        except Exception as e:
+            logger.error(f"Failed to get Celery status: {e}")
+            celery_info = {"enabled": True, "connected": False, "error": str(e)}
 
     services = ServiceHealthInfo(
         gateway="healthy",
@@ -1204,12 +2044,12 @@ async def get_statistics():
     """Get aggregated statistics from storage service"""
 
     try:
-        async with create_http_client() as stats_client:
-            response = await stats_client.get(f"{settings.storage_service_url}/statistics")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(status_code=response.status_code, detail="Failed to get statistics")
+        stats_client = get_http_client("storage")
+        response = await stats_client.get(f"{settings.storage_service_url}/statistics")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(status_code=response.status_code, detail="Failed to get statistics")
     except HTTPException:
         raise
     except Exception as e:
@@ -1217,22 +2057,130 @@ async def get_statistics():
         raise HTTPException(status_code=500, detail="Failed to get statistics")
 
 
-# WebSocket for real-time updates (simplified for now)
+@app.get("/api/metrics/http-clients")
+async def get_http_client_metrics():
+    """Upstream connection pool and latency metrics"""
+    return {upstream: get_http_pool_stats(upstream) for upstream in ("storage", "dispatcher")}
+
+
+def _parse_eval_ids(value: Optional[str]) -> List[str]:
+    """Split a comma-separated eval_ids (or batch_ids) parameter"""
+    return [eval_id.strip() for eval_id in (value or "").split(",") if eval_id.strip()]
+
+
+def _heartbeat() -> Dict[str, Any]:
+    return {"type": "heartbeat", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+# WebSocket for real-time updates
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket for real-time evaluation updates"""
+    """
+    WebSocket for real-time evaluation updates.
+
+    Subscribe with query parameters (?eval_ids=a,b&batch_ids=c&all=true&logs=false)
+    or by sending {"action": "subscribe" | "unsubscribe", "eval_ids": [...], "batch_ids": [...]}.
+    Batch subscriptions receive status updates for every member.
+    Messages have type "status", "log", "dropped" (slow consumer) or "heartbeat".
+    """
     await websocket.accept()
+    if event_hub is None:
+        await websocket.close(code=1011, reason="Event subscription unavailable")
+        return
+
+    params = websocket.query_params
+    subscription = Subscription(
+        eval_ids=_parse_eval_ids(params.get("eval_ids")),
+        all_events=params.get("all", "false").lower() == "true",
+        include_logs=params.get("logs", "true").lower() != "false",
+        max_queue=STREAM_QUEUE_SIZE,
+        batch_ids=_parse_eval_ids(params.get("batch_ids")),
+    )
+    event_hub.subscribe(subscription)
+
+    async def receive_commands():
+        while True:
+            try:
+                command = await websocket.receive_json()
+            except ValueError:
+                continue  # Ignore malformed client messages
+            if not isinstance(command, dict):
+                continue  # Valid JSON, but not a command object
+            eval_ids = command.get("eval_ids") or []
+            batch_ids = command.get("batch_ids") or []
+            if not isinstance(eval_ids, list) or not isinstance(batch_ids, list):
+                continue
+            if command.get("action") == "subscribe":
+                event_hub.add_interest(subscription, eval_ids, batch_ids)
+            elif command.get("action") == "unsubscribe":
+                event_hub.remove_interest(subscription, eval_ids, batch_ids)
+
+    receiver = asyncio.create_task(receive_commands())
     try:
         while True:
-            # Send heartbeat to keep connection alive
-            heartbeat = {
-                "type": "heartbeat",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-            await websocket.send_json(heartbeat)
-            await asyncio.sleep(10)  # Less frequent heartbeat
+            # Wake on the next message or on disconnect, whichever comes first
+            next_message = asyncio.ensure_future(subscription.get(timeout=STREAM_HEARTBEAT_INTERVAL))
+            await asyncio.wait({next_message, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                next_message.cancel()
+                break
+            await websocket.send_json(next_message.result() or _heartbeat())
     except WebSocketDisconnect:
+        pass
+    finally:
         logger.info("WebSocket client disconnected")
+        receiver.cancel()
+        event_hub.unsubscribe(subscription)
+
+
+@app.get("/api/events")
+async def stream_events(
+    request: Request,
+    eval_ids: Optional[str] = None,
+    all_events: bool = Query(False, alias="all"),
+    logs: bool = True,
+    batch_ids: Optional[str] = None,
+):
+    """
+    Server-Sent Events variant of /ws for clients that can't use WebSockets.
+    Each message is sent as an SSE event named after its type.
+    """
+    if event_hub is None:
+        raise HTTPException(status_code=503, detail="Event subscription unavailable")
+
+    subscription = Subscription(
+        eval_ids=_parse_eval_ids(eval_ids),
+        all_events=all_events,
+        include_logs=logs,
+        max_queue=STREAM_QUEUE_SIZE,
+        batch_ids=_parse_eval_ids(batch_ids),
+    )
+    event_hub.subscribe(subscription)
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=STREAM_HEARTBEAT_INTERVAL)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/metrics/events")
+async def get_event_stream_metrics():
+    """Live subscription counts for this gateway process"""
+    if event_hub is None:
+        raise HTTPException(status_code=503, detail="Event subscription unavailable")
+    return event_hub.stats()
 
 
 # OpenAPI endpoint
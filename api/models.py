@@ -72,6 +72,7 @@ class BatchEvaluationResponse(BaseModel):
     total: int
     queued: int
     failed: int
+    batch_id: Optional[str] = None
 
 
 class EvaluationStatusResponse(BaseModel):
@@ -84,11 +85,49 @@ class EvaluationStatusResponse(BaseModel):
     success: bool = False
 
 
+class EvaluationStatusBatchRequest(BaseModel):
+    eval_ids: List[str]
+    include_output: bool = False
+
+
+class EvaluationStatusBatchResponse(BaseModel):
+    evaluations: List[EvaluationStatusResponse]
+    not_found: List[str] = Field(default_factory=list)
+    total: int
+
+
+class BatchProgressResponse(BaseModel):
+    batch_id: str
+    total: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    finished: int = 0
+    done: bool = False
+    created_at: Optional[str] = None
+
+
+class BatchResultsResponse(BaseModel):
+    batch_id: str
+    results: List[EvaluationStatusResponse]
+    next_offset: int
+    done: bool
+
+
+class QueueDepthInfo(BaseModel):
+    depth: int = 0
+    oldest_message_age_seconds: Optional[float] = None
+
+
 class QueueStatusResponse(BaseModel):
     queued: int = 0
     processing: int = 0
     queue_length: int = 0
     total_tasks: int = 0
+    queues: Dict[str, QueueDepthInfo] = {}
+    workers_online: Optional[int] = None
     error: Optional[str] = None
 
 
@@ -14,4 +14,6 @@ app = Celery("crucible_worker")
 app.config_from_object("celery_worker.celeryconfig")
 
 # Auto-discover tasks in the celery_worker package
-app.autodiscover_tasks(["celery_worker"])
\ No newline at end of file
+app.autodiscover_tasks(["celery_worker"])
+# Register worker heartbeat signal handlers
+import celery_worker.heartbeat  # noqa: E402,F401
@@ -35,6 +35,7 @@ result_persistent = True  # Persist results across restarts
 # Queue configuration
 default_exchange = Exchange("crucible", type="direct")
 
+# Keep in sync with CELERY_QUEUES in shared/utils/queue_telemetry.py
 task_queues = (
     Queue("evaluation", default_exchange, routing_key="evaluation", priority=5),
     Queue("high_priority", default_exchange, routing_key="high_priority", priority=10),
@@ -0,0 +1,75 @@
+"""
+Worker heartbeats in the broker Redis.
+
+Each worker writes a small JSON entry to the celery:workers hash every
+WORKER_HEARTBEAT_INTERVAL seconds, so the gateway can report live workers
+and their load with one HGETALL instead of a control broadcast.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import redis
+from celery.signals import worker_ready, worker_shutdown
+from celery.worker import state
+
+from shared.utils.queue_telemetry import WORKER_HEARTBEATS_KEY, WORKER_HEARTBEAT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+_stop = threading.Event()
+_thread = None
+
+
+def _heartbeat_payload(consumer, started_at: float) -> str:
+    try:
+        queues = sorted(queue.name for queue in consumer.task_consumer.queues)
+    except Exception:
+        queues = []
+    return json.dumps({
+        "pid": os.getpid(),
+        "concurrency": consumer.app.conf.worker_concurrency,
+        "queues": queues,
+        "active": len(state.active_requests),
+        "reserved": len(state.reserved_requests),
+        "started_at": started_at,
+        "last_seen": time.time(),
+    })
+
+
+def _beat(consumer):
+    client = redis.from_url(consumer.app.conf.broker_url)
+    started_at = time.time()
+    while True:
+        try:
+            client.hset(WORKER_HEARTBEATS_KEY, consumer.hostname, _heartbeat_payload(consumer, started_at))
+        except Exception as e:
+            logger.warning(f"Failed to write worker heartbeat: {e}")
+        if _stop.wait(WORKER_HEARTBEAT_INTERVAL):
+            break
+    try:
+        client.hdel(WORKER_HEARTBEATS_KEY, consumer.hostname)
+    except Exception as e:
+        logger.warning(f"Failed to clear worker heartbeat: {e}")
+
+
+@worker_ready.connect
+def start_heartbeat(sender=None, **kwargs):
+    """Start heartbeating once the worker is consuming."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_beat, args=(sender,), name="worker-heartbeat", daemon=True)
+    _thread.start()
+
+
+@worker_shutdown.connect
+def stop_heartbeat(**kwargs):
+    """Remove this worker's heartbeat on a clean shutdown."""
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
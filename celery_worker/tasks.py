@@ -78,65 +78,10 @@ def evaluate_code(self, eval_id: str, code: str, language: str = "python", timeo
             )
             storage_response.raise_for_status()
 
-        # Check cluster capacity before attempting to create job
-        # Use the resource limits passed from the API
-        
+        # Hand the evaluation to the dispatcher. If the cluster is full it parks
+        # the evaluation and starts it as soon as capacity is released, so the
+        # task finishes now instead of retrying on a backoff timer.
         with httpx.Client(timeout=30.0) as client:
-            # Always check capacity - dispatcher will use defaults if not specified
-            capacity_payload = {}
-            if memory_limit is not None:
-                capacity_payload["memory_limit"] = memory_limit
-            if cpu_limit is not None:
-                capacity_payload["cpu_limit"] = cpu_limit
-            
-            capacity_response = client.post(
-                f"{DISPATCHER_SERVICE_URL}/capacity/check",
-                json=capacity_payload
-            )
-            
-            if capacity_response.status_code == 200:
-                capacity_data = capacity_response.json()
-                if not capacity_data.get("has_capacity", False):
-                    # No capacity available - this is a temporary condition, retry
-                    retry_count = self.request.retries
-                    max_retries = 10  # Same as quota_exceeded policy
-                    
-                    # Check if we've exceeded retry limit
-                    if retry_count >= max_retries:
-                        error_msg = (
-                            f"Evaluation {eval_id} failed after {retry_count} capacity retries. "
-                            f"Cluster resources exhausted. Final state: "
-                            f"{capacity_data.get('available_memory_mb')}MB memory, "
-                            f"{capacity_data.get('available_cpu_millicores')}m CPU available"
-                        )
-                        logger.error(error_msg)
-                        # Update storage to mark as failed
-                        with httpx.Client() as storage_client:
-                            storage_client.put(
-                                f"{STORAGE_SERVICE_URL}/evaluations/{eval_id}",
-                                json={
-                                    "status": "failed",
-                                    "error": error_msg,
-                                    "metadata": {"reason": "resource_exhaustion"}
-                                }
-                            )
-                        # Return failure instead of proceeding
-                        return {
-                            "eval_id": eval_id,
-                            "status": "failed",
-                            "error": error_msg
-                        }
-                    else:
-                        logger.info(
-                            f"No cluster capacity for eval {eval_id}: {capacity_data.get('reason')}. "
-                            f"Available: {capacity_data.get('available_memory_mb')}MB memory, "
-                            f"{capacity_data.get('available_cpu_millicores')}m CPU. "
-                            f"Retry {retry_count + 1}/{max_retries}"
-                        )
-                        delay = calculate_retry_delay(retry_count, "quota_exceeded")
-                        raise self.retry(countdown=delay)
-            
-            # Capacity available (or check failed), proceed with job creation
             # Build request payload - only include resource limits if specified
             dispatch_payload = {
                 "eval_id": eval_id,
@@ -145,7 +90,8 @@ def evaluate_code(self, eval_id: str, code: str, language: str = "python", timeo
                 "timeout": timeout,  # Use the actual timeout from the request
                 "priority": priority,  # Pass priority to dispatcher
                 "debug": debug,  # Pass debug flag to dispatcher
-                "expect_failure": expect_failure  # Pass expect_failure flag to dispatcher
+                "expect_failure": expect_failure,  # Pass expect_failure flag to dispatcher
+                "wait_for_capacity": True  # Dispatcher queues it if the cluster is full
             }
             
             # Only include optional fields if they have values
@@ -163,7 +109,10 @@ def evaluate_code(self, eval_id: str, code: str, language: str = "python", timeo
             dispatch_response.raise_for_status()
             result = dispatch_response.json()
 
-        logger.info(f"Created job {result.get('job_name')} for evaluation {eval_id}")
+        if result.get("status") == "queued":
+            logger.info(f"Evaluation {eval_id} waiting in dispatcher for capacity as job {result.get('job_name')}: {result.get('message')}")
+        else:
+            logger.info(f"Created job {result.get('job_name')} for evaluation {eval_id}")
         
         # Store job name for monitoring
         redis_client.setex(f"eval:{eval_id}:job", 3600, result.get('job_name', ''))
@@ -176,7 +125,8 @@ def evaluate_code(self, eval_id: str, code: str, language: str = "python", timeo
                     "status": "provisioning",
                     "metadata": {
                         "job_name": result.get('job_name'),
-                        "namespace": result.get('namespace', 'crucible')
+                        "namespace": result.get('namespace', 'crucible'),
+                        "dispatch_status": result.get('status')
                     }
                 }
             )
@@ -390,46 +340,11 @@ def monitor_job_status(self, eval_id: str, job_name: str) -> Dict[str, Any]:
         job_status = status_info.get('status', 'unknown')
         logger.info(f"Job {job_name} status: {job_status}")
         
-        if job_status == 'succeeded':
-            # Get logs from the job
-            with httpx.Client() as client:
-                logs_response = client.get(f"{DISPATCHER_SERVICE_URL}/logs/{job_name}")
-                logs_response.raise_for_status()
-                logs_data = logs_response.json()
-            
-            # Update evaluation as completed
-            with httpx.Client() as client:
-                storage_response = client.put(
-                    f"{STORAGE_SERVICE_URL}/evaluations/{eval_id}",
-                    json={
-                        "status": "completed",
-                        "output": logs_data.get('logs', ''),
-                        "exit_code": logs_data.get('exit_code', 0)
-                    }
-                )
-                storage_response.raise_for_status()
-            
-            return {"status": "completed", "eval_id": eval_id}
-            
-        elif job_status == 'failed':
-            # Get error information
-            with httpx.Client() as client:
-                logs_response = client.get(f"{DISPATCHER_SERVICE_URL}/logs/{job_name}")
-                logs_data = logs_response.json() if logs_response.status_code == 200 else {}
-            
-            # Update evaluation as failed
-            with httpx.Client() as client:
-                storage_response = client.put(
-                    f"{STORAGE_SERVICE_URL}/evaluations/{eval_id}",
-                    json={
-                        "status": "failed",
-                        "error": logs_data.get('logs', 'Job failed'),
-                        "exit_code": logs_data.get('exit_code', 1)
-                    }
-                )
-                storage_response.raise_for_status()
-            
-            return {"status": "failed", "eval_id": eval_id}
+        if job_status in ('succeeded', 'failed'):
+            # The dispatcher captures the job's logs once at termination and
+            # publishes the terminal event; the storage worker persists it.
+            final_status = 'completed' if job_status == 'succeeded' else 'failed'
+            return {"status": final_status, "eval_id": eval_id}
             
         elif job_status in ['pending', 'running']:
             # Update status if changed
@@ -5,12 +5,19 @@ Provides a simple HTTP interface for queue workers to request code execution.
 
 import os
 import logging
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Set, Tuple
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 import uuid
 import json
+import math
+import re
+import time
 import asyncio
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from pathlib import Path
 import yaml
 
 from fastapi import FastAPI, HTTPException, Depends
@@ -18,17 +25,27 @@ from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import ReadTimeoutError
 import uvicorn
 import httpx
+from redis.asyncio import Redis as AsyncRedis
 
 # Import shared resilient Redis client
 from shared.utils.resilient_connections import ResilientRedisClient
 from shared.utils.kubernetes_utils import generate_job_name
+from shared.utils.metrics import LatencyTracker
 from shared.constants.evaluation_defaults import (
     DEFAULT_MEMORY_LIMIT, DEFAULT_CPU_LIMIT,
     DEFAULT_MEMORY_MB, DEFAULT_CPU_MILLICORES
 )
 from shared.utils.priority_mapping import get_priority_class, normalize_priority
+from shared.utils.pending_dispatch import PENDING_DISPATCH_MAX_WAIT_SECONDS, PendingDispatchQueue
+from shared.utils.kubernetes_calls import (
+    KubernetesCallLayer, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW
+)
+from shared.utils.headroom import HeadroomController
+from shared.utils.queue_telemetry import EVALUATION_QUEUES, QueueTelemetry
+from shared.utils import packed_runner
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +61,7 @@ DEFAULT_IMAGE_TAG = os.getenv("DEFAULT_IMAGE_TAG", "latest")  # Default tag when
 MAX_JOB_TTL = int(os.getenv("MAX_JOB_TTL", "3600"))  # 1 hour
 JOB_CLEANUP_TTL = int(os.getenv("JOB_CLEANUP_TTL", "300"))  # 5 minutes
 DEBUG_JOB_CLEANUP_TTL = int(os.getenv("DEBUG_JOB_CLEANUP_TTL", "3600"))  # 1 hour for debug pods
+JOB_STATE_TTL = MAX_JOB_TTL + 300  # Outlives any job's active deadline, for failover
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
 
 # Security configuration
@@ -52,6 +70,59 @@ HOST_OS = os.getenv("HOST_OS", "linux")  # Default to linux, can be set to "darw
 
 # Feature flags
 ENABLE_EVENT_MONITORING = os.getenv("ENABLE_EVENT_MONITORING", "true").lower() == "true"
+ENABLE_LOG_STREAMING = os.getenv("ENABLE_LOG_STREAMING", "true").lower() == "true"
+
+# Job watch configuration
+JOB_WATCH_TIMEOUT_SECONDS = int(os.getenv("JOB_WATCH_TIMEOUT_SECONDS", "300"))  # Server-side watch length
+JOB_WATCH_RETRY_SECONDS = float(os.getenv("JOB_WATCH_RETRY_SECONDS", "2"))  # Back-off after a watch error
+JOB_EVENT_WORKERS = int(os.getenv("JOB_EVENT_WORKERS", "8"))  # Jobs whose events are processed concurrently
+# Watch evaluation pods too: running/terminated from container state, real exit codes
+ENABLE_POD_WATCH = ENABLE_EVENT_MONITORING and os.getenv("ENABLE_POD_WATCH", "true").lower() == "true"
+
+# Leader election configuration (client-go's defaults)
+# Only the Lease holder watches jobs/pods and drains pending dispatch; /execute runs on every replica
+ENABLE_LEADER_ELECTION = os.getenv("ENABLE_LEADER_ELECTION", "true").lower() == "true"
+LEADER_LEASE_NAME = os.getenv("LEADER_LEASE_NAME", "dispatcher-leader")
+LEADER_LEASE_DURATION_SECONDS = int(os.getenv("LEADER_LEASE_DURATION_SECONDS", "15"))  # Standbys wait this long
+LEADER_RENEW_DEADLINE_SECONDS = float(os.getenv("LEADER_RENEW_DEADLINE_SECONDS", "10"))  # Step down if not renewed
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "2"))  # Renew/acquire interval
+
+# Kubernetes API client-side limits (shared by every call; watches and log follows only pay to start)
+K8S_CLIENT_QPS = float(os.getenv("K8S_CLIENT_QPS", "20"))  # 0 disables limiting
+K8S_CLIENT_BURST = int(os.getenv("K8S_CLIENT_BURST", "40"))
+K8S_CLIENT_MAX_RETRIES = int(os.getenv("K8S_CLIENT_MAX_RETRIES", "2"))  # Retries of API-server 429s
+
+# Image pre-warming and locality
+ENABLE_IMAGE_PREWARM = os.getenv("ENABLE_IMAGE_PREWARM", "true").lower() == "true"  # Leader pre-pulls catalog images
+IMAGE_PREWARM_RECHECK_SECONDS = float(os.getenv("IMAGE_PREWARM_RECHECK_SECONDS", "60"))  # New nodes wake it sooner
+IMAGE_PREWARM_RETRY_SECONDS = int(os.getenv("IMAGE_PREWARM_RETRY_SECONDS", "1800"))  # Per node and image
+IMAGE_PREWARM_DEADLINE_SECONDS = int(os.getenv("IMAGE_PREWARM_DEADLINE_SECONDS", "900"))  # Longest pull allowed
+IMAGE_LOCALITY_WEIGHT = int(os.getenv("IMAGE_LOCALITY_WEIGHT", "50"))  # Preferred affinity to warm nodes, 0 disables
+
+# Live log streaming configuration
+MAX_LOG_STREAMS = int(os.getenv("MAX_LOG_STREAMS", "50"))  # Concurrent pod log follow connections
+LOG_STREAM_FLUSH_INTERVAL = float(os.getenv("LOG_STREAM_FLUSH_INTERVAL", "0.5"))  # Seconds per chunk
+LOG_STREAM_MAX_CHUNK_LINES = int(os.getenv("LOG_STREAM_MAX_CHUNK_LINES", "100"))
+LOG_STREAM_START_TIMEOUT = int(os.getenv("LOG_STREAM_START_TIMEOUT", "60"))  # Wait for container start
+LOG_STREAM_DRAIN_TIMEOUT = float(os.getenv("LOG_STREAM_DRAIN_TIMEOUT", "5"))  # Wait at job completion
+# A follow read blocks until the next line; this bounds it so stopped streams free their thread.
+# A pod quiet for longer drops to the post-completion capture.
+LOG_STREAM_IDLE_TIMEOUT = float(os.getenv("LOG_STREAM_IDLE_TIMEOUT", "60"))
+
+# Loki fallback configuration
+LOKI_URL = os.getenv("LOKI_URL", "http://loki:3100")
+LOKI_QUERY_TIMEOUT = float(os.getenv("LOKI_QUERY_TIMEOUT", "10"))
+LOKI_PAGE_LIMIT = int(os.getenv("LOKI_PAGE_LIMIT", "5000"))  # Lines per query_range request
+LOKI_MAX_PAGES = int(os.getenv("LOKI_MAX_PAGES", "20"))
+LOKI_LOOKBACK_HOURS = int(os.getenv("LOKI_LOOKBACK_HOURS", "1"))  # Used when the Job is gone
+LOKI_TIME_PADDING_SECONDS = int(os.getenv("LOKI_TIME_PADDING_SECONDS", "30"))
+LOKI_CACHE_SIZE = int(os.getenv("LOKI_CACHE_SIZE", "256"))
+
+# Log capture configuration
+LOG_CAPTURE_WORKERS = int(os.getenv("LOG_CAPTURE_WORKERS", "8"))  # Concurrent terminal log fetches
+LOG_CAPTURE_CACHE_SIZE = int(os.getenv("LOG_CAPTURE_CACHE_SIZE", "500"))  # Captured results kept in memory
+LOG_CAPTURE_EMPTY_RETRIES = int(os.getenv("LOG_CAPTURE_EMPTY_RETRIES", "3"))  # Refetches while Loki lags behind
+LOG_CAPTURE_RETRY_DELAY = float(os.getenv("LOG_CAPTURE_RETRY_DELAY", "2"))  # Seconds before the first, doubling
 
 # Autoscaling configuration
 MAX_NODES = int(os.getenv("MAX_NODES", "2"))  # Maximum cluster size
@@ -60,32 +131,255 @@ NODE_MEMORY_MB = int(os.getenv("NODE_MEMORY_MB", "7400"))  # t3.large has ~7.4GB
 SCALE_UP_THRESHOLD = float(os.getenv("SCALE_UP_THRESHOLD", "0.9"))  # Scale at 90% capacity
 ENABLE_PROJECTED_CAPACITY = os.getenv("ENABLE_PROJECTED_CAPACITY", "true").lower() == "true"
 
+# Predictive headroom: the leader keeps placeholder pods sized from Celery demand
+# (policy knobs HEADROOM_MIN_PODS, HEADROOM_MAX_PODS, ... in shared/utils/headroom.py)
+ENABLE_HEADROOM = os.getenv("ENABLE_HEADROOM", "false").lower() == "true"
+HEADROOM_DEPLOYMENT = os.getenv("HEADROOM_DEPLOYMENT", "evaluation-headroom")  # Its replicas are the placeholders
+HEADROOM_INTERVAL_SECONDS = float(os.getenv("HEADROOM_INTERVAL_SECONDS", "15"))
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://celery-redis:6379/0")  # Queue depths
+
+# Indexed batch jobs: /execute-batch packs evaluations sharing an image and resource profile into one Job
+INDEXED_JOB_MAX_COMPLETIONS = int(os.getenv("INDEXED_JOB_MAX_COMPLETIONS", "500"))  # Evaluations per Job
+INDEXED_JOB_MAX_PARALLELISM = int(os.getenv("INDEXED_JOB_MAX_PARALLELISM", "20"))  # Pods per Job at once
+INDEXED_JOB_MAX_CODE_BYTES = int(os.getenv("INDEXED_JOB_MAX_CODE_BYTES", str(900 * 1024)))  # ConfigMaps hold 1MiB
+# Packed pods: batches may ask for several short evaluations per pod (one sandbox startup for all of them)
+PACKED_MAX_EVALUATIONS_PER_POD = int(os.getenv("PACKED_MAX_EVALUATIONS_PER_POD", "16"))
+PACKED_MAX_TIMEOUT_SECONDS = int(os.getenv("PACKED_MAX_TIMEOUT_SECONDS", "60"))  # Longer evaluations get a pod each
+
+# Pending dispatch configuration
+# Job events wake the dispatch loop; the recheck catches capacity that appears
+# without one (new nodes, quota changes, event monitoring disabled)
+PENDING_DISPATCH_RECHECK_SECONDS = float(os.getenv("PENDING_DISPATCH_RECHECK_SECONDS", "15"))
+
+
+# Job watch
+# Jobs (and, with ENABLE_POD_WATCH, their pods) are watched on dedicated
+# threads that resume from the last resourceVersion seen (bookmarks keep that
+# current on quiet namespaces), so a reconnect replays nothing; only a 410 Gone
+# forces a relist. Events are spread over JOB_EVENT_WORKERS lanes by job name:
+# jobs are processed concurrently, each job's job and pod events in order.
+# Last-known job states live in job_states; Redis (job:{name}:last_state) is
+# read only for jobs this process hasn't seen yet, e.g. after a restart or
+# failover. States only move forward, so whichever watch sees a transition
+# first publishes it, once.
+# Watches every replica runs for its lifetime (executor images, nodes) share
+# this pool. The leader's job and pod watches get a pool per leadership term:
+# Watch.stop() can't interrupt a blocked read, so a stepped-down term's threads
+# only exit once their read returns, and new watches mustn't queue behind them.
+job_watch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-watch")
+job_states: Dict[str, str] = {}  # job_name -> last published state
+job_pods: Dict[str, Dict] = {}  # job_name -> {"pod_name", "exit_code"} from the pod watch
+indexed_jobs: Dict[str, Dict] = {}  # Indexed Job name -> {"indexes": eval_ids per completion index, "packed"}
+JOB_STATE_ORDER = {"pending": 0, "running": 1, "succeeded": 2, "failed": 2}
+
+
+def new_watch_stats() -> Dict:
+    return {
+        "resource_version": None,
+        "watch_reconnects": 0,
+        "bookmarks": 0,
+        "relists": 0,
+        "last_relist_items": 0,
+        "last_relist_seconds": 0.0,
+    }
+
+
+job_watch_stats = {
+    "started_at": time.time(),
+    "events_processed": 0,
+    "processing_seconds": 0.0,
+    "resources": {
+        "jobs": new_watch_stats(), "pods": new_watch_stats(), "images": new_watch_stats(), "nodes": new_watch_stats()
+    },
+}
+active_watches: Set[watch.Watch] = set()
+
+
+def job_state_key(job_name: str) -> str:
+    return f"job:{job_name}:last_state"
+
+
+# Each evaluation in an Indexed Job goes by "{job_name}-i{index}" wherever a
+# plain evaluation uses its job name: job states, pods, logs, status and events.
+# In a packed pod, running several evaluations, they are "{job_name}-i{index}s{slot}"
+# and "{job_name}-i{index}" is the pod. Job names end in eight hex characters,
+# so none of these can be confused.
+COMPLETION_INDEX_KEY = "batch.kubernetes.io/job-completion-index"  # Pod annotation and label
+INDEX_UNIT_PATTERN = re.compile(r"^(?P<job>.+-[0-9a-f]{8})-i(?P<index>\d+)(?:s(?P<slot>\d+))?$")
+
+
+def index_unit_name(job_name: str, index: int, slot: Optional[int] = None) -> str:
+    return f"{job_name}-i{index}" if slot is None else f"{job_name}-i{index}s{slot}"
+
+
+def parse_index_unit(name: str) -> Optional[Tuple[str, int]]:
+    """(Indexed Job name, completion index) for one of its evaluations, None for a plain job name."""
+    match = INDEX_UNIT_PATTERN.match(name)
+    return (match["job"], int(match["index"])) if match else None
+
+
+def packed_slot(name: str) -> Optional[int]:
+    """Position of an evaluation within its packed pod, None if it has the pod to itself."""
+    match = INDEX_UNIT_PATTERN.match(name)
+    return int(match["slot"]) if match and match["slot"] is not None else None
+
+
+def pod_selector(job_name: str) -> str:
+    """Label selector for the pods of a job, or of one index of an Indexed Job."""
+    unit = parse_index_unit(job_name)
+    if unit:
+        return f"job-name={unit[0]},{COMPLETION_INDEX_KEY}={unit[1]}"
+    return f"job-name={job_name}"
+
+
+def parse_indexes(indexes: Optional[str]) -> Set[int]:
+    """Expand a Job status index list such as "0,3-5" into {0, 3, 4, 5}."""
+    expanded = set()
+    for part in (indexes or "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        expanded.update(range(int(first), int(last or first) + 1))
+    return expanded
+
+
+def list_evaluation_jobs_sync(**kwargs):
+    return k8s_api.call(
+        batch_v1.list_namespaced_job, namespace=KUBERNETES_NAMESPACE, label_selector="app=evaluation", **kwargs
+    )
+
+
+def list_evaluation_pods_sync(**kwargs):
+    return k8s_api.call(
+        core_v1.list_namespaced_pod, namespace=KUBERNETES_NAMESPACE, label_selector="app=evaluation", **kwargs
+    )
+
+
+# The list helpers have no API docstring for Watch to infer the type from
+WATCH_RETURN_TYPES = {"jobs": "V1Job", "pods": "V1Pod", "images": "V1ConfigMap", "nodes": "V1Node"}
+
 
-def watch_job_events_sync(event_queue: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+def watch_events_sync(
+    resource: str,
+    list_func,
+    resource_version: str,
+    loop: asyncio.AbstractEventLoop,
+    dispatch
+) -> Optional[str]:
     """
-    Synchronous function to watch Kubernetes job events.
-    This runs in a thread pool executor and puts events in a queue.
+    Stream events for list_func from resource_version until the server ends
+    the watch, handing each one to dispatch on the event loop.
+    Returns the resourceVersion to resume from, or None if it has expired
+    and the resource must be relisted.
     """
-    w = watch.Watch()
-    
+    stats = job_watch_stats["resources"][resource]
+    w = watch.Watch(return_type=WATCH_RETURN_TYPES[resource])
+    active_watches.add(w)
     try:
-        # Watch for job events in our namespace
         for event in w.stream(
-            batch_v1.list_namespaced_job,
-            namespace=KUBERNETES_NAMESPACE,
-            label_selector="app=evaluation",
-            _request_timeout=300  # 5 minute timeout, then reconnect
+            list_func,
+            resource_version=resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=JOB_WATCH_TIMEOUT_SECONDS,
+            _request_timeout=JOB_WATCH_TIMEOUT_SECONDS + 30
         ):
-            # Put event in queue to be processed in main async context
-            asyncio.run_coroutine_threadsafe(
-                event_queue.put(event),
-                loop
-            )
-    except Exception as e:
-        logger.error(f"Watch stream error: {e}")
+            if event["type"] == "BOOKMARK":
+                # Bookmarks aren't deserialized; they only carry a resourceVersion
+                resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+                stats["bookmarks"] += 1
+                continue
+            resource_version = event["object"].metadata.resource_version
+            loop.call_soon_threadsafe(dispatch, event)
+    except ApiException as e:
+        if e.status == 410:
+            logger.info(f"Watch on {resource} at resourceVersion {resource_version} expired, relisting")
+            return None
         raise
     finally:
         w.stop()
+        active_watches.discard(w)
+    return resource_version
+
+
+def prune_deleted_jobs(jobs: List):
+    """Forget jobs deleted while we weren't watching."""
+    names = {job.metadata.name for job in jobs}
+    gone = {name for name in job_states if (parse_index_unit(name) or (name,))[0] not in names}
+    for job_name in gone:
+        job_states.pop(job_name, None)
+        job_pods.pop(job_name, None)
+    for job_name in set(indexed_jobs) - names:
+        indexed_jobs.pop(job_name, None)
+    if gone:
+        wake_pending_dispatch()
+
+
+async def relist(
+    resource: str,
+    list_func,
+    loop: asyncio.AbstractEventLoop,
+    dispatch,
+    on_relist: Optional[Callable[[List], None]] = None,
+    executor: ThreadPoolExecutor = job_watch_executor
+) -> str:
+    """
+    List every object, replay each as an ADDED event, and return the list's resourceVersion.
+    on_relist gets the full list, to drop whatever was deleted while unwatched.
+    """
+    started = time.perf_counter()
+    listing = await loop.run_in_executor(executor, list_func)
+    for item in listing.items:
+        dispatch({"type": "ADDED", "object": item})
+    if on_relist:
+        on_relist(listing.items)
+
+    job_watch_stats["resources"][resource].update(
+        relists=job_watch_stats["resources"][resource]["relists"] + 1,
+        last_relist_items=len(listing.items),
+        last_relist_seconds=round(time.perf_counter() - started, 3),
+    )
+    logger.info(f"Listed {len(listing.items)} {resource} at resourceVersion {listing.metadata.resource_version}")
+    return listing.metadata.resource_version
+
+
+async def run_watch(
+    resource: str,
+    list_func,
+    loop: asyncio.AbstractEventLoop,
+    dispatch,
+    on_relist: Optional[Callable[[List], None]] = None,
+    executor: ThreadPoolExecutor = job_watch_executor
+):
+    """
+    Keep a resource watched: relist when needed, otherwise resume where the last watch ended.
+    Blocking list and watch calls run on executor, one at a time.
+    """
+    stats = job_watch_stats["resources"][resource]
+    resource_version = None
+    while True:
+        try:
+            if resource_version is None:
+                resource_version = await relist(resource, list_func, loop, dispatch, on_relist, executor)
+            stats["resource_version"] = resource_version
+            resource_version = await loop.run_in_executor(
+                executor, watch_events_sync, resource, list_func, resource_version, loop, dispatch
+            )
+            stats["watch_reconnects"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Watch on {resource} failed, reconnecting in {JOB_WATCH_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(JOB_WATCH_RETRY_SECONDS)
+
+
+async def process_job_event_lane(lane: asyncio.Queue, redis_client: ResilientRedisClient):
+    """Process one lane's (handler, event) items in arrival order."""
+    while True:
+        handler, event = await lane.get()
+        started = time.perf_counter()
+        await handler(event, redis_client)
+        job_watch_stats["events_processed"] += 1
+        job_watch_stats["processing_seconds"] += time.perf_counter() - started
 
 
 async def monitor_job_events(app: FastAPI):
@@ -94,44 +388,92 @@ async def monitor_job_events(app: FastAPI):
     This replaces the polling-based approach with event-driven updates.
     """
     redis_client = app.state.redis_client
-    event_queue = asyncio.Queue()
-    loop = asyncio.get_event_loop()
-    
-    # Start the watcher in a thread
-    watcher_task = loop.run_in_executor(
-        None,
-        watch_job_events_sync,
-        event_queue,
-        loop
-    )
-    
+    loop = asyncio.get_running_loop()
+    lanes = [asyncio.Queue() for _ in range(JOB_EVENT_WORKERS)]
+    workers = [asyncio.create_task(process_job_event_lane(lane, redis_client)) for lane in lanes]
+    app.state.job_event_lanes = lanes
+
+    def lane_for(job_name: str) -> asyncio.Queue:
+        return lanes[zlib.crc32(job_name.encode()) % len(lanes)]
+
+    def dispatch_job(event: Dict):
+        lane_for(event["object"].metadata.name).put_nowait((process_job_event, event))
+
+    def dispatch_pod(event: Dict):
+        job_name = (event["object"].metadata.labels or {}).get("job-name")
+        if job_name:
+            lane_for(job_name).put_nowait((process_pod_event, event))
+
+    # This term's own threads, one per watch (see job_watch_executor)
+    term_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-watch-term")
+    watches = [run_watch(
+        "jobs", list_evaluation_jobs_sync, loop, dispatch_job, prune_deleted_jobs, term_executor
+    )]
+    if ENABLE_POD_WATCH:
+        watches.append(run_watch("pods", list_evaluation_pods_sync, loop, dispatch_pod, executor=term_executor))
+
     try:
-        while True:
-            try:
-                # Get event from queue with timeout to check for cancellation
-                event = await asyncio.wait_for(event_queue.get(), timeout=1.0)
-                
-                # Process the event in the main async context
-                await process_job_event(event, redis_client)
-                
-            except asyncio.TimeoutError:
-                # Check if watcher thread is still running
-                if watcher_task.done():
-                    # Watcher died, restart it
-                    logger.warning("Job watcher thread died, restarting...")
-                    watcher_task = loop.run_in_executor(
-                        None,
-                        watch_job_events_sync,
-                        event_queue,
-                        loop
-                    )
-            except Exception as e:
-                logger.error(f"Error processing job event: {e}")
-                
+        await asyncio.gather(*watches)
     except asyncio.CancelledError:
         # Graceful shutdown
         logger.info("Job monitor shutting down")
+        for w in list(active_watches):
+            w.stop()
+        for worker in workers:
+            worker.cancel()
         raise
+    finally:
+        # Threads still blocked in a read exit when it returns (bounded by _request_timeout)
+        term_executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def advance_job_state(job_name: str, status: str, redis_client: ResilientRedisClient) -> Tuple[bool, Optional[str]]:
+    """
+    Move a job to status unless it is already there or further along.
+    Returns (advanced, previous state).
+    Redis is read only for jobs this process hasn't seen, and written only on change.
+    """
+    if job_name in job_states:
+        last_state = job_states[job_name]
+    else:
+        last_state_bytes = await redis_client.get(job_state_key(job_name))
+        last_state = last_state_bytes.decode('utf-8') if last_state_bytes else None
+
+    if last_state is not None and JOB_STATE_ORDER.get(status, 0) <= JOB_STATE_ORDER.get(last_state, 0):
+        job_states[job_name] = last_state
+        return False, last_state
+
+    job_states[job_name] = status
+    await redis_client.setex(job_state_key(job_name), JOB_STATE_TTL, status)
+    return True, last_state
+
+
+async def publish_running_event(
+    job_name: str,
+    eval_id: str,
+    timeout: int,
+    started_at: Optional[datetime],
+    redis_client: ResilientRedisClient,
+    pod_name: Optional[str] = None,
+    metadata: Optional[Dict] = None,
+    stream_logs: bool = True
+):
+    """Publish evaluation:running and start streaming the pod's output."""
+    event_data = {
+        "eval_id": eval_id,
+        "executor_id": job_name,
+        "container_id": job_name,
+        "timeout": timeout,
+        "started_at": (started_at or datetime.now(timezone.utc)).isoformat()
+    }
+    if metadata:
+        event_data["metadata"] = metadata
+    await redis_client.publish("evaluation:running", json.dumps(event_data))
+    logger.info(f"Published evaluation:running event for {eval_id}")
+
+    # Stream output incrementally while the pod runs
+    if stream_logs:
+        start_log_stream(job_name, eval_id, redis_client, pod_name)
 
 
 async def process_job_event(event: Dict, redis_client: ResilientRedisClient):
@@ -140,12 +482,19 @@ async def process_job_event(event: Dict, redis_client: ResilientRedisClient):
         event_type = event['type']
         job = event['object']  # This is always a V1Job from the Kubernetes watch stream
         
+        if job.spec and job.spec.completion_mode == "Indexed":
+            await process_indexed_job_event(event, redis_client)
+            return
+
         # The watch stream always returns V1Job objects from the Kubernetes Python client
         job_name = job.metadata.name
         eval_id = job.metadata.labels.get('eval-id') if job.metadata.labels else None
         
         if not eval_id:
             return  # Not an evaluation job or missing label
+
+        if ENABLE_HEADROOM and job.metadata.creation_timestamp:
+            headroom_controller.record_job(job_name, job.metadata.creation_timestamp.timestamp())
         
         # Get active pod count for status determination
         active = job.status.active if job.status and job.status.active else 0
@@ -161,83 +510,41 @@ async def process_job_event(event: Dict, redis_client: ResilientRedisClient):
                     status = "succeeded"  # Job succeeded
                     break
         
-        # If no terminal condition yet, check if running or pending
+        # If no terminal condition yet, check if running or pending.
+        # Active also counts pods still pulling images, so with the pod watch
+        # on, "running" waits for the container to actually start.
         if status is None:
-            status = "running" if active > 0 else "pending"
+            status = "running" if active > 0 and not ENABLE_POD_WATCH else "pending"
         
         # Check if this is a state change
-        state_key = f"job:{job_name}:last_state"
-        last_state_bytes = await redis_client.get(state_key)
-        last_state = last_state_bytes.decode('utf-8') if last_state_bytes else None
+        advanced, last_state = await advance_job_state(job_name, status, redis_client)
         
         # If state changed or this is a new job, publish event
-        if status != last_state:
-            await redis_client.setex(state_key, 300, status)  # Cache for 5 minutes
-            
+        if advanced:
             logger.info(f"Job {job_name} state change: {last_state} -> {status}")
             
             if status == "running":
-                # Publish running event
                 # Get start time and timeout from V1Job object
-                start_time = job.status.start_time.isoformat() if job.status and job.status.start_time else None
                 timeout = job.spec.active_deadline_seconds if job.spec and job.spec.active_deadline_seconds else 300
+                await publish_running_event(job_name, eval_id, timeout, job.status.start_time, redis_client)
                 
-                event_data = {
-                    "eval_id": eval_id,
-                    "executor_id": job_name,
-                    "container_id": job_name,
-                    "timeout": timeout,
-                    "started_at": start_time if start_time else datetime.now(timezone.utc).isoformat()
-                }
-                await redis_client.publish("evaluation:running", json.dumps(event_data))
-                logger.info(f"Published evaluation:running event for {eval_id}")
-                
-            elif status == "succeeded":
-                # Job succeeded in Kubernetes = evaluation succeeded
-                # Try to get logs but don't block on it
-                logs_result = await get_job_logs_internal(job_name)
-                logs = logs_result.get("logs", "")
-                log_source = logs_result.get("source", "not_available")
-                
-                completion_time = job.status.completion_time.isoformat() if job.status and job.status.completion_time else None
-                
-                # Always publish completed event when Kubernetes says job succeeded
-                event_data = {
-                    "eval_id": eval_id,
-                    "output": logs,  # Empty string if logs not available
-                    "exit_code": 0,  # Kubernetes already confirmed success
-                    "metadata": {
-                        "job_name": job_name,
-                        "completed_at": completion_time if completion_time else datetime.now(timezone.utc).isoformat(),
-                        "log_source": log_source
-                    }
-                }
-                await redis_client.publish("evaluation:completed", json.dumps(event_data))
-                logger.info(f"Published evaluation:completed event for {eval_id} (logs from {log_source})")
-                
-            elif status == "failed":
-                # Get job logs
-                logs_result = await get_job_logs_internal(job_name)
-                
-                # Publish failed event
-                completion_time = job.status.completion_time.isoformat() if job.status and job.status.completion_time else None
-                event_data = {
-                    "eval_id": eval_id,
-                    "error": logs_result.get("logs", "Job failed"),
-                    "exit_code": logs_result.get("exit_code", 1),
-                    "metadata": {
-                        "job_name": job_name,
-                        "failed_at": completion_time if completion_time else datetime.now(timezone.utc).isoformat(),
-                        "log_source": logs_result.get("source", "unknown")
-                    }
-                }
-                await redis_client.publish("evaluation:failed", json.dumps(event_data))
-                logger.info(f"Published evaluation:failed event for {eval_id} (logs from {logs_result.get('source', 'unknown')})")
+            elif status in ("succeeded", "failed"):
+                # Capture logs and publish off the watch loop so later events aren't blocked
+                completed_at = job.status.completion_time.isoformat() if job.status and job.status.completion_time else None
+                schedule_terminal_event(job_name, eval_id, status, completed_at, redis_client)
+
+                # The job's resources are free: start whatever was waiting for them
+                wake_pending_dispatch()
+                if ENABLE_HEADROOM:
+                    headroom_controller.record_finished()
                 
         # Handle job deletion events
         if event_type == "DELETED" and eval_id:
+            current_state = job_states.pop(job_name, None)
+            job_pods.pop(job_name, None)
+            wake_pending_dispatch()
             # Publish cancellation event if job was deleted before completion
-            if last_state in ["pending", "running"]:
+            if current_state in ["pending", "running"]:
                 await redis_client.publish(
                     "evaluation:cancelled",
                     json.dumps({
@@ -253,6 +560,882 @@ async def process_job_event(event: Dict, redis_client: ResilientRedisClient):
         logger.error(f"Error processing job event: {e}", exc_info=True)
 
 
+def job_index_eval_ids(job) -> Dict:
+    """
+    eval_ids run by each completion index of an Indexed Job, from its annotations,
+    and whether its pods are packed (several evaluations each).
+    """
+    annotations = job.metadata.annotations or {}
+    eval_ids = json.loads(annotations.get("eval-ids", "[]"))
+    per_pod = int(annotations.get("evaluations-per-pod", "1"))
+    return {
+        "indexes": [eval_ids[start:start + per_pod] for start in range(0, len(eval_ids), per_pod)],
+        "packed": per_pod > 1,
+    }
+
+
+def indexed_job_entry(job) -> Dict:
+    """job_index_eval_ids, parsed once per job."""
+    job_name = job.metadata.name
+    if job_name not in indexed_jobs:
+        indexed_jobs[job_name] = job_index_eval_ids(job)
+    return indexed_jobs[job_name]
+
+
+def index_evaluations(job_name: str, index: int, eval_ids: List[str], packed: bool) -> List[Tuple[str, str]]:
+    """(name, eval_id) of each evaluation run by one completion index."""
+    if not packed:
+        return [(index_unit_name(job_name, index), eval_ids[0])]
+    return [(index_unit_name(job_name, index, slot), eval_id) for slot, eval_id in enumerate(eval_ids)]
+
+
+async def process_indexed_job_event(event: Dict, redis_client: ResilientRedisClient):
+    """
+    Publish each evaluation of an Indexed Job as its index finishes.
+
+    completedIndexes and failedIndexes say which indexes are done; once the
+    Job itself has failed (deadline, or failed indexes at the end), every
+    index not completed failed with it. Running events come from the pod
+    watch, which knows when each index's container starts. A packed index's
+    evaluations are published from its pod's framed output. Deleting the Job
+    cancels the indexes that hadn't finished.
+    """
+    job = event['object']
+    job_name = job.metadata.name
+    entry = indexed_job_entry(job)
+    indexes, packed = entry["indexes"], entry["packed"]
+    if not indexes:
+        return
+
+    if ENABLE_HEADROOM and job.metadata.creation_timestamp:
+        # Headroom is sized in pods
+        created_at = job.metadata.creation_timestamp.timestamp()
+        for index in range(len(indexes)):
+            headroom_controller.record_job(index_unit_name(job_name, index), created_at)
+
+    status = job.status
+    completed = parse_indexes(status.completed_indexes) if status else set()
+    failed = parse_indexes(status.failed_indexes) if status else set()
+    job_failed = any(
+        condition.type == "Failed" and condition.status == "True"
+        for condition in (status.conditions if status and status.conditions else [])
+    )
+    completed_at = status.completion_time.isoformat() if status and status.completion_time else None
+
+    finished = 0
+    for index, eval_ids in enumerate(indexes):
+        if index in completed:
+            index_status = "succeeded"
+        elif index in failed or job_failed:
+            index_status = "failed"
+        else:
+            continue
+        unit = index_unit_name(job_name, index)
+        advanced, last_state = await advance_job_state(unit, index_status, redis_client)
+        if advanced:
+            logger.info(f"Job {job_name} index {index} state change: {last_state} -> {index_status}")
+            if packed:
+                schedule_packed_terminal_events(job_name, index, eval_ids, index_status, completed_at, redis_client)
+            else:
+                schedule_terminal_event(unit, eval_ids[0], index_status, completed_at, redis_client)
+            finished += 1
+
+    if finished:
+        wake_pending_dispatch()
+        if ENABLE_HEADROOM:
+            for _ in range(finished):
+                headroom_controller.record_finished()
+
+    if event['type'] == "DELETED":
+        indexed_jobs.pop(job_name, None)
+        unfinished = []
+        for index, eval_ids in enumerate(indexes):
+            job_states.pop(index_unit_name(job_name, index), None)
+            job_pods.pop(index_unit_name(job_name, index), None)
+            for unit, eval_id in index_evaluations(job_name, index, eval_ids, packed):
+                job_states.pop(unit, None)
+                if index not in completed and index not in failed and not job_failed:
+                    unfinished.append((unit, eval_id))
+        wake_pending_dispatch()
+        for unit, eval_id in unfinished:
+            await redis_client.publish(
+                "evaluation:cancelled",
+                json.dumps({
+                    "eval_id": eval_id,
+                    "job_name": unit,
+                    "cancelled_at": datetime.now(timezone.utc).isoformat(),
+                    "reason": "Job deleted"
+                })
+            )
+        if unfinished:
+            logger.info(f"Published evaluation:cancelled for {len(unfinished)} evaluations of deleted job {job_name}")
+
+
+async def process_packed_pod_event(pod, job_name: str, index: int, eval_ids: List[str], redis_client: ResilientRedisClient):
+    """
+    Pod event of a packed index. Its evaluations all start with the runner;
+    they finish together when it exits and are published from its output.
+    """
+    container = next(
+        (c for c in (pod.status.container_statuses or []) if c.name == "evaluation"), None
+    ) if pod.status else None
+    if not container or not container.state:
+        return
+
+    unit = index_unit_name(job_name, index)
+    known = job_pods.setdefault(unit, {})
+    known["pod_name"] = pod.metadata.name
+    annotations = pod.metadata.annotations or {}
+
+    if container.state.terminated:
+        terminated = container.state.terminated
+        known["exit_code"] = terminated.exit_code
+        if terminated.exit_code == 0:
+            status = "succeeded"  # The runner ran them all; each has its own exit code
+        elif annotations.get("backoff-limit") == "0":
+            status = "failed"
+        else:
+            return
+
+        advanced, last_state = await advance_job_state(unit, status, redis_client)
+        if advanced:
+            logger.info(f"Packed pod {pod.metadata.name} terminated ({terminated.exit_code}): {last_state} -> {status}")
+            completed_at = terminated.finished_at.isoformat() if terminated.finished_at else None
+            schedule_packed_terminal_events(job_name, index, eval_ids, status, completed_at, redis_client)
+            wake_pending_dispatch()
+            if ENABLE_HEADROOM:
+                headroom_controller.record_finished()
+
+    elif container.state.running:
+        advanced, _ = await advance_job_state(unit, "running", redis_client)
+        if advanced:
+            timeout = int(annotations.get("active-deadline-seconds", 300))
+            for slot_unit, eval_id in index_evaluations(job_name, index, eval_ids, packed=True):
+                if (await advance_job_state(slot_unit, "running", redis_client))[0]:
+                    # Output arrives demultiplexed at the end, not streamed
+                    await publish_running_event(
+                        slot_unit, eval_id, timeout, container.state.running.started_at, redis_client,
+                        pod.metadata.name, {"packed_pod": pod.metadata.name}, stream_logs=False
+                    )
+
+
+async def process_pod_event(event: Dict, redis_client: ResilientRedisClient):
+    """
+    Process a single evaluation pod event.
+
+    Publishes evaluation:running when the evaluation container starts and
+    the terminal event, with the container's exit code, when it terminates.
+    A failed container on a job with retries left only records its exit
+    code; the Job's Failed condition decides whether the evaluation failed.
+    """
+    try:
+        pod = event['object']
+        labels = pod.metadata.labels or {}
+        annotations = pod.metadata.annotations or {}
+        job_name = labels.get('job-name')
+        eval_id = labels.get('eval-id')
+        index = annotations.get(COMPLETION_INDEX_KEY)
+        if job_name and not eval_id and index is not None:
+            # A pod of an Indexed Job; unknown until the job watch has seen the Job
+            entry = indexed_jobs.get(job_name)
+            if not entry or int(index) >= len(entry["indexes"]) or event['type'] == "DELETED":
+                return
+            if entry["packed"]:
+                await process_packed_pod_event(pod, job_name, int(index), entry["indexes"][int(index)], redis_client)
+                return
+            eval_id = entry["indexes"][int(index)][0]
+            job_name = index_unit_name(job_name, int(index))
+        if not job_name or not eval_id or event['type'] == "DELETED":
+            return
+
+        known = job_pods.setdefault(job_name, {})
+        node_name = pod.spec.node_name if pod.spec else None
+        if node_name and "image_cached" not in known:
+            # Checked when first seen on its node, before its own pull reaches the inventory
+            image = next((c.image for c in pod.spec.containers if c.name == "evaluation"), None)
+            known["node"] = node_name
+            known["image_cached"] = node_image_inventory.has(node_name, image) if image else None
+
+        container = next(
+            (c for c in (pod.status.container_statuses or []) if c.name == "evaluation"), None
+        ) if pod.status else None
+        if not container or not container.state:
+            return
+
+        known["pod_name"] = pod.metadata.name
+
+        if container.state.terminated:
+            terminated = container.state.terminated
+            known["exit_code"] = terminated.exit_code
+            if terminated.exit_code == 0:
+                status = "succeeded"
+            elif annotations.get("backoff-limit") == "0":
+                status = "failed"  # No retries: this attempt is the job's outcome
+            else:
+                return
+
+            advanced, last_state = await advance_job_state(job_name, status, redis_client)
+            if advanced:
+                logger.info(f"Pod {pod.metadata.name} terminated ({terminated.exit_code}): {last_state} -> {status}")
+                completed_at = terminated.finished_at.isoformat() if terminated.finished_at else None
+                schedule_terminal_event(
+                    job_name, eval_id, status, completed_at, redis_client, exit_code=terminated.exit_code
+                )
+                wake_pending_dispatch()
+                if ENABLE_HEADROOM:
+                    headroom_controller.record_finished()
+
+        elif container.state.running:
+            advanced, last_state = await advance_job_state(job_name, "running", redis_client)
+            if advanced:
+                logger.info(f"Pod {pod.metadata.name} started: {last_state} -> running")
+                timeout = int(annotations.get("active-deadline-seconds", 300))
+                started_at = container.state.running.started_at
+                metadata = {
+                    "node": known.get("node"),
+                    "image_cached": known.get("image_cached"),
+                    "image_pull_wait_seconds": record_pull_wait(pod, started_at, known.get("image_cached")),
+                }
+                await publish_running_event(
+                    job_name, eval_id, timeout, started_at, redis_client, pod.metadata.name, metadata
+                )
+
+    except Exception as e:
+        logger.error(f"Error processing pod event: {e}", exc_info=True)
+
+
+# Live log streaming
+# Each running evaluation pod gets one follow=True log connection. The blocking
+# Kubernetes stream runs on a dedicated, bounded thread pool so it can't starve
+# the default executor used by the job watcher. Lines are batched into chunks
+# and published on evaluation:{eval_id}:logs, which the storage worker persists.
+log_stream_executor = ThreadPoolExecutor(max_workers=MAX_LOG_STREAMS, thread_name_prefix="log-stream")
+active_log_streams: Dict[str, asyncio.Task] = {}  # job_name -> streaming task
+
+
+def find_running_pod_sync(job_name: str) -> Optional[str]:
+    """
+    Wait until the evaluation container of a job's pod has started.
+    Returns the pod name, or None if it never started (or already finished).
+    """
+    deadline = time.monotonic() + LOG_STREAM_START_TIMEOUT
+    while time.monotonic() < deadline:
+        pods = k8s_api.call(
+            core_v1.list_namespaced_pod,
+            namespace=KUBERNETES_NAMESPACE,
+            label_selector=pod_selector(job_name)
+        )
+        for pod in pods.items:
+            for container_status in pod.status.container_statuses or []:
+                state = container_status.state
+                if state and (state.running or state.terminated):
+                    return pod.metadata.name
+        time.sleep(1)
+    return None
+
+
+def follow_pod_logs_sync(
+    job_name: str,
+    line_queue: asyncio.Queue,
+    loop: asyncio.AbstractEventLoop,
+    log_watch: watch.Watch,
+    pod_name: Optional[str] = None
+) -> Optional[str]:
+    """
+    Follow a job pod's logs from the beginning, pushing each line onto the queue.
+    Runs in the log stream executor. A None sentinel marks the end of the stream.
+    pod_name, when the pod watch already knows the started pod, skips the lookup.
+    Returns None, leaving the output to the post-completion capture, if the
+    pod never started or went LOG_STREAM_IDLE_TIMEOUT without output.
+    """
+    try:
+        pod_name = pod_name or find_running_pod_sync(job_name)
+        if not pod_name:
+            logger.info(f"No started pod found for job {job_name}, skipping log stream")
+            return None
+
+        try:
+            for line in log_watch.stream(
+                core_v1.read_namespaced_pod_log,
+                name=pod_name,
+                namespace=KUBERNETES_NAMESPACE,
+                container="evaluation",
+                # log_watch.stop() only takes effect on the next line
+                _request_timeout=(10, LOG_STREAM_IDLE_TIMEOUT)
+            ):
+                loop.call_soon_threadsafe(line_queue.put_nowait, line)
+        except ReadTimeoutError:
+            logger.info(f"No output from job {job_name} for {LOG_STREAM_IDLE_TIMEOUT}s, ending its log stream")
+            return None
+        return pod_name
+    finally:
+        loop.call_soon_threadsafe(line_queue.put_nowait, None)
+
+
+async def stream_job_logs(
+    job_name: str,
+    eval_id: str,
+    redis_client: ResilientRedisClient,
+    pod_name: Optional[str] = None
+) -> Dict:
+    """
+    Publish a job's logs as sequence-numbered chunks while the pod runs.
+
+    Returns a summary; "complete" is True when the stream covered the pod's
+    whole output, so the completion handler can skip a post-completion fetch.
+    """
+    loop = asyncio.get_running_loop()
+    line_queue: asyncio.Queue = asyncio.Queue()
+    log_watch = watch.Watch()
+    follower = loop.run_in_executor(
+        log_stream_executor, follow_pod_logs_sync, job_name, line_queue, loop, log_watch, pod_name
+    )
+
+    seq = 0
+    lines_published = 0
+    pending: List[str] = []
+    chunk_started = None
+    finished = False
+
+    async def publish(is_final: bool):
+        nonlocal seq, lines_published, pending
+        event_data = {
+            "eval_id": eval_id,
+            "job_name": job_name,
+            "seq": seq,
+            # Whole lines, newline-terminated, so chunks concatenate back into the log
+            "content": "".join(f"{line}\n" for line in pending),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "is_final": is_final
+        }
+        await redis_client.publish(f"evaluation:{eval_id}:logs", json.dumps(event_data))
+        seq += 1
+        lines_published += len(pending)
+        pending = []
+
+    try:
+        while not finished:
+            timeout = LOG_STREAM_FLUSH_INTERVAL
+            if chunk_started is not None:
+                timeout = max(0.0, chunk_started + LOG_STREAM_FLUSH_INTERVAL - loop.time())
+            try:
+                line = await asyncio.wait_for(line_queue.get(), timeout=timeout)
+                if line is None:
+                    finished = True
+                else:
+                    if not pending:
+                        chunk_started = loop.time()
+                    pending.append(line)
+            except asyncio.TimeoutError:
+                pass
+
+            chunk_due = chunk_started is not None and loop.time() - chunk_started >= LOG_STREAM_FLUSH_INTERVAL
+            if pending and (finished or chunk_due or len(pending) >= LOG_STREAM_MAX_CHUNK_LINES):
+                await publish(is_final=finished)
+                chunk_started = None
+
+        streamed_pod = await follower
+        logger.info(f"Log stream for job {job_name} ended: {lines_published} lines in {seq} chunks")
+        return {"complete": streamed_pod is not None, "pod_name": streamed_pod, "chunks": seq, "lines": lines_published}
+
+    except asyncio.CancelledError:
+        log_watch.stop()
+        raise
+    except Exception as e:
+        logger.warning(f"Log stream for job {job_name} failed after {seq} chunks: {e}")
+        log_watch.stop()
+        return {"complete": False, "pod_name": None, "chunks": seq, "lines": lines_published}
+    finally:
+        active_log_streams.pop(job_name, None)
+
+
+def start_log_stream(
+    job_name: str,
+    eval_id: str,
+    redis_client: ResilientRedisClient,
+    pod_name: Optional[str] = None
+) -> bool:
+    """Start following a job's logs unless streaming is disabled or the pool is full."""
+    if not ENABLE_LOG_STREAMING or job_name in active_log_streams:
+        return False
+    if len(active_log_streams) >= MAX_LOG_STREAMS:
+        logger.warning(
+            f"Log stream pool full ({MAX_LOG_STREAMS}), {job_name} logs will be captured at completion"
+        )
+        return False
+
+    active_log_streams[job_name] = asyncio.create_task(stream_job_logs(job_name, eval_id, redis_client, pod_name))
+    return True
+
+
+async def finish_log_stream(job_name: str) -> Optional[Dict]:
+    """Wait briefly for a job's log stream to drain; returns its summary if it finished."""
+    task = active_log_streams.get(job_name)
+    if task is None:
+        return None
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout=LOG_STREAM_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Log stream for job {job_name} did not drain within {LOG_STREAM_DRAIN_TIMEOUT}s")
+        return None
+
+
+# Log capture
+# A finished job's logs are captured exactly once. Concurrent callers for the
+# same job share one in-flight fetch (singleflight), captures run on a bounded
+# pool, and the result rides on the terminal event that the storage worker
+# persists. An empty capture is refetched a few times before it is published,
+# since nothing retries it afterwards. Later readers get the cached capture
+# instead of refetching.
+log_capture_semaphore = asyncio.Semaphore(LOG_CAPTURE_WORKERS)
+log_capture_inflight: Dict[str, asyncio.Future] = {}  # job_name -> in-flight capture
+captured_logs: "OrderedDict[str, Dict]" = OrderedDict()  # job_name -> capture result (LRU)
+terminal_event_tasks: Set[asyncio.Task] = set()
+
+# Loki fallback state
+loki_client: Optional[httpx.AsyncClient] = None
+loki_cache: "OrderedDict[str, str]" = OrderedDict()  # job_name -> parsed logs (LRU)
+loki_query_metrics = LatencyTracker()
+
+
+async def _capture_job_logs(job_name: str) -> Dict:
+    delay = LOG_CAPTURE_RETRY_DELAY
+    for attempt in range(LOG_CAPTURE_EMPTY_RETRIES + 1):
+        async with log_capture_semaphore:
+            result = await get_job_logs_internal(job_name, tail_lines=None)
+
+        # A terminated pod's own log is final; an empty result from Loki, or
+        # none at all once the pod is gone, can just be ingestion lag
+        if result.get("source") == "kubernetes" or (result.get("logs") or "").strip():
+            break
+        if attempt < LOG_CAPTURE_EMPTY_RETRIES:
+            logger.info(f"No logs captured for {job_name} yet, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    # Only cache real captures so a transient miss can be retried
+    if result.get("source"):
+        captured_logs[job_name] = result
+        while len(captured_logs) > LOG_CAPTURE_CACHE_SIZE:
+            captured_logs.popitem(last=False)
+    return result
+
+
+async def capture_job_logs(job_name: str) -> Dict:
+    """Get a finished job's full logs, fetching them at most once per job."""
+    if job_name in captured_logs:
+        captured_logs.move_to_end(job_name)
+        return captured_logs[job_name]
+
+    inflight = log_capture_inflight.get(job_name)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_capture_job_logs(job_name))
+        log_capture_inflight[job_name] = inflight
+        inflight.add_done_callback(lambda _: log_capture_inflight.pop(job_name, None))
+
+    # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+    return await asyncio.shield(inflight)
+
+
+async def publish_terminal_event(
+    job_name: str,
+    eval_id: str,
+    status: str,
+    completed_at: Optional[str],
+    redis_client: ResilientRedisClient,
+    exit_code: Optional[int] = None
+):
+    """
+    Capture a finished job's logs and publish evaluation:completed or evaluation:failed.
+    exit_code is the container's, when the pod watch saw it terminate.
+    """
+    try:
+        finished_at = completed_at or datetime.now(timezone.utc).isoformat()
+        stream_result = await finish_log_stream(job_name)
+
+        if status == "succeeded":
+            if stream_result and stream_result["complete"]:
+                # Full output already published as chunks; storage compacts them
+                logs = ""
+                log_source = "stream"
+            else:
+                logs_result = await capture_job_logs(job_name)
+                logs = logs_result.get("logs", "")
+                log_source = logs_result.get("source", "not_available")
+
+            # Always publish completed event when Kubernetes says job succeeded
+            event_data = {
+                "eval_id": eval_id,
+                "output": logs,  # Empty string if logs not available
+                "exit_code": 0,  # Kubernetes already confirmed success
+                "metadata": {
+                    "job_name": job_name,
+                    "completed_at": finished_at,
+                    "log_source": log_source
+                }
+            }
+            await redis_client.publish("evaluation:completed", json.dumps(event_data))
+            logger.info(f"Published evaluation:completed event for {eval_id} (logs from {log_source})")
+        else:
+            logs_result = await capture_job_logs(job_name)
+            if exit_code is None:
+                exit_code = job_pods.get(job_name, {}).get("exit_code")
+            event_data = {
+                "eval_id": eval_id,
+                "error": logs_result.get("logs", "Job failed"),
+                "exit_code": exit_code if exit_code is not None else logs_result.get("exit_code", 1),
+                "metadata": {
+                    "job_name": job_name,
+                    "failed_at": finished_at,
+                    "log_source": logs_result.get("source", "unknown")
+                }
+            }
+            await redis_client.publish("evaluation:failed", json.dumps(event_data))
+            logger.info(f"Published evaluation:failed event for {eval_id} (logs from {logs_result.get('source', 'unknown')})")
+
+    except Exception as e:
+        logger.error(f"Error publishing terminal event for job {job_name}: {e}", exc_info=True)
+
+
+def schedule_terminal_event(
+    job_name: str,
+    eval_id: str,
+    status: str,
+    completed_at: Optional[str],
+    redis_client: ResilientRedisClient,
+    exit_code: Optional[int] = None
+):
+    """Run publish_terminal_event in the background, keeping a reference until it finishes."""
+    task = asyncio.create_task(
+        publish_terminal_event(job_name, eval_id, status, completed_at, redis_client, exit_code)
+    )
+    terminal_event_tasks.add(task)
+    task.add_done_callback(terminal_event_tasks.discard)
+
+
+def packed_slot_event(eval_id: str, slot_unit: str, result: Optional[Dict], log_source: str, finished_at: str) -> Tuple[str, Dict]:
+    """(channel, event) for one evaluation of a packed pod, from its demultiplexed result."""
+    metadata = {"job_name": slot_unit, "log_source": log_source}
+    if result and result["exit_code"] == 0:
+        metadata.update(completed_at=finished_at, duration_seconds=result.get("duration_seconds"))
+        return "evaluation:completed", {
+            "eval_id": eval_id,
+            "output": result["stdout"],
+            "error": result["stderr"],
+            "exit_code": 0,
+            "metadata": metadata
+        }
+
+    metadata["failed_at"] = finished_at
+    if result is None or result["exit_code"] is None:
+        # The pod died (deadline, node loss, OOM) before the runner reported this slot
+        error = (result["stdout"] + result["stderr"]) if result else ""
+        return "evaluation:failed", {
+            "eval_id": eval_id,
+            "error": error or "Packed pod ended before this evaluation finished",
+            "exit_code": 1,
+            "metadata": metadata
+        }
+    metadata.update(duration_seconds=result.get("duration_seconds"), timed_out=result["timed_out"])
+    return "evaluation:failed", {
+        "eval_id": eval_id,
+        "error": result["stdout"] + result["stderr"],
+        "exit_code": result["exit_code"],
+        "metadata": metadata
+    }
+
+
+async def publish_packed_terminal_events(
+    job_name: str,
+    index: int,
+    eval_ids: List[str],
+    completed_at: Optional[str],
+    redis_client: ResilientRedisClient
+):
+    """Capture a finished packed pod's logs once and publish each of its evaluations' outcome."""
+    unit = index_unit_name(job_name, index)
+    try:
+        finished_at = completed_at or datetime.now(timezone.utc).isoformat()
+        logs_result = await capture_job_logs(unit)
+        results = packed_runner.parse_packed_output(logs_result.get("logs", ""))
+        log_source = logs_result.get("source", "not_available")
+
+        for slot, eval_id in enumerate(eval_ids):
+            slot_unit = index_unit_name(job_name, index, slot)
+            channel, event_data = packed_slot_event(eval_id, slot_unit, results.get(slot), log_source, finished_at)
+            advanced, _ = await advance_job_state(
+                slot_unit, "succeeded" if channel == "evaluation:completed" else "failed", redis_client
+            )
+            if advanced:
+                await redis_client.publish(channel, json.dumps(event_data))
+        logger.info(f"Published outcomes of {len(eval_ids)} packed evaluations of {unit} (logs from {log_source})")
+
+    except Exception as e:
+        logger.error(f"Error publishing packed terminal events for {unit}: {e}", exc_info=True)
+
+
+def schedule_packed_terminal_events(
+    job_name: str,
+    index: int,
+    eval_ids: List[str],
+    status: str,
+    completed_at: Optional[str],
+    redis_client: ResilientRedisClient
+):
+    """
+    Run publish_packed_terminal_events in the background. The pod's status
+    doesn't decide its evaluations' outcomes (the runner exits 0 after
+    failing ones), only that they are over.
+    """
+    task = asyncio.create_task(
+        publish_packed_terminal_events(job_name, index, eval_ids, completed_at, redis_client)
+    )
+    terminal_event_tasks.add(task)
+    task.add_done_callback(terminal_event_tasks.discard)
+
+
+# Pending dispatch
+# Evaluations that don't fit when Celery hands them off wait in a Redis queue
+# owned by the dispatcher. The job watcher wakes the loop below whenever a job
+# finishes or is deleted, and it starts parked evaluations in priority order
+# until the next one doesn't fit.
+pending_dispatch: Optional[PendingDispatchQueue] = None
+pending_dispatch_wakeup = asyncio.Event()
+
+
+def wake_pending_dispatch():
+    """Ask the dispatch loop to retry parked evaluations now."""
+    pending_dispatch_wakeup.set()
+
+
+async def fail_pending_evaluation(entry: Dict, error: str, redis_client: ResilientRedisClient):
+    """Drop a parked evaluation and publish evaluation:failed for it."""
+    if not await pending_dispatch.remove(entry["eval_id"]):
+        return  # Cancelled or handled elsewhere in the meantime
+    await redis_client.publish(
+        "evaluation:failed",
+        json.dumps({
+            "eval_id": entry["eval_id"],
+            "error": error,
+            "exit_code": None,
+            "metadata": {
+                "job_name": entry["job_name"],
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+                "reason": "resource_exhaustion"
+            }
+        })
+    )
+    logger.warning(f"Evaluation {entry['eval_id']} failed while waiting for capacity: {error}")
+
+
+async def drain_pending_dispatch(redis_client: ResilientRedisClient) -> int:
+    """Start parked evaluations in order until one doesn't fit. Returns how many started."""
+    started = 0
+    while True:
+        entry = await pending_dispatch.peek()
+        if entry is None:
+            return started
+
+        waited = time.time() - entry["queued_at"]
+        if waited > PENDING_DISPATCH_MAX_WAIT_SECONDS:
+            await fail_pending_evaluation(
+                entry, f"No cluster capacity after waiting {int(waited)}s. Cluster resources exhausted.", redis_client
+            )
+            continue
+
+        request = ExecuteRequest(**entry["request"])
+        capacity = await asyncio.to_thread(
+            compute_capacity, CapacityRequest(memory_limit=request.memory_limit, cpu_limit=request.cpu_limit)
+        )
+        if not capacity.has_capacity:
+            return started  # Strict order: wait for the next release rather than skip ahead
+
+        try:
+            # The RuntimeClass lookup goes through the rate-limited API layer until it's cached
+            use_gvisor = await asyncio.to_thread(check_gvisor_availability)
+            await asyncio.to_thread(create_evaluation_job, request, entry["job_name"], use_gvisor)
+        except HTTPException as e:
+            if e.status_code == 429:
+                return started  # Quota still full
+            if e.status_code != 409:  # 409: another replica already created it
+                await fail_pending_evaluation(entry, f"Failed to create job: {e.detail}", redis_client)
+                continue
+
+        await pending_dispatch.remove(request.eval_id)
+        started += 1
+        logger.info(f"Started parked evaluation {request.eval_id} as job {entry['job_name']} after {waited:.1f}s")
+
+
+async def run_pending_dispatch(app: FastAPI):
+    """Background loop that starts parked evaluations when capacity is released."""
+    while True:
+        try:
+            await asyncio.wait_for(pending_dispatch_wakeup.wait(), timeout=PENDING_DISPATCH_RECHECK_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        pending_dispatch_wakeup.clear()
+
+        try:
+            await drain_pending_dispatch(app.state.redis_client)
+        except Exception as e:
+            logger.error(f"Error dispatching parked evaluations: {e}", exc_info=True)
+
+
+# Leader election
+# Any number of replicas serve /execute, but only the holder of the dispatcher
+# Lease (coordination.k8s.io) watches jobs and pods and drains the pending-
+# dispatch queue, so each transition is published by one replica. A new
+# leader relists, and job states it hasn't seen are read from Redis, so
+# transitions that happen during a failover are published late, not lost.
+class LeaderElector:
+    """
+    Acquires and renews the dispatcher Lease.
+
+    Like client-go, expiry is judged by how long the holder's record has gone
+    unchanged on this replica's clock, so clock skew between replicas doesn't matter.
+    """
+
+    def __init__(self, identity: str):
+        self.identity = identity
+        self.is_leader = False
+        self.last_renewed = 0.0  # monotonic time of our last successful write
+        self.observed_version: Optional[str] = None
+        self.observed_at = 0.0  # monotonic time the lease record last changed
+        self.terms = 0
+
+    def try_acquire_or_renew(self) -> bool:
+        """One election round. Returns whether this replica holds the lease."""
+        now = datetime.now(timezone.utc)
+        try:
+            lease = k8s_api.call(
+                coordination_v1.read_namespaced_lease, LEADER_LEASE_NAME, KUBERNETES_NAMESPACE,
+                priority=PRIORITY_CRITICAL, coalesce=False  # We modify it
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            lease = client.V1Lease(
+                metadata=client.V1ObjectMeta(name=LEADER_LEASE_NAME),
+                spec=client.V1LeaseSpec(
+                    holder_identity=self.identity,
+                    lease_duration_seconds=LEADER_LEASE_DURATION_SECONDS,
+                    acquire_time=now,
+                    renew_time=now,
+                    lease_transitions=0
+                )
+            )
+            return self._write(coordination_v1.create_namespaced_lease, KUBERNETES_NAMESPACE, lease)
+
+        if lease.metadata.resource_version != self.observed_version:
+            self.observed_version = lease.metadata.resource_version
+            self.observed_at = time.monotonic()
+
+        spec = lease.spec
+        duration = spec.lease_duration_seconds or LEADER_LEASE_DURATION_SECONDS
+        if spec.holder_identity and spec.holder_identity != self.identity \
+                and time.monotonic() - self.observed_at < duration:
+            return False  # Held by a live replica
+
+        if spec.holder_identity != self.identity:
+            spec.holder_identity = self.identity
+            spec.acquire_time = now
+            spec.lease_transitions = (spec.lease_transitions or 0) + 1
+        spec.renew_time = now
+        spec.lease_duration_seconds = LEADER_LEASE_DURATION_SECONDS
+        # The read's resourceVersion makes this a compare-and-swap
+        return self._write(coordination_v1.replace_namespaced_lease, LEADER_LEASE_NAME, KUBERNETES_NAMESPACE, lease)
+
+    def _write(self, func, *args) -> bool:
+        try:
+            written = k8s_api.call(func, *args, priority=PRIORITY_CRITICAL)
+        except ApiException as e:
+            if e.status == 409:
+                return False  # Another replica wrote first
+            raise
+        self.observed_version = written.metadata.resource_version
+        self.observed_at = self.last_renewed = time.monotonic()
+        return True
+
+    def release(self):
+        """Give up the lease so a standby takes over without waiting for it to expire."""
+        lease = k8s_api.call(
+            coordination_v1.read_namespaced_lease, LEADER_LEASE_NAME, KUBERNETES_NAMESPACE,
+            priority=PRIORITY_CRITICAL, coalesce=False
+        )
+        if lease.spec.holder_identity != self.identity:
+            return
+        lease.spec.holder_identity = None
+        lease.spec.lease_duration_seconds = 1
+        k8s_api.call(
+            coordination_v1.replace_namespaced_lease, LEADER_LEASE_NAME, KUBERNETES_NAMESPACE, lease,
+            priority=PRIORITY_CRITICAL
+        )
+
+
+leader_elector: Optional[LeaderElector] = None
+
+
+def is_event_leader() -> bool:
+    """Whether this replica publishes job transitions (always, without leader election)."""
+    return leader_elector is None or leader_elector.is_leader
+
+
+def start_leader_tasks(app: FastAPI) -> List[asyncio.Task]:
+    tasks = [asyncio.create_task(run_pending_dispatch(app))]
+    if ENABLE_IMAGE_PREWARM:
+        tasks.append(asyncio.create_task(run_image_prewarm()))
+    if ENABLE_HEADROOM:
+        tasks.append(asyncio.create_task(run_headroom_controller()))
+    if ENABLE_EVENT_MONITORING:
+        tasks.append(asyncio.create_task(monitor_job_events(app)))
+        logger.info("Started Kubernetes job event monitoring")
+    else:
+        logger.info("Event monitoring disabled - using polling approach")
+    return tasks
+
+
+async def stop_tasks(tasks: List[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+async def run_leader_election(app: FastAPI):
+    """Hold the lease, running the job monitor and pending dispatch only while leading."""
+    leader_tasks: List[asyncio.Task] = []
+    try:
+        while True:
+            try:
+                leading = await asyncio.to_thread(leader_elector.try_acquire_or_renew)
+            except Exception as e:
+                logger.warning(f"Leader election round failed: {e}")
+                leading = False
+            if not leading and leader_elector.is_leader:
+                # Failed renewals are retried until the deadline, which ends well before the lease expires
+                leading = time.monotonic() - leader_elector.last_renewed < LEADER_RENEW_DEADLINE_SECONDS
+
+            if leading and not leader_elector.is_leader:
+                leader_elector.is_leader = True
+                leader_elector.terms += 1
+                logger.info(f"{leader_elector.identity} acquired lease {LEADER_LEASE_NAME}")
+                leader_tasks = start_leader_tasks(app)
+            elif not leading and leader_elector.is_leader:
+                leader_elector.is_leader = False
+                logger.warning(f"{leader_elector.identity} lost lease {LEADER_LEASE_NAME}, stepping down")
+                await stop_tasks(leader_tasks)
+                leader_tasks = []
+                # The next leader owns these jobs now; re-read Redis if we lead again
+                job_states.clear()
+                job_pods.clear()
+
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+    finally:
+        await stop_tasks(leader_tasks)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown"""
@@ -265,23 +1448,46 @@ async def lifespan(app: FastAPI):
     )
     logger.info("Dispatcher service started - Redis will connect when needed")
     
-    # Start background job monitoring task if enabled
-    monitor_task = None
-    if ENABLE_EVENT_MONITORING:
-        monitor_task = asyncio.create_task(monitor_job_events(app))
-        logger.info("Started Kubernetes job event monitoring")
+    global pending_dispatch, leader_elector
+    pending_dispatch = PendingDispatchQueue(AsyncRedis.from_url(REDIS_URL))
+
+    # Start the job monitor and pending dispatch, on this replica only if it leads
+    # Every replica keeps its executor image catalog and node image inventory current
+    loop = asyncio.get_running_loop()
+    background_tasks: List[asyncio.Task] = [
+        asyncio.create_task(run_watch(
+            "images", list_executor_images_configmap_sync, loop,
+            executor_image_catalog.apply_event, executor_image_catalog.on_relist
+        )),
+        asyncio.create_task(run_watch(
+            "nodes", list_nodes_sync, loop, node_image_inventory.apply_event, node_image_inventory.on_relist
+        )),
+    ]
+    if ENABLE_LEADER_ELECTION:
+        leader_elector = LeaderElector(f"{os.getenv('HOSTNAME', 'dispatcher')}-{uuid.uuid4().hex[:8]}")
+        background_tasks.append(asyncio.create_task(run_leader_election(app)))
+        logger.info(f"Leader election enabled as {leader_elector.identity}")
     else:
-        logger.info("Event monitoring disabled - using polling approach")
+        background_tasks.extend(start_leader_tasks(app))
     
     yield
     
     # Shutdown
-    if monitor_task:
-        monitor_task.cancel()
+    await stop_tasks(background_tasks)
+    if leader_elector is not None and leader_elector.is_leader:
         try:
-            await monitor_task
-        except asyncio.CancelledError:
-            pass
+            await asyncio.to_thread(leader_elector.release)
+            logger.info(f"Released lease {LEADER_LEASE_NAME}")
+        except Exception as e:
+            logger.warning(f"Failed to release lease {LEADER_LEASE_NAME}: {e}")
+    await pending_dispatch.redis.aclose()
+
+    for stream_task in list(active_log_streams.values()) + list(terminal_event_tasks):
+        stream_task.cancel()
+    log_stream_executor.shutdown(wait=False, cancel_futures=True)
+    job_watch_executor.shutdown(wait=False, cancel_futures=True)
+    if loki_client is not None:
+        await loki_client.aclose()
     
     if hasattr(app.state, 'redis_client'):
         await app.state.redis_client.close()
@@ -314,12 +1520,14 @@ except:
 batch_v1 = client.BatchV1Api()
 core_v1 = client.CoreV1Api()
 node_v1 = client.NodeV1Api()
+coordination_v1 = client.CoordinationV1Api()
+apps_v1 = client.AppsV1Api()
+
+# Every API call except watch streams and log follows goes through this layer
+k8s_api = KubernetesCallLayer(K8S_CLIENT_QPS, K8S_CLIENT_BURST, max_retries=K8S_CLIENT_MAX_RETRIES)
 
 # Cache for gVisor availability check
 gvisor_runtime_available = None
-# Cache for available executor images
-available_images_cache = None
-cache_timestamp = None
 
 
 # Dependency injection for Redis client
@@ -327,56 +1535,316 @@ def get_redis_client() -> ResilientRedisClient:
     """Get Redis client from app state."""
     return app.state.redis_client
 
-def load_executor_images() -> Dict[str, str]:
-    """Load available executor images from ConfigMap"""
-    global available_images_cache, cache_timestamp
-    
-    # Cache for 30 seconds
-    if available_images_cache and cache_timestamp and (datetime.now(timezone.utc) - cache_timestamp).seconds < 30:
-        return available_images_cache
-    
-    try:
-        # Read ConfigMap
-        config_map = core_v1.read_namespaced_config_map(
-            name="executor-images",
-            namespace=KUBERNETES_NAMESPACE
-        )
-        
-        # Parse YAML data
-        images_yaml = config_map.data.get("images.yaml", "")
-        images_data = yaml.safe_load(images_yaml)
-        
-        # Build image mapping
-        image_map = {}
+# Executor image catalog
+# The executor-images ConfigMap is watched on every replica (all of them serve
+# /execute, not just the leader). Each change rebuilds the catalog and its
+# resolution table, so resolving a known image is a dict lookup and an edit to
+# the ConfigMap applies as soon as its event arrives.
+EXECUTOR_IMAGES_CONFIGMAP = "executor-images"
+
+
+def qualify_image(image: str) -> str:
+    """Add the registry prefix and default tag an image reference is missing."""
+    if REGISTRY_PREFIX and not image.startswith(REGISTRY_PREFIX):
+        image = f"{REGISTRY_PREFIX}/{image}"
+    if ":" not in image.split("/")[-1]:  # Check last part for tag
+        image = f"{image}:{DEFAULT_IMAGE_TAG}"
+    return image
+
+
+class ExecutorImageCatalog:
+    """Executor images by name, with every known reference resolved ahead of time."""
+
+    def __init__(self):
+        self.images: Dict[str, str] = {}
+        self.resolved: Dict[str, str] = {}
+        self.resource_version: Optional[str] = None
+        self.updated_at: Optional[float] = None
+        self.update(None)
+
+    def update(self, images_yaml: Optional[str]):
+        """Rebuild from the ConfigMap's images.yaml; None falls back to EXECUTOR_IMAGE."""
+        images: Dict[str, str] = {}
         default_image = None
-        
-        for img in images_data.get("images", []):
+        for img in (yaml.safe_load(images_yaml or "") or {}).get("images", []):
             if img.get("available", True):  # Default to available if not specified
-                name = img["name"]
-                full_image = img["image"]
-                
-                image_map[name] = full_image
-                
+                images[img["name"]] = img["image"]
                 if img.get("default", False):
-                    default_image = full_image
-        
+                    default_image = img["image"]
+
         # Set default if none specified
-        if not default_image and image_map:
-            default_image = list(image_map.values())[0]
-        
-        if default_image:
-            image_map["default"] = default_image
-            
-        available_images_cache = image_map
-        cache_timestamp = datetime.now(timezone.utc)
-        
-        logger.info(f"Loaded {len(image_map)} executor images from ConfigMap")
-        return image_map
-        
-    except ApiException as e:
-        logger.warning(f"Failed to load executor images from ConfigMap: {e}")
-        # Fallback to environment variable
-        return {"default": EXECUTOR_IMAGE}
+        if not default_image and images:
+            default_image = next(iter(images.values()))
+        images["default"] = default_image or EXECUTOR_IMAGE
+
+        resolved = {name: qualify_image(image) for name, image in images.items()}
+        # Full references to catalog images, as clients often send them
+        resolved.update({
+            image: qualify_image(image) for image in images.values() if "/" in image or ":" in image
+        })
+        self.images = images
+        self.resolved = resolved
+        self.updated_at = time.time()
+
+    def resolve(self, requested: str) -> str:
+        """Resolve an image name or reference to a full registry path with a tag."""
+        image = self.resolved.get(requested)
+        if image is not None:
+            return image
+        # Other full paths are used as given
+        if "/" in requested or ":" in requested:
+            return qualify_image(requested)
+        logger.warning(f"Unknown executor image '{requested}', using default")
+        return self.resolved["default"]
+
+    def apply_event(self, event: Dict):
+        """Watch dispatch: rebuild on add/modify, fall back on delete."""
+        config_map = event["object"]
+        try:
+            if event["type"] == "DELETED":
+                self.update(None)
+            else:
+                self.update((config_map.data or {}).get("images.yaml"))
+        except (yaml.YAMLError, KeyError, AttributeError) as e:
+            logger.error(f"Ignoring invalid {EXECUTOR_IMAGES_CONFIGMAP} ConfigMap, keeping previous catalog: {e}")
+            return
+        self.resource_version = config_map.metadata.resource_version
+        logger.info(f"Executor image catalog updated: {len(self.images) - 1} images, default {self.images['default']}")
+
+    def on_relist(self, config_maps: List):
+        if not config_maps:
+            self.update(None)  # Deleted while we weren't watching
+
+
+executor_image_catalog = ExecutorImageCatalog()
+
+
+def list_executor_images_configmap_sync(**kwargs):
+    return k8s_api.call(
+        core_v1.list_namespaced_config_map,
+        namespace=KUBERNETES_NAMESPACE,
+        field_selector=f"metadata.name={EXECUTOR_IMAGES_CONFIGMAP}",
+        **kwargs
+    )
+
+
+def load_executor_images() -> Dict[str, str]:
+    """Available executor images by name, plus "default"."""
+    return executor_image_catalog.images
+
+
+# Node image inventory and pre-warming
+# Every replica watches nodes and keeps the images each schedulable node holds
+# (node.status.images). /execute adds a preferred node affinity toward nodes
+# that already have the requested image, and the pod watch reports how long
+# each evaluation waited between scheduling and container start. The leader
+# pre-pulls catalog images onto nodes that lack them, so nodes added by the
+# autoscaler are warm before their first evaluation.
+def image_aliases(name: str) -> Set[str]:
+    """A node image name plus the short form the runtime expanded with docker.io."""
+    for prefix in ("docker.io/library/", "docker.io/"):
+        if name.startswith(prefix):
+            return {name, name[len(prefix):]}
+    return {name}
+
+
+class NodeImageInventory:
+    """Images present on each schedulable node, kept current by the node watch."""
+
+    def __init__(self):
+        self.nodes: Dict[str, Set[str]] = {}  # node name -> image names
+        self.wakeup = asyncio.Event()  # Set when a node joins, for the pre-warm loop
+
+    @staticmethod
+    def schedulable(node) -> bool:
+        """Ready, not cordoned, and not tainted against pods without tolerations."""
+        if node.spec and (node.spec.unschedulable or any(
+            taint.effect in ("NoSchedule", "NoExecute") for taint in node.spec.taints or []
+        )):
+            return False
+        conditions = node.status.conditions if node.status else None
+        return any(c.type == "Ready" and c.status == "True" for c in conditions or [])
+
+    def apply_event(self, event: Dict):
+        node = event["object"]
+        name = node.metadata.name
+        if event["type"] == "DELETED" or not self.schedulable(node):
+            self.nodes.pop(name, None)
+            return
+
+        images: Set[str] = set()
+        for image in node.status.images or []:
+            for image_name in image.names or []:
+                images |= image_aliases(image_name)
+        if name not in self.nodes:
+            self.wakeup.set()
+        self.nodes[name] = images
+
+    def on_relist(self, nodes: List):
+        listed = {node.metadata.name for node in nodes}
+        for name in set(self.nodes) - listed:
+            self.nodes.pop(name, None)
+
+    def has(self, node: str, image: str) -> Optional[bool]:
+        """Whether the node holds the image; None if the node isn't known."""
+        images = self.nodes.get(node)
+        return None if images is None else image in images
+
+    def nodes_with(self, image: str) -> List[str]:
+        return sorted(name for name, images in self.nodes.items() if image in images)
+
+    def missing(self, images: List[str]) -> List[Tuple[str, str]]:
+        """(node, image) pairs for images a schedulable node doesn't hold yet."""
+        return [(name, image) for name, held in self.nodes.items() for image in images if image not in held]
+
+
+node_image_inventory = NodeImageInventory()
+prewarm_attempts: Dict[Tuple[str, str], float] = {}  # (node, image) -> when its pre-pull was started
+prewarm_stats = {"created": 0, "already_running": 0, "failed": 0}
+# Scheduled-to-started wait by whether the node already held the image
+image_pull_wait_metrics = {"cached": LatencyTracker(), "cold": LatencyTracker(), "unknown": LatencyTracker()}
+
+
+def list_nodes_sync(**kwargs):
+    return k8s_api.call(core_v1.list_node, **kwargs)
+
+
+def record_pull_wait(pod, started_at: Optional[datetime], image_cached: Optional[bool]) -> Optional[float]:
+    """
+    Seconds from the pod being scheduled to its container starting: the image
+    pull plus container creation. Recorded by whether the image was cached.
+    """
+    scheduled_at = next((
+        c.last_transition_time for c in (pod.status.conditions or [])
+        if c.type == "PodScheduled" and c.status == "True"
+    ), None)
+    if not scheduled_at or not started_at:
+        return None
+    wait = max(0.0, (started_at - scheduled_at).total_seconds())
+    bucket = "unknown" if image_cached is None else ("cached" if image_cached else "cold")
+    image_pull_wait_metrics[bucket].record(wait * 1000)
+    return round(wait, 3)
+
+
+def image_locality_affinity(image: str) -> Optional[client.V1Affinity]:
+    """Prefer nodes that already hold the image, unless all or none of them do."""
+    if IMAGE_LOCALITY_WEIGHT <= 0:
+        return None
+    warm = node_image_inventory.nodes_with(image)
+    if not warm or len(warm) == len(node_image_inventory.nodes):
+        return None
+    return client.V1Affinity(
+        node_affinity=client.V1NodeAffinity(
+            preferred_during_scheduling_ignored_during_execution=[
+                client.V1PreferredSchedulingTerm(
+                    weight=IMAGE_LOCALITY_WEIGHT,
+                    preference=client.V1NodeSelectorTerm(
+                        match_fields=[client.V1NodeSelectorRequirement(
+                            key="metadata.name", operator="In", values=warm
+                        )]
+                    )
+                )
+            ]
+        )
+    )
+
+
+def prewarm_job_name(node: str, image: str) -> str:
+    """Deterministic, so a second pre-pull of the same image on the same node is a 409."""
+    return f"image-prepull-{zlib.crc32(f'{node}|{image}'.encode()):08x}"
+
+
+def create_prepull_job(node: str, image: str):
+    """Create a Job that runs a no-op container from the image on the node, pulling it."""
+    job = client.V1Job(
+        metadata=client.V1ObjectMeta(
+            name=prewarm_job_name(node, image),
+            labels={"app": "image-prepull", "created-by": "dispatcher"},
+            annotations={"node": node, "image": image}
+        ),
+        spec=client.V1JobSpec(
+            ttl_seconds_after_finished=JOB_CLEANUP_TTL,
+            active_deadline_seconds=IMAGE_PREWARM_DEADLINE_SECONDS,
+            backoff_limit=0,
+            template=client.V1PodTemplateSpec(
+                metadata=client.V1ObjectMeta(labels={"app": "image-prepull"}),
+                spec=client.V1PodSpec(
+                    restart_policy="Never",
+                    node_name=node,  # The node to warm; no scheduling needed
+                    priority_class_name=get_priority_class(0),
+                    termination_grace_period_seconds=1,
+                    automount_service_account_token=False,
+                    security_context=client.V1PodSecurityContext(
+                        run_as_non_root=True,
+                        run_as_user=1000,
+                        seccomp_profile=client.V1SeccompProfile(type="RuntimeDefault")
+                    ),
+                    containers=[
+                        client.V1Container(
+                            name="prepull",
+                            image=image,
+                            image_pull_policy="IfNotPresent",
+                            command=["true"],
+                            resources=client.V1ResourceRequirements(
+                                limits={"memory": "32Mi", "cpu": "50m"},
+                                requests={"memory": "16Mi", "cpu": "10m"}
+                            ),
+                            security_context=client.V1SecurityContext(
+                                allow_privilege_escalation=False,
+                                read_only_root_filesystem=True,
+                                capabilities=client.V1Capabilities(drop=["ALL"])
+                            )
+                        )
+                    ]
+                )
+            )
+        )
+    )
+    k8s_api.call(batch_v1.create_namespaced_job, namespace=KUBERNETES_NAMESPACE, body=job, priority=PRIORITY_LOW)
+
+
+async def prewarm_images() -> int:
+    """Start pre-pulls of catalog images onto nodes that lack them. Returns how many started."""
+    catalog = executor_image_catalog
+    images = sorted({catalog.resolved[name] for name in catalog.images})
+    now = time.time()
+    started = 0
+    for node, image in node_image_inventory.missing(images):
+        if now - prewarm_attempts.get((node, image), 0) < IMAGE_PREWARM_RETRY_SECONDS:
+            continue  # Pulling, or pulled and not reported by the node yet
+        prewarm_attempts[(node, image)] = now
+        try:
+            await asyncio.to_thread(create_prepull_job, node, image)
+        except ApiException as e:
+            if e.status == 409:
+                prewarm_stats["already_running"] += 1
+            else:
+                prewarm_stats["failed"] += 1
+                logger.warning(f"Failed to pre-pull {image} on node {node}: {e.reason}")
+            continue
+        prewarm_stats["created"] += 1
+        started += 1
+        logger.info(f"Pre-pulling {image} on node {node}")
+
+    # Forget nodes that left the cluster
+    for key in [key for key in prewarm_attempts if key[0] not in node_image_inventory.nodes]:
+        del prewarm_attempts[key]
+    return started
+
+
+async def run_image_prewarm():
+    """Background loop that warms nodes as they join, and rechecks periodically."""
+    while True:
+        try:
+            await asyncio.wait_for(node_image_inventory.wakeup.wait(), timeout=IMAGE_PREWARM_RECHECK_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        node_image_inventory.wakeup.clear()
+
+        try:
+            await prewarm_images()
+        except Exception as e:
+            logger.error(f"Error pre-pulling executor images: {e}", exc_info=True)
 
 # Commented out - no longer needed with registry approach
 # def get_latest_executor_image(executor_type: str) -> Optional[str]:
@@ -416,40 +1884,6 @@ def load_executor_images() -> Dict[str, str]:
 #         logger.error(f"Failed to query node images: {e}")
 #         return None
 
-def resolve_executor_image(requested_image: str, available_images: Dict[str, str]) -> str:
-    """
-    Resolve an executor image name to a full registry path with :latest tag.
-    
-    Args:
-        requested_image: The image name requested (e.g., "executor-base", "base", full path)
-        available_images: Dict of known images from configmap
-        
-    Returns:
-        Full image path with registry prefix and tag
-    """
-    # Check if it's a known image name from configmap
-    if requested_image in available_images:
-        image = available_images[requested_image]
-    # Check if it's already a full image path
-    elif "/" in requested_image or ":" in requested_image:
-        image = requested_image
-    else:
-        # Unknown image, use default
-        logger.warning(f"Unknown executor image '{requested_image}', using default")
-        image = available_images.get("default", EXECUTOR_IMAGE)
-    
-    # Add registry prefix if configured
-    if REGISTRY_PREFIX and not image.startswith(REGISTRY_PREFIX):
-        image = f"{REGISTRY_PREFIX}/{image}"
-    
-    # Add default tag if no tag specified
-    if ":" not in image.split("/")[-1]:  # Check last part for tag
-        image = f"{image}:{DEFAULT_IMAGE_TAG}"
-    
-    logger.info(f"Resolved executor image '{requested_image}' to: {image}")
-    return image
-
-
 def check_gvisor_availability():
     """Check if gVisor RuntimeClass is available in the cluster"""
     global gvisor_runtime_available
@@ -467,7 +1901,7 @@ def check_gvisor_availability():
     # For all other environments (including dev on EKS), check if RuntimeClass exists
     try:
         # Check if gvisor RuntimeClass exists
-        node_v1.read_runtime_class("gvisor")
+        k8s_api.call(node_v1.read_runtime_class, "gvisor")
         gvisor_runtime_available = True
         logger.info("gVisor RuntimeClass found - will use for evaluations")
         return True
@@ -540,6 +1974,7 @@ class ExecuteRequest(BaseModel):
     executor_image: Optional[str] = Field(default=None, description="Executor image name (e.g., 'python-ml') or full image path")
     debug: bool = Field(default=False, description="Preserve pod for debugging if it fails")
     expect_failure: bool = Field(default=False, description="If True, job will use backoffLimit=0 (no retries)")
+    wait_for_capacity: bool = Field(default=False, description="Park the evaluation until capacity frees up instead of creating the job now")
     
 class ExecuteResponse(BaseModel):
     eval_id: str
@@ -587,13 +2022,15 @@ def min_resource(limit: str, default: str, resource_type: str) -> str:
     return default
 
 
-def count_pending_evaluation_pods() -> int:
+def count_pending_evaluation_pods(priority: int = PRIORITY_NORMAL) -> int:
     """Count the number of pending evaluation pods in the namespace."""
     try:
         # List pods with evaluation label
-        pods = core_v1.list_namespaced_pod(
+        pods = k8s_api.call(
+            core_v1.list_namespaced_pod,
             namespace=KUBERNETES_NAMESPACE,
-            label_selector="app=evaluation"
+            label_selector="app=evaluation",
+            priority=priority
         )
         
         pending_count = 0
@@ -616,10 +2053,10 @@ def count_pending_evaluation_pods() -> int:
         return 0
 
 
-def get_current_node_count() -> int:
+def get_current_node_count(priority: int = PRIORITY_NORMAL) -> int:
     """Get the current number of ready nodes in the cluster."""
     try:
-        nodes = core_v1.list_node()
+        nodes = k8s_api.call(core_v1.list_node, priority=priority)
         ready_nodes = 0
         
         for node in nodes.items:
@@ -665,13 +2102,13 @@ def calculate_projected_capacity(current_nodes: int, pending_pods: int) -> Dict[
     }
 
 
-@app.post("/capacity/check", response_model=CapacityResponse)
-async def check_capacity(request: CapacityRequest):
+def compute_capacity(request: CapacityRequest) -> CapacityResponse:
     """
     Check if the cluster has capacity for a new evaluation with specified resources.
     
     With projected capacity enabled, this will allow pods to be created up to the
     projected capacity of MAX_NODES, enabling cluster autoscaling.
+    Blocking (Kubernetes API calls); the dispatch loop runs it in a thread.
     """
     try:
         # Check requested resources
@@ -744,7 +2181,8 @@ async def check_capacity(request: CapacityRequest):
             
         else:
             # Original ResourceQuota-based logic
-            quota = core_v1.read_namespaced_resource_quota(
+            quota = k8s_api.call(
+                core_v1.read_namespaced_resource_quota,
                 name="evaluation-quota",
                 namespace=KUBERNETES_NAMESPACE
             )
@@ -813,12 +2251,70 @@ async def check_capacity(request: CapacityRequest):
             raise HTTPException(status_code=500, detail=f"Failed to check capacity: {str(e)}")
 
 
+# Predictive headroom
+# calculate_projected_capacity lets pods be created beyond current nodes, but
+# the autoscaler only reacts once they're Pending, so a burst waits out node
+# provisioning. The leader instead keeps HEADROOM_DEPLOYMENT's replicas, pause
+# pods at a PriorityClass below every evaluation, sized by HeadroomController
+# from the Celery backlog and arrival trend. Evaluations preempt them at once;
+# the evicted placeholders go Pending and the autoscaler adds a node before
+# the next arrivals need it.
+headroom_controller = HeadroomController()
+headroom_state = {"replicas": None, "scaled_at": None, "errors": 0}
+
+
+def scale_headroom_sync(replicas: int):
+    k8s_api.call(
+        apps_v1.patch_namespaced_deployment_scale,
+        name=HEADROOM_DEPLOYMENT,
+        namespace=KUBERNETES_NAMESPACE,
+        body={"spec": {"replicas": replicas}},
+        priority=PRIORITY_LOW
+    )
+
+
+async def update_headroom(telemetry: QueueTelemetry) -> int:
+    """Sample Celery demand and scale the placeholders to the controller's target."""
+    snapshot = await telemetry.snapshot(max_age=0)
+    target = headroom_controller.sample(snapshot["queued"] + snapshot["unacked"], time.time())
+    if target != headroom_state["replicas"]:
+        await asyncio.to_thread(scale_headroom_sync, target)
+        logger.info(f"Headroom placeholders: {headroom_state['replicas']} -> {target}")
+        headroom_state["replicas"] = target
+        headroom_state["scaled_at"] = datetime.now(timezone.utc).isoformat()
+    return target
+
+
+async def run_headroom_controller():
+    """Background loop that keeps the placeholder pods sized to predicted demand."""
+    telemetry = QueueTelemetry(AsyncRedis.from_url(CELERY_BROKER_URL, decode_responses=True), EVALUATION_QUEUES)
+    headroom_state["replicas"] = None  # Whatever a previous leader left, set it on the first pass
+    try:
+        while True:
+            try:
+                await update_headroom(telemetry)
+            except Exception as e:
+                headroom_state["errors"] += 1
+                logger.error(f"Error updating evaluation headroom: {e}", exc_info=True)
+            await asyncio.sleep(HEADROOM_INTERVAL_SECONDS)
+    finally:
+        await telemetry.broker.aclose()
+
+
+@app.post("/capacity/check", response_model=CapacityResponse)
+async def check_capacity(request: CapacityRequest):
+    """Check if the cluster has capacity for a new evaluation with specified resources."""
+    # Kubernetes calls may wait on the client-side rate limiter; keep them off the event loop
+    return await asyncio.to_thread(compute_capacity, request)
+
+
 @app.get("/cluster/status")
 async def get_cluster_status():
     """Get current cluster scaling status."""
     try:
-        current_nodes = get_current_node_count()
-        pending_pods = count_pending_evaluation_pods()
+        # Diagnostics: lowest priority for API tokens
+        current_nodes = await asyncio.to_thread(get_current_node_count, PRIORITY_LOW)
+        pending_pods = await asyncio.to_thread(count_pending_evaluation_pods, PRIORITY_LOW)
         
         # Calculate utilization
         system_cpu_overhead = 1475
@@ -841,20 +2337,19 @@ async def get_cluster_status():
             "scale_threshold_percent": round(SCALE_UP_THRESHOLD * 100, 1),
             "projected_nodes": projection["nodes"],
             "projected_capacity_enabled": ENABLE_PROJECTED_CAPACITY,
-            "would_scale": cpu_utilization >= SCALE_UP_THRESHOLD or memory_utilization >= SCALE_UP_THRESHOLD or pending_pods > 0
+            "would_scale": cpu_utilization >= SCALE_UP_THRESHOLD or memory_utilization >= SCALE_UP_THRESHOLD or pending_pods > 0,
+            "pending_dispatch": await pending_dispatch.stats() if pending_dispatch else None
         }
     except Exception as e:
         logger.error(f"Failed to get cluster status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/execute", response_model=ExecuteResponse)
-async def execute(request: ExecuteRequest):
+def validate_execute_request(request: ExecuteRequest) -> bool:
     """
-    Create a Kubernetes Job to execute the provided code.
+    Reject requests that can never run: no gVisor, or limits above the cluster totals.
+    Returns whether to use the gVisor runtime.
     """
-    logger.info(f"Creating job for evaluation {request.eval_id}, code length: {len(request.code)} chars, timeout: {request.timeout}s, priority: {request.priority}")
-    
     # Check gVisor availability and requirements
     use_gvisor = check_gvisor_availability()
     
@@ -873,15 +2368,11 @@ async def execute(request: ExecuteRequest):
             "This is only acceptable for local development."
         )
     
-    # Generate job name using shared utility
-    job_name = generate_job_name(request.eval_id)
-    
-    logger.info(f"Creating job {job_name} for evaluation {request.eval_id}")
-    
     # Validate resource limits against cluster capacity
     try:
         # Get ResourceQuota to check total limits
-        quota = core_v1.read_namespaced_resource_quota(
+        quota = k8s_api.call(
+            core_v1.read_namespaced_resource_quota,
             name="evaluation-quota",
             namespace=KUBERNETES_NAMESPACE
         )
@@ -921,18 +2412,137 @@ async def execute(request: ExecuteRequest):
     except Exception as e:
         logger.error(f"Unexpected error during resource validation: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Resource validation error: {str(e)}")
-    
-    # Determine which executor image to use
-    if request.executor_image:
-        # Load available images and resolve
-        available_images = load_executor_images()
-        executor_image = resolve_executor_image(request.executor_image, available_images)
-    else:
-        # Use default and resolve it too
-        available_images = load_executor_images()
-        executor_image = resolve_executor_image(EXECUTOR_IMAGE, available_images)
-        logger.info(f"No executor specified, using default: {executor_image}")
-    
+
+    return use_gvisor
+
+
+def evaluation_pod_template(
+    request: ExecuteRequest,
+    use_gvisor: bool,
+    labels: Dict[str, str],
+    command: List[str],
+    env: List[client.V1EnvVar],
+    volumes: Optional[List[client.V1Volume]] = None,
+    volume_mounts: Optional[List[client.V1VolumeMount]] = None
+) -> client.V1PodTemplateSpec:
+    """Pod template shared by plain and Indexed evaluation Jobs."""
+    # Determine which executor image to use (default: EXECUTOR_IMAGE)
+    executor_image = executor_image_catalog.resolve(request.executor_image or EXECUTOR_IMAGE)
+    affinity = image_locality_affinity(executor_image)
+
+    return client.V1PodTemplateSpec(
+        metadata=client.V1ObjectMeta(
+            labels=labels,
+            # Read by the pod watch, which never fetches the Job
+            annotations={
+                "active-deadline-seconds": str(request.timeout + 300),
+                "backoff-limit": "0" if request.expect_failure else "2"
+            }
+        ),
+        spec=client.V1PodSpec(
+            restart_policy="Never",
+            # Use gVisor runtime for strong isolation when available
+            runtime_class_name="gvisor" if use_gvisor else None,
+            # Set priority class based on numeric priority
+            priority_class_name=get_priority_class(normalize_priority(request.priority)),
+            # Reduce grace period so timeouts are enforced quickly
+            termination_grace_period_seconds=1,
+            # Prefer nodes that already hold the image (no pull on the critical path)
+            affinity=affinity,
+            # EKS nodes have ECR permissions via IAM role, no pull secret needed
+            image_pull_secrets=None,
+            # Security context for pod
+            security_context=client.V1PodSecurityContext(
+                run_as_non_root=True,
+                run_as_user=1000,
+                fs_group=1000,
+                seccomp_profile=client.V1SeccompProfile(
+                    type="RuntimeDefault"
+                )
+            ),
+            containers=[
+                client.V1Container(
+                    name="evaluation",
+                    image=executor_image,
+                    image_pull_policy="IfNotPresent",  # Don't try to pull if image exists locally
+                    command=command,
+                    # Environment variables
+                    env=env + [client.V1EnvVar(name="PYTHONUNBUFFERED", value="1")],
+                    # Resource limits
+                    resources=client.V1ResourceRequirements(
+                        limits={
+                            "memory": request.memory_limit,
+                            "cpu": request.cpu_limit
+                        },
+                        requests={
+                            # Set requests to be min of limit or reasonable defaults
+                            # This ensures requests <= limits (Kubernetes requirement)
+                            "memory": min_resource(request.memory_limit, "128Mi", "memory"),
+                            "cpu": min_resource(request.cpu_limit, "100m", "cpu")
+                        }
+                    ),
+                    # Security context for container
+                    security_context=client.V1SecurityContext(
+                        allow_privilege_escalation=False,
+                        read_only_root_filesystem=True,
+                        run_as_non_root=True,
+                        capabilities=client.V1Capabilities(
+                            drop=["ALL"]
+                        )
+                    ),
+                    # Mount temp directory for writing
+                    volume_mounts=[
+                        client.V1VolumeMount(
+                            name="tmp",
+                            mount_path="/tmp"
+                        )
+                    ] + (volume_mounts or [])
+                )
+            ],
+            # Volumes
+            volumes=[
+                client.V1Volume(
+                    name="tmp",
+                    empty_dir=client.V1EmptyDirVolumeSource(
+                        size_limit="100Mi"
+                    )
+                )
+            ] + (volumes or [])
+        )
+    )
+
+
+def job_creation_error(job_name: str, error: Exception) -> HTTPException:
+    """
+    HTTPException for a failed Job creation.
+    ResourceQuota rejections become 429 (Too Many Requests) so Celery will retry.
+    """
+    if isinstance(error, ApiException):
+        logger.error(f"Failed to create job {job_name}: {error}")
+        if error.status == 403 and "exceeded quota" in str(error.body):
+            return HTTPException(
+                status_code=429,
+                detail="Resource quota exceeded - too many jobs. Please wait and retry."
+            )
+        return HTTPException(
+            status_code=error.status,
+            detail=f"Kubernetes API error: {error.reason}"
+        )
+
+    logger.error(f"Unexpected error creating job {job_name}: {error}")
+    return HTTPException(
+        status_code=500,
+        detail=f"Internal error: {str(error)}"
+    )
+
+
+def create_evaluation_job(request: ExecuteRequest, job_name: str, use_gvisor: bool) -> ExecuteResponse:
+    """
+    Create the Kubernetes Job for a validated request.
+    Quota rejections raise HTTPException(429).
+    """
+    logger.info(f"Creating job {job_name} for evaluation {request.eval_id}")
+
     # Create job manifest
     job = client.V1Job(
         metadata=client.V1ObjectMeta(
@@ -959,93 +2569,26 @@ async def execute(request: ExecuteRequest):
             # Evaluations that expect failure should set expect_failure=True for no retries
             backoff_limit=0 if request.expect_failure else 2,  # None means use k8s default (6)
             # Pod template
-            template=client.V1PodTemplateSpec(
-                metadata=client.V1ObjectMeta(
-                    labels={
-                        "app": "evaluation",
-                        "eval-id": request.eval_id
-                    }
-                ),
-                spec=client.V1PodSpec(
-                    restart_policy="Never",
-                    # Use gVisor runtime for strong isolation when available
-                    runtime_class_name="gvisor" if use_gvisor else None,
-                    # Set priority class based on numeric priority
-                    priority_class_name=get_priority_class(normalize_priority(request.priority)),
-                    # Reduce grace period so timeouts are enforced quickly
-                    termination_grace_period_seconds=1,
-                    # EKS nodes have ECR permissions via IAM role, no pull secret needed
-                    image_pull_secrets=None,
-                    # Security context for pod
-                    security_context=client.V1PodSecurityContext(
-                        run_as_non_root=True,
-                        run_as_user=1000,
-                        fs_group=1000,
-                        seccomp_profile=client.V1SeccompProfile(
-                            type="RuntimeDefault"
-                        )
-                    ),
-                    containers=[
-                        client.V1Container(
-                            name="evaluation",
-                            image=executor_image,
-                            image_pull_policy="IfNotPresent",  # Don't try to pull if image exists locally
-                            command=["timeout_wrapper.sh", str(request.timeout), "python", "-u", "-c", request.code],
-                            # Environment variables
-                            env=[
-                                client.V1EnvVar(name="EVAL_ID", value=request.eval_id),
-                                client.V1EnvVar(name="PYTHONUNBUFFERED", value="1")
-                            ],
-                            # Resource limits
-                            resources=client.V1ResourceRequirements(
-                                limits={
-                                    "memory": request.memory_limit,
-                                    "cpu": request.cpu_limit
-                                },
-                                requests={
-                                    # Set requests to be min of limit or reasonable defaults
-                                    # This ensures requests <= limits (Kubernetes requirement)
-                                    "memory": min_resource(request.memory_limit, "128Mi", "memory"),
-                                    "cpu": min_resource(request.cpu_limit, "100m", "cpu")
-                                }
-                            ),
-                            # Security context for container
-                            security_context=client.V1SecurityContext(
-                                allow_privilege_escalation=False,
-                                read_only_root_filesystem=True,
-                                run_as_non_root=True,
-                                capabilities=client.V1Capabilities(
-                                    drop=["ALL"]
-                                )
-                            ),
-                            # Mount temp directory for writing
-                            volume_mounts=[
-                                client.V1VolumeMount(
-                                    name="tmp",
-                                    mount_path="/tmp"
-                                )
-                            ]
-                        )
-                    ],
-                    # Volumes
-                    volumes=[
-                        client.V1Volume(
-                            name="tmp",
-                            empty_dir=client.V1EmptyDirVolumeSource(
-                                size_limit="100Mi"
-                            )
-                        )
-                    ]
-                )
+            template=evaluation_pod_template(
+                request,
+                use_gvisor,
+                labels={
+                    "app": "evaluation",
+                    "eval-id": request.eval_id
+                },
+                command=["timeout_wrapper.sh", str(request.timeout), "python", "-u", "-c", request.code],
+                env=[client.V1EnvVar(name="EVAL_ID", value=request.eval_id)]
             )
         )
     )
     
     try:
         # Create the job
-        batch_v1.create_namespaced_job(
+        k8s_api.call(
+            batch_v1.create_namespaced_job,
             namespace=KUBERNETES_NAMESPACE,
-            body=job
+            body=job,
+            priority=PRIORITY_CRITICAL
         )
         
         logger.info(
@@ -1060,27 +2603,433 @@ async def execute(request: ExecuteRequest):
             message=f"Job created successfully"
         )
         
-    except ApiException as e:
-        logger.error(f"Failed to create job {job_name}: {e}")
-        
-        # Check if this is a ResourceQuota error
-        if e.status == 403 and "exceeded quota" in str(e.body):
-            # Return 429 (Too Many Requests) for quota errors so Celery will retry
-            raise HTTPException(
-                status_code=429,
-                detail=f"Resource quota exceeded - too many jobs. Please wait and retry."
+    except Exception as e:
+        raise job_creation_error(job_name, e)
+
+
+@app.post("/execute", response_model=ExecuteResponse)
+async def execute(request: ExecuteRequest):
+    """
+    Create a Kubernetes Job to execute the provided code.
+
+    With wait_for_capacity, an evaluation that doesn't fit right now (or would
+    overtake evaluations already waiting) is parked and started by the dispatch
+    loop when capacity is released; the response then has status "queued" and
+    the job name the evaluation will run under.
+    """
+    logger.info(f"Creating job for evaluation {request.eval_id}, code length: {len(request.code)} chars, timeout: {request.timeout}s, priority: {request.priority}")
+
+    # Kubernetes calls may wait on the client-side rate limiter; keep them off the event loop
+    use_gvisor = await asyncio.to_thread(validate_execute_request, request)
+
+    if not (request.wait_for_capacity and pending_dispatch is not None):
+        return await asyncio.to_thread(create_evaluation_job, request, generate_job_name(request.eval_id), use_gvisor)
+
+    # A repeated hand-off for an evaluation that is already parked keeps its place
+    parked = await pending_dispatch.get(request.eval_id)
+    if parked:
+        return ExecuteResponse(
+            eval_id=request.eval_id,
+            job_name=parked["job_name"],
+            status="queued",
+            message="Waiting for cluster capacity"
+        )
+
+    job_name = generate_job_name(request.eval_id)
+    if await pending_dispatch.size() == 0:
+        capacity = await asyncio.to_thread(
+            compute_capacity, CapacityRequest(memory_limit=request.memory_limit, cpu_limit=request.cpu_limit)
+        )
+        if capacity.has_capacity:
+            try:
+                return await asyncio.to_thread(create_evaluation_job, request, job_name, use_gvisor)
+            except HTTPException as e:
+                if e.status_code != 429:
+                    raise
+
+    position = await pending_dispatch.add(
+        request.eval_id, job_name, request.priority, request.model_dump(exclude={"wait_for_capacity"})
+    )
+    # Capacity may have been released between the check and parking
+    wake_pending_dispatch()
+    logger.info(f"No capacity for evaluation {request.eval_id}; parked at position {position + 1}")
+    return ExecuteResponse(
+        eval_id=request.eval_id,
+        job_name=job_name,
+        status="queued",
+        message=f"Waiting for cluster capacity (position {position + 1})"
+    )
+
+
+# Indexed batch jobs
+# /execute-batch packs evaluations that share an image and resource profile
+# into one Indexed Job (completionMode: Indexed) instead of a Job each. Every
+# index's code is a key of a per-job ConfigMap mounted at /batch; the pod
+# runs /batch/{index}.py, its index coming from the completion-index
+# annotation. The Job's eval-ids annotation maps indexes back to evaluations,
+# and the ConfigMap is owned by the Job so TTL cleanup removes both.
+#
+# Packed pods (evaluations_per_pod > 1) go further for short evaluations:
+# each index runs several, one after another, through the packed runner
+# (shared/utils/packed_runner.py, shipped in the same ConfigMap), which gives
+# each its own subprocess, working directory, timeout and rlimits and frames
+# their output so it can be split per evaluation again. They share the pod's
+# sandbox, so only evaluations of one batch (one submitter) are packed.
+PACKED_RUNNER_SOURCE = Path(packed_runner.__file__).read_text()
+
+
+class ExecuteBatchRequest(BaseModel):
+    batch_id: str = Field(..., description="Batch the evaluations belong to")
+    evaluations: List[ExecuteRequest] = Field(..., min_length=1, description="Evaluations to run")
+    evaluations_per_pod: int = Field(
+        1, ge=1, le=PACKED_MAX_EVALUATIONS_PER_POD,
+        description="Run up to this many short evaluations one after another in each pod"
+    )
+    tenant: Optional[str] = Field(None, description="Submitter of the batch, recorded on packed jobs")
+
+
+class ExecuteBatchResponse(BaseModel):
+    batch_id: str
+    jobs: List[str]
+    evaluations: List[ExecuteResponse]
+
+
+def batch_profile(request: ExecuteRequest) -> Tuple:
+    """Evaluations with the same profile can run from one pod template."""
+    return (
+        executor_image_catalog.resolve(request.executor_image or EXECUTOR_IMAGE),
+        request.memory_limit,
+        request.cpu_limit,
+        request.timeout,
+        get_priority_class(normalize_priority(request.priority)),
+        request.expect_failure,
+        request.debug,
+    )
+
+
+def packable(request: ExecuteRequest) -> bool:
+    """Short enough to share a pod; debug evaluations keep theirs for inspection."""
+    return request.timeout <= PACKED_MAX_TIMEOUT_SECONDS and not request.debug
+
+
+def pack_batch(requests: List[ExecuteRequest], evaluations_per_pod: int = 1) -> List[List[ExecuteRequest]]:
+    """
+    Group requests by profile, split into Jobs of at most INDEXED_JOB_MAX_COMPLETIONS
+    pods and INDEXED_JOB_MAX_CODE_BYTES of code. Order is kept within a group.
+    With evaluations_per_pod > 1, packable requests form their own groups.
+    """
+    groups: Dict[Tuple, List[ExecuteRequest]] = {}
+    for request in requests:
+        packed = evaluations_per_pod > 1 and packable(request)
+        groups.setdefault((batch_profile(request), packed), []).append(request)
+
+    packs = []
+    for (_, packed), group in groups.items():
+        max_evaluations = INDEXED_JOB_MAX_COMPLETIONS * (evaluations_per_pod if packed else 1)
+        max_code_bytes = INDEXED_JOB_MAX_CODE_BYTES - (len(PACKED_RUNNER_SOURCE.encode("utf-8")) if packed else 0)
+        pack: List[ExecuteRequest] = []
+        code_bytes = 0
+        for request in group:
+            size = len(request.code.encode("utf-8"))
+            if pack and (len(pack) >= max_evaluations or code_bytes + size > max_code_bytes):
+                packs.append(pack)
+                pack, code_bytes = [], 0
+            pack.append(request)
+            code_bytes += size
+        packs.append(pack)
+    return packs
+
+
+def create_indexed_job(
+    requests: List[ExecuteRequest],
+    job_name: str,
+    batch_id: str,
+    use_gvisor: bool,
+    evaluations_per_pod: int = 1,
+    tenant: Optional[str] = None
+) -> List[ExecuteResponse]:
+    """
+    Create the code ConfigMap and Indexed Job for one pack of a validated batch,
+    running evaluations_per_pod of them in each pod.
+    Quota rejections raise HTTPException(429), as for a single job.
+    """
+    profile = requests[0]
+    eval_ids = [request.eval_id for request in requests]
+    per_pod = min(evaluations_per_pod, len(requests))
+    completions = math.ceil(len(requests) / per_pod)
+    parallelism = min(completions, INDEXED_JOB_MAX_PARALLELISM)
+    logger.info(
+        f"Creating indexed job {job_name} for {len(requests)} evaluations of batch {batch_id}"
+        f" ({per_pod} per pod)"
+    )
+
+    if per_pod > 1:
+        code = {f"{n // per_pod}.{n % per_pod}.py": request.code for n, request in enumerate(requests)}
+        code["runner.py"] = PACKED_RUNNER_SOURCE
+        # The runner applies each evaluation's timeout; the pod's memory limit caps each one's address space
+        command = [
+            "python", "-u", "/batch/runner.py", "/batch", "$(EVAL_INDEX)",
+            "--timeout", str(profile.timeout),
+            "--memory-bytes", str(parse_memory(profile.memory_limit) * 1024 * 1024)
+        ]
+        # Room for every evaluation of the pod to time out, plus its startup
+        pod_seconds = per_pod * (profile.timeout + packed_runner.KILL_GRACE_SECONDS) + 300
+    else:
+        code = {f"{index}.py": request.code for index, request in enumerate(requests)}
+        command = ["timeout_wrapper.sh", str(profile.timeout), "python", "-u", "/batch/$(EVAL_INDEX).py"]
+        pod_seconds = profile.timeout + 300
+
+    configmap = client.V1ConfigMap(
+        metadata=client.V1ObjectMeta(
+            name=job_name,
+            labels={"app": "evaluation-code", "created-by": "dispatcher"}
+        ),
+        data=code
+    )
+    job = client.V1Job(
+        metadata=client.V1ObjectMeta(
+            name=job_name,
+            labels={
+                "app": "evaluation",
+                "created-by": "dispatcher"
+            },
+            annotations={
+                "batch-id": batch_id,
+                "eval-ids": json.dumps(eval_ids),
+                "created-at": datetime.now(timezone.utc).isoformat(),
+                **({"evaluations-per-pod": str(per_pod)} if per_pod > 1 else {}),
+                **({"tenant": tenant} if tenant else {}),
+                **({"debug": "true"} if profile.debug else {})
+            }
+        ),
+        spec=client.V1JobSpec(
+            completion_mode="Indexed",
+            completions=completions,
+            parallelism=parallelism,
+            ttl_seconds_after_finished=DEBUG_JOB_CLEANUP_TTL if profile.debug else JOB_CLEANUP_TTL,
+            # Covers every wave of pods; each evaluation is still bounded by its own timeout
+            active_deadline_seconds=math.ceil(completions / parallelism) * pod_seconds,
+            # Retries are per index, so one failing evaluation doesn't use up the others'
+            backoff_limit_per_index=0 if profile.expect_failure else 2,
+            template=evaluation_pod_template(
+                profile,
+                use_gvisor,
+                labels={"app": "evaluation"},
+                command=command,
+                env=[
+                    client.V1EnvVar(
+                        name="EVAL_INDEX",
+                        value_from=client.V1EnvVarSource(
+                            field_ref=client.V1ObjectFieldSelector(
+                                field_path=f"metadata.annotations['{COMPLETION_INDEX_KEY}']"
+                            )
+                        )
+                    )
+                ],
+                volumes=[
+                    client.V1Volume(
+                        name="code",
+                        config_map=client.V1ConfigMapVolumeSource(name=job_name)
+                    )
+                ],
+                volume_mounts=[
+                    client.V1VolumeMount(
+                        name="code",
+                        mount_path="/batch",
+                        read_only=True
+                    )
+                ]
             )
-        
-        raise HTTPException(
-            status_code=e.status,
-            detail=f"Kubernetes API error: {e.reason}"
         )
+    )
+
+    try:
+        # Code first, so no pod waits on a missing volume
+        k8s_api.call(
+            core_v1.create_namespaced_config_map,
+            namespace=KUBERNETES_NAMESPACE,
+            body=configmap,
+            priority=PRIORITY_CRITICAL
+        )
+        try:
+            created = k8s_api.call(
+                batch_v1.create_namespaced_job,
+                namespace=KUBERNETES_NAMESPACE,
+                body=job,
+                priority=PRIORITY_CRITICAL
+            )
+        except Exception:
+            try:
+                k8s_api.call(
+                    core_v1.delete_namespaced_config_map,
+                    name=job_name,
+                    namespace=KUBERNETES_NAMESPACE,
+                    priority=PRIORITY_CRITICAL
+                )
+            except ApiException as e:
+                logger.warning(f"Could not delete ConfigMap {job_name} of uncreated job: {e.reason}")
+            raise
+
+        # Garbage-collected with the Job. The Job is already running its
+        # evaluations, so a failure here must not report them as rejected
+        try:
+            k8s_api.call(
+                core_v1.patch_namespaced_config_map,
+                name=job_name,
+                namespace=KUBERNETES_NAMESPACE,
+                body={"metadata": {"ownerReferences": [{
+                    "apiVersion": "batch/v1",
+                    "kind": "Job",
+                    "name": job_name,
+                    "uid": created.metadata.uid,
+                    "blockOwnerDeletion": False
+                }]}},
+                priority=PRIORITY_CRITICAL
+            )
+        except Exception as e:
+            logger.warning(f"Could not make job {job_name} the owner of its ConfigMap; it outlives the job: {e}")
+
+        logger.info(
+            f"Successfully created indexed job {job_name} "
+            f"({len(requests)} evaluations, parallelism {parallelism}, runtime: {'gVisor' if use_gvisor else 'standard'})"
+        )
+        if per_pod > 1:
+            return [
+                ExecuteResponse(
+                    eval_id=request.eval_id,
+                    job_name=index_unit_name(job_name, n // per_pod, n % per_pod),
+                    status="created",
+                    message=f"Slot {n % per_pod} of index {n // per_pod} of job {job_name}"
+                )
+                for n, request in enumerate(requests)
+            ]
+        return [
+            ExecuteResponse(
+                eval_id=request.eval_id,
+                job_name=index_unit_name(job_name, index),
+                status="created",
+                message=f"Index {index} of job {job_name}"
+            )
+            for index, request in enumerate(requests)
+        ]
+
     except Exception as e:
-        logger.error(f"Unexpected error creating job {job_name}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal error: {str(e)}"
+        raise job_creation_error(job_name, e)
+
+
+@app.post("/execute-batch", response_model=ExecuteBatchResponse)
+async def execute_batch(request: ExecuteBatchRequest):
+    """
+    Run a batch of evaluations, one Indexed Job per pack of evaluations sharing
+    an image and resource profile (a pack of one is a plain Job).
+
+    Each evaluation's job_name is "{job}-i{index}" ("{job}-i{index}s{slot}" in a
+    packed pod), usable with /status, /logs and the evaluation events like any
+    job name. Packs that can't be created
+    come back with status "rejected" and the reason, so the caller can resubmit
+    just those; the batch mode doesn't park evaluations, since an Indexed Job's
+    parallelism already meters its pods.
+    """
+    logger.info(f"Creating jobs for batch {request.batch_id}: {len(request.evaluations)} evaluations")
+
+    results: Dict[str, ExecuteResponse] = {}
+    jobs = []
+    for pack in pack_batch(request.evaluations, request.evaluations_per_pod):
+        try:
+            use_gvisor = await asyncio.to_thread(validate_execute_request, pack[0])
+            if len(pack) == 1:
+                created = [await asyncio.to_thread(
+                    create_evaluation_job, pack[0], generate_job_name(pack[0].eval_id), use_gvisor
+                )]
+                jobs.append(created[0].job_name)
+            else:
+                job_name = generate_job_name(request.batch_id)
+                per_pod = request.evaluations_per_pod if packable(pack[0]) else 1
+                created = await asyncio.to_thread(
+                    create_indexed_job, pack, job_name, request.batch_id, use_gvisor,
+                    evaluations_per_pod=per_pod, tenant=request.tenant
+                )
+                jobs.append(job_name)
+        except HTTPException as e:
+            logger.warning(f"Could not start {len(pack)} evaluations of batch {request.batch_id}: {e.detail}")
+            created = [
+                ExecuteResponse(eval_id=item.eval_id, job_name="", status="rejected", message=str(e.detail))
+                for item in pack
+            ]
+        results.update((response.eval_id, response) for response in created)
+
+    return ExecuteBatchResponse(
+        batch_id=request.batch_id,
+        jobs=jobs,
+        evaluations=[results[item.eval_id] for item in request.evaluations]
+    )
+
+
+async def get_index_status(job_name: str, redis_client: ResilientRedisClient) -> Dict:
+    """
+    /status for one evaluation of an Indexed Job, from the Job's completed and failed indexes.
+    A packed evaluation's own outcome is in its pod's output, read once the pod has finished.
+    """
+    owner, index = parse_index_unit(job_name)
+    slot = packed_slot(job_name)
+    try:
+        job = await asyncio.to_thread(
+            k8s_api.call,
+            batch_v1.read_namespaced_job_status,
+            name=owner,
+            namespace=KUBERNETES_NAMESPACE
         )
+    except ApiException as e:
+        if e.status == 404:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=e.status, detail=f"Kubernetes API error: {e.reason}")
+
+    entry = job_index_eval_ids(job)
+    if index >= len(entry["indexes"]) or entry["packed"] != (slot is not None) or (
+        slot is not None and slot >= len(entry["indexes"][index])
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    eval_id = entry["indexes"][index][slot or 0]
+
+    job_failed = any(
+        condition.type == "Failed" and condition.status == "True" for condition in job.status.conditions or []
+    )
+    if index in parse_indexes(job.status.completed_indexes):
+        status = "succeeded"
+    elif index in parse_indexes(job.status.failed_indexes) or job_failed:
+        status = "failed"
+    else:
+        # Per-index start isn't in the Job status; the pod watch records it
+        status = job_states.get(job_name, "pending")
+
+    completed_at = job.status.completion_time.isoformat() if job.status.completion_time else None
+    if slot is not None and status in ("succeeded", "failed"):
+        # Same single capture path as the job watcher (which owns transitions when there is one)
+        if not ENABLE_EVENT_MONITORING or is_event_leader():
+            advanced, _ = await advance_job_state(index_unit_name(owner, index), status, redis_client)
+            if advanced:
+                schedule_packed_terminal_events(owner, index, entry["indexes"][index], status, completed_at, redis_client)
+        result = packed_runner.parse_packed_output(
+            (await capture_job_logs(index_unit_name(owner, index))).get("logs", "")
+        ).get(slot)
+        status = "succeeded" if result and result["exit_code"] == 0 else "failed"
+
+    # Same single capture path as the job watcher (which owns transitions when there is one)
+    elif status in ("succeeded", "failed") and (not ENABLE_EVENT_MONITORING or is_event_leader()):
+        advanced, _ = await advance_job_state(job_name, status, redis_client)
+        if advanced:
+            schedule_terminal_event(job_name, eval_id, status, completed_at, redis_client)
+
+    return {
+        "job_name": job_name,
+        "status": status,
+        "start_time": job.status.start_time,
+        "completion_time": job.status.completion_time if status in ("succeeded", "failed") else None,
+        "completion_index": index,
+        **({"packed_slot": slot} if slot is not None else {}),
+        "indexed_job": owner,
+        "eval_id": eval_id
+    }
 
 
 @app.get("/status/{job_name}")
@@ -1088,8 +3037,13 @@ async def get_job_status(job_name: str, redis_client: ResilientRedisClient = Dep
     """
     Get the status of a Kubernetes Job.
     """
+    if parse_index_unit(job_name):
+        return await get_index_status(job_name, redis_client)
+
     try:
-        job = batch_v1.read_namespaced_job_status(
+        job = await asyncio.to_thread(
+            k8s_api.call,
+            batch_v1.read_namespaced_job_status,
             name=job_name,
             namespace=KUBERNETES_NAMESPACE
         )
@@ -1114,18 +3068,14 @@ async def get_job_status(job_name: str, redis_client: ResilientRedisClient = Dep
         eval_id = job.metadata.labels.get("eval-id")
         
         # Check if this is a state transition and publish event
-        if eval_id:
+        # (the leader's watch owns transitions when there is one)
+        if eval_id and (not ENABLE_EVENT_MONITORING or is_event_leader()):
             try:
                 # Check if we've seen this state before
-                state_key = f"job:{job_name}:last_state"
-                last_state = await redis_client.get(state_key)
-                if last_state:
-                    last_state = last_state.decode('utf-8')
+                advanced, last_state = await advance_job_state(job_name, status, redis_client)
                 
                 # If state changed, publish event
-                if status != last_state:
-                    await redis_client.setex(state_key, 300, status)  # Cache state for 5 minutes
-                    
+                if advanced:
                     if status == "running":
                         # Publish running event with all required fields
                         event_data = {
@@ -1142,52 +3092,10 @@ async def get_job_status(job_name: str, redis_client: ResilientRedisClient = Dep
                         if success:
                             logger.info(f"Published evaluation:running event for {eval_id}")
                     
-                    elif status == "succeeded":
-                        # Job succeeded in Kubernetes = evaluation succeeded
-                        # Try to get logs but don't block on it
-                        logs_result = await get_job_logs_internal(job_name)
-                        logs = logs_result.get("logs", "")
-                        log_source = logs_result.get("source", "not_available")
-                        
-                        # Always publish completed event when Kubernetes says job succeeded
-                        event_data = {
-                            "eval_id": eval_id,
-                            "output": logs,  # Empty string if logs not available
-                            "exit_code": 0,  # Kubernetes already confirmed success
-                            "metadata": {
-                                "job_name": job_name,
-                                "completed_at": job.status.completion_time.isoformat() if job.status.completion_time else datetime.now(timezone.utc).isoformat(),
-                                "log_source": log_source
-                            }
-                        }
-                        success = await redis_client.publish(
-                            "evaluation:completed",
-                            json.dumps(event_data)
-                        )
-                        if success:
-                            logger.info(f"Published evaluation:completed event for {eval_id} (logs from {log_source})")
-                    
-                    elif status == "failed":
-                        # Get job logs for the failed evaluation
-                        logs_result = await get_job_logs_internal(job_name)
-                        
-                        # Publish evaluation failed event
-                        event_data = {
-                            "eval_id": eval_id,
-                            "error": logs_result.get("logs", "Job failed"),
-                            "exit_code": logs_result.get("exit_code", 1),
-                            "metadata": {
-                                "job_name": job_name,
-                                "failed_at": job.status.completion_time.isoformat() if job.status.completion_time else datetime.now(timezone.utc).isoformat(),
-                                "log_source": logs_result.get("source", "unknown")
-                            }
-                        }
-                        success = await redis_client.publish(
-                            "evaluation:failed",
-                            json.dumps(event_data)
-                        )
-                        if success:
-                            logger.info(f"Published evaluation:failed event for {eval_id}")
+                    elif status in ("succeeded", "failed"):
+                        # Same single capture path as the job watcher
+                        completed_at = job.status.completion_time.isoformat() if job.status.completion_time else None
+                        schedule_terminal_event(job_name, eval_id, status, completed_at, redis_client)
                         
             except Exception as e:
                 logger.error(f"Failed to publish event for job {job_name}: {e}")
@@ -1206,6 +3114,10 @@ async def get_job_status(job_name: str, redis_client: ResilientRedisClient = Dep
         
     except ApiException as e:
         if e.status == 404:
+            # Parked jobs don't exist yet; report them as pending
+            eval_id = await pending_dispatch.eval_id_for_job(job_name) if pending_dispatch else None
+            if eval_id:
+                return {"job_name": job_name, "status": "pending", "queued": True, "eval_id": eval_id}
             raise HTTPException(status_code=404, detail="Job not found")
         raise HTTPException(
             status_code=e.status,
@@ -1213,92 +3125,246 @@ async def get_job_status(job_name: str, redis_client: ResilientRedisClient = Dep
         )
 
 
+def parse_loki_line(line: str) -> str:
+    """
+    Extract the log message from a Loki line shipped by Fluent Bit.
+    Lines are JSON with a "log" field holding the raw CRI line, e.g.
+    "2025-07-24T10:38:29.007631626Z stderr F Error stream test".
+    """
+    if line.startswith("{"):
+        try:
+            log_line = json.loads(line).get("log")
+        except (json.JSONDecodeError, AttributeError):
+            log_line = None
+        if log_line is None:
+            return line
+        # Strip the CRI timestamp/stream/tag prefix if present
+        parts = log_line.split(" ", 3)
+        if len(parts) >= 4 and parts[2] in ("F", "P"):
+            return parts[3].rstrip("\n")
+        return log_line.rstrip("\n")
+
+    # Not JSON - older format with the CRI tag inline
+    for tag in (" F ", " P "):
+        if tag in line:
+            return line.split(tag, 1)[1]
+    return line
+
+
+def get_loki_client() -> httpx.AsyncClient:
+    """Shared pooled HTTP client for Loki queries."""
+    global loki_client
+    if loki_client is None or loki_client.is_closed:
+        loki_client = httpx.AsyncClient(
+            base_url=LOKI_URL,
+            timeout=LOKI_QUERY_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return loki_client
+
+
+async def get_job_time_range(job_name: str) -> tuple:
+    """
+    Get (start, end, finished) bounds for a job's Loki query from the Job object.
+    Falls back to the last LOKI_LOOKBACK_HOURS if the Job is gone.
+    """
+    now = datetime.now(timezone.utc)
+    pad = timedelta(seconds=LOKI_TIME_PADDING_SECONDS)
+    unit = parse_index_unit(job_name)
+    try:
+        # An Indexed Job's evaluations are bounded by the whole Job
+        job = await asyncio.to_thread(
+            k8s_api.call,
+            batch_v1.read_namespaced_job_status,
+            name=unit[0] if unit else job_name,
+            namespace=KUBERNETES_NAMESPACE
+        )
+        started = job.status.start_time or job.metadata.creation_timestamp
+        completed = job.status.completion_time
+        if completed is None and job.status.conditions:
+            # Failed jobs have no completion_time; use the terminal condition's time
+            for condition in job.status.conditions:
+                if condition.type in ("Complete", "Failed") and condition.status == "True":
+                    completed = condition.last_transition_time
+        if started:
+            end = min(completed + pad, now) if completed else now
+            return started - pad, end, completed is not None
+    except ApiException as e:
+        if e.status != 404:
+            logger.warning(f"Could not read job {job_name} for Loki time bounds: {e.reason}")
+    except Exception as e:
+        logger.warning(f"Could not read job {job_name} for Loki time bounds: {e}")
+
+    return now - timedelta(hours=LOKI_LOOKBACK_HOURS), now, False
+
+
 async def get_logs_from_loki(job_name: str) -> Optional[str]:
     """
     Query Loki for logs from a specific job/pod.
     Returns the log content or None if not found.
+
+    The query is bounded by the Job's start/completion time, matches the
+    job-name and container labels exactly, and pages forward past the
+    per-request line limit. Results for finished jobs are cached.
     """
-    loki_url = os.getenv("LOKI_URL", "http://loki:3100")
-    
+    cached = loki_cache.get(job_name)
+    if cached is not None:
+        loki_cache.move_to_end(job_name)
+        return cached
+
+    start_time, end_time, finished = await get_job_time_range(job_name)
+    unit = parse_index_unit(job_name)
+    if unit:
+        # One index of an Indexed Job: its pods are named {job}-{index}-{suffix}
+        pod_matcher = f'kubernetes_labels_job_name="{unit[0]}",kubernetes_pod_name=~"{unit[0]}-{unit[1]}-[a-z0-9]+"'
+    else:
+        pod_matcher = f'kubernetes_labels_job_name="{job_name}"'
+    query = (
+        f'{{job="fluentbit",kubernetes_namespace_name="{KUBERNETES_NAMESPACE}",'
+        f'{pod_matcher},kubernetes_container_name="evaluation"}}'
+    )
+    start_ns = int(start_time.timestamp() * 1e9)
+    end_ns = int(end_time.timestamp() * 1e9)
+
+    all_logs = []
+    found_streams = False
+    boundary_entries = set()  # Entries at the page boundary timestamp already collected
+
     try:
-        # Query for logs from pods with this job name
-        # Using LogQL to search for logs from pods matching the job
-        query = f'{{job="fluentbit",kubernetes_namespace_name="{KUBERNETES_NAMESPACE}",kubernetes_pod_name=~"{job_name}.*"}}'
-        
-        # Time range - last hour should be enough for recent evaluations
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(hours=1)
-        
-        params = {
-            "query": query,
-            "start": int(start_time.timestamp() * 1e9),  # Nanoseconds
-            "end": int(end_time.timestamp() * 1e9),
-            "limit": 5000,  # Limit number of log lines
-            "direction": "forward"
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{loki_url}/loki/api/v1/query_range",
-                params=params
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data["status"] == "success":
-                    if not data["data"]["result"]:
-                        logger.info(f"Loki query succeeded but found no streams for {job_name}")
-                        return None  # No logs found in Loki
-                    
-                    # Log the number of streams found for debugging
-                    logger.info(f"Loki found {len(data['data']['result'])} log streams for {job_name}")
-                    
-                    # Combine all log lines from all streams
-                    all_logs = []
-                    for stream in data["data"]["result"]:
-                        for timestamp, line in stream["values"]:
-                            # Fluent Bit sends logs as JSON with a "log" field
-                            try:
-                                import json as json_module
-                                log_data = json_module.loads(line)
-                                if "log" in log_data:
-                                    # Extract the actual log message from the JSON
-                                    log_line = log_data["log"]
-                                    # Remove the timestamp and stream indicator if present
-                                    # Format: "2025-07-24T10:38:29.007631626Z stderr F Error stream test"
-                                    parts = log_line.split(" ", 3)
-                                    if len(parts) >= 4 and parts[2] in ["F", "P"]:
-                                        # Extract just the message part
-                                        all_logs.append(parts[3].rstrip("\n"))
-                                    else:
-                                        # Use the whole line if format doesn't match
-                                        all_logs.append(log_line.rstrip("\n"))
-                                else:
-                                    # If not JSON or no "log" field, use as-is
-                                    all_logs.append(line)
-                            except json_module.JSONDecodeError:
-                                # If not valid JSON, try the old format
-                                if " F " in line or " P " in line:
-                                    parts = line.split(" F " if " F " in line else " P ", 1)
-                                    if len(parts) > 1:
-                                        all_logs.append(parts[1])
-                                else:
-                                    all_logs.append(line)
-                    
-                    logger.info(f"Collected {len(all_logs)} log lines for {job_name}")
-                    # Return None if no logs found, otherwise return the logs (even if empty string)
-                    return "\n".join(all_logs) if all_logs else ""
-            else:
+        client = get_loki_client()
+        for page in range(LOKI_MAX_PAGES):
+            params = {
+                "query": query,
+                "start": start_ns,  # Nanoseconds
+                "end": end_ns,
+                "limit": LOKI_PAGE_LIMIT,
+                "direction": "forward"
+            }
+
+            query_start = time.monotonic()
+            response = await client.get("/loki/api/v1/query_range", params=params)
+            ok = response.status_code == 200
+            loki_query_metrics.record((time.monotonic() - query_start) * 1000, success=ok)
+
+            if not ok:
                 logger.warning(f"Loki query failed with status {response.status_code}: {response.text}")
-                
+                return None
+
+            data = response.json()
+            if data["status"] != "success":
+                return None
+
+            # Merge streams into one time-ordered page
+            entries = sorted(
+                (int(ts), line)
+                for stream in data["data"]["result"]
+                for ts, line in stream["values"]
+            )
+            found_streams = found_streams or bool(entries)
+
+            for entry in entries:
+                if entry not in boundary_entries:
+                    all_logs.append(parse_loki_line(entry[1]))
+
+            if len(entries) < LOKI_PAGE_LIMIT:
+                break
+
+            # Next page starts at the last timestamp (inclusive) so same-timestamp
+            # lines aren't dropped; skip the ones already collected
+            last_ts = entries[-1][0]
+            boundary_entries = {entry for entry in entries if entry[0] == last_ts}
+            start_ns = last_ts
+        else:
+            logger.warning(f"Loki logs for {job_name} truncated at {LOKI_MAX_PAGES} pages")
+
     except Exception as e:
         logger.error(f"Error querying Loki for job {job_name}: {e}")
-    
-    return None
+        return None
+
+    if not found_streams:
+        logger.info(f"Loki query succeeded but found no streams for {job_name}")
+        return None  # No logs found in Loki
+
+    logger.info(f"Collected {len(all_logs)} log lines from Loki for {job_name}")
+    logs = "\n".join(all_logs)
+
+    # Only finished jobs' logs are final
+    if finished:
+        loki_cache[job_name] = logs
+        while len(loki_cache) > LOKI_CACHE_SIZE:
+            loki_cache.popitem(last=False)
+    return logs
+
+
+@app.get("/metrics/loki")
+async def get_loki_metrics():
+    """Loki fallback query latency and cache metrics."""
+    return {
+        "queries": loki_query_metrics.snapshot(),
+        "cache_entries": len(loki_cache),
+        "cache_size": LOKI_CACHE_SIZE
+    }
+
+
+@app.get("/metrics/kubernetes-api")
+async def get_kubernetes_api_metrics():
+    """Kubernetes API call latency, client-side throttling, coalescing and server 429s."""
+    return k8s_api.snapshot()
+
+
+@app.get("/metrics/headroom")
+async def get_headroom_metrics():
+    """Placeholder target, demand forecast and the replicas last set (leader only)."""
+    return {
+        "enabled": ENABLE_HEADROOM,
+        "leader": is_event_leader(),
+        "deployment": HEADROOM_DEPLOYMENT,
+        **headroom_state,
+        **headroom_controller.snapshot(),
+    }
+
+
+@app.get("/metrics/image-locality")
+async def get_image_locality_metrics():
+    """Node image inventory, pre-pulls and scheduled-to-start wait by image cache hit."""
+    catalog_images = sorted({executor_image_catalog.resolved[name] for name in executor_image_catalog.images})
+    return {
+        "nodes": len(node_image_inventory.nodes),
+        "catalog_images": {
+            image: node_image_inventory.nodes_with(image) for image in catalog_images
+        },
+        "prewarm_enabled": ENABLE_IMAGE_PREWARM,
+        "prewarm": {**prewarm_stats, "tracked": len(prewarm_attempts)},
+        "pull_wait": {bucket: tracker.snapshot() for bucket, tracker in image_pull_wait_metrics.items()},
+    }
+
+
+@app.get("/metrics/job-watch")
+async def get_job_watch_metrics():
+    """Job and pod watch throughput, reconnect and relist costs."""
+    stats = dict(job_watch_stats)
+    started_at = stats.pop("started_at")
+    processed = stats["events_processed"]
+    lanes = getattr(app.state, "job_event_lanes", [])
+    return {
+        **stats,
+        "uptime_seconds": round(time.time() - started_at, 1),
+        "processing_seconds": round(stats["processing_seconds"], 3),
+        "mean_event_ms": round(stats["processing_seconds"] * 1000 / processed, 3) if processed else None,
+        "pod_watch_enabled": ENABLE_POD_WATCH,
+        "leader": {
+            "identity": leader_elector.identity,
+            "is_leader": leader_elector.is_leader,
+            "terms": leader_elector.terms,
+        } if leader_elector else None,
+        "tracked_jobs": len(job_states),
+        "tracked_pods": len(job_pods),
+        "lane_backlog": sum(lane.qsize() for lane in lanes),
+    }
 
 
 @app.get("/logs/{job_name}")
-async def get_job_logs_internal(job_name: str, tail_lines: int = 100):
+async def get_job_logs_internal(job_name: str, tail_lines: Optional[int] = 100):
     """
     Internal function to get logs from a job's pod.
     Returns a dict with logs and exit code.
@@ -1310,11 +3376,40 @@ async def get_job_logs_internal(job_name: str, tail_lines: int = 100):
     Only use this exit_code when you have actual pod container status.
     For job success/failure, trust the Kubernetes Job status instead.
     """
+    # A finished job's logs are captured once; serve that instead of refetching
+    if job_name in captured_logs:
+        return captured_logs[job_name]
+
+    if packed_slot(job_name) is not None:
+        return await get_packed_slot_logs(job_name, tail_lines)
+
     try:
-        # Find pods for this job
-        pods = core_v1.list_namespaced_pod(
+        known_pod = job_pods.get(job_name, {})
+        if known_pod.get("pod_name"):
+            # The pod watch already knows the pod and its exit code; skip the list call
+            pod_name = known_pod["pod_name"]
+            log_kwargs = {"tail_lines": tail_lines} if tail_lines else {}
+            logs = await asyncio.to_thread(
+                k8s_api.call,
+                core_v1.read_namespaced_pod_log,
+                name=pod_name,
+                namespace=KUBERNETES_NAMESPACE,
+                **log_kwargs
+            )
+            return {
+                "job_name": job_name,
+                "pod_name": pod_name,
+                "logs": logs,
+                "exit_code": known_pod.get("exit_code") or 0,
+                "source": "kubernetes"
+            }
+
+        # Find pods for this job (off the event loop)
+        pods = await asyncio.to_thread(
+            k8s_api.call,
+            core_v1.list_namespaced_pod,
             namespace=KUBERNETES_NAMESPACE,
-            label_selector=f"job-name={job_name}"
+            label_selector=pod_selector(job_name)
         )
         
         if not pods.items:
@@ -1335,11 +3430,14 @@ async def get_job_logs_internal(job_name: str, tail_lines: int = 100):
         pod = pods.items[0]
         pod_name = pod.metadata.name
         
-        # Get logs
-        logs = core_v1.read_namespaced_pod_log(
+        # Get logs (tail_lines=None reads the full log)
+        log_kwargs = {"tail_lines": tail_lines} if tail_lines else {}
+        logs = await asyncio.to_thread(
+            k8s_api.call,
+            core_v1.read_namespaced_pod_log,
             name=pod_name,
             namespace=KUBERNETES_NAMESPACE,
-            tail_lines=tail_lines
+            **log_kwargs
         )
         
         # Try to get exit code from container status
@@ -1374,6 +3472,24 @@ async def get_job_logs_internal(job_name: str, tail_lines: int = 100):
         return {"logs": f"Failed to get logs: {str(e)}", "exit_code": 1}
 
 
+async def get_packed_slot_logs(job_name: str, tail_lines: Optional[int]) -> Dict:
+    """One evaluation's output, split out of its packed pod's framed log."""
+    owner, index = parse_index_unit(job_name)
+    # Frames only parse from the start of the log, which has the runner's nonce
+    pod_logs = await get_job_logs_internal(index_unit_name(owner, index), tail_lines=None)
+    result = packed_runner.parse_packed_output(pod_logs.get("logs", "")).get(packed_slot(job_name))
+    logs = result["stdout"] + result["stderr"] if result else ""
+    if tail_lines:
+        logs = "\n".join(logs.splitlines()[-tail_lines:])
+    return {
+        "job_name": job_name,
+        "pod_name": pod_logs.get("pod_name"),
+        "logs": logs,
+        "exit_code": result["exit_code"] if result and result["exit_code"] is not None else pod_logs.get("exit_code", 1),
+        "source": pod_logs.get("source")
+    }
+
+
 @app.get("/logs/{job_name}")
 async def get_job_logs(job_name: str, tail_lines: int = 100):
     """
@@ -1392,20 +3508,34 @@ async def delete_job(job_name: str, redis_client: ResilientRedisClient = Depends
     """
     Delete a Kubernetes Job and its pods.
     """
+    unit = parse_index_unit(job_name)
+    if unit:
+        # Deleting an index's pod only retries it; the Job is the unit of cancellation
+        raise HTTPException(
+            status_code=409,
+            detail=f"Evaluation runs as index {unit[1]} of job {unit[0]}; delete that job to cancel its evaluations"
+        )
+
     try:
         # First, get the job to extract eval_id from labels
-        job = batch_v1.read_namespaced_job(
+        job = await asyncio.to_thread(
+            k8s_api.call,
+            batch_v1.read_namespaced_job,
             name=job_name,
-            namespace=KUBERNETES_NAMESPACE
+            namespace=KUBERNETES_NAMESPACE,
+            priority=PRIORITY_CRITICAL
         )
         
         eval_id = job.metadata.labels.get("eval-id")
         
         # Delete the job (this also deletes pods)
-        batch_v1.delete_namespaced_job(
+        await asyncio.to_thread(
+            k8s_api.call,
+            batch_v1.delete_namespaced_job,
             name=job_name,
             namespace=KUBERNETES_NAMESPACE,
-            propagation_policy="Foreground"
+            propagation_policy="Foreground",
+            priority=PRIORITY_CRITICAL
         )
         
         # Emit cancellation event if we have an eval_id
@@ -1439,6 +3569,28 @@ async def delete_job(job_name: str, redis_client: ResilientRedisClient = Depends
         )
 
 
+@app.delete("/pending/{eval_id}")
+async def cancel_pending_evaluation(eval_id: str, redis_client: ResilientRedisClient = Depends(get_redis_client)):
+    """
+    Remove an evaluation that is still waiting for capacity, so it never starts.
+    """
+    entry = await pending_dispatch.get(eval_id) if pending_dispatch else None
+    if not entry or not await pending_dispatch.remove(eval_id):
+        raise HTTPException(status_code=404, detail="Evaluation not waiting for capacity")
+
+    await redis_client.publish(
+        "evaluation:cancelled",
+        json.dumps({
+            "eval_id": eval_id,
+            "job_name": entry["job_name"],
+            "cancelled_at": datetime.now(timezone.utc).isoformat(),
+            "reason": "Cancelled while waiting for capacity"
+        })
+    )
+    logger.info(f"Removed parked evaluation {eval_id}")
+    return {"eval_id": eval_id, "job_name": entry["job_name"], "status": "cancelled"}
+
+
 @app.get("/health")
 async def health():
     """
@@ -1446,7 +3598,9 @@ async def health():
     """
     try:
         # Try to list namespaces to verify K8s connection
-        core_v1.read_namespace(name=KUBERNETES_NAMESPACE)
+        await asyncio.to_thread(
+            k8s_api.call, core_v1.read_namespace, name=KUBERNETES_NAMESPACE, priority=PRIORITY_LOW
+        )
         return {"status": "healthy", "namespace": KUBERNETES_NAMESPACE}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
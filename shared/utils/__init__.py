@@ -10,6 +10,11 @@ def generate_evaluation_id() -> str:
     return f"{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
 
 
+def generate_batch_id() -> str:
+    """Generate a unique batch ID with format: batch_YYYYMMDD_HHMMSS_<hex>"""
+    return f"batch_{generate_evaluation_id()}"
+
+
 def is_valid_evaluation_id(eval_id: str) -> bool:
     """Check if a string matches the evaluation ID format"""
     # Pattern: YYYYMMDD_HHMMSS_[8 hex chars]
@@ -0,0 +1,202 @@
+"""
+Admission control state in Redis.
+
+The gateway admits a submission only if the client has rate-limit tokens
+left and fewer than the allowed number of unfinished evaluations; the
+storage worker releases the client's slot once the evaluation reaches a
+terminal status and counts it toward the drain rate used for Retry-After.
+
+Limits are read from shared/constants/limits.yaml (0 disables a limit):
+    api.rate_limit_per_minute        token bucket per client (API key or IP)
+    queue.max_queue_size             Celery backlog at which submissions are refused
+    queue.max_evaluations_per_user   unfinished evaluations per client
+
+Keys:
+    ratelimit:{client}           hash: tokens, updated_at
+    client:{client}:active       zset: eval_id -> admitted_at
+    eval:{id}:client             string: client, so the slot can be released
+    admission:drained:{second}   counter: evaluations finished in that second
+"""
+
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LIMITS_FILE = Path(__file__).resolve().parent.parent / "constants" / "limits.yaml"
+
+
+def _load_limits() -> Dict[str, Any]:
+    try:
+        import yaml
+
+        with open(LIMITS_FILE) as f:
+            return yaml.safe_load(f) or {}
+    except (ImportError, OSError) as e:
+        logger.warning(f"Could not load {LIMITS_FILE}, using built-in admission limits: {e}")
+        return {}
+
+
+_limits = _load_limits()
+RATE_LIMIT_PER_MINUTE = int(
+    os.getenv("RATE_LIMIT_PER_MINUTE", _limits.get("api", {}).get("rate_limit_per_minute", 60))
+)
+MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", _limits.get("queue", {}).get("max_queue_size", 1000)))
+MAX_EVALUATIONS_PER_USER = int(
+    os.getenv("MAX_EVALUATIONS_PER_USER", _limits.get("queue", {}).get("max_evaluations_per_user", 10))
+)
+
+# Slots held longer than this are assumed lost (the terminal event never came)
+ACTIVE_SLOT_TTL_SECONDS = int(os.getenv("ACTIVE_SLOT_TTL_SECONDS", "3600"))
+# Drain rate is averaged over this many seconds of finished evaluations
+DRAIN_WINDOW_SECONDS = 60
+DEFAULT_RETRY_AFTER_SECONDS = 5  # When nothing has finished recently
+MAX_RETRY_AFTER_SECONDS = 300
+
+# Outcomes of ADMIT_SCRIPT
+ADMITTED = 0
+RATE_LIMITED = 1
+TOO_MANY_ACTIVE = 2
+
+# Reserve a concurrency slot for every eval_id, then take one token per
+# evaluation (one for a submission without eval_ids); a refusal spends nothing.
+# A submission needs a whole token to start, and whatever it costs beyond the
+# tokens on hand is borrowed: the bucket goes negative and refuses everything
+# until refill repays it, so a batch bigger than the bucket still averages out
+# to the per-minute rate.
+# KEYS: bucket hash, active zset, then one eval client key per eval_id
+# ARGV: capacity, tokens per second, max active (0 = unlimited), client,
+#       slot ttl, then the eval_ids
+# Returns {outcome, detail}: seconds until the next token, or the active count
+ADMIT_SCRIPT = """
+local time = redis.call('time')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local max_active = tonumber(ARGV[3])
+local slot_ttl = tonumber(ARGV[5])
+local count = #ARGV - 5
+if max_active > 0 and count > 0 then
+    redis.call('zremrangebyscore', KEYS[2], '-inf', now - slot_ttl)
+    local active = redis.call('zcard', KEYS[2])
+    if active + count > max_active then
+        return {2, tostring(active)}
+    end
+end
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+if capacity > 0 then
+    local bucket = redis.call('hmget', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    if tokens < 1 then
+        return {1, tostring((1 - tokens) / rate)}
+    end
+    tokens = tokens - math.max(1, count)
+    redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    -- Kept until refill would bring it back to full
+    redis.call('expire', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+end
+for i = 1, count do
+    redis.call('zadd', KEYS[2], now, ARGV[5 + i])
+    redis.call('set', KEYS[2 + i], ARGV[4], 'EX', slot_ttl)
+end
+if count > 0 then
+    redis.call('expire', KEYS[2], slot_ttl)
+end
+return {0, '0'}
+"""
+
+
+def rate_limit_key(client: str) -> str:
+    return f"ratelimit:{client}"
+
+
+def client_active_key(client: str) -> str:
+    return f"client:{client}:active"
+
+
+def eval_client_key(eval_id: str) -> str:
+    return f"eval:{eval_id}:client"
+
+
+def drained_key(second: int) -> str:
+    return f"admission:drained:{second}"
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+async def admit(
+    redis_client,
+    client: str,
+    eval_ids: Sequence[str] = (),
+    rate_limit_per_minute: int = RATE_LIMIT_PER_MINUTE,
+    max_active: int = MAX_EVALUATIONS_PER_USER,
+) -> Tuple[int, float]:
+    """
+    Try to admit a submission of eval_ids for a client.
+
+    Each evaluation costs a token and takes one of the client's concurrency
+    slots until release_evaluation frees it; either all of them fit or the
+    submission is refused. Without eval_ids the submission costs one token.
+
+    Returns:
+        (ADMITTED, 0), (RATE_LIMITED, seconds until a token) or
+        (TOO_MANY_ACTIVE, number of unfinished evaluations)
+    """
+    outcome, detail = await redis_client.eval(
+        ADMIT_SCRIPT,
+        2 + len(eval_ids),
+        rate_limit_key(client),
+        client_active_key(client),
+        *(eval_client_key(eval_id) for eval_id in eval_ids),
+        rate_limit_per_minute,
+        rate_limit_per_minute / 60.0,
+        max_active,
+        client,
+        ACTIVE_SLOT_TTL_SECONDS,
+        *eval_ids,
+    )
+    return int(outcome), float(_text(detail))
+
+
+async def release_evaluation(redis_client, eval_id: str, drained: bool = True) -> bool:
+    """
+    Free the client slot held by an evaluation (idempotent).
+
+    drained counts the evaluation as finished for the drain rate; pass
+    False when a submission is abandoned before reaching the queue.
+    Returns True if a slot was freed.
+    """
+    client = _text(await redis_client.get(eval_client_key(eval_id)))
+    pipe = redis_client.pipeline(transaction=False)
+    if client:
+        pipe.zrem(client_active_key(client), eval_id)
+        pipe.delete(eval_client_key(eval_id))
+    if drained:
+        key = drained_key(int(time.time()))
+        pipe.incr(key)
+        pipe.expire(key, DRAIN_WINDOW_SECONDS * 2)
+    await pipe.execute()
+    return bool(client)
+
+
+async def get_drain_rate(redis_client, window: int = DRAIN_WINDOW_SECONDS) -> float:
+    """Evaluations finished per second over the last window seconds."""
+    now = int(time.time())
+    counts = await redis_client.mget([drained_key(second) for second in range(now - window, now)])
+    return sum(int(count) for count in counts if count) / window
+
+
+def retry_after_seconds(backlog: float, drain_rate: float) -> int:
+    """Seconds until backlog evaluations have drained at drain_rate."""
+    if drain_rate <= 0:
+        return DEFAULT_RETRY_AFTER_SECONDS
+    return max(1, min(MAX_RETRY_AFTER_SECONDS, math.ceil(backlog / drain_rate)))
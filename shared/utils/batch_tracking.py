@@ -0,0 +1,169 @@
+"""
+Batch progress tracking in Redis.
+
+The gateway creates a batch when it accepts /api/eval-batch; the storage
+worker records each member's status transitions after persisting them, so
+progress is always a single HGETALL regardless of batch size.
+
+Keys (all expire BATCH_TTL_SECONDS after the last write):
+    batch:{id}           hash: total, created_at and one counter per bucket
+    batch:{id}:states    hash: eval_id -> bucket last counted for it
+    batch:{id}:results   list: JSON {eval_id, status, finished_at} in finish order
+    eval:{id}:batch      string: batch_id, so transition handlers can find the batch
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+BATCH_TTL_SECONDS = int(os.getenv("BATCH_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Progress buckets; pre-execution states all count as queued
+BUCKETS = ("queued", "running", "completed", "failed", "cancelled")
+TERMINAL_BUCKETS = ("completed", "failed", "cancelled")
+STATUS_BUCKETS = {
+    "submitted": "queued",
+    "queued": "queued",
+    "provisioning": "queued",
+    "running": "running",
+    "completed": "completed",
+    "failed": "failed",
+    "timeout": "failed",
+    "cancelled": "cancelled",
+}
+
+# Move one member between buckets atomically. Repeated and out-of-order
+# events are no-ops: a member already in a terminal bucket never moves again.
+# KEYS: batch hash, states hash, results list
+# ARGV: eval_id, bucket, result JSON (terminal buckets only), ttl
+RECORD_TRANSITION_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return -1
+end
+local previous = redis.call('hget', KEYS[2], ARGV[1])
+if previous == ARGV[2] or previous == 'completed' or previous == 'failed' or previous == 'cancelled' then
+    return 0
+end
+if previous then
+    redis.call('hincrby', KEYS[1], previous, -1)
+end
+redis.call('hincrby', KEYS[1], ARGV[2], 1)
+redis.call('hset', KEYS[2], ARGV[1], ARGV[2])
+if ARGV[3] ~= '' then
+    redis.call('rpush', KEYS[3], ARGV[3])
+end
+for i = 1, 3 do
+    redis.call('expire', KEYS[i], ARGV[4])
+end
+return 1
+"""
+
+
+def batch_key(batch_id: str) -> str:
+    return f"batch:{batch_id}"
+
+
+def batch_states_key(batch_id: str) -> str:
+    return f"batch:{batch_id}:states"
+
+
+def batch_results_key(batch_id: str) -> str:
+    return f"batch:{batch_id}:results"
+
+
+def eval_batch_key(eval_id: str) -> str:
+    return f"eval:{eval_id}:batch"
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+async def create_batch(redis_client, batch_id: str, eval_ids: List[str]):
+    """Register a batch and its members, all counted as queued, in one pipeline."""
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.hset(
+        batch_key(batch_id),
+        mapping={
+            "total": len(eval_ids),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **{bucket: 0 for bucket in BUCKETS},
+            "queued": len(eval_ids),
+        },
+    )
+    if eval_ids:
+        pipe.hset(batch_states_key(batch_id), mapping={eval_id: "queued" for eval_id in eval_ids})
+    for eval_id in eval_ids:
+        pipe.set(eval_batch_key(eval_id), batch_id, ex=BATCH_TTL_SECONDS)
+    pipe.expire(batch_key(batch_id), BATCH_TTL_SECONDS)
+    pipe.expire(batch_states_key(batch_id), BATCH_TTL_SECONDS)
+    await pipe.execute()
+
+
+async def get_batch_id(redis_client, eval_id: str) -> Optional[str]:
+    """Batch the evaluation belongs to, if any."""
+    return _text(await redis_client.get(eval_batch_key(eval_id)))
+
+
+async def record_transition(
+    redis_client, batch_id: str, eval_id: str, status: str
+) -> bool:
+    """
+    Count an evaluation's move to a new status in its batch.
+    Returns True if the counters changed.
+    """
+    bucket = STATUS_BUCKETS.get(status)
+    if bucket is None:
+        return False
+
+    result = ""
+    if bucket in TERMINAL_BUCKETS:
+        result = json.dumps({
+            "eval_id": eval_id,
+            "status": status,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    changed = await redis_client.eval(
+        RECORD_TRANSITION_SCRIPT,
+        3,
+        batch_key(batch_id),
+        batch_states_key(batch_id),
+        batch_results_key(batch_id),
+        eval_id,
+        bucket,
+        result,
+        BATCH_TTL_SECONDS,
+    )
+    return changed == 1
+
+
+async def get_batch_progress(redis_client, batch_id: str) -> Optional[Dict[str, Any]]:
+    """Current counters for a batch, or None if it doesn't exist (or expired)."""
+    raw = await redis_client.hgetall(batch_key(batch_id))
+    if not raw:
+        return None
+    data = {_text(key): _text(value) for key, value in raw.items()}
+
+    progress: Dict[str, Any] = {
+        "batch_id": batch_id,
+        "total": int(data.get("total", 0)),
+        "created_at": data.get("created_at"),
+    }
+    for bucket in BUCKETS:
+        progress[bucket] = int(data.get(bucket, 0))
+    progress["finished"] = sum(progress[bucket] for bucket in TERMINAL_BUCKETS)
+    progress["done"] = progress["finished"] >= progress["total"]
+    return progress
+
+
+async def get_batch_results(
+    redis_client, batch_id: str, offset: int = 0, limit: int = -1
+) -> List[Dict[str, Any]]:
+    """Finished members in the order they finished, starting at offset."""
+    end = -1 if limit < 0 else offset + limit - 1
+    entries = await redis_client.lrange(batch_results_key(batch_id), offset, end)
+    return [json.loads(_text(entry)) for entry in entries]
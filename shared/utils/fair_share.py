@@ -0,0 +1,404 @@
+"""
+Weighted fair-share scheduling between the gateway and Celery.
+
+With one Celery queue per priority, a tenant that submits a large batch
+fills its queue ahead of everyone else's later work, and low_priority
+work waits behind all of it. With fair share enabled the gateway parks
+each evaluation in a virtual queue for its (tenant, Celery queue) pair,
+and a single pump moves work into Celery only as fast as Celery drains,
+picking the next evaluations by deficit round robin (DRR):
+
+- a virtual queue's weight is its tenant's weight times its Celery
+  queue's weight
+- on its turn a virtual queue's deficit grows by its weight, and it
+  dispatches one evaluation per whole unit of deficit
+- the weight grows linearly with the age of the queue's oldest evaluation,
+  adding its base weight again every FAIR_SHARE_AGEING_SECONDS, so nothing
+  waits forever
+
+Keys:
+    fairshare:vq:{tenant}|{queue}   list: eval_ids in arrival order
+    fairshare:task:{eval_id}        string: JSON {vqueue, enqueued_at, submission}
+    fairshare:active                set: virtual queues that may hold work
+    fairshare:deficits              hash: virtual queue -> deficit carried between calls
+    fairshare:cursor                string: virtual queue whose turn comes next
+    fairshare:size                  counter: evaluations parked in all virtual queues
+    fairshare:inflight              list: eval_ids taken by the pump but not yet published
+    fairshare:pump                  string: owner of the pump lease
+
+Taken evaluations stay in fairshare:inflight until the pump completes or
+requeues them, so a pump that dies in between loses nothing: the next
+lease holder recovers them onto the head of their virtual queues.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .priority_mapping import get_celery_queue
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "name=weight,name=weight" into a dict."""
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = item.rpartition("=")
+        weights[name] = float(weight)
+    return weights
+
+
+FAIR_SHARE_QUEUE_WEIGHTS = parse_weights(
+    os.getenv("FAIR_SHARE_QUEUE_WEIGHTS", "high_priority=4,evaluation=2,low_priority=1,batch=1")
+)
+# Tenants not listed weigh 1; tenants are admission client keys (key:<hash> or ip:<addr>)
+FAIR_SHARE_TENANT_WEIGHTS = parse_weights(os.getenv("FAIR_SHARE_TENANT_WEIGHTS", ""))
+FAIR_SHARE_AGEING_SECONDS = float(os.getenv("FAIR_SHARE_AGEING_SECONDS", "60"))
+# Parked evaluations are dropped if never dispatched within this time
+FAIR_SHARE_TASK_TTL_SECONDS = 24 * 3600
+MIN_WEIGHT = 0.01
+
+ACTIVE_KEY = "fairshare:active"
+DEFICITS_KEY = "fairshare:deficits"
+CURSOR_KEY = "fairshare:cursor"
+SIZE_KEY = "fairshare:size"
+INFLIGHT_KEY = "fairshare:inflight"
+PUMP_LEASE_KEY = "fairshare:pump"
+
+# Drop a virtual queue from the active set only if it is still empty
+DEACTIVATE_SCRIPT = """
+if redis.call('llen', KEYS[1]) == 0 then
+    return redis.call('srem', KEYS[2], ARGV[1])
+end
+return 0
+"""
+
+# Move up to ARGV[i] eval_ids from the head of each virtual queue onto the
+# in-flight list and uncount them; returns the ids moved, per virtual queue
+# KEYS: in-flight list, size counter, then the virtual queues
+TAKE_SCRIPT = """
+local moved = {}
+local total = 0
+for i = 3, #KEYS do
+    local taken = {}
+    for _ = 1, tonumber(ARGV[i - 2]) do
+        local eval_id = redis.call('lmove', KEYS[i], KEYS[1], 'LEFT', 'RIGHT')
+        if not eval_id then
+            break
+        end
+        taken[#taken + 1] = eval_id
+    end
+    total = total + #taken
+    moved[#moved + 1] = taken
+end
+if total > 0 then
+    redis.call('decrby', KEYS[2], total)
+end
+return moved
+"""
+
+# Take or renew the pump lease if free or already ours
+LEASE_SCRIPT = """
+local owner = redis.call('get', KEYS[1])
+if owner == false or owner == ARGV[1] then
+    redis.call('set', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def virtual_queue_key(vqueue: str) -> str:
+    return f"fairshare:vq:{vqueue}"
+
+
+def task_key(eval_id: str) -> str:
+    return f"fairshare:task:{eval_id}"
+
+
+def virtual_queue_name(tenant: str, priority: int) -> str:
+    return f"{tenant}|{get_celery_queue(priority)}"
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+@dataclass
+class VirtualQueue:
+    name: str
+    weight: float
+    length: int
+    head_enqueued_at: Optional[float] = None
+
+
+def effective_weight(queue: VirtualQueue, now: float, ageing_seconds: float = FAIR_SHARE_AGEING_SECONDS) -> float:
+    """Weight boosted by how long the queue's oldest evaluation has waited."""
+    age = max(0.0, now - queue.head_enqueued_at) if queue.head_enqueued_at is not None else 0.0
+    return max(MIN_WEIGHT, queue.weight) * (1 + age / ageing_seconds)
+
+
+def plan_dispatch(
+    queues: List[VirtualQueue],
+    deficits: Dict[str, float],
+    budget: int,
+    now: float,
+    cursor: Optional[str] = None,
+    ageing_seconds: float = FAIR_SHARE_AGEING_SECONDS,
+) -> Tuple[List[str], Dict[str, float], Optional[str]]:
+    """
+    Choose up to budget evaluations by deficit round robin.
+
+    A turn that runs out of budget resumes on the next call without being
+    credited again, so small budgets still honour the weights.
+
+    Returns:
+        (virtual queue per dispatched evaluation, in order; deficits of
+        queues that still hold work; virtual queue whose turn comes next)
+    """
+    order = sorted(queue.name for queue in queues if queue.length > 0)
+    if not order or budget <= 0:
+        return [], {name: deficits.get(name, 0.0) for name in order}, cursor
+    # Start at the cursor (or the first queue after it, if it emptied)
+    start = next((index for index, name in enumerate(order) if cursor is not None and name >= cursor), 0)
+    order = order[start:] + order[:start]
+
+    by_name = {queue.name: queue for queue in queues}
+    weights = {name: effective_weight(by_name[name], now, ageing_seconds) for name in order}
+    remaining = {name: by_name[name].length for name in order}
+    deficit = {name: deficits.get(name, 0.0) for name in order}
+    picks: List[str] = []
+
+    index = 0
+    while budget > 0 and order:
+        name = order[index]
+        if deficit[name] < 1:
+            deficit[name] += weights[name]
+        take = min(int(deficit[name]), remaining[name], budget)
+        picks.extend([name] * take)
+        deficit[name] -= take
+        remaining[name] -= take
+        budget -= take
+
+        if remaining[name] == 0:
+            # Empty queues don't bank credit
+            del deficit[name]
+            order.pop(index)
+            if order:
+                index %= len(order)
+        elif budget == 0 and deficit[name] >= 1:
+            break  # Turn interrupted by the budget; resume it next call
+        else:
+            index = (index + 1) % len(order)
+
+    next_cursor = order[index] if order else None
+    return picks, deficit, next_cursor
+
+
+class FairShareQueue:
+    """Redis-backed virtual queues feeding Celery in fair-share order."""
+
+    def __init__(
+        self,
+        redis_client,
+        queue_weights: Optional[Dict[str, float]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        ageing_seconds: float = FAIR_SHARE_AGEING_SECONDS,
+    ):
+        self.redis = redis_client
+        self.queue_weights = FAIR_SHARE_QUEUE_WEIGHTS if queue_weights is None else queue_weights
+        self.tenant_weights = FAIR_SHARE_TENANT_WEIGHTS if tenant_weights is None else tenant_weights
+        self.ageing_seconds = ageing_seconds
+
+    def weight(self, vqueue: str) -> float:
+        tenant, _, queue = vqueue.rpartition("|")
+        return self.tenant_weights.get(tenant, 1.0) * self.queue_weights.get(queue, 1.0)
+
+    async def enqueue(self, tenant: str, submissions: List[Dict[str, Any]]):
+        """Park submissions (submit_evaluation_to_celery kwargs) in their tenant's virtual queues."""
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=True)
+        for submission in submissions:
+            vqueue = virtual_queue_name(tenant, submission.get("priority", 0))
+            pipe.set(
+                task_key(submission["eval_id"]),
+                json.dumps({"vqueue": vqueue, "enqueued_at": now, "submission": submission}),
+                ex=FAIR_SHARE_TASK_TTL_SECONDS,
+            )
+            pipe.rpush(virtual_queue_key(vqueue), submission["eval_id"])
+            pipe.sadd(ACTIVE_KEY, vqueue)
+        pipe.incrby(SIZE_KEY, len(submissions))
+        await pipe.execute()
+
+    async def size(self) -> int:
+        return int(_text(await self.redis.get(SIZE_KEY)) or 0)
+
+    async def cancel(self, eval_id: str) -> bool:
+        """Remove a parked evaluation; False if it was already dispatched (or unknown)."""
+        raw = await self.redis.get(task_key(eval_id))
+        if not raw:
+            return False
+        vqueue = json.loads(_text(raw))["vqueue"]
+        if not await self.redis.lrem(virtual_queue_key(vqueue), 1, eval_id):
+            return False
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(task_key(eval_id))
+        pipe.decr(SIZE_KEY)
+        await pipe.execute()
+        return True
+
+    async def _virtual_queues(self) -> List[VirtualQueue]:
+        names = sorted(_text(name) for name in await self.redis.smembers(ACTIVE_KEY))
+        if not names:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for name in names:
+            pipe.llen(virtual_queue_key(name))
+            pipe.lindex(virtual_queue_key(name), 0)
+        results = await pipe.execute()
+
+        lengths = dict(zip(names, results[0::2]))
+        heads = {name: _text(head) for name, head in zip(names, results[1::2]) if head}
+        for name in names:
+            if not lengths[name]:
+                await self.redis.eval(DEACTIVATE_SCRIPT, 2, virtual_queue_key(name), ACTIVE_KEY, name)
+
+        head_tasks = await self.redis.mget([task_key(eval_id) for eval_id in heads.values()]) if heads else []
+        enqueued_at = {}
+        for name, raw in zip(heads, head_tasks):
+            if raw:
+                enqueued_at[name] = json.loads(_text(raw))["enqueued_at"]
+        return [
+            VirtualQueue(name, self.weight(name), lengths[name], enqueued_at.get(name))
+            for name in names
+            if lengths[name]
+        ]
+
+    async def take(self, budget: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Move up to budget parked evaluations, in fair-share order, in flight.
+
+        Returns task entries ({vqueue, enqueued_at, submission}), which must
+        be passed to complete() once published or requeue() if publishing
+        failed, and the ids of taken evaluations whose task entry has
+        expired and can't be published. Only one caller at a time (the
+        pump lease holder) should take.
+        """
+        queues = await self._virtual_queues()
+        if not queues or budget <= 0:
+            return [], []
+        raw_deficits = await self.redis.hgetall(DEFICITS_KEY)
+        deficits = {_text(name): float(_text(value)) for name, value in raw_deficits.items()}
+        cursor = _text(await self.redis.get(CURSOR_KEY))
+
+        picks, deficits, cursor = plan_dispatch(
+            queues, deficits, budget, time.time(), cursor, self.ageing_seconds
+        )
+        counts: Dict[str, int] = {}
+        for name in picks:
+            counts[name] = counts.get(name, 0) + 1
+
+        moved_lists = await self.redis.eval(
+            TAKE_SCRIPT,
+            2 + len(counts),
+            INFLIGHT_KEY,
+            SIZE_KEY,
+            *(virtual_queue_key(name) for name in counts),
+            *counts.values(),
+        ) if counts else []
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(DEFICITS_KEY)
+        if deficits:
+            pipe.hset(DEFICITS_KEY, mapping={name: str(value) for name, value in deficits.items()})
+        if cursor:
+            pipe.set(CURSOR_KEY, cursor)
+        await pipe.execute()
+        popped = {
+            name: [_text(eval_id) for eval_id in (eval_ids or [])]
+            for name, eval_ids in zip(counts, moved_lists)
+        }
+
+        # Interleave in planned order; ids cancelled meanwhile simply come up short
+        ordered: List[str] = []
+        positions = {name: 0 for name in popped}
+        for name in picks:
+            if positions[name] < len(popped[name]):
+                ordered.append(popped[name][positions[name]])
+                positions[name] += 1
+        if not ordered:
+            return [], []
+
+        raw_tasks = await self.redis.mget([task_key(eval_id) for eval_id in ordered])
+        entries = [json.loads(_text(raw)) for raw in raw_tasks if raw]
+        lost = [eval_id for eval_id, raw in zip(ordered, raw_tasks) if not raw]
+        await self._forget_inflight(lost)
+        return entries, lost
+
+    async def _forget_inflight(self, eval_ids: List[str]):
+        if eval_ids:
+            pipe = self.redis.pipeline(transaction=True)
+            for eval_id in eval_ids:
+                pipe.lrem(INFLIGHT_KEY, 1, eval_id)
+            await pipe.execute()
+
+    async def complete(self, entries: List[Dict[str, Any]]):
+        """Forget entries that made it into Celery."""
+        if not entries:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        for entry in entries:
+            pipe.delete(task_key(entry["submission"]["eval_id"]))
+            pipe.lrem(INFLIGHT_KEY, 1, entry["submission"]["eval_id"])
+        await pipe.execute()
+
+    async def requeue(self, entries: List[Dict[str, Any]]):
+        """Put entries that failed to publish back at the head of their virtual queues."""
+        if not entries:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        for entry in reversed(entries):
+            pipe.lpush(virtual_queue_key(entry["vqueue"]), entry["submission"]["eval_id"])
+            pipe.lrem(INFLIGHT_KEY, 1, entry["submission"]["eval_id"])
+            pipe.sadd(ACTIVE_KEY, entry["vqueue"])
+        pipe.incrby(SIZE_KEY, len(entries))
+        await pipe.execute()
+
+    async def recover(self) -> List[str]:
+        """
+        Requeue evaluations a previous pump took but never completed or
+        requeued. Call on taking over the pump lease, before the first take.
+        Returns the ids whose task entry has expired, which can't be requeued.
+        """
+        eval_ids = [_text(eval_id) for eval_id in await self.redis.lrange(INFLIGHT_KEY, 0, -1)]
+        if not eval_ids:
+            return []
+        raw_tasks = await self.redis.mget([task_key(eval_id) for eval_id in eval_ids])
+        entries = [json.loads(_text(raw)) for raw in raw_tasks if raw]
+        lost = [eval_id for eval_id, raw in zip(eval_ids, raw_tasks) if not raw]
+        await self.requeue(entries)
+        await self._forget_inflight(lost)
+        return lost
+
+    async def acquire_pump_lease(self, owner: str, ttl_ms: int) -> bool:
+        """Take or renew the single-pump lease."""
+        return await self.redis.eval(LEASE_SCRIPT, 1, PUMP_LEASE_KEY, owner, ttl_ms) == 1
+
+    async def stats(self) -> Dict[str, Any]:
+        queues = await self._virtual_queues()
+        return {
+            "parked": sum(queue.length for queue in queues),
+            "in_flight": await self.redis.llen(INFLIGHT_KEY),
+            "virtual_queues": {
+                queue.name: {
+                    "length": queue.length,
+                    "weight": queue.weight,
+                    "oldest_age_seconds": (
+                        round(time.time() - queue.head_enqueued_at, 3) if queue.head_enqueued_at is not None else None
+                    ),
+                }
+                for queue in queues
+            },
+        }
@@ -0,0 +1,170 @@
+"""
+Predictive headroom for evaluation pods.
+
+The cluster autoscaler adds a node only once a pod is unschedulable, so a
+burst of evaluations waits out node provisioning (minutes) in Pending.
+Placeholder ("balloon") pods at a priority below every evaluation hold
+spare capacity ahead of demand instead: the scheduler preempts them as
+soon as a real evaluation needs the room, and the evicted placeholders,
+now pending themselves, make the autoscaler add a node for the next
+arrivals.
+
+HeadroomController sizes that buffer, in evaluation-sized pods, from:
+- arrivals: evaluation Jobs created since the last sample plus the change
+  in Celery backlog (queued + unacked), i.e. everything that entered the
+  system whether or not it has reached the cluster yet
+- the arrival rate's level and trend (Holt's linear smoothing)
+- completions, which give capacity back (smoothed rate)
+- the backlog itself, which becomes pods as workers pick it up
+
+Over a lookahead of roughly how long a new node takes to become
+schedulable:
+
+    target = backlog + arrivals - completions + safety * sqrt(arrivals)
+
+clamped to [min_pods, max_pods]; the last term covers Poisson-like
+burstiness around the forecast. Scale-down waits out scale_down_delay so a
+lull between bursts doesn't give the capacity back.
+
+Pure logic with an injectable clock: the dispatcher feeds it live samples,
+the headroom simulation benchmark replays recorded arrival traces.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+HEADROOM_MIN_PODS = int(os.getenv("HEADROOM_MIN_PODS", "0"))
+HEADROOM_MAX_PODS = int(os.getenv("HEADROOM_MAX_PODS", "20"))
+HEADROOM_LOOKAHEAD_SECONDS = float(os.getenv("HEADROOM_LOOKAHEAD_SECONDS", "180"))
+HEADROOM_SCALE_DOWN_DELAY_SECONDS = float(os.getenv("HEADROOM_SCALE_DOWN_DELAY_SECONDS", "300"))
+HEADROOM_RATE_SMOOTHING = float(os.getenv("HEADROOM_RATE_SMOOTHING", "0.3"))  # Level: weight of the newest sample
+HEADROOM_TREND_SMOOTHING = float(os.getenv("HEADROOM_TREND_SMOOTHING", "0.3"))  # Trend: weight of the newest slope
+HEADROOM_SAFETY = float(os.getenv("HEADROOM_SAFETY", "1.0"))  # Standard deviations of arrivals to cover
+
+# Job names remembered for de-duplicating creations across relists
+SEEN_JOBS_TTL_SECONDS = 3600
+# Jobs created this long before the previous sample still count as arrivals
+# (API server and dispatcher clocks, watch delivery delay)
+CREATION_SKEW_SECONDS = 5
+
+
+@dataclass
+class HeadroomPolicy:
+    min_pods: int = HEADROOM_MIN_PODS
+    max_pods: int = HEADROOM_MAX_PODS
+    lookahead_seconds: float = HEADROOM_LOOKAHEAD_SECONDS
+    scale_down_delay_seconds: float = HEADROOM_SCALE_DOWN_DELAY_SECONDS
+    rate_smoothing: float = HEADROOM_RATE_SMOOTHING
+    trend_smoothing: float = HEADROOM_TREND_SMOOTHING
+    safety: float = HEADROOM_SAFETY
+
+
+class ArrivalForecaster:
+    """Holt's linear smoothing of an arrival rate sampled at irregular intervals."""
+
+    def __init__(self, rate_smoothing: float, trend_smoothing: float):
+        self.rate_smoothing = rate_smoothing
+        self.trend_smoothing = trend_smoothing
+        self.level: Optional[float] = None  # Arrivals per second
+        self.trend = 0.0  # Change in arrivals per second, per second
+
+    def update(self, rate: float, elapsed: float):
+        if self.level is None:
+            self.level = rate
+            return
+        previous = self.level
+        self.level = self.rate_smoothing * rate + (1 - self.rate_smoothing) * (previous + self.trend * elapsed)
+        slope = (self.level - previous) / elapsed
+        self.trend = self.trend_smoothing * slope + (1 - self.trend_smoothing) * self.trend
+
+    def expected_arrivals(self, horizon: float) -> float:
+        """Arrivals over the next horizon seconds, following the trend but never below zero."""
+        if self.level is None:
+            return 0.0
+        end_rate = max(0.0, self.level + self.trend * horizon)
+        return max(0.0, horizon * (max(0.0, self.level) + end_rate) / 2)
+
+
+class HeadroomController:
+    """Placeholder pod count from arrival and backlog samples."""
+
+    def __init__(self, policy: Optional[HeadroomPolicy] = None):
+        self.policy = policy or HeadroomPolicy()
+        self.forecaster = ArrivalForecaster(self.policy.rate_smoothing, self.policy.trend_smoothing)
+        self.seen_jobs: Dict[str, float] = {}  # job name -> creation time
+        self.created = 0  # Jobs first seen since the last sample
+        self.finished = 0  # Jobs finished since the last sample
+        self.completion_rate: Optional[float] = None  # Per second, smoothed
+        self.backlog: Optional[int] = None
+        self.sampled_at: Optional[float] = None
+        self.target = self.policy.min_pods
+        self.raised_at = 0.0  # When the target was last at or above the current one
+        self.last_arrival_rate = 0.0
+
+    def record_job(self, name: str, created_at: float):
+        """Count an evaluation Job once, however often the watch reports it."""
+        if name in self.seen_jobs:
+            return
+        self.seen_jobs[name] = created_at
+        # Jobs that predate the previous sample (a relist after failover) aren't new arrivals
+        if self.sampled_at is not None and created_at >= self.sampled_at - CREATION_SKEW_SECONDS:
+            self.created += 1
+
+    def record_finished(self):
+        """Count an evaluation Job reaching a terminal state; its capacity is free again."""
+        self.finished += 1
+
+    def desired(self, backlog: int) -> int:
+        lookahead = self.policy.lookahead_seconds
+        arrivals = self.forecaster.expected_arrivals(lookahead)
+        completions = (self.completion_rate or 0.0) * lookahead
+        wanted = backlog + arrivals - completions + self.policy.safety * math.sqrt(arrivals)
+        return max(self.policy.min_pods, min(self.policy.max_pods, math.ceil(wanted - 1e-9)))
+
+    def sample(self, backlog: int, now: float) -> int:
+        """Take a backlog sample, update the forecast and return the placeholder target."""
+        if self.sampled_at is not None and now > self.sampled_at:
+            elapsed = now - self.sampled_at
+            arrivals = max(0, self.created + backlog - self.backlog)
+            self.last_arrival_rate = arrivals / elapsed
+            self.forecaster.update(self.last_arrival_rate, elapsed)
+            rate = self.finished / elapsed
+            self.completion_rate = rate if self.completion_rate is None else (
+                self.policy.rate_smoothing * rate + (1 - self.policy.rate_smoothing) * self.completion_rate
+            )
+        self.created = 0
+        self.finished = 0
+        self.backlog = backlog
+        self.sampled_at = now
+        self.seen_jobs = {
+            job: created for job, created in self.seen_jobs.items() if now - created < SEEN_JOBS_TTL_SECONDS
+        }
+
+        wanted = self.desired(backlog)
+        if wanted >= self.target:
+            self.target = wanted
+            self.raised_at = now
+        elif now - self.raised_at >= self.policy.scale_down_delay_seconds:
+            self.target = wanted
+            self.raised_at = now
+        return self.target
+
+    def snapshot(self) -> Dict:
+        return {
+            "target_pods": self.target,
+            "backlog": self.backlog,
+            "arrival_rate_per_second": round(self.last_arrival_rate, 4),
+            "forecast_rate_per_second": round(self.forecaster.level or 0.0, 4),
+            "forecast_trend": round(self.forecaster.trend, 6),
+            "completion_rate_per_second": round(self.completion_rate or 0.0, 4),
+            "expected_arrivals": round(self.forecaster.expected_arrivals(self.policy.lookahead_seconds), 2),
+            "policy": {
+                "min_pods": self.policy.min_pods,
+                "max_pods": self.policy.max_pods,
+                "lookahead_seconds": self.policy.lookahead_seconds,
+                "scale_down_delay_seconds": self.policy.scale_down_delay_seconds,
+                "safety": self.policy.safety,
+            },
+        }
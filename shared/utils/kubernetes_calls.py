@@ -0,0 +1,218 @@
+"""
+Client-side rate limiting and coalescing for Kubernetes API calls.
+
+A service routes its API calls through one KubernetesCallLayer:
+- a token bucket (qps, burst) shared by every caller, like client-go's
+  client-side limiter, so bursts queue here instead of becoming API-server 429s;
+- priority lanes: callers waiting for a token are served highest priority
+  first, so job creation isn't stuck behind diagnostics;
+- singleflight for reads: identical concurrent reads share one request
+  (and one result object, which callers must not mutate);
+- per-operation latency, client-side wait and server-throttling metrics.
+
+Calls are synchronous like the Kubernetes client itself; async code runs them
+with asyncio.to_thread. Watch requests take a token but are never coalesced.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from .metrics import LatencyTracker
+
+PRIORITY_CRITICAL = 0  # Job creation/deletion, leader lease
+PRIORITY_NORMAL = 1  # Status, capacity and log reads
+PRIORITY_LOW = 2  # Diagnostics and cluster overviews
+PRIORITIES = (PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW)
+
+READ_VERBS = ("read", "list", "get")
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+class PriorityTokenBucket:
+    """Thread-safe token bucket whose waiters are served in priority order."""
+
+    def __init__(self, qps: float, burst: int):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.waiting: List[int] = [0] * len(PRIORITIES)
+        self.condition = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.qps)
+        self.updated = now
+
+    def acquire(self, priority: int = PRIORITY_NORMAL) -> float:
+        """Take one token, waiting behind higher-priority callers. Returns seconds waited."""
+        if self.qps <= 0:
+            return 0.0  # Unlimited
+
+        started = time.monotonic()
+        with self.condition:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    higher_waiting = any(self.waiting[p] for p in range(priority))
+                    if not higher_waiting and self.tokens >= 1:
+                        self.tokens -= 1
+                        return time.monotonic() - started
+                    # Until the next token is due; a higher-priority taker wakes us sooner
+                    self.condition.wait(timeout=max(1 - self.tokens, 0.01) / self.qps)
+            finally:
+                self.waiting[priority] -= 1
+                self.condition.notify_all()
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inflight: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, shared), shared being True if another caller made the call."""
+        with self.lock:
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.inflight[key] = future
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+
+def retry_after_seconds(error: Exception) -> float:
+    """Seconds the API server asked us to wait, from a 429's Retry-After header."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", DEFAULT_RETRY_AFTER_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+class KubernetesCallLayer:
+    """Rate-limited, coalescing front for Kubernetes client calls."""
+
+    def __init__(self, qps: float, burst: int, max_retries: int = 2):
+        self.bucket = PriorityTokenBucket(qps, burst)
+        self.flights = SingleFlight()
+        self.max_retries = max_retries  # Retries of server-throttled (429) calls
+        self.operations: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def _stats(self, operation: str) -> Dict:
+        with self.lock:
+            if operation not in self.operations:
+                self.operations[operation] = {
+                    "latency": LatencyTracker(),
+                    "coalesced": 0,
+                    "throttled": 0,
+                    "throttled_seconds": 0.0,
+                    "server_throttled": 0,
+                    "watches": 0,
+                }
+            return self.operations[operation]
+
+    def call(self, func: Callable, *args, priority: int = PRIORITY_NORMAL, coalesce: bool = None, **kwargs) -> Any:
+        """
+        Call a Kubernetes client method once a token is available.
+
+        Reads (read_*, list_*, get_*) are coalesced with identical in-flight
+        reads unless coalesce=False; writes never are.
+        """
+        operation = getattr(func, "__name__", "unknown")
+        stats = self._stats(operation)
+
+        if kwargs.get("watch"):
+            # Long-lived stream: limit how fast watches (re)start, nothing else
+            self._take_token(stats, priority)
+            stats["watches"] += 1
+            return func(*args, **kwargs)
+
+        if coalesce is None:
+            coalesce = operation.split("_", 1)[0] in READ_VERBS
+        if not coalesce:
+            return self._call(stats, func, priority, args, kwargs)
+
+        key = (operation, args, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+        result, shared = self.flights.do(key, lambda: self._call(stats, func, priority, args, kwargs))
+        if shared:
+            stats["coalesced"] += 1
+        return result
+
+    def _take_token(self, stats: Dict, priority: int):
+        waited = self.bucket.acquire(priority)
+        if waited >= 0.001:
+            stats["throttled"] += 1
+            stats["throttled_seconds"] += waited
+
+    def _call(self, stats: Dict, func: Callable, priority: int, args: tuple, kwargs: Dict) -> Any:
+        attempt = 0
+        while True:
+            self._take_token(stats, priority)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                stats["latency"].record((time.perf_counter() - started) * 1000, success=False)
+                if getattr(e, "status", None) == 429 and attempt < self.max_retries:
+                    # API Priority and Fairness rejected us; back off as told
+                    stats["server_throttled"] += 1
+                    attempt += 1
+                    time.sleep(retry_after_seconds(e))
+                    continue
+                raise
+            stats["latency"].record((time.perf_counter() - started) * 1000)
+            return result
+
+    def snapshot(self) -> Dict:
+        """Per-operation and per-verb metrics as a JSON-serializable dict."""
+        with self.lock:
+            operations = dict(self.operations)
+
+        by_operation = {}
+        by_verb: Dict[str, Dict] = {}
+        for operation, stats in sorted(operations.items()):
+            entry = {
+                **stats["latency"].snapshot(),
+                "coalesced": stats["coalesced"],
+                "throttled": stats["throttled"],
+                "throttled_seconds": round(stats["throttled_seconds"], 3),
+                "server_throttled": stats["server_throttled"],
+                "watches": stats["watches"],
+            }
+            by_operation[operation] = entry
+
+            verb = by_verb.setdefault(operation.split("_", 1)[0], {
+                "count": 0, "errors": 0, "coalesced": 0, "throttled": 0,
+                "throttled_seconds": 0.0, "server_throttled": 0,
+            })
+            for field in verb:
+                verb[field] = round(verb[field] + entry[field], 3)
+
+        return {
+            "qps": self.bucket.qps,
+            "burst": self.bucket.burst,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "waiting": dict(zip(("critical", "normal", "low"), self.bucket.waiting)),
+            "verbs": by_verb,
+            "operations": by_operation,
+        }
@@ -0,0 +1,48 @@
+"""
+Lightweight in-process latency metrics.
+
+Services expose snapshots of these over their own HTTP endpoints; there is
+no metrics backend dependency.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Track call counts, errors and latency percentiles over a sliding window."""
+
+    def __init__(self, window: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float, success: bool = True):
+        """Record one call's duration in milliseconds."""
+        self.samples.append(duration_ms)
+        self.count += 1
+        if not success:
+            self.errors += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the given percentile (0-100) of the current window."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict:
+        """Return current metrics as a JSON-serializable dict."""
+        avg = sum(self.samples) / len(self.samples) if self.samples else None
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(avg, 2) if avg is not None else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+        }
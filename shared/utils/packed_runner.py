@@ -0,0 +1,188 @@
+"""
+Packed evaluation runner.
+
+For tiny snippets, scheduling a pod and starting its gVisor sandbox take far
+longer than the code itself. In packed mode one pod runs several evaluations
+of the same batch (one tenant, one image and resource profile): the
+dispatcher ships this file in the batch's code ConfigMap and the pod runs it
+instead of a single evaluation.
+
+The runner executes {index}.{slot}.py files in order, each in a fresh Python
+subprocess with its own working directory, wall-clock timeout and rlimits
+(CPU seconds, address space, file size), and writes framed results to
+stdout, one JSON object per line behind FRAME_PREFIX:
+
+    {"packed_runner": 1, "nonce": ...}                          header, once
+    {"nonce": ..., "slot": 0, "stream": "stdout", "data": ...}  output chunks
+    {"nonce": ..., "slot": 0, "exit_code": 0, ...}              end of slot 0
+
+Evaluation output never reaches the pod log directly (it is piped through
+the runner), and frames only count with the nonce from the header, which
+the evaluations never see. parse_packed_output turns a pod log back into
+per-slot results. Standard library only: this runs in the executor images.
+"""
+
+import argparse
+import json
+import os
+import resource
+import secrets
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PROTOCOL_VERSION = 1
+FRAME_PREFIX = "@@crucible-packed "
+CHUNK_CHARS = 8192  # Output characters per frame, well under container runtime line limits
+OUTPUT_LIMIT_BYTES = 1024 * 1024  # Per evaluation and stream; the rest is dropped
+FILE_SIZE_LIMIT_BYTES = 100 * 1024 * 1024  # Matches the pod's /tmp emptyDir
+TIMEOUT_EXIT_CODE = 124  # What timeout(1) exits with, as for unpacked evaluations
+KILL_GRACE_SECONDS = 5  # CPU rlimit headroom over the wall-clock timeout
+
+
+def slot_files(code_dir: str, index: int) -> List[Tuple[int, str]]:
+    """(slot, path) of every evaluation for this completion index, in slot order."""
+    prefix = f"{index}."
+    slots = []
+    for name in os.listdir(code_dir):
+        if name.startswith(prefix) and name.endswith(".py"):
+            slot = name[len(prefix):-len(".py")]
+            if slot.isdigit():
+                slots.append((int(slot), os.path.abspath(os.path.join(code_dir, name))))
+    return sorted(slots)
+
+
+def emit(frame: Dict):
+    sys.stdout.write(FRAME_PREFIX + json.dumps(frame) + "\n")
+    sys.stdout.flush()
+
+
+def read_capped(pipe, sink: List[bytes]):
+    """Keep the first OUTPUT_LIMIT_BYTES of a pipe, drain the rest so the child never blocks."""
+    kept = 0
+    for block in iter(lambda: pipe.read(65536), b""):
+        if kept < OUTPUT_LIMIT_BYTES:
+            sink.append(block[:OUTPUT_LIMIT_BYTES - kept])
+            kept += len(sink[-1])
+    pipe.close()
+
+
+def limit_resources(timeout: float, memory_bytes: int):
+    """Runs in the child before exec."""
+    cpu_seconds = int(timeout) + KILL_GRACE_SECONDS
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (FILE_SIZE_LIMIT_BYTES, FILE_SIZE_LIMIT_BYTES))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory_bytes:
+        # A runaway evaluation gets MemoryError instead of OOM-killing the pod and its neighbours
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def run_one(path: str, timeout: float, memory_bytes: int) -> Dict:
+    """Run one evaluation in a fresh subprocess and working directory."""
+    workdir = tempfile.mkdtemp(prefix="eval-")
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-u", path],
+        cwd=workdir,
+        env=dict(os.environ, HOME=workdir, TMPDIR=workdir),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,  # Own process group, so a timeout kills anything it spawned
+        preexec_fn=lambda: limit_resources(timeout, memory_bytes),
+    )
+    output: Dict[str, List[bytes]] = {"stdout": [], "stderr": []}
+    readers = [
+        threading.Thread(target=read_capped, args=(process.stdout, output["stdout"]), daemon=True),
+        threading.Thread(target=read_capped, args=(process.stderr, output["stderr"]), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    try:
+        exit_code = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        exit_code = TIMEOUT_EXIT_CODE
+    try:
+        os.killpg(process.pid, signal.SIGKILL)  # Whatever it left behind
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.wait()
+    for reader in readers:
+        reader.join(timeout=KILL_GRACE_SECONDS)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "stdout": b"".join(output["stdout"]).decode("utf-8", errors="replace"),
+        "stderr": b"".join(output["stderr"]).decode("utf-8", errors="replace"),
+        "exit_code": exit_code,
+        "timed_out": timed_out,
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def parse_packed_output(logs: str) -> Dict[int, Dict]:
+    """
+    Per-slot results from a packed pod's log: stdout, stderr and exit_code.
+    A slot whose end frame is missing (the pod died mid-run) has exit_code None.
+    """
+    nonce = None
+    results: Dict[int, Dict] = {}
+    for line in logs.splitlines():
+        if not line.startswith(FRAME_PREFIX):
+            continue
+        try:
+            frame = json.loads(line[len(FRAME_PREFIX):])
+        except ValueError:
+            continue
+        if nonce is None:
+            if frame.get("packed_runner") == PROTOCOL_VERSION:
+                nonce = frame.get("nonce")
+            continue
+        if frame.get("nonce") != nonce or not isinstance(frame.get("slot"), int):
+            continue
+
+        result = results.setdefault(
+            frame["slot"], {"stdout": "", "stderr": "", "exit_code": None, "timed_out": False}
+        )
+        if result["exit_code"] is not None:
+            continue  # First end frame wins
+        if frame.get("stream") in ("stdout", "stderr"):
+            result[frame["stream"]] += frame.get("data", "")
+        elif "exit_code" in frame:
+            result["exit_code"] = frame["exit_code"]
+            result["timed_out"] = bool(frame.get("timed_out"))
+            result["duration_seconds"] = frame.get("duration_seconds")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a packed pod's evaluations one by one")
+    parser.add_argument("code_dir", help="Directory holding {index}.{slot}.py files")
+    parser.add_argument("index", type=int, help="Completion index of this pod")
+    parser.add_argument("--timeout", type=float, required=True, help="Seconds per evaluation")
+    parser.add_argument("--memory-bytes", type=int, default=0, help="Address space per evaluation, 0 for none")
+    args = parser.parse_args(argv)
+
+    nonce = secrets.token_hex(16)
+    emit({"packed_runner": PROTOCOL_VERSION, "nonce": nonce})
+    for slot, path in slot_files(args.code_dir, args.index):
+        result = run_one(path, args.timeout, args.memory_bytes)
+        for stream in ("stdout", "stderr"):
+            text = result.pop(stream)
+            for start in range(0, len(text), CHUNK_CHARS):
+                emit({"nonce": nonce, "slot": slot, "stream": stream, "data": text[start:start + CHUNK_CHARS]})
+        emit({"nonce": nonce, "slot": slot, **result})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
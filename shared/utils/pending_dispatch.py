@@ -0,0 +1,121 @@
+"""
+Evaluations waiting in the dispatcher for cluster capacity.
+
+When the cluster has no room for an evaluation, the dispatcher parks its
+execute request here and the Celery task finishes instead of retrying on a
+backoff timer. The dispatcher's job watcher wakes the dispatch loop as soon
+as capacity is released (a job finishes or is deleted), and the loop starts
+parked evaluations in order: highest priority first, then oldest.
+
+Keys:
+    dispatch:pending                zset: eval_id -> score (priority, then queued time)
+    dispatch:pending:{eval_id}      string: JSON {eval_id, job_name, priority, queued_at, request}
+    dispatch:pending:job:{job_name} string: eval_id, so job status lookups can find parked jobs
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+# Parked evaluations fail with resource_exhaustion after waiting this long
+PENDING_DISPATCH_MAX_WAIT_SECONDS = int(os.getenv("PENDING_DISPATCH_MAX_WAIT_SECONDS", "3600"))
+
+PENDING_KEY = "dispatch:pending"
+# One priority step outweighs any queued-time difference (~300 years of seconds)
+PRIORITY_SCALE = 1e10
+
+
+def pending_entry_key(eval_id: str) -> str:
+    return f"dispatch:pending:{eval_id}"
+
+
+def pending_job_key(job_name: str) -> str:
+    return f"dispatch:pending:job:{job_name}"
+
+
+def pending_score(priority: int, queued_at: float) -> float:
+    """Lower scores dispatch first: higher priority, then earlier queued_at."""
+    return -priority * PRIORITY_SCALE + queued_at
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class PendingDispatchQueue:
+    """Priority-ordered queue of execute requests, kept in Redis so it survives restarts."""
+
+    def __init__(self, redis_client, max_wait_seconds: int = PENDING_DISPATCH_MAX_WAIT_SECONDS):
+        self.redis = redis_client
+        # Entries outlive the wait limit so the loop can still fail them explicitly
+        self.entry_ttl = max_wait_seconds * 2
+
+    async def add(self, eval_id: str, job_name: str, priority: int, request: Dict[str, Any]) -> int:
+        """
+        Park an evaluation and return its position (0 = next to start).
+
+        Adding an evaluation that is already parked keeps its original place
+        and job name, so a repeated hand-off can't jump the queue.
+        """
+        queued_at = time.time()
+        entry = {
+            "eval_id": eval_id,
+            "job_name": job_name,
+            "priority": priority,
+            "queued_at": queued_at,
+            "request": request,
+        }
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(pending_entry_key(eval_id), json.dumps(entry), ex=self.entry_ttl, nx=True)
+        pipe.set(pending_job_key(job_name), eval_id, ex=self.entry_ttl, nx=True)
+        pipe.zadd(PENDING_KEY, {eval_id: pending_score(priority, queued_at)}, nx=True)
+        pipe.zrank(PENDING_KEY, eval_id)
+        results = await pipe.execute()
+        return int(results[-1])
+
+    async def get(self, eval_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.get(pending_entry_key(eval_id))
+        return json.loads(raw) if raw else None
+
+    async def eval_id_for_job(self, job_name: str) -> Optional[str]:
+        return _text(await self.redis.get(pending_job_key(job_name)))
+
+    async def peek(self) -> Optional[Dict[str, Any]]:
+        """The next evaluation to start, or None if nothing is parked."""
+        while True:
+            head = await self.redis.zrange(PENDING_KEY, 0, 0)
+            if not head:
+                return None
+            eval_id = _text(head[0])
+            entry = await self.get(eval_id)
+            if entry is not None:
+                return entry
+            # Entry expired or was removed mid-way; drop the dangling member
+            await self.redis.zrem(PENDING_KEY, eval_id)
+
+    async def remove(self, eval_id: str) -> bool:
+        """Remove a parked evaluation (started, failed or cancelled). Returns True if it was parked."""
+        entry = await self.get(eval_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zrem(PENDING_KEY, eval_id)
+        pipe.delete(pending_entry_key(eval_id))
+        if entry:
+            pipe.delete(pending_job_key(entry["job_name"]))
+        removed, *_ = await pipe.execute()
+        return bool(removed)
+
+    async def size(self) -> int:
+        return int(await self.redis.zcard(PENDING_KEY))
+
+    async def stats(self) -> Dict[str, Any]:
+        size = await self.size()
+        oldest = await self.redis.zrange(PENDING_KEY, 0, 0)
+        head = await self.get(_text(oldest[0])) if oldest else None
+        return {
+            "pending": size,
+            "head_eval_id": head["eval_id"] if head else None,
+            "head_wait_seconds": round(time.time() - head["queued_at"], 1) if head else None,
+        }
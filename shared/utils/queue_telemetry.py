@@ -0,0 +1,157 @@
+"""
+Celery queue telemetry read straight from the Redis broker.
+
+Celery's inspect() broadcasts to every worker and waits out a timeout for
+replies. Everything the status endpoints need is already in the broker:
+
+    <queue>          list: waiting messages; kombu LPUSHes and workers
+                     BRPOP, so the oldest message is at index -1
+    unacked          hash: messages delivered to a worker and not yet
+                     acked (with acks_late, reserved plus executing)
+    celery:workers   hash: hostname -> JSON heartbeat, written by each
+                     worker every WORKER_HEARTBEAT_INTERVAL seconds
+
+Message age comes from the ENQUEUED_AT_HEADER the gateway stamps on each
+task; messages without it report no age.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Must match task_queues in celery_worker/celeryconfig.py
+CELERY_QUEUES = ("high_priority", "evaluation", "low_priority", "batch", "maintenance")
+# Queues evaluate_code is routed to (see priority_mapping.get_celery_queue)
+EVALUATION_QUEUES = ("high_priority", "evaluation", "low_priority")
+
+# kombu's Redis transport keeps delivered-but-unacked messages here
+UNACKED_KEY = "unacked"
+
+WORKER_HEARTBEATS_KEY = "celery:workers"
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10"))
+# A worker missing this many intervals is reported offline
+WORKER_OFFLINE_AFTER_INTERVALS = 3
+# Heartbeats this old are deleted (worker gone without a clean shutdown)
+WORKER_HEARTBEAT_PRUNE_SECONDS = 3600
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+QUEUE_TELEMETRY_CACHE_SECONDS = float(os.getenv("QUEUE_TELEMETRY_CACHE_SECONDS", "1.0"))
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+def message_enqueued_at(raw_message: Any) -> Optional[float]:
+    """Enqueue time stamped on a raw kombu message, if any."""
+    try:
+        headers = json.loads(_text(raw_message)).get("headers") or {}
+        return float(headers[ENQUEUED_AT_HEADER])
+    except (TypeError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def parse_worker_heartbeats(raw: Dict[Any, Any], now: float) -> List[Dict[str, Any]]:
+    """Heartbeat entries with their age and an online flag, newest first."""
+    workers = []
+    for hostname, payload in raw.items():
+        try:
+            worker = json.loads(_text(payload))
+        except (TypeError, ValueError):
+            continue
+        age = max(0.0, now - float(worker.get("last_seen", 0)))
+        worker["hostname"] = _text(hostname)
+        worker["heartbeat_age_seconds"] = round(age, 3)
+        worker["online"] = age <= WORKER_HEARTBEAT_INTERVAL * WORKER_OFFLINE_AFTER_INTERVALS
+        workers.append(worker)
+    workers.sort(key=lambda worker: worker["heartbeat_age_seconds"])
+    return workers
+
+
+class QueueTelemetry:
+    """
+    Cached snapshot of queue depths, oldest-message ages and worker heartbeats.
+
+    One pipelined round trip collects everything. Concurrent callers share
+    a refresh, and snapshots younger than cache_seconds are served as is.
+    """
+
+    def __init__(
+        self,
+        broker_client,
+        queues: Iterable[str] = CELERY_QUEUES,
+        cache_seconds: float = QUEUE_TELEMETRY_CACHE_SECONDS,
+    ):
+        self.broker = broker_client
+        self.queues = tuple(queues)
+        self.cache_seconds = cache_seconds
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._collected_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def snapshot(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Latest telemetry, refreshed if older than max_age (default cache_seconds)."""
+        max_age = self.cache_seconds if max_age is None else max_age
+        if self._snapshot and time.monotonic() - self._collected_at <= max_age:
+            return self._snapshot
+        async with self._lock:
+            # Another caller may have refreshed while we waited
+            if self._snapshot and time.monotonic() - self._collected_at <= max_age:
+                return self._snapshot
+            self._snapshot = await self._collect()
+            self._collected_at = time.monotonic()
+            return self._snapshot
+
+    async def queue_depths(
+        self, queues: Iterable[str], max_age: Optional[float] = None
+    ) -> Dict[str, int]:
+        snapshot = await self.snapshot(max_age)
+        return {
+            queue: snapshot["queues"][queue]["depth"]
+            for queue in queues
+            if queue in snapshot["queues"]
+        }
+
+    async def _collect(self) -> Dict[str, Any]:
+        pipe = self.broker.pipeline(transaction=False)
+        for queue in self.queues:
+            pipe.llen(queue)
+            pipe.lindex(queue, -1)
+        pipe.hlen(UNACKED_KEY)
+        pipe.hgetall(WORKER_HEARTBEATS_KEY)
+        results = await pipe.execute()
+        now = time.time()
+
+        queues: Dict[str, Dict[str, Any]] = {}
+        for index, queue in enumerate(self.queues):
+            depth, oldest = results[2 * index], results[2 * index + 1]
+            enqueued_at = message_enqueued_at(oldest) if oldest is not None else None
+            queues[queue] = {
+                "depth": depth,
+                "oldest_message_age_seconds": (
+                    round(max(0.0, now - enqueued_at), 3) if enqueued_at is not None else None
+                ),
+            }
+
+        workers = parse_worker_heartbeats(results[-1], now)
+        stale = [
+            worker["hostname"] for worker in workers
+            if worker["heartbeat_age_seconds"] > WORKER_HEARTBEAT_PRUNE_SECONDS
+        ]
+        if stale:
+            await self.broker.hdel(WORKER_HEARTBEATS_KEY, *stale)
+            workers = [worker for worker in workers if worker["hostname"] not in stale]
+
+        return {
+            "queues": queues,
+            "queued": sum(queues[queue]["depth"] for queue in EVALUATION_QUEUES if queue in queues),
+            "unacked": results[-2],
+            "workers": workers,
+            "workers_online": sum(1 for worker in workers if worker["online"]),
+            "collected_at": now,
+        }
@@ -12,12 +12,12 @@ from pathlib import Path
 # Add parent directory to path to import shared utilities
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from sqlalchemy import create_engine, select, delete
+from sqlalchemy import create_engine, select, delete, func
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from ..core.base import StorageService
-from ..models.models import Evaluation, EvaluationEvent
+from ..models.models import Evaluation, EvaluationEvent, EvaluationLogChunk
 
 # Import resilient connection utilities if available
 try:
@@ -26,6 +26,25 @@ try:
 except ImportError:
     RESILIENT_CONNECTIONS_AVAILABLE = False
 
+# Tries per log chunk append when concurrent appends race for the same seq
+LOG_CHUNK_APPEND_ATTEMPTS = 5
+
+# Evaluation columns that can be selected individually in bulk retrieval
+PROJECTABLE_COLUMNS = frozenset({
+    "status",
+    "code_hash",
+    "output",
+    "error",
+    "exit_code",
+    "runtime_ms",
+    "memory_used_mb",
+    "engine",
+    "worker_id",
+})
+
+# IDs per IN (...) clause; keeps bulk lookups under SQLite's bound-parameter limit
+IN_QUERY_CHUNK_SIZE = 900
+
 
 class DatabaseStorage(StorageService):
     """
@@ -158,43 +177,103 @@ class DatabaseStorage(StorageService):
                 if not eval_record:
                     return None
 
-                # Build response dict
-                result = {
-                    "id": eval_record.id,
-                    "status": eval_record.status,
-                    "code_hash": eval_record.code_hash,
-                }
-
-                # Add optional fields if present
-                if eval_record.output:
-                    result["output"] = eval_record.output
-                if eval_record.error:
-                    result["error"] = eval_record.error
-                if eval_record.exit_code is not None:
-                    result["exit_code"] = eval_record.exit_code
-                if eval_record.runtime_ms is not None:
-                    result["runtime_ms"] = eval_record.runtime_ms
-                if eval_record.memory_used_mb is not None:
-                    result["memory_used_mb"] = eval_record.memory_used_mb
-                if eval_record.engine:
-                    result["engine"] = eval_record.engine
-                if eval_record.worker_id:
-                    result["worker_id"] = eval_record.worker_id
-
-                # Add metadata fields
-                if eval_record.eval_metadata:
-                    result.update(eval_record.eval_metadata)
-
-                # Add timestamps
-                if eval_record.created_at:
-                    result["timestamp"] = eval_record.created_at.isoformat()
-
-                return result
+                return self._evaluation_to_dict(eval_record)
 
         except SQLAlchemyError as e:
             print(f"Database error retrieving evaluation {eval_id}: {e}")
             return None
 
+    def retrieve_evaluations(
+        self, eval_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve many evaluations with one IN query per chunk of IDs.
+
+        With fields given, only those columns and metadata keys are selected,
+        so status lookups never load output, error or code text.
+        """
+        unique_ids = list(dict.fromkeys(eval_ids))
+        if not unique_ids:
+            return {}
+
+        if fields is None:
+            selected = None
+        else:
+            # Columns are selected directly; other fields are extracted from the
+            # metadata JSON in SQL so the stored code is never loaded
+            selected = [Evaluation.id]
+            for field in dict.fromkeys(fields):
+                if field in PROJECTABLE_COLUMNS:
+                    selected.append(getattr(Evaluation, field).label(field))
+                elif field == "timestamp":
+                    selected.append(Evaluation.created_at.label(field))
+                elif field != "id":
+                    selected.append(Evaluation.eval_metadata[field].label(field))
+
+        results = {}
+        try:
+            with self.get_session() as session:
+                for start in range(0, len(unique_ids), IN_QUERY_CHUNK_SIZE):
+                    chunk = unique_ids[start:start + IN_QUERY_CHUNK_SIZE]
+                    if selected is None:
+                        records = session.scalars(
+                            select(Evaluation).where(Evaluation.id.in_(chunk))
+                        )
+                        for record in records:
+                            results[record.id] = self._evaluation_to_dict(record)
+                        continue
+
+                    stmt = select(*selected).where(Evaluation.id.in_(chunk))
+                    for row in session.execute(stmt):
+                        data = {}
+                        for field, value in row._mapping.items():
+                            if value is None:
+                                continue
+                            if field == "timestamp":
+                                value = value.isoformat()
+                            data[field] = value
+                        results[data["id"]] = data
+
+            return results
+
+        except SQLAlchemyError as e:
+            print(f"Database error retrieving {len(unique_ids)} evaluations: {e}")
+            return {}
+
+    def _evaluation_to_dict(self, record: Evaluation) -> Dict[str, Any]:
+        """Build the evaluation dict returned by retrieve_evaluation."""
+        result = {
+            "id": record.id,
+            "status": record.status,
+            "code_hash": record.code_hash,
+        }
+
+        # Add optional fields if present
+        if record.output:
+            result["output"] = record.output
+        if record.error:
+            result["error"] = record.error
+        if record.exit_code is not None:
+            result["exit_code"] = record.exit_code
+        if record.runtime_ms is not None:
+            result["runtime_ms"] = record.runtime_ms
+        if record.memory_used_mb is not None:
+            result["memory_used_mb"] = record.memory_used_mb
+        if record.engine:
+            result["engine"] = record.engine
+        if record.worker_id:
+            result["worker_id"] = record.worker_id
+
+        # Add metadata fields
+        if record.eval_metadata:
+            result.update(record.eval_metadata)
+
+        # Add timestamps
+        if record.created_at:
+            result["timestamp"] = record.created_at.isoformat()
+
+        return result
+
     def store_events(self, eval_id: str, events: List[Dict[str, Any]]) -> bool:
         """Store events in database."""
         try:
@@ -352,3 +431,93 @@ class DatabaseStorage(StorageService):
         except SQLAlchemyError as e:
             print(f"Database error deleting evaluation {eval_id}: {e}")
             return False
+
+    def append_log_chunk(
+        self, eval_id: str, content: str, timestamp: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Insert a log chunk; the (evaluation_id, seq) index makes MAX(seq) a cheap lookup.
+        A concurrent append (another replica) can take the same seq first; the
+        unique index rejects ours and we retry with the next one.
+        """
+        for _ in range(LOG_CHUNK_APPEND_ATTEMPTS):
+            try:
+                with self.get_session() as session:
+                    last_seq = session.execute(
+                        select(func.max(EvaluationLogChunk.seq)).where(
+                            EvaluationLogChunk.evaluation_id == eval_id
+                        )
+                    ).scalar()
+                    seq = 0 if last_seq is None else last_seq + 1
+
+                    chunk = EvaluationLogChunk(evaluation_id=eval_id, seq=seq, content=content)
+                    if timestamp:
+                        chunk.timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                    session.add(chunk)
+
+                return seq
+
+            except IntegrityError:
+                continue
+            except SQLAlchemyError as e:
+                print(f"Database error appending log chunk for {eval_id}: {e}")
+                return None
+
+        print(f"Database error appending log chunk for {eval_id}: seq still taken after {LOG_CHUNK_APPEND_ATTEMPTS} attempts")
+        return None
+
+    def retrieve_log_chunks(
+        self, eval_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve log chunks ordered by sequence number."""
+        try:
+            with self.get_session() as session:
+                stmt = (
+                    select(EvaluationLogChunk)
+                    .where(EvaluationLogChunk.evaluation_id == eval_id)
+                    .order_by(EvaluationLogChunk.seq)
+                    .offset(offset)
+                )
+                if limit is not None:
+                    stmt = stmt.limit(limit)
+
+                return [
+                    {
+                        "seq": chunk.seq,
+                        "content": chunk.content,
+                        "timestamp": chunk.timestamp.isoformat() if chunk.timestamp else None,
+                    }
+                    for chunk in session.execute(stmt).scalars().all()
+                ]
+
+        except SQLAlchemyError as e:
+            print(f"Database error retrieving log chunks for {eval_id}: {e}")
+            return []
+
+    def count_log_chunks(self, eval_id: str) -> int:
+        """Count log chunks for an evaluation."""
+        try:
+            with self.get_session() as session:
+                result = session.execute(
+                    select(func.count(EvaluationLogChunk.id)).where(
+                        EvaluationLogChunk.evaluation_id == eval_id
+                    )
+                ).scalar()
+                return result or 0
+
+        except SQLAlchemyError as e:
+            print(f"Database error counting log chunks for {eval_id}: {e}")
+            return 0
+
+    def delete_log_chunks(self, eval_id: str) -> bool:
+        """Delete all log chunks for an evaluation."""
+        try:
+            with self.get_session() as session:
+                result = session.execute(
+                    delete(EvaluationLogChunk).where(EvaluationLogChunk.evaluation_id == eval_id)
+                )
+                return result.rowcount > 0
+
+        except SQLAlchemyError as e:
+            print(f"Database error deleting log chunks for {eval_id}: {e}")
+            return False
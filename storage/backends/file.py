@@ -4,7 +4,9 @@ File-based storage implementation.
 
 import json
 import logging
+import shutil
 import threading
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
@@ -24,13 +26,18 @@ class FileStorage(StorageService):
     │   └── {eval_id}.json
     ├── events/
     │   └── {eval_id}.json
-    └── metadata/
-        └── {eval_id}.json
+    ├── metadata/
+    │   └── {eval_id}.json
+    └── logs/
+        └── {eval_id}/
+            └── {seq:010d}.json  (one segment file per log chunk)
     """
 
     def __init__(self, base_path: str = "data/storage"):
         self.base_path = Path(base_path)
         self.lock = threading.Lock()
+        # Next log sequence per evaluation, so appends never rescan the directory
+        self._next_log_seq: Dict[str, int] = {}
 
         # Create directory structure
         self._ensure_directories()
@@ -42,6 +49,7 @@ class FileStorage(StorageService):
             self.base_path / "evaluations",
             self.base_path / "events",
             self.base_path / "metadata",
+            self.base_path / "logs",
         ]
 
         for directory in directories:
@@ -59,6 +67,17 @@ class FileStorage(StorageService):
         """Get metadata file path"""
         return self.base_path / "metadata" / f"{eval_id}.json"
 
+    def _get_logs_dir(self, eval_id: str) -> Path:
+        """Get log segment directory path"""
+        return self.base_path / "logs" / eval_id
+
+    def _list_log_segments(self, eval_id: str) -> List[Path]:
+        """List log segment files in sequence order (names are zero-padded)"""
+        logs_dir = self._get_logs_dir(eval_id)
+        if not logs_dir.exists():
+            return []
+        return sorted(logs_dir.glob("*.json"))
+
     def _write_json(self, path: Path, data: Any) -> bool:
         """Write JSON data to file atomically"""
         try:
@@ -148,4 +167,57 @@ class FileStorage(StorageService):
                     path.unlink()
                     deleted = True
 
+            self._delete_log_segments(eval_id)
             return deleted
+
+    def _delete_log_segments(self, eval_id: str) -> bool:
+        """Remove the log segment directory (caller holds the lock)"""
+        self._next_log_seq.pop(eval_id, None)
+        logs_dir = self._get_logs_dir(eval_id)
+        if not logs_dir.exists():
+            return False
+        shutil.rmtree(logs_dir, ignore_errors=True)
+        return True
+
+    def append_log_chunk(
+        self, eval_id: str, content: str, timestamp: Optional[str] = None
+    ) -> Optional[int]:
+        with self.lock:
+            if eval_id not in self._next_log_seq:
+                segments = self._list_log_segments(eval_id)
+                self._next_log_seq[eval_id] = int(segments[-1].stem) + 1 if segments else 0
+
+            seq = self._next_log_seq[eval_id]
+            logs_dir = self._get_logs_dir(eval_id)
+            logs_dir.mkdir(parents=True, exist_ok=True)
+
+            chunk = {
+                "seq": seq,
+                "content": content,
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+            }
+            if not self._write_json(logs_dir / f"{seq:010d}.json", chunk):
+                return None
+
+            self._next_log_seq[eval_id] = seq + 1
+            return seq
+
+    def retrieve_log_chunks(
+        self, eval_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self.lock:
+            end = None if limit is None else offset + limit
+            chunks = []
+            for path in self._list_log_segments(eval_id)[offset:end]:
+                chunk = self._read_json(path)
+                if chunk is not None:
+                    chunks.append(chunk)
+            return chunks
+
+    def count_log_chunks(self, eval_id: str) -> int:
+        with self.lock:
+            return len(self._list_log_segments(eval_id))
+
+    def delete_log_chunks(self, eval_id: str) -> bool:
+        with self.lock:
+            return self._delete_log_segments(eval_id)
@@ -3,6 +3,7 @@ In-memory storage implementation.
 """
 
 import threading
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 from ..core.base import StorageService
@@ -24,6 +25,7 @@ class InMemoryStorage(StorageService):
         self.evaluations = {}
         self.events = {}
         self.metadata = {}
+        self.log_chunks = {}
         self.lock = threading.Lock()
 
     def store_evaluation(self, eval_id: str, data: Dict[str, Any]) -> bool:
@@ -70,4 +72,36 @@ class InMemoryStorage(StorageService):
             if eval_id in self.metadata:
                 del self.metadata[eval_id]
                 deleted = True
+            self.log_chunks.pop(eval_id, None)
             return deleted
+
+    def append_log_chunk(
+        self, eval_id: str, content: str, timestamp: Optional[str] = None
+    ) -> Optional[int]:
+        with self.lock:
+            chunks = self.log_chunks.setdefault(eval_id, [])
+            seq = len(chunks)
+            chunks.append(
+                {
+                    "seq": seq,
+                    "content": content,
+                    "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+                }
+            )
+            return seq
+
+    def retrieve_log_chunks(
+        self, eval_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self.lock:
+            chunks = self.log_chunks.get(eval_id, [])
+            end = None if limit is None else offset + limit
+            return [chunk.copy() for chunk in chunks[offset:end]]
+
+    def count_log_chunks(self, eval_id: str) -> int:
+        with self.lock:
+            return len(self.log_chunks.get(eval_id, []))
+
+    def delete_log_chunks(self, eval_id: str) -> bool:
+        with self.lock:
+            return self.log_chunks.pop(eval_id, None) is not None
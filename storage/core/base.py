@@ -54,6 +54,57 @@ class StorageService(ABC):
         """Delete all data for an evaluation"""
         pass
 
+    @abstractmethod
+    def append_log_chunk(
+        self, eval_id: str, content: str, timestamp: Optional[str] = None
+    ) -> Optional[int]:
+        """Append a log chunk and return its sequence number (None on failure)"""
+        pass
+
+    @abstractmethod
+    def retrieve_log_chunks(
+        self, eval_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve log chunks ordered by sequence number"""
+        pass
+
+    @abstractmethod
+    def count_log_chunks(self, eval_id: str) -> int:
+        """Count stored log chunks for an evaluation"""
+        pass
+
+    @abstractmethod
+    def delete_log_chunks(self, eval_id: str) -> bool:
+        """Delete all log chunks for an evaluation"""
+        pass
+
+    def retrieve_evaluations(
+        self, eval_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve many evaluations at once, keyed by ID; missing IDs are omitted.
+
+        If fields is given, each result holds only "id" plus those fields.
+        Backends that can fetch in bulk should override this default loop.
+        """
+        results = {}
+        for eval_id in dict.fromkeys(eval_ids):
+            data = self.retrieve_evaluation(eval_id)
+            if data:
+                results[eval_id] = project_fields(data, fields)
+        return results
+
     def get_test_suite(self) -> unittest.TestSuite:
         """Get test suite for this storage implementation"""
         return unittest.TestSuite()
+
+
+def project_fields(data: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Reduce an evaluation dict to "id" plus the requested fields (all if None)."""
+    if fields is None:
+        return data
+    projected = {"id": data.get("id")}
+    for field in fields:
+        if field in data:
+            projected[field] = data[field]
+    return projected
@@ -23,6 +23,9 @@ except ImportError:
     SQLALCHEMY_AVAILABLE = False
     DatabaseStorage = None
 
+# Statuses after which no more log chunks are expected for an evaluation
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "timeout")
+
 
 class FlexibleStorageManager:
     """
@@ -183,6 +186,12 @@ class FlexibleStorageManager:
         if not current:
             return False
 
+        # On terminal states, fold streamed log chunks into the final output blob.
+        # An explicit non-empty output (e.g. a full post-completion capture) wins.
+        compact_logs = status in TERMINAL_STATUSES and self.count_log_chunks(eval_id) > 0
+        if compact_logs and not output:
+            output = self._join_log_chunks(eval_id)
+
         # Update fields
         if status:
             current["status"] = status
@@ -255,6 +264,9 @@ class FlexibleStorageManager:
                 events.append(event)
                 self.primary.store_events(eval_id, events)
 
+            if result and compact_logs:
+                self.delete_log_chunks(eval_id)
+
             return result
 
         except Exception as e:
@@ -292,6 +304,103 @@ class FlexibleStorageManager:
 
         return None
 
+    def get_evaluations(
+        self, eval_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many evaluations at once, keyed by ID; missing IDs are omitted.
+
+        Cache hits are served first, then the remaining IDs are fetched from
+        the primary backend in bulk, with the fallback covering whatever the
+        primary did not return.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        remaining = list(dict.fromkeys(eval_ids))
+
+        if self.cache and remaining:
+            cached = self.cache.retrieve_evaluations(remaining, fields)
+            results.update(cached)
+            remaining = [eval_id for eval_id in remaining if eval_id not in cached]
+
+        if remaining:
+            try:
+                found = self.primary.retrieve_evaluations(remaining, fields)
+                results.update(found)
+                remaining = [eval_id for eval_id in remaining if eval_id not in found]
+                # Only full records are cached; projections would shadow other fields
+                if self.cache and fields is None:
+                    for eval_id, data in found.items():
+                        self.cache.store_evaluation(eval_id, data)
+            except Exception as e:
+                logger.debug(f"Primary bulk retrieval failed: {e}, trying fallback")
+
+        if remaining and self.fallback:
+            try:
+                results.update(self.fallback.retrieve_evaluations(remaining, fields))
+            except Exception as e:
+                logger.warning(f"Fallback bulk retrieval also failed: {e}")
+
+        return results
+
+    def append_logs(
+        self, eval_id: str, content: str, timestamp: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Append a log chunk without rewriting the evaluation record.
+
+        Returns the chunk sequence number, or None if the append failed.
+        """
+        try:
+            return self.primary.append_log_chunk(eval_id, content, timestamp)
+        except Exception as e:
+            logger.warning(f"Primary log append failed: {e}, attempting fallback")
+            if self.fallback:
+                try:
+                    return self.fallback.append_log_chunk(eval_id, content, timestamp)
+                except Exception as e2:
+                    logger.error(f"Fallback log append also failed: {e2}")
+        return None
+
+    def get_log_chunks(
+        self,
+        eval_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        tail: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get log chunks in sequence order; ``tail`` returns the last N chunks."""
+        if tail is not None:
+            offset = max(0, self.count_log_chunks(eval_id) - tail)
+            limit = tail
+
+        try:
+            return self.primary.retrieve_log_chunks(eval_id, offset=offset, limit=limit)
+        except Exception as e:
+            logger.warning(f"Failed to get log chunks from primary: {e}")
+            if self.fallback:
+                return self.fallback.retrieve_log_chunks(eval_id, offset=offset, limit=limit)
+        return []
+
+    def count_log_chunks(self, eval_id: str) -> int:
+        """Count stored (not yet compacted) log chunks."""
+        try:
+            return self.primary.count_log_chunks(eval_id)
+        except Exception as e:
+            logger.debug(f"Failed to count log chunks: {e}")
+            return 0
+
+    def delete_log_chunks(self, eval_id: str) -> bool:
+        """Discard stored log chunks (e.g. when the output is replaced wholesale)."""
+        try:
+            return self.primary.delete_log_chunks(eval_id)
+        except Exception as e:
+            logger.warning(f"Failed to delete log chunks: {e}")
+            return False
+
+    def _join_log_chunks(self, eval_id: str) -> str:
+        """Concatenate all log chunks into a single output string (chunks carry their own newlines)."""
+        return "".join(chunk["content"] for chunk in self.get_log_chunks(eval_id))
+
     def add_event(self, eval_id: str, event_type: str, message: str, **metadata) -> bool:
         """Add an event to evaluation history."""
         event = {
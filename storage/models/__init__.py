@@ -8,7 +8,7 @@ Handles structured data storage for:
 """
 
 try:
-    from .models import Evaluation, EvaluationEvent, EvaluationMetric
+    from .models import Evaluation, EvaluationEvent, EvaluationMetric, EvaluationLogChunk
     from .connection import get_db, init_db
 
     SQLALCHEMY_AVAILABLE = True
@@ -25,6 +25,9 @@ except ImportError:
     class EvaluationMetric:
         pass
 
+    class EvaluationLogChunk:
+        pass
+
     def get_db():
         raise RuntimeError("SQLAlchemy not installed")
 
@@ -36,6 +39,7 @@ __all__ = [
     "Evaluation",
     "EvaluationEvent",
     "EvaluationMetric",
+    "EvaluationLogChunk",
     "get_db",
     "init_db",
     "SQLALCHEMY_AVAILABLE",
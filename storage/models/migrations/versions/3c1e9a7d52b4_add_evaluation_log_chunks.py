@@ -0,0 +1,43 @@
+"""Add append-only evaluation log chunks
+
+Revision ID: 3c1e9a7d52b4
+Revises: ecb8af5d833a
+Create Date: 2026-10-18 09:12:04.118532
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3c1e9a7d52b4"
+down_revision = "ecb8af5d833a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evaluation_log_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("evaluation_id", sa.String(length=64), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "timestamp", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.ForeignKeyConstraint(["evaluation_id"], ["evaluations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_log_chunks_eval_seq",
+        "evaluation_log_chunks",
+        ["evaluation_id", "seq"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_log_chunks_eval_seq", table_name="evaluation_log_chunks")
+    op.drop_table("evaluation_log_chunks")
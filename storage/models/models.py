@@ -72,6 +72,9 @@ class Evaluation(Base):
     metrics = relationship(
         "EvaluationMetric", back_populates="evaluation", cascade="all, delete-orphan"
     )
+    log_chunks = relationship(
+        "EvaluationLogChunk", back_populates="evaluation", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Evaluation(id='{self.id}', status='{self.status}')>"
@@ -104,6 +107,29 @@ class EvaluationEvent(Base):
         return f"<EvaluationEvent(type='{self.event_type}', eval='{self.evaluation_id}')>"
 
 
+class EvaluationLogChunk(Base):
+    """Append-only log chunk, compacted into Evaluation.output on completion."""
+
+    __tablename__ = "evaluation_log_chunks"
+
+    id = Column(Integer, primary_key=True)  # Using Integer for SQLite compatibility
+    evaluation_id = Column(
+        String(64), ForeignKey("evaluations.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)  # Per-evaluation sequence number, starting at 0
+    content = Column(Text, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationship
+    evaluation = relationship("Evaluation", back_populates="log_chunks")
+
+    # (evaluation_id, seq) is unique and serves ordered range reads
+    __table_args__ = (Index("idx_log_chunks_eval_seq", "evaluation_id", "seq", unique=True),)
+
+    def __repr__(self):
+        return f"<EvaluationLogChunk(eval='{self.evaluation_id}', seq={self.seq})>"
+
+
 class EvaluationMetric(Base):
     """Numeric metrics for graphing and analysis."""
 
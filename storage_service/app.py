@@ -21,6 +21,7 @@ import redis.asyncio as redis
 
 from storage import FlexibleStorageManager
 from storage.core.config import StorageConfig
+from storage.core.flexible_manager import TERMINAL_STATUSES
 from shared.generated.python import EvaluationStatus
 
 # Import models
@@ -35,7 +36,9 @@ from .models import (
     StorageInfoResponse,
     HealthResponse,
     RunningEvaluationInfo,
-    RunningEvaluationsResponse
+    RunningEvaluationsResponse,
+    EvaluationBatchGetRequest,
+    EvaluationBatchGetResponse,
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -61,6 +64,9 @@ except Exception as e:
 # Global variables
 redis_client = None  # Will be initialized in lifespan
 
+# Maximum IDs accepted by a single batch-get request
+MAX_BATCH_GET_IDS = 5000
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -627,6 +633,29 @@ async def bulk_create_evaluations(evaluations: List[EvaluationCreate]):
     return {"created": len(results), "failed": len(errors), "results": results, "errors": errors}
 
 
+@app.post("/evaluations/batch-get", response_model=EvaluationBatchGetResponse)
+async def batch_get_evaluations(request: EvaluationBatchGetRequest):
+    """Get many evaluations in one request
+
+    The primary database answers with a single WHERE id IN (...) query that
+    selects only the requested fields, so status lookups for large batches
+    don't load outputs.
+    """
+    if len(request.eval_ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_GET_IDS} evaluation IDs per request"
+        )
+
+    try:
+        evaluations = storage.get_evaluations(request.eval_ids, fields=request.fields)
+    except Exception as e:
+        logger.error(f"Error fetching {len(request.eval_ids)} evaluations: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    missing = [eval_id for eval_id in dict.fromkeys(request.eval_ids) if eval_id not in evaluations]
+    return EvaluationBatchGetResponse(evaluations=evaluations, missing=missing)
+
+
 # Storage Explorer endpoints
 @app.get("/storage/overview")
 async def get_storage_overview():
@@ -914,7 +943,12 @@ async def get_openapi_yaml():
 # Logs endpoints
 @app.post("/evaluations/{eval_id}/logs")
 async def append_evaluation_logs(eval_id: str, request: Dict[str, Any]):
-    """Append logs to an evaluation"""
+    """Append logs to an evaluation
+
+    Appends are stored as sequence-numbered log chunks so each flush is O(1)
+    instead of rewriting the whole output. Chunks are compacted into the
+    evaluation's output when it reaches a terminal status.
+    """
     content = request.get("content", "")
     append = request.get("append", True)
 
@@ -923,11 +957,22 @@ async def append_evaluation_logs(eval_id: str, request: Dict[str, Any]):
     if not existing:
         raise HTTPException(status_code=404, detail="Evaluation not found")
 
-    # Handle log appending
+    is_terminal = existing.get("status") in TERMINAL_STATUSES
+
+    if append and not is_terminal:
+        seq = storage.append_logs(
+            eval_id, content, timestamp=request.get("last_update") or request.get("timestamp")
+        )
+        if seq is None:
+            raise HTTPException(status_code=500, detail="Failed to append logs")
+        return {"status": "success", "eval_id": eval_id, "seq": seq}
+
+    # Late appends to a finished evaluation, and full replacements, write the output directly
     if append:
-        current_output = existing.get("output", "")
-        new_output = current_output + content
+        # Content carries its own newlines, like the chunks compacted into the output
+        new_output = (existing.get("output") or "") + content
     else:
+        storage.delete_log_chunks(eval_id)
         new_output = content
 
     # Prepare update data
@@ -946,8 +991,43 @@ async def append_evaluation_logs(eval_id: str, request: Dict[str, Any]):
 
 
 @app.get("/evaluations/{eval_id}/logs")
-async def get_evaluation_logs(eval_id: str):
-    """Get logs for an evaluation with Redis cache check"""
+async def get_evaluation_logs(
+    eval_id: str,
+    offset: int = Query(default=0, ge=0, description="First log chunk to return"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Maximum log chunks to return"),
+    tail: Optional[int] = Query(default=None, ge=1, description="Return only the last N log chunks"),
+):
+    """Get logs for an evaluation
+
+    While an evaluation is producing output, logs are served from the chunk
+    store and ``offset``/``limit``/``tail`` select chunks by sequence number;
+    clients can resume from ``next_offset``. Once compacted, the full output
+    is returned from the evaluation record.
+    """
+    total_chunks = storage.count_log_chunks(eval_id)
+    if total_chunks:
+        result = storage.get_evaluation(eval_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="Evaluation not found")
+
+        chunks = storage.get_log_chunks(eval_id, offset=offset, limit=limit, tail=tail)
+        return {
+            "eval_id": eval_id,
+            "output": "".join(chunk["content"] for chunk in chunks),
+            "error": result.get("error", ""),
+            "is_running": result.get("status") == "running",
+            "exit_code": result.get("exit_code"),
+            "source": "log_chunks",
+            "offset": chunks[0]["seq"] if chunks else offset,
+            "next_offset": chunks[-1]["seq"] + 1 if chunks else offset,
+            "total_chunks": total_chunks,
+            "last_update": chunks[-1]["timestamp"] if chunks else result.get("started_at"),
+            "started_at": result.get("started_at"),
+            "completed_at": result.get("completed_at"),
+            "status": result.get("status"),
+            "runtime_ms": result.get("runtime_ms"),
+        }
+
     # Check Redis cache first for running evaluations
     if redis_client:
         try:
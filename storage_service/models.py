@@ -111,4 +111,17 @@ class RunningEvaluationInfo(BaseModel):
 
 class RunningEvaluationsResponse(BaseModel):
     running_evaluations: List[RunningEvaluationInfo]
-    count: int
\ No newline at end of file
+    count: int
+
+class EvaluationBatchGetRequest(BaseModel):
+    eval_ids: List[str] = Field(..., description="Evaluation IDs to fetch")
+    fields: Optional[List[str]] = Field(
+        None, description="Fields to return besides id (all fields if omitted)"
+    )
+
+
+class EvaluationBatchGetResponse(BaseModel):
+    evaluations: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict, description="Found evaluations keyed by ID"
+    )
+    missing: List[str] = Field(default_factory=list, description="IDs with no stored evaluation")
@@ -10,7 +10,7 @@ import asyncio
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,6 +22,8 @@ import uvicorn
 from shared.generated.python import EvaluationStatus
 from shared.state_machine import validate_and_update_status
 from shared.utils.resilient_connections import get_async_redis_client
+from shared.utils.batch_tracking import get_batch_id, record_transition
+from shared.utils.admission import release_evaluation
 
 # Configure standard logging for libraries (redis, etc)
 logging.basicConfig(
@@ -172,6 +174,19 @@ class StorageWorker:
                 timer = asyncio.create_task(self.delayed_flush(eval_id))
                 self.log_buffer_timers[eval_id] = timer
 
+    async def flush_pending_logs(self, eval_id: str):
+        """Flush and drop any buffered logs before an evaluation reaches a terminal state.
+
+        Chunks must be stored before the terminal status update so the storage
+        service can compact them into the final output.
+        """
+        if eval_id in self.log_buffer_timers:
+            self.log_buffer_timers[eval_id].cancel()
+            del self.log_buffer_timers[eval_id]
+        if eval_id in self.log_buffers:
+            await self.flush_logs(eval_id)
+            del self.log_buffers[eval_id]
+
     async def delayed_flush(self, eval_id: str):
         """Flush logs after timeout"""
         await asyncio.sleep(self.log_batch_timeout)
@@ -188,8 +203,8 @@ class StorageWorker:
         self.log_buffers[eval_id] = []
 
         try:
-            # Combine all log content
-            combined_logs = "\n".join(log["content"] for log in logs)
+            # Combine all log content; chunks end with their own newlines
+            combined_logs = "".join(log["content"] for log in logs)
 
             # Update storage service
             response = await self.client.post(
@@ -217,6 +232,24 @@ class StorageWorker:
         except Exception as e:
             logger.error(f"Error flushing logs for {eval_id}: {e}")
 
+    async def record_batch_progress(self, eval_id: str, status: str) -> Optional[str]:
+        """Count a persisted transition in the evaluation's batch; returns its batch_id"""
+        try:
+            batch_id = await get_batch_id(self.redis, eval_id)
+            if batch_id:
+                await record_transition(self.redis, batch_id, eval_id, status)
+            return batch_id
+        except Exception as e:
+            logger.warning(f"Failed to record batch progress for {eval_id}: {e}")
+            return None
+
+    async def release_admission(self, eval_id: str):
+        """Free the submitting client's concurrency slot and count the evaluation as drained"""
+        try:
+            await release_evaluation(self.redis, eval_id)
+        except Exception as e:
+            logger.warning(f"Failed to release admission slot for {eval_id}: {e}")
+
     async def handle_evaluation_submitted(self, data: Dict[str, Any]):
         """Handle evaluation submitted event - create initial record"""
         eval_id = data.get("eval_id")
@@ -275,13 +308,12 @@ class StorageWorker:
 
             if success:
                 logger.info(f"Updated evaluation {eval_id} to queued status")
+                batch_id = await self.record_batch_progress(eval_id, EvaluationStatus.QUEUED.value)
                 # Publish confirmation event (other services can listen)
-                await self.redis.publish(
-                    "storage:evaluation:queued",
-                    json.dumps(
-                        {"eval_id": eval_id, "timestamp": datetime.now(timezone.utc).isoformat()}
-                    ),
-                )
+                confirmation = {"eval_id": eval_id, "timestamp": datetime.now(timezone.utc).isoformat()}
+                if batch_id:
+                    confirmation["batch_id"] = batch_id
+                await self.redis.publish("storage:evaluation:queued", json.dumps(confirmation))
             else:
                 logger.error(f"Failed to update evaluation {eval_id} to queued: {error}")
 
@@ -300,11 +332,14 @@ class StorageWorker:
 
         try:
             # Validate and update status to running using shared helper
+            # (metadata: node placement and image pull wait, when the dispatcher knows them)
+            metadata = data.get("metadata", {})
             success, error = await validate_and_update_status(
                 http_client=self.client,
                 storage_url=self.storage_url,
                 eval_id=eval_id, 
-                new_status=EvaluationStatus.RUNNING.value
+                new_status=EvaluationStatus.RUNNING.value,
+                update_data={"metadata": metadata} if metadata else None
             )
             
             if not success:
@@ -327,18 +362,17 @@ class StorageWorker:
             await self.redis.sadd("running_evaluations", eval_id)
 
             logger.info(f"Stored running info for {eval_id} on {executor_id}")
+            batch_id = await self.record_batch_progress(eval_id, EvaluationStatus.RUNNING.value)
 
             # Publish confirmation event
-            await self.redis.publish(
-                "storage:evaluation:running",
-                json.dumps(
-                    {
-                        "eval_id": eval_id,
-                        "executor_id": executor_id,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    }
-                ),
-            )
+            confirmation = {
+                "eval_id": eval_id,
+                "executor_id": executor_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            if batch_id:
+                confirmation["batch_id"] = batch_id
+            await self.redis.publish("storage:evaluation:running", json.dumps(confirmation))
 
         except Exception as e:
             logger.error(f"Error handling running evaluation {eval_id}: {e}")
@@ -354,11 +388,13 @@ class StorageWorker:
         logger.info(f"Storage-worker handling completed event for {eval_id}")
 
         try:
-            # Check if logs are empty - this indicates a potential race condition
+            # Logs were captured once by the dispatcher when the job finished
             output = data.get("output", "")
             metadata = data.get("metadata", {})
             log_source = metadata.get("log_source", "unknown")
-            
+
+            await self.flush_pending_logs(eval_id)
+
             # Validate and update status to completed using shared helper
             update_data = {
                 "output": output,
@@ -382,30 +418,18 @@ class StorageWorker:
                 await self.redis.srem("running_evaluations", eval_id)
                 logger.info(f"Cleaned up Redis running info for {eval_id}")
 
-                # Flush any remaining logs
-                if eval_id in self.log_buffers:
-                    await self.flush_logs(eval_id)
-                    del self.log_buffers[eval_id]
-                if eval_id in self.log_buffer_timers:
-                    self.log_buffer_timers[eval_id].cancel()
-                    del self.log_buffer_timers[eval_id]
-
-                # If logs are empty, schedule async log fetch
-                if not output and metadata.get("job_name"):
-                    logger.info(f"Scheduling async log fetch for {eval_id} (job: {metadata['job_name']})")
-                    asyncio.create_task(self.fetch_logs_async(eval_id, metadata["job_name"]))
+                batch_id = await self.record_batch_progress(eval_id, EvaluationStatus.COMPLETED.value)
+                await self.release_admission(eval_id)
 
                 # Publish confirmation event
-                await self.redis.publish(
-                    "storage:evaluation:updated",
-                    json.dumps(
-                        {
-                            "eval_id": eval_id,
-                            "status": EvaluationStatus.COMPLETED.value,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ),
-                )
+                confirmation = {
+                    "eval_id": eval_id,
+                    "status": EvaluationStatus.COMPLETED.value,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+                if batch_id:
+                    confirmation["batch_id"] = batch_id
+                await self.redis.publish("storage:evaluation:updated", json.dumps(confirmation))
             else:
                 logger.error(f"Failed to update completed evaluation {eval_id}: {error}")
 
@@ -423,6 +447,8 @@ class StorageWorker:
             return
 
         try:
+            await self.flush_pending_logs(eval_id)
+
             # Validate and update status to failed using shared helper
             update_data = {
                 "error": error,
@@ -444,22 +470,18 @@ class StorageWorker:
                 await self.redis.delete(f"eval:{eval_id}:running")
                 await self.redis.srem("running_evaluations", eval_id)
 
-                # If error logs are empty and we have a job name, fetch logs async
-                if not error and metadata.get("job_name"):
-                    logger.info(f"Scheduling async log fetch for failed {eval_id} (job: {metadata['job_name']})")
-                    asyncio.create_task(self.fetch_logs_async(eval_id, metadata["job_name"]))
+                batch_id = await self.record_batch_progress(eval_id, EvaluationStatus.FAILED.value)
+                await self.release_admission(eval_id)
 
                 # Publish confirmation event
-                await self.redis.publish(
-                    "storage:evaluation:updated",
-                    json.dumps(
-                        {
-                            "eval_id": eval_id,
-                            "status": EvaluationStatus.FAILED.value,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ),
-                )
+                confirmation = {
+                    "eval_id": eval_id,
+                    "status": EvaluationStatus.FAILED.value,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+                if batch_id:
+                    confirmation["batch_id"] = batch_id
+                await self.redis.publish("storage:evaluation:updated", json.dumps(confirmation))
             else:
                 logger.error(f"Failed to update failed evaluation {eval_id}: {error_msg}")
 
@@ -475,6 +497,8 @@ class StorageWorker:
             return
         
         try:
+            await self.flush_pending_logs(eval_id)
+
             # Validate and update status to cancelled using shared helper
             success, error_msg = await validate_and_update_status(
                 http_client=self.client,
@@ -490,107 +514,23 @@ class StorageWorker:
                 await self.redis.delete(f"eval:{eval_id}:running")
                 await self.redis.srem("running_evaluations", eval_id)
                 
+                batch_id = await self.record_batch_progress(eval_id, EvaluationStatus.CANCELLED.value)
+                await self.release_admission(eval_id)
+
                 # Publish confirmation event
-                await self.redis.publish(
-                    "storage:evaluation:updated",
-                    json.dumps(
-                        {
-                            "eval_id": eval_id,
-                            "status": EvaluationStatus.CANCELLED.value,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ),
-                )
+                confirmation = {
+                    "eval_id": eval_id,
+                    "status": EvaluationStatus.CANCELLED.value,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+                if batch_id:
+                    confirmation["batch_id"] = batch_id
+                await self.redis.publish("storage:evaluation:updated", json.dumps(confirmation))
             else:
                 logger.error(f"Failed to update cancelled evaluation {eval_id}: {error_msg}")
         except Exception as e:
             logger.error(f"Error updating cancelled evaluation {eval_id}: {e}")
 
-    async def fetch_logs_async(self, eval_id: str, job_name: str):
-        """
-        Asynchronously fetch logs for a completed evaluation.
-        This runs in the background to handle the race condition where logs
-        might not be immediately available when the job completes.
-        """
-        max_attempts = 10
-        delay = 2  # Start with 2 second delay
-        
-        logger.info(f"Starting async log fetch for {eval_id} (job: {job_name})")
-        
-        for attempt in range(max_attempts):
-            try:
-                # Wait before attempting (exponential backoff)
-                await asyncio.sleep(delay)
-                
-                # Try to get logs from dispatcher
-                dispatcher_url = os.getenv("DISPATCHER_SERVICE_URL", "http://dispatcher-service:8090")
-                response = await self.client.get(f"{dispatcher_url}/logs/{job_name}")
-                
-                if response.status_code == 200:
-                    log_data = response.json()
-                    logs = log_data.get("logs", "")
-                    
-                    if logs and logs.strip():
-                        # Successfully fetched logs - update the evaluation
-                        logger.info(f"Fetched logs for {eval_id} on attempt {attempt + 1} (source: {log_data.get('source', 'unknown')})")
-                        
-                        # Get current evaluation to check status
-                        eval_response = await self.client.get(f"{self.storage_url}/evaluations/{eval_id}")
-                        if eval_response.status_code != 200:
-                            logger.error(f"Failed to get evaluation {eval_id} for log update")
-                            return
-                        
-                        eval_data = eval_response.json()
-                        
-                        # Update the appropriate field based on status
-                        update_payload = {
-                            "metadata": {
-                                "log_fetch_attempts": attempt + 1,
-                                "log_source": log_data.get("source", "unknown"),
-                                "log_fetch_completed_at": datetime.now(timezone.utc).isoformat()
-                            }
-                        }
-                        
-                        if eval_data.get("status") == "failed":
-                            update_payload["error"] = logs
-                        else:
-                            update_payload["output"] = logs
-                        
-                        # Update the evaluation with the fetched logs
-                        update_response = await self.client.put(
-                            f"{self.storage_url}/evaluations/{eval_id}",
-                            json=update_payload
-                        )
-                        
-                        if update_response.status_code == 200:
-                            logger.info(f"Successfully updated logs for {eval_id}")
-                            # Publish event to notify that logs are now available
-                            await self.redis.publish(
-                                "storage:evaluation:logs_updated",
-                                json.dumps({
-                                    "eval_id": eval_id,
-                                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                                    "log_length": len(logs)
-                                })
-                            )
-                        else:
-                            logger.error(f"Failed to update logs for {eval_id}: {update_response.status_code}")
-                        
-                        return  # Success, exit
-                    else:
-                        logger.info(f"Logs still empty for {eval_id} on attempt {attempt + 1}")
-                else:
-                    logger.warning(f"Failed to fetch logs for {eval_id}: HTTP {response.status_code}")
-                
-                # Exponential backoff with max delay of 30 seconds
-                delay = min(delay * 1.5, 30)
-                
-            except Exception as e:
-                logger.error(f"Error fetching logs for {eval_id} on attempt {attempt + 1}: {e}")
-                delay = min(delay * 1.5, 30)
-        
-        logger.warning(f"Failed to fetch logs for {eval_id} after {max_attempts} attempts")
-
     async def health_check(self) -> Dict[str, Any]:
         """Check worker health"""
         try:
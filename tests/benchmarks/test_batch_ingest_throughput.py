@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Batch Ingestion Benchmark
+
+Measures how fast /api/eval-batch items are enqueued into Celery by the
+gateway's background ingestion, comparing the previous one-at-a-time
+trickle (fixed 100ms/500ms sleeps, a broker publish and Redis calls per
+item) with chunked ingestion (pipelined events and pending keys, one
+producer connection per chunk).
+
+Requires a Redis server; it is used both as the platform Redis and as the
+Celery broker. Queues and keys written by the run are deleted afterwards.
+
+Key metrics:
+- Items enqueued per second
+- Wall time to enqueue the whole batch
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Configuration
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "10000"))
+LEGACY_BATCH_SIZE = int(os.environ.get("LEGACY_BATCH_SIZE", "100"))
+
+QUEUES = ("high_priority", "evaluation", "low_priority")
+
+
+def load_gateway():
+    """Import the gateway with Celery enabled against the benchmark Redis."""
+    os.environ.update({
+        "QUEUE_SERVICE_URL": "http://queue",
+        "STORAGE_SERVICE_URL": "http://storage",
+        "DISPATCHER_SERVICE_URL": "http://dispatcher",
+        "REDIS_URL": REDIS_URL,
+        "CELERY_BROKER_URL": REDIS_URL,
+        "CELERY_ENABLED": "true",
+        "INTERNAL_API_KEY": "benchmark",
+        # Measure raw enqueue rate; pacing only engages on a backed-up queue
+        "BATCH_INGEST_MAX_QUEUE_DEPTH": os.environ.get("BATCH_INGEST_MAX_QUEUE_DEPTH", str(BATCH_SIZE * 2)),
+    })
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    import logging
+    from api import microservices_gateway
+
+    logging.getLogger("api.microservices_gateway").setLevel(logging.WARNING)
+    logging.getLogger("api.celery_client").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return microservices_gateway
+
+
+def make_requests(gateway, count: int) -> List[Any]:
+    return [
+        gateway.EvaluationRequest(code=f"print({i})", priority=[0, 500, 1000][i % 3])
+        for i in range(count)
+    ]
+
+
+async def legacy_ingest(gateway, evaluations, eval_ids):
+    """The previous _process_batch_async: one item at a time with fixed sleeps."""
+    from api.celery_client import submit_evaluation_to_celery
+
+    BATCH_SIZE = 5
+    BASE_DELAY = 0.1
+    BATCH_DELAY = 0.5
+
+    for batch_idx in range(0, len(evaluations), BATCH_SIZE):
+        batch = list(zip(evaluations[batch_idx:batch_idx + BATCH_SIZE], eval_ids[batch_idx:batch_idx + BATCH_SIZE]))
+        for item_idx, (request, eval_id) in enumerate(batch):
+            await gateway.publish_evaluation_event(
+                "evaluation:queued", {"eval_id": eval_id, "code": request.code}
+            )
+            submit_evaluation_to_celery(
+                eval_id=eval_id, code=request.code, priority=request.priority, timeout=request.timeout
+            )
+            await gateway.redis_client.setex(f"pending:{eval_id}", 600, "queued")
+            if item_idx < len(batch) - 1:
+                await asyncio.sleep(BASE_DELAY)
+        if batch_idx + BATCH_SIZE < len(evaluations):
+            await asyncio.sleep(BATCH_DELAY)
+
+
+async def cleanup(gateway, eval_ids):
+    """Drop everything the run wrote so it doesn't reach real workers."""
+    pipe = gateway.redis_client.pipeline(transaction=False)
+    for queue in QUEUES:
+        pipe.delete(queue)
+    for eval_id in eval_ids:
+        pipe.delete(f"pending:{eval_id}", f"task_mapping:{eval_id}")
+    await pipe.execute()
+    async for key in gateway.redis_client.scan_iter(match="eval_mapping:*"):
+        await gateway.redis_client.delete(key)
+
+
+async def measure(gateway, label: str, ingest, count: int) -> Dict[str, Any]:
+    evaluations = make_requests(gateway, count)
+    eval_ids = [gateway.generate_evaluation_id() for _ in evaluations]
+
+    started = time.perf_counter()
+    await ingest(evaluations, eval_ids)
+    elapsed = time.perf_counter() - started
+
+    enqueued = sum(await asyncio.gather(*(gateway.redis_client.llen(q) for q in QUEUES)))
+    await cleanup(gateway, eval_ids)
+    return {
+        "mode": label,
+        "items": count,
+        "enqueued": enqueued,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(count / elapsed, 1),
+    }
+
+
+async def run_benchmark(gateway) -> Dict[str, Any]:
+    import httpx
+
+    gateway.redis_client = await gateway.get_async_redis_client(REDIS_URL)
+    # Dispatcher stub: always has capacity
+    dispatcher = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"has_capacity": True}))
+    )
+    gateway.get_http_client = lambda upstream: dispatcher
+
+    before = await measure(
+        gateway, "legacy_trickle", lambda e, i: legacy_ingest(gateway, e, i), LEGACY_BATCH_SIZE
+    )
+    after = await measure(gateway, "chunked", gateway._process_batch_async, BATCH_SIZE)
+
+    await dispatcher.aclose()
+    await gateway.redis_client.aclose()
+    return {
+        "before": before,
+        "after": after,
+        "speedup": round(after["items_per_second"] / before["items_per_second"], 1),
+    }
+
+
+def main():
+    gateway = load_gateway()
+    print(f"Benchmarking batch ingestion (legacy={LEGACY_BATCH_SIZE} items, chunked={BATCH_SIZE} items)")
+    results = asyncio.run(run_benchmark(gateway))
+
+    for key in ("before", "after"):
+        r = results[key]
+        print(f"  {r['mode']:<16} {r['items']:>6} items in {r['seconds']:>7}s  "
+              f"{r['items_per_second']:>9} items/s  (enqueued {r['enqueued']})")
+    print(f"  Speedup: {results['speedup']}x")
+
+    with open("batch_ingest_benchmark_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("Results saved to batch_ingest_benchmark_results.json")
+
+
+if __name__ == "__main__":
+    main()
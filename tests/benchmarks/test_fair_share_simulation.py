@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Fair-Share Scheduling Simulation
+
+Simulates a worker pool under skewed load and reports per-tenant queue
+wait (dispatch time minus submission time) for:
+
+- celery_fifo: today's routing. One FIFO per Celery queue, shared by all
+  tenants; workers poll the queues round robin (as kombu's Redis
+  transport does).
+- fair_share: per-(tenant, queue) virtual queues dispatched by the
+  production planner, shared.utils.fair_share.plan_dispatch, whenever a
+  worker slot frees up.
+
+The default workload has one tenant dropping a large batch at t=0 while
+others submit steadily at normal, high and low priority. Everything is
+deterministic for a given SEED. No services are needed.
+
+Key metrics:
+- Mean / p50 / p95 / max wait per tenant
+- Total makespan (both schedulers are work conserving, so it differs only
+  by which runtimes end up last)
+"""
+
+import heapq
+import json
+import os
+import random
+import sys
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.utils.fair_share import (  # noqa: E402
+    FAIR_SHARE_QUEUE_WEIGHTS,
+    VirtualQueue,
+    plan_dispatch,
+)
+from shared.utils.priority_mapping import get_celery_queue  # noqa: E402
+
+# Configuration
+SEED = int(os.environ.get("SEED", "7"))
+WORKER_SLOTS = int(os.environ.get("WORKER_SLOTS", "20"))
+MEAN_RUNTIME = float(os.environ.get("MEAN_RUNTIME", "4.0"))  # Seconds per evaluation
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", "3000"))
+STREAM_DURATION = float(os.environ.get("STREAM_DURATION", "600"))  # Seconds of steady submissions
+AGEING_SECONDS = float(os.environ.get("FAIR_SHARE_AGEING_SECONDS", "60"))
+
+# (tenant, priority, submissions per second) for the steady streams
+STREAMS = [
+    ("alice", 500, 0.5),
+    ("bob", 500, 0.5),
+    ("carol", 0, 0.2),      # low_priority
+    ("dave", 1000, 0.1),    # high_priority
+]
+BULK_TENANT = ("bulk", 500)
+
+CELERY_QUEUE_ORDER = ("high_priority", "evaluation", "low_priority")
+
+
+def make_workload(rng: random.Random) -> List[Tuple[float, str, int, float]]:
+    """(submitted_at, tenant, priority, runtime) for every evaluation, by time."""
+    jobs = [(0.0, BULK_TENANT[0], BULK_TENANT[1], rng.expovariate(1 / MEAN_RUNTIME))
+            for _ in range(BULK_BATCH_SIZE)]
+    for tenant, priority, rate in STREAMS:
+        t = rng.expovariate(rate)
+        while t < STREAM_DURATION:
+            jobs.append((t, tenant, priority, rng.expovariate(1 / MEAN_RUNTIME)))
+            t += rng.expovariate(rate)
+    jobs.sort(key=lambda job: job[0])
+    return jobs
+
+
+class CeleryFifo:
+    """Shared FIFO per Celery queue, polled round robin."""
+
+    def __init__(self):
+        self.queues = {queue: deque() for queue in CELERY_QUEUE_ORDER}
+        self.next_queue = 0
+
+    def add(self, job, now):
+        self.queues[get_celery_queue(job[2])].append(job)
+
+    def pending(self) -> bool:
+        return any(self.queues.values())
+
+    def take(self, budget: int, now: float) -> List[Any]:
+        taken = []
+        while budget > 0 and self.pending():
+            queue = CELERY_QUEUE_ORDER[self.next_queue]
+            self.next_queue = (self.next_queue + 1) % len(CELERY_QUEUE_ORDER)
+            if self.queues[queue]:
+                taken.append(self.queues[queue].popleft())
+                budget -= 1
+        return taken
+
+
+class FairShare:
+    """Virtual queues per (tenant, Celery queue), planned by plan_dispatch."""
+
+    def __init__(self):
+        self.queues: Dict[str, deque] = defaultdict(deque)
+        self.deficits: Dict[str, float] = {}
+        self.cursor = None
+
+    def add(self, job, now):
+        self.queues[f"{job[1]}|{get_celery_queue(job[2])}"].append(job)
+
+    def pending(self) -> bool:
+        return any(self.queues.values())
+
+    def take(self, budget: int, now: float) -> List[Any]:
+        virtual_queues = [
+            VirtualQueue(name, FAIR_SHARE_QUEUE_WEIGHTS.get(name.rpartition("|")[2], 1.0), len(jobs), jobs[0][0])
+            for name, jobs in self.queues.items()
+            if jobs
+        ]
+        picks, self.deficits, self.cursor = plan_dispatch(
+            virtual_queues, self.deficits, budget, now, self.cursor, AGEING_SECONDS
+        )
+        return [self.queues[name].popleft() for name in picks]
+
+
+def simulate(scheduler, jobs) -> Dict[str, Any]:
+    """Event-driven run: arrivals and completions, dispatching into free slots."""
+    waits: Dict[str, List[float]] = defaultdict(list)
+    events: List[Tuple[float, int, str, Any]] = []
+    for seq, job in enumerate(jobs):
+        heapq.heappush(events, (job[0], seq, "arrive", job))
+    seq = len(jobs)
+    free = WORKER_SLOTS
+    now = 0.0
+
+    while events:
+        now, _, kind, job = heapq.heappop(events)
+        if kind == "arrive":
+            scheduler.add(job, now)
+        else:
+            free += 1
+        # Dispatch only once all events at this instant are applied
+        if events and events[0][0] == now:
+            continue
+        if free and scheduler.pending():
+            for started in scheduler.take(free, now):
+                free -= 1
+                waits[started[1]].append(now - started[0])
+                seq += 1
+                heapq.heappush(events, (now + started[3], seq, "finish", started))
+
+    return {"makespan_seconds": round(now, 1), "tenants": {t: summarize(w) for t, w in sorted(waits.items())}}
+
+
+def summarize(waits: List[float]) -> Dict[str, Any]:
+    waits = sorted(waits)
+
+    def percentile(p):
+        return round(waits[min(len(waits) - 1, int(p * len(waits)))], 1)
+
+    return {
+        "count": len(waits),
+        "mean_wait": round(sum(waits) / len(waits), 1),
+        "p50_wait": percentile(0.50),
+        "p95_wait": percentile(0.95),
+        "max_wait": round(waits[-1], 1),
+    }
+
+
+def main():
+    jobs = make_workload(random.Random(SEED))
+    print(
+        f"Simulating {len(jobs)} evaluations on {WORKER_SLOTS} slots "
+        f"(bulk batch of {BULK_BATCH_SIZE} at t=0, steady streams for {STREAM_DURATION:.0f}s)"
+    )
+    results = {
+        "celery_fifo": simulate(CeleryFifo(), jobs),
+        "fair_share": simulate(FairShare(), jobs),
+    }
+
+    for mode, result in results.items():
+        print(f"\n{mode} (makespan {result['makespan_seconds']}s)")
+        print(f"  {'tenant':<8} {'count':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+        for tenant, stats in result["tenants"].items():
+            print(
+                f"  {tenant:<8} {stats['count']:>6} {stats['mean_wait']:>7}s {stats['p50_wait']:>7}s "
+                f"{stats['p95_wait']:>7}s {stats['max_wait']:>7}s"
+            )
+
+    with open("fair_share_simulation_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to fair_share_simulation_results.json")
+
+
+if __name__ == "__main__":
+    main()
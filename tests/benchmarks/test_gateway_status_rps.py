@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Gateway Status Endpoint Benchmark
+
+Measures GET /api/eval/{id}/status requests per second through the API
+gateway with a new upstream HTTP client per request (the previous
+behaviour) versus the shared pooled clients.
+
+The gateway runs in-process behind an ASGI transport and talks over real
+TCP to a stub storage service, so the numbers isolate the cost of
+upstream connection handling from the rest of the platform.
+
+Key metrics:
+- Requests per second
+- Latency percentiles (p50, p95, p99)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, Any
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException
+
+# Configuration
+CONCURRENCY = int(os.environ.get("CONCURRENCY", "32"))
+TEST_DURATION_SECONDS = float(os.environ.get("TEST_DURATION_SECONDS", "10"))
+WARMUP_SECONDS = float(os.environ.get("WARMUP_SECONDS", "1"))
+EVAL_ID = "20250101_000000_deadbeef"
+
+
+def create_stub_storage() -> FastAPI:
+    """Minimal storage service: the evaluation is completed and not running."""
+    stub = FastAPI()
+
+    @stub.get("/evaluations/{eval_id}/running")
+    async def running(eval_id: str):
+        raise HTTPException(status_code=404, detail="Not running")
+
+    @stub.get("/evaluations/{eval_id}")
+    async def evaluation(eval_id: str):
+        return {
+            "id": eval_id,
+            "status": "completed",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "completed_at": "2025-01-01T00:00:01+00:00",
+            "output": "hello",
+            "error": "",
+        }
+
+    return stub
+
+
+def start_stub_storage() -> str:
+    """Serve the stub storage service on a free local port in a background thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(create_stub_storage(), host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def load_gateway(storage_url: str):
+    """Import the gateway configured against the stub storage service."""
+    os.environ.update({
+        "QUEUE_SERVICE_URL": storage_url,
+        "STORAGE_SERVICE_URL": storage_url,
+        "DISPATCHER_SERVICE_URL": storage_url,
+        "REDIS_URL": "redis://localhost:6379",
+        "INTERNAL_API_KEY": "benchmark",
+    })
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    import logging
+    from api import microservices_gateway
+
+    logging.getLogger("api.microservices_gateway").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return microservices_gateway
+
+
+async def run_load(gateway, label: str) -> Dict[str, Any]:
+    """Drive the status endpoint at fixed concurrency and collect latencies."""
+    latencies = []
+    errors = 0
+    transport = httpx.ASGITransport(app=gateway.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        async def worker(deadline: float, record: bool):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(f"/api/eval/{EVAL_ID}/status")
+                if not record:
+                    continue
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        warmup_deadline = time.perf_counter() + WARMUP_SECONDS
+        await asyncio.gather(*(worker(warmup_deadline, False) for _ in range(CONCURRENCY)))
+
+        started = time.perf_counter()
+        deadline = started + TEST_DURATION_SECONDS
+        await asyncio.gather(*(worker(deadline, True) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "mode": label,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(ordered), 2) if ordered else None,
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 2) if ordered else None,
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1], 2) if ordered else None,
+    }
+
+
+async def run_benchmark(gateway) -> Dict[str, Any]:
+    pooled_get_http_client = gateway.get_http_client
+    per_request_clients = []
+
+    def per_request_client(upstream: str) -> httpx.AsyncClient:
+        # Previous behaviour: a fresh client (and connection) for every handler call
+        client = gateway.create_http_client(upstream)
+        per_request_clients.append(client)
+        return client
+
+    gateway.get_http_client = per_request_client
+    try:
+        before = await run_load(gateway, "per_request_client")
+    finally:
+        gateway.get_http_client = pooled_get_http_client
+        for client in per_request_clients:
+            await client.aclose()
+
+    after = await run_load(gateway, "pooled_clients")
+    pool_stats = gateway.get_http_pool_stats("storage")
+    await gateway.close_http_clients()
+
+    return {
+        "concurrency": CONCURRENCY,
+        "duration_seconds": TEST_DURATION_SECONDS,
+        "before": before,
+        "after": after,
+        "speedup": round(after["rps"] / before["rps"], 2) if before["rps"] else None,
+        "pooled_connections": pool_stats["connections"],
+    }
+
+
+def main():
+    storage_url = start_stub_storage()
+    gateway = load_gateway(storage_url)
+
+    print(f"Benchmarking GET /api/eval/{{id}}/status "
+          f"(concurrency={CONCURRENCY}, duration={TEST_DURATION_SECONDS}s per mode)")
+    results = asyncio.run(run_benchmark(gateway))
+
+    for key in ("before", "after"):
+        r = results[key]
+        print(f"  {r['mode']:<20} {r['rps']:>8} req/s  "
+              f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms errors={r['errors']}")
+    print(f"  Speedup: {results['speedup']}x")
+
+    with open("gateway_status_benchmark_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("Results saved to gateway_status_benchmark_results.json")
+
+
+if __name__ == "__main__":
+    main()
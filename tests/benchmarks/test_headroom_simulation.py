@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Headroom Controller Simulation
+
+Replays an arrival trace against a simulated autoscaled cluster and reports
+how long evaluation pods wait to be scheduled, comparing:
+
+- reactive: today's behaviour. Nodes are added only once evaluation pods
+  are unschedulable, so a burst waits out node provisioning.
+- headroom: the production controller (shared.utils.headroom) sizes
+  low-priority placeholder pods every HEADROOM_INTERVAL seconds; an
+  evaluation preempts a placeholder instantly, and pending placeholders
+  make the autoscaler add nodes ahead of demand.
+
+The cluster is modelled in one-second steps: nodes of SLOTS_PER_NODE
+evaluation-sized slots, NODE_PROVISION_SECONDS to add a node, empty nodes
+removed after SCALE_DOWN_UNNEEDED_SECONDS (the autoscaler's default 10
+minutes), evaluations reaching the cluster DISPATCH_DELAY seconds after
+submission (the Celery backlog the controller sees).
+
+Traces: TRACE_FILE is a JSON list of submission times, either numbers
+(seconds or epoch seconds) or objects with "created_at" (ISO 8601), e.g.
+exported from the storage service's evaluations. Without one, a
+deterministic synthetic trace (steady load with bursts, SEED) is used.
+Controller knobs come from the same HEADROOM_* variables as production,
+so a policy can be tuned here before it is deployed. No services needed.
+
+Key metrics:
+- Mean / p50 / p95 / max scheduling wait per evaluation
+- Node-hours (what the headroom costs)
+"""
+
+import heapq
+import json
+import math
+import os
+import random
+import sys
+from collections import deque
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.utils.headroom import HeadroomController, HeadroomPolicy  # noqa: E402
+
+# Configuration
+SEED = int(os.environ.get("SEED", "11"))
+TRACE_FILE = os.environ.get("TRACE_FILE")
+SLOTS_PER_NODE = int(os.environ.get("SLOTS_PER_NODE", "8"))
+MIN_NODES = int(os.environ.get("MIN_NODES", "1"))
+MAX_NODES = int(os.environ.get("MAX_NODES", "20"))
+NODE_PROVISION_SECONDS = int(os.environ.get("NODE_PROVISION_SECONDS", "150"))
+SCALE_DOWN_UNNEEDED_SECONDS = int(os.environ.get("SCALE_DOWN_UNNEEDED_SECONDS", "600"))
+MEAN_RUNTIME = float(os.environ.get("MEAN_RUNTIME", "45"))  # Seconds per evaluation
+DISPATCH_DELAY = int(os.environ.get("DISPATCH_DELAY", "2"))  # Submission to Job creation
+HEADROOM_INTERVAL = int(os.environ.get("HEADROOM_INTERVAL_SECONDS", "15"))
+DURATION = int(os.environ.get("DURATION", "3600"))  # Synthetic trace length
+
+# Synthetic trace: (start, length, submissions per second)
+BASE_RATE = 0.05
+BURSTS = [(600, 300, 0.4), (1800, 120, 1.0), (2700, 600, 0.25)]
+
+
+def synthetic_trace(rng: random.Random) -> List[float]:
+    """Poisson arrivals at BASE_RATE, plus ramping bursts."""
+    arrivals = []
+    t = 0.0
+    while t < DURATION:
+        rate = BASE_RATE
+        for start, length, burst_rate in BURSTS:
+            if start <= t < start + length:
+                rate += burst_rate * min(1.0, (t - start + 1) / 60)  # Ramp up over a minute
+        t += rng.expovariate(rate)
+        arrivals.append(t)
+    return arrivals
+
+
+def load_trace(path: str) -> List[float]:
+    """Submission offsets in seconds from the first one."""
+    with open(path) as f:
+        raw = json.load(f)
+    times = []
+    for entry in raw:
+        if isinstance(entry, dict):
+            entry = datetime.fromisoformat(entry["created_at"].replace("Z", "+00:00")).timestamp()
+        times.append(float(entry))
+    times.sort()
+    return [t - times[0] for t in times]
+
+
+class Cluster:
+    """Nodes of fixed slots, a FIFO of pending evaluations and placeholders, and a reactive autoscaler."""
+
+    def __init__(self):
+        self.nodes: List[Dict] = [self.new_node(0) for _ in range(MIN_NODES)]
+        self.provisioning: List[int] = []  # Ready times of nodes being added
+        self.pending = deque()  # Evaluation pods: (eval_id, created_at)
+        self.pending_placeholders = 0
+        self.placeholder_target = 0
+        self.finishing = []  # Heap of (finish time, eval_id, node)
+        self.waits: List[float] = []
+        self.node_seconds = 0
+        self.finished_now = 0
+
+    @staticmethod
+    def new_node(now: int) -> Dict:
+        return {"evaluations": 0, "placeholders": 0, "empty_since": now}
+
+    def free_slots(self, node: Dict) -> int:
+        return SLOTS_PER_NODE - node["evaluations"] - node["placeholders"]
+
+    def scale_placeholders(self, target: int):
+        self.placeholder_target = target
+        running = sum(node["placeholders"] for node in self.nodes)
+        excess = running + self.pending_placeholders - target
+        if excess > 0:
+            dropped = min(excess, self.pending_placeholders)
+            self.pending_placeholders -= dropped
+            excess -= dropped
+            for node in self.nodes:
+                removed = min(excess, node["placeholders"])
+                node["placeholders"] -= removed
+                excess -= removed
+        else:
+            self.pending_placeholders -= excess
+
+    def step(self, now: int, rng: random.Random):
+        self.finished_now = 0
+        while self.finishing and self.finishing[0][0] <= now:
+            _, _, node = heapq.heappop(self.finishing)
+            node["evaluations"] -= 1
+            self.finished_now += 1
+
+        while self.provisioning and self.provisioning[0] <= now:
+            self.provisioning.pop(0)
+            self.nodes.append(self.new_node(now))
+
+        # Evaluations first: a free slot, else preempt a placeholder
+        while self.pending:
+            node = next((n for n in self.nodes if self.free_slots(n) > 0), None)
+            if node is None:
+                node = next((n for n in self.nodes if n["placeholders"] > 0), None)
+                if node is None:
+                    break
+                node["placeholders"] -= 1
+                self.pending_placeholders += 1  # Evicted; its ReplicaSet recreates it
+            eval_id, created_at = self.pending.popleft()
+            node["evaluations"] += 1
+            self.waits.append(now - created_at)
+            heapq.heappush(self.finishing, (now + max(1, round(rng.expovariate(1 / MEAN_RUNTIME))), eval_id, node))
+
+        for node in self.nodes:
+            placed = min(self.pending_placeholders, self.free_slots(node))
+            node["placeholders"] += placed
+            self.pending_placeholders -= placed
+
+        # Autoscaler: enough nodes for whatever is unschedulable
+        unschedulable = len(self.pending) + self.pending_placeholders
+        needed = math.ceil(unschedulable / SLOTS_PER_NODE) - len(self.provisioning)
+        room = MAX_NODES - len(self.nodes) - len(self.provisioning)
+        for _ in range(max(0, min(needed, room))):
+            self.provisioning.append(now + NODE_PROVISION_SECONDS)
+
+        # Scale-down: nodes with nothing on them for long enough
+        for node in list(self.nodes):
+            if node["evaluations"] or node["placeholders"]:
+                node["empty_since"] = now
+            elif now - node["empty_since"] >= SCALE_DOWN_UNNEEDED_SECONDS and len(self.nodes) > MIN_NODES:
+                self.nodes.remove(node)
+
+        self.node_seconds += len(self.nodes)
+
+
+def simulate(arrivals: List[float], policy: HeadroomPolicy, seed: int) -> Dict:
+    rng = random.Random(seed)
+    cluster = Cluster()
+    controller = HeadroomController(policy)
+    submitted = deque(arrivals)
+    in_celery = deque()  # Submission times not yet dispatched
+    end = math.ceil(arrivals[-1]) + 1 if arrivals else 0
+
+    now = 0
+    while now <= end or cluster.pending or cluster.finishing:
+        while submitted and submitted[0] <= now:
+            in_celery.append(submitted.popleft())
+        while in_celery and in_celery[0] + DISPATCH_DELAY <= now:
+            in_celery.popleft()
+            eval_id = f"eval-{len(cluster.waits) + len(cluster.pending)}"
+            cluster.pending.append((eval_id, now))
+            controller.record_job(eval_id, now)
+
+        cluster.step(now, rng)
+        for _ in range(cluster.finished_now):
+            controller.record_finished()
+        if now % HEADROOM_INTERVAL == 0:
+            cluster.scale_placeholders(controller.sample(len(in_celery), now))
+        now += 1
+
+    waits = sorted(cluster.waits)
+
+    def percentile(p: float) -> float:
+        return waits[min(len(waits) - 1, int(p * len(waits)))] if waits else 0.0
+
+    return {
+        "evaluations": len(waits),
+        "mean_wait": round(sum(waits) / len(waits), 2) if waits else 0.0,
+        "p50_wait": percentile(0.5),
+        "p95_wait": percentile(0.95),
+        "max_wait": waits[-1] if waits else 0.0,
+        "waited_over_10s": sum(1 for wait in waits if wait > 10),
+        "node_hours": round(cluster.node_seconds / 3600, 2),
+    }
+
+
+def main():
+    arrivals = load_trace(TRACE_FILE) if TRACE_FILE else synthetic_trace(random.Random(SEED))
+    print(f"Replaying {len(arrivals)} arrivals over {arrivals[-1] / 60:.1f} minutes "
+          f"({SLOTS_PER_NODE} slots/node, {NODE_PROVISION_SECONDS}s to add a node)")
+
+    headroom_policy = HeadroomPolicy()
+    results = {
+        "trace": TRACE_FILE or f"synthetic (seed {SEED})",
+        "reactive": simulate(arrivals, HeadroomPolicy(min_pods=0, max_pods=0), SEED),
+        "headroom": simulate(arrivals, headroom_policy, SEED),
+        "policy": vars(headroom_policy),
+    }
+
+    for mode in ("reactive", "headroom"):
+        stats = results[mode]
+        print(
+            f"{mode:>8}: wait mean {stats['mean_wait']}s, p50 {stats['p50_wait']}s, "
+            f"p95 {stats['p95_wait']}s, max {stats['max_wait']}s; "
+            f"{stats['waited_over_10s']} waited >10s; {stats['node_hours']} node-hours"
+        )
+
+    with open("headroom_simulation_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to headroom_simulation_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Job Watch Processing Benchmark
+
+Measures the dispatcher's job-event pipeline with a simulated Redis round
+trip, comparing:
+
+- previous: one event at a time, with a Redis GET (and a SETEX on change)
+  per event to detect state changes, and a full replay of every job on
+  each 300s reconnect
+- current: events spread over JOB_EVENT_WORKERS lanes (per-job order kept),
+  last-known state in process, and reconnects that resume from the last
+  resourceVersion, replaying nothing
+
+Each job goes pending -> running -> succeeded with a duplicate event per
+state, as the Kubernetes watch delivers them. Terminal-event publishing and
+log streaming are stubbed out; they run off the watch path either way.
+Needs the dispatcher's dependencies but no cluster or Redis.
+
+Key metrics:
+- Events processed per second
+- Redis calls per event
+- Events replayed and seconds spent per reconnect
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Configuration
+JOBS = int(os.environ.get("JOBS", "2000"))
+REDIS_RTT_MS = float(os.environ.get("REDIS_RTT_MS", "0.5"))
+
+
+class SimulatedRedis:
+    """Counts calls and sleeps one round trip per call."""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = 0
+
+    async def _round_trip(self):
+        self.calls += 1
+        await asyncio.sleep(REDIS_RTT_MS / 1000)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self.store.get(key)
+
+    async def setex(self, key, seconds, value):
+        await self._round_trip()
+        self.store[key] = value.encode()
+
+    async def publish(self, channel, message):
+        await self._round_trip()
+
+
+def load_dispatcher():
+    import importlib
+    import logging
+
+    # Not "from dispatcher_service import app": the package re-exports the FastAPI app under that name
+    dispatcher = importlib.import_module("dispatcher_service.app")
+
+    logging.getLogger("dispatcher_service.app").setLevel(logging.WARNING)
+    return dispatcher
+
+
+def make_events(count: int):
+    """Events for count jobs, interleaved the way a busy namespace produces them."""
+    from kubernetes.client import V1Job, V1JobCondition, V1JobSpec, V1JobStatus, V1ObjectMeta, V1PodTemplateSpec
+
+    now = datetime.now(timezone.utc)
+
+    def job(i: int, active: int = 0, done: bool = False) -> V1Job:
+        return V1Job(
+            metadata=V1ObjectMeta(name=f"eval-{i}-job", labels={"eval-id": f"eval-{i}"}, resource_version=str(i)),
+            spec=V1JobSpec(template=V1PodTemplateSpec(), active_deadline_seconds=600),
+            status=V1JobStatus(
+                active=active,
+                start_time=now,
+                completion_time=now if done else None,
+                conditions=[V1JobCondition(type="Complete", status="True")] if done else None,
+            ),
+        )
+
+    phases = [
+        ("ADDED", {}), ("MODIFIED", {}),
+        ("MODIFIED", {"active": 1}), ("MODIFIED", {"active": 1}),
+        ("MODIFIED", {"done": True}), ("MODIFIED", {"done": True}),
+    ]
+    return [{"type": kind, "object": job(i, **state)} for kind, state in phases for i in range(count)]
+
+
+async def run_previous(dispatcher, events):
+    """Sequential processing with a Redis lookup per event."""
+    redis_client = SimulatedRedis()
+    started = time.perf_counter()
+    for event in events:
+        dispatcher.job_states.clear()  # The previous watcher kept no state in process
+        await dispatcher.process_job_event(event, redis_client)
+    return time.perf_counter() - started, redis_client.calls
+
+
+async def run_current(dispatcher, events):
+    """Lanes by job name with in-process state."""
+    redis_client = SimulatedRedis()
+    dispatcher.job_states.clear()
+    dispatcher.job_watch_stats["events_processed"] = 0
+    lanes = [asyncio.Queue() for _ in range(dispatcher.JOB_EVENT_WORKERS)]
+    workers = [asyncio.create_task(dispatcher.process_job_event_lane(lane, redis_client)) for lane in lanes]
+
+    started = time.perf_counter()
+    for event in events:
+        name = event["object"].metadata.name
+        lanes[dispatcher.zlib.crc32(name.encode()) % len(lanes)].put_nowait((dispatcher.process_job_event, event))
+    while dispatcher.job_watch_stats["events_processed"] < len(events):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+
+    for worker in workers:
+        worker.cancel()
+    return elapsed, redis_client.calls
+
+
+async def previous_reconnect_cost(dispatcher, events):
+    """A reconnect without resourceVersion replays every live job as ADDED."""
+    replay = [{"type": "ADDED", "object": event["object"]} for event in events[-JOBS:]]
+    elapsed, _ = await run_previous(dispatcher, replay)
+    return len(replay), elapsed
+
+
+async def main():
+    dispatcher = load_dispatcher()
+    events = make_events(JOBS)
+    print(f"Processing {len(events)} job events for {JOBS} jobs (Redis RTT {REDIS_RTT_MS}ms)")
+
+    # Job events only, as the watcher saw them before the pod watch existed
+    with patch.object(dispatcher, "ENABLE_POD_WATCH", False), \
+            patch.object(dispatcher, "schedule_terminal_event"), \
+            patch.object(dispatcher, "start_log_stream"), \
+            patch.object(dispatcher, "wake_pending_dispatch"):
+        previous_seconds, previous_calls = await run_previous(dispatcher, events)
+        current_seconds, current_calls = await run_current(dispatcher, events)
+        replayed, replay_seconds = await previous_reconnect_cost(dispatcher, events)
+
+    results = {
+        "jobs": JOBS,
+        "events": len(events),
+        "redis_rtt_ms": REDIS_RTT_MS,
+        "previous": {
+            "events_per_second": round(len(events) / previous_seconds),
+            "redis_calls_per_event": round(previous_calls / len(events), 2),
+            "events_replayed_per_reconnect": replayed,
+            "seconds_per_reconnect": round(replay_seconds, 2),
+        },
+        "current": {
+            "events_per_second": round(len(events) / current_seconds),
+            "redis_calls_per_event": round(current_calls / len(events), 2),
+            "events_replayed_per_reconnect": 0,
+            "seconds_per_reconnect": 0.0,
+            "lanes": dispatcher.JOB_EVENT_WORKERS,
+        },
+    }
+
+    for mode in ("previous", "current"):
+        stats = results[mode]
+        print(
+            f"{mode:>8}: {stats['events_per_second']:>7} events/s, "
+            f"{stats['redis_calls_per_event']} Redis calls/event, "
+            f"{stats['events_replayed_per_reconnect']} events replayed per reconnect "
+            f"({stats['seconds_per_reconnect']}s)"
+        )
+
+    with open("job_watch_processing_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to job_watch_processing_results.json")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -133,7 +133,7 @@ def submit_evaluation(index: int, code: str) -> Tuple[Optional[str], LoadTestRes
 
 
 def monitor_evaluation_http(eval_id: str, result: LoadTestResult, timeout: int = 120) -> LoadTestResult:
-    """Monitor a single evaluation via HTTP polling with exponential backoff."""
+    """Monitor a single evaluation via long-polling /wait, backing off exponentially on errors."""
     start_time = result.submit_timestamp
     queue_start = time.time()
     execution_start = None
@@ -152,11 +152,16 @@ def monitor_evaluation_http(eval_id: str, result: LoadTestResult, timeout: int =
         rate_limiter.acquire(0.1)  # Use fractional tokens for status checks
         
         try:
-            # Increase timeout based on load
+            # Increase timeout based on load; the server parks the request up to wait_seconds
             request_timeout = min(30, 5 + consecutive_failures * 2)
-            response = requests.get(f"{API_BASE_URL}/eval/{eval_id}", timeout=request_timeout)
+            wait_seconds = max(1, min(30, int(end_time - time.time())))
+            response = requests.get(
+                f"{API_BASE_URL}/eval/{eval_id}/wait",
+                params={"until": "change", "timeout": wait_seconds},
+                timeout=request_timeout + wait_seconds
+            )
             
-            if response.status_code == 200:
+            if response.status_code in (200, 202):
                 status_data = response.json()
                 result.status = status_data.get("status", "unknown")
                 
@@ -174,9 +179,10 @@ def monitor_evaluation_http(eval_id: str, result: LoadTestResult, timeout: int =
                         result.execution_time = current_time - execution_start
                     break
                 
-                # Reset backoff on success
+                # Reset backoff on success; the next long-poll can start immediately
                 consecutive_failures = 0
                 poll_interval = min_interval
+                continue
                 
             elif response.status_code == 429:
                 # Rate limited - back off more aggressively
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for submission admission control state.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+
+from shared.utils.admission import (
+    ACTIVE_SLOT_TTL_SECONDS,
+    ADMITTED,
+    DEFAULT_RETRY_AFTER_SECONDS,
+    MAX_RETRY_AFTER_SECONDS,
+    RATE_LIMITED,
+    TOO_MANY_ACTIVE,
+    admit,
+    get_drain_rate,
+    release_evaluation,
+    retry_after_seconds,
+)
+
+
+@pytest.mark.unit
+class TestAdmission:
+    """Test the Redis calls behind rate limiting and concurrency slots."""
+
+    @pytest.mark.asyncio
+    async def test_admit_passes_bucket_and_slot_keys(self):
+        """Test one script call checks the client's bucket and takes a slot for the evaluation."""
+        redis_client = MagicMock()
+        redis_client.eval = AsyncMock(return_value=[RATE_LIMITED, b"2.5"])
+
+        outcome, detail = await admit(
+            redis_client, "ip:10.0.0.1", ["eval-1"], rate_limit_per_minute=60, max_active=10
+        )
+
+        assert (outcome, detail) == (RATE_LIMITED, 2.5)
+        args = redis_client.eval.call_args.args
+        assert args[1:5] == (3, "ratelimit:ip:10.0.0.1", "client:ip:10.0.0.1:active", "eval:eval-1:client")
+        assert args[5:11] == (60, 1.0, 10, "ip:10.0.0.1", ACTIVE_SLOT_TTL_SECONDS, "eval-1")
+
+    @pytest.mark.asyncio
+    async def test_admit_without_eval_ids_skips_concurrency(self):
+        """Test a submission without evaluations only spends a token."""
+        redis_client = MagicMock()
+        redis_client.eval = AsyncMock(return_value=[ADMITTED, "0"])
+
+        assert await admit(redis_client, "key:abc") == (ADMITTED, 0.0)
+        args = redis_client.eval.call_args.args
+        assert args[1] == 2
+        assert len(args) == 9
+
+    @pytest.mark.asyncio
+    async def test_batch_larger_than_bucket_is_throttled(self):
+        """Test a batch spends a token per member, borrowing past an empty bucket."""
+        redis_client = fakeredis.FakeAsyncRedis()
+        batch = [f"eval-{i}" for i in range(100)]
+
+        assert await admit(redis_client, "ip:10.0.0.1", batch, rate_limit_per_minute=60, max_active=0) == (
+            ADMITTED,
+            0.0,
+        )
+
+        # 40 tokens in debt: the next submission waits for 41 to refill
+        outcome, detail = await admit(
+            redis_client, "ip:10.0.0.1", ["eval-100"], rate_limit_per_minute=60, max_active=0
+        )
+        assert outcome == RATE_LIMITED
+        assert detail == pytest.approx(41, abs=0.5)
+        assert float(await redis_client.hget("ratelimit:ip:10.0.0.1", "tokens")) == pytest.approx(-40, abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_batch_takes_a_slot_per_member_or_none(self):
+        """Test batch members reserve concurrency slots together, within the client's limit."""
+        redis_client = fakeredis.FakeAsyncRedis()
+
+        assert (await admit(redis_client, "ip:10.0.0.1", ["a", "b", "c"], max_active=4))[0] == ADMITTED
+        assert await redis_client.zcard("client:ip:10.0.0.1:active") == 3
+        assert await redis_client.get("eval:b:client") == b"ip:10.0.0.1"
+
+        # Two more don't fit; nothing is reserved and no token is spent
+        tokens = await redis_client.hget("ratelimit:ip:10.0.0.1", "tokens")
+        assert await admit(redis_client, "ip:10.0.0.1", ["d", "e"], max_active=4) == (TOO_MANY_ACTIVE, 3.0)
+        assert await redis_client.zcard("client:ip:10.0.0.1:active") == 3
+        assert await redis_client.get("eval:d:client") is None
+        assert await redis_client.hget("ratelimit:ip:10.0.0.1", "tokens") == tokens
+
+        # A finished member frees its slot for the next submission
+        assert await release_evaluation(redis_client, "a")
+        assert (await admit(redis_client, "ip:10.0.0.1", ["d", "e"], max_active=4))[0] == ADMITTED
+
+    @pytest.mark.asyncio
+    async def test_release_frees_slot_once(self):
+        """Test release removes the slot, and an abandoned submission isn't counted as drained."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        redis_client.get = AsyncMock(side_effect=[b"ip:10.0.0.1", None])
+
+        assert await release_evaluation(redis_client, "eval-1", drained=False)
+        pipe.zrem.assert_called_once_with("client:ip:10.0.0.1:active", "eval-1")
+        pipe.incr.assert_not_called()
+
+        assert not await release_evaluation(redis_client, "eval-1")
+        pipe.zrem.assert_called_once()
+        pipe.incr.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_drain_rate_averages_recent_seconds(self):
+        """Test the drain rate sums per-second counters over the window."""
+        redis_client = MagicMock()
+        redis_client.mget = AsyncMock(return_value=[b"3", None, "3"] + [None] * 57)
+
+        assert await get_drain_rate(redis_client, window=60) == pytest.approx(0.1)
+        assert len(redis_client.mget.call_args.args[0]) == 60
+
+    def test_retry_after_from_drain_rate(self):
+        """Test Retry-After is backlog over drain rate, bounded, with a fallback when idle."""
+        assert retry_after_seconds(10, 2.0) == 5
+        assert retry_after_seconds(0.1, 2.0) == 1
+        assert retry_after_seconds(10_000, 0.5) == MAX_RETRY_AFTER_SECONDS
+        assert retry_after_seconds(10, 0) == DEFAULT_RETRY_AFTER_SECONDS
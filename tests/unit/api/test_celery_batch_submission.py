@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Unit tests for grouped Celery submission used by batch ingestion.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.celery_client import submit_evaluations_to_celery_batch
+
+
+@pytest.mark.unit
+class TestCeleryBatchSubmission(unittest.TestCase):
+    """Test submitting many evaluations over one producer."""
+
+    @patch("api.celery_client.CELERY_ENABLED", True)
+    @patch("api.celery_client.celery_app")
+    @patch("api.celery_client.redis_client")
+    def test_batch_shares_producer_and_pipelines_mappings(self, mock_redis_client, mock_celery_app):
+        """Test one producer publishes every task and mappings go out in one pipeline."""
+        producer = MagicMock()
+        mock_celery_app.producer_or_acquire.return_value.__enter__.return_value = producer
+
+        def send_task(name, args, queue, producer, headers):
+            if args[0] == "eval-2":
+                raise ConnectionError("broker hiccup")
+            return MagicMock(id=f"task-{args[0]}")
+
+        mock_celery_app.send_task.side_effect = send_task
+
+        task_ids = submit_evaluations_to_celery_batch([
+            {"eval_id": "eval-1", "code": "print(1)", "priority": 1000},
+            {"eval_id": "eval-2", "code": "print(2)"},
+            {"eval_id": "eval-3", "code": "print(3)", "priority": -1},
+        ])
+
+        self.assertEqual(task_ids, ["task-eval-1", None, "task-eval-3"])
+        mock_celery_app.producer_or_acquire.assert_called_once()
+        queues = [call.kwargs["queue"] for call in mock_celery_app.send_task.call_args_list]
+        self.assertEqual(queues, ["high_priority", "low_priority", "low_priority"])
+        self.assertTrue(all(
+            call.kwargs["producer"] is producer for call in mock_celery_app.send_task.call_args_list
+        ))
+
+        pipe = mock_redis_client.pipeline.return_value
+        mapped = [call.args[0] for call in pipe.setex.call_args_list]
+        self.assertEqual(mapped, [
+            "task_mapping:eval-1", "eval_mapping:task-eval-1",
+            "task_mapping:eval-3", "eval_mapping:task-eval-3",
+        ])
+        pipe.execute.assert_called_once()
+
+    @patch("api.celery_client.CELERY_ENABLED", False)
+    def test_batch_disabled_returns_none_per_item(self):
+        """Test nothing is submitted when Celery is disabled."""
+        self.assertEqual(
+            submit_evaluations_to_celery_batch([{"eval_id": "a", "code": "x"}]), [None]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the gateway's non-blocking Celery publisher.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api.celery_publisher import CeleryPublisher
+
+
+@pytest.mark.unit
+@patch("api.celery_publisher.CELERY_ENABLED", True)
+class TestCeleryPublisher:
+    """Test handing broker publishes to the publisher thread."""
+
+    @pytest.mark.asyncio
+    async def test_slow_broker_does_not_block_event_loop(self):
+        """Test the loop keeps running while a publish is stuck on the broker."""
+        release = threading.Event()
+
+        def publish(submissions):
+            release.wait(timeout=2)
+            return [f"task-{s['eval_id']}" for s in submissions]
+
+        publisher = CeleryPublisher(publish=publish)
+        pending = asyncio.create_task(publisher.submit(eval_id="eval-1", code="print(1)"))
+
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+        assert time.perf_counter() - started < 0.5
+        assert not pending.done()
+
+        release.set()
+        assert await pending == "task-eval-1"
+        await publisher.stop()
+
+    @pytest.mark.asyncio
+    async def test_queued_submissions_share_a_round_and_get_their_own_results(self):
+        """Test waiting groups are published together and results are split back in order."""
+        rounds = []
+        first_round = threading.Event()
+
+        def publish(submissions):
+            rounds.append([s["eval_id"] for s in submissions])
+            if len(rounds) == 1:
+                first_round.wait(timeout=2)
+            return [None if s["eval_id"] == "eval-3" else f"task-{s['eval_id']}" for s in submissions]
+
+        publisher = CeleryPublisher(publish=publish)
+        first = asyncio.create_task(publisher.submit(eval_id="eval-1", code="x"))
+        await asyncio.sleep(0.05)  # First round is now in flight
+        second = asyncio.create_task(publisher.submit_many([
+            {"eval_id": "eval-2", "code": "x"},
+            {"eval_id": "eval-3", "code": "x"},
+        ]))
+        third = asyncio.create_task(publisher.submit(eval_id="eval-4", code="x"))
+        await asyncio.sleep(0.05)
+        first_round.set()
+
+        assert await first == "task-eval-1"
+        assert await second == ["task-eval-2", None]
+        assert await third == "task-eval-4"
+        assert rounds == [["eval-1"], ["eval-2", "eval-3", "eval-4"]]
+        assert publisher.stats()["failed"] == 1
+        await publisher.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_backlog_fails_fast(self):
+        """Test a full queue returns None instead of waiting, like a broker error."""
+        release = threading.Event()
+
+        def publish(submissions):
+            release.wait(timeout=2)
+            return ["task"] * len(submissions)
+
+        publisher = CeleryPublisher(max_queue=1, publish=publish)
+        in_flight = asyncio.create_task(publisher.submit(eval_id="eval-1", code="x"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(publisher.submit(eval_id="eval-2", code="x"))
+        await asyncio.sleep(0.01)
+
+        assert await publisher.submit(eval_id="eval-3", code="x") is None
+        assert publisher.stats()["rejected"] == 1
+
+        release.set()
+        assert await in_flight == "task"
+        assert await queued == "task"
+        await publisher.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_exception_fails_every_submission(self):
+        """Test an unexpected error resolves the round with None rather than hanging."""
+        def publish(submissions):
+            raise ConnectionError("broker down")
+
+        publisher = CeleryPublisher(publish=publish)
+        assert await publisher.submit_many([{"eval_id": "a", "code": "x"}, {"eval_id": "b", "code": "x"}]) == [None, None]
+        await publisher.stop()
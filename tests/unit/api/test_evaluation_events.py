@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the gateway's shared evaluation event subscription.
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.evaluation_events import EvaluationEventHub, Subscription
+
+
+class FakePubSub:
+    """Minimal async pub/sub that yields a fixed list of messages."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.patterns = []
+
+    async def psubscribe(self, *patterns):
+        self.patterns.extend(patterns)
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()  # Stay subscribed like a real connection
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.unit
+class TestEvaluationEventHub:
+    """Test multiplexing one subscription across long-polls and streams."""
+
+    @pytest.mark.asyncio
+    async def test_listener_maps_channels_to_status(self):
+        """Test the single pattern subscription delivers running and terminal updates."""
+        pubsub = FakePubSub([
+            {"type": "psubscribe", "channel": "storage:evaluation:*", "data": 1},
+            {
+                "type": "pmessage",
+                "channel": "storage:evaluation:running",
+                "data": json.dumps({"eval_id": "eval-1", "executor_id": "job-1"}),
+            },
+        ])
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value = pubsub
+        hub = EvaluationEventHub(redis_client)
+
+        waiter = Subscription(eval_ids=["eval-1"])
+        hub.subscribe(waiter)
+        hub.start()
+        try:
+            update = await waiter.get(timeout=1)
+        finally:
+            await hub.stop()
+
+        assert update["status"] == "running"
+        assert pubsub.patterns == ["storage:evaluation:*", "evaluation:*:logs"]
+        redis_client.pubsub.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_receive_matching_status_and_logs(self):
+        """Test per-eval and all-events subscriptions each get the updates they asked for."""
+        hub = EvaluationEventHub(MagicMock())
+        watcher = Subscription(eval_ids=["eval-1"])
+        firehose = Subscription(all_events=True, include_logs=False)
+        hub.subscribe(watcher)
+        hub.subscribe(firehose)
+
+        hub.publish_local("eval-1", {"type": "log", "eval_id": "eval-1", "seq": 0, "content": "hi"})
+        hub.publish_local("eval-2", {"type": "status", "eval_id": "eval-2", "status": "running"})
+
+        assert (await watcher.get(timeout=0.1))["content"] == "hi"
+        assert await watcher.get(timeout=0.01) is None
+        assert (await firehose.get(timeout=0.1))["eval_id"] == "eval-2"
+
+        hub.unsubscribe(watcher)
+        hub.unsubscribe(firehose)
+        assert hub.stats()["subscriptions"] == 0
+        assert hub.subscriptions_by_eval == {}
+
+    @pytest.mark.asyncio
+    async def test_status_subscription_keeps_back_to_back_updates(self):
+        """Test a long-poll subscription still hears the terminal update that follows an intermediate one."""
+        hub = EvaluationEventHub(MagicMock())
+        waiter = Subscription(eval_ids=["eval-1"], include_logs=False)
+        hub.subscribe(waiter)
+
+        hub.publish_local("eval-1", {"type": "status", "eval_id": "eval-1", "status": "running"})
+        assert hub.has_listeners("eval-1")
+        hub.publish_local("eval-1", {"type": "status", "eval_id": "eval-1", "status": "completed"})
+
+        assert (await waiter.get(timeout=0.1))["status"] == "completed"
+        hub.unsubscribe(waiter)
+        assert not hub.has_listeners("eval-1")
+
+    @pytest.mark.asyncio
+    async def test_batch_subscription_receives_member_status_once(self):
+        """Test batch subscribers get members' status updates, without duplicates or logs."""
+        hub = EvaluationEventHub(MagicMock())
+        batch_watcher = Subscription(eval_ids=["eval-1"], batch_ids=["batch-1"])
+        hub.subscribe(batch_watcher)
+
+        assert hub.has_listeners("eval-2", "batch-1")
+        hub.publish_local("eval-1", {"type": "status", "eval_id": "eval-1", "batch_id": "batch-1", "status": "completed"})
+        hub.publish_local("eval-2", {"type": "log", "eval_id": "eval-2", "seq": 0})
+        hub.publish_local("eval-2", {"type": "status", "eval_id": "eval-2", "batch_id": "batch-1", "status": "failed"})
+        hub.publish_local("eval-3", {"type": "status", "eval_id": "eval-3", "batch_id": "batch-2", "status": "failed"})
+
+        assert (await batch_watcher.get(timeout=0.1))["eval_id"] == "eval-1"
+        assert (await batch_watcher.get(timeout=0.1))["eval_id"] == "eval-2"
+        assert await batch_watcher.get(timeout=0.01) is None
+
+        hub.unsubscribe(batch_watcher)
+        assert hub.subscriptions_by_batch == {}
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_coalesces_status_and_drops_logs(self):
+        """Test a full outbox keeps the latest status and reports dropped log chunks."""
+        subscription = Subscription(eval_ids=["eval-1"], max_queue=2)
+
+        subscription.offer({"type": "status", "eval_id": "eval-1", "status": "queued"})
+        subscription.offer({"type": "status", "eval_id": "eval-1", "status": "running"})
+        for seq in range(3):
+            subscription.offer({"type": "log", "eval_id": "eval-1", "seq": seq})
+
+        assert await subscription.get() == {"type": "dropped", "count": 2}
+        assert (await subscription.get())["status"] == "running"
+        assert (await subscription.get())["seq"] == 0
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for deficit-round-robin planning and the Redis queues of the fair-share stage.
+"""
+
+from collections import Counter
+
+import fakeredis
+import pytest
+
+from shared.utils.fair_share import (
+    FairShareQueue,
+    VirtualQueue,
+    parse_weights,
+    plan_dispatch,
+    task_key,
+    virtual_queue_name,
+)
+
+
+@pytest.mark.unit
+class TestPlanDispatch:
+    """Test which virtual queues DRR serves, and in what order."""
+
+    def test_dispatch_follows_weights(self):
+        """Test a queue with four times the weight gets four times the slots."""
+        queues = [VirtualQueue("a|evaluation", 4, 100), VirtualQueue("b|evaluation", 1, 100)]
+
+        picks, _, _ = plan_dispatch(queues, {}, budget=50, now=0)
+
+        assert Counter(picks) == {"a|evaluation": 40, "b|evaluation": 10}
+        assert picks[:5] == ["a|evaluation"] * 4 + ["b|evaluation"]
+
+    def test_small_budgets_resume_interrupted_turn(self):
+        """Test one-at-a-time dispatch still honours weights across calls."""
+        queues = [VirtualQueue("a|evaluation", 3, 100), VirtualQueue("b|evaluation", 1, 100)]
+        deficits, cursor, picks = {}, None, []
+        for _ in range(40):
+            step, deficits, cursor = plan_dispatch(queues, deficits, budget=1, now=0, cursor=cursor)
+            picks += step
+
+        assert Counter(picks) == {"a|evaluation": 30, "b|evaluation": 10}
+
+    def test_bulk_tenant_cannot_monopolize(self):
+        """Test a tenant with a huge backlog shares equally with a tenant that has a little."""
+        queues = [VirtualQueue("bulk|evaluation", 2, 10_000), VirtualQueue("small|evaluation", 2, 3)]
+
+        picks, deficits, _ = plan_dispatch(queues, {}, budget=8, now=0)
+
+        assert Counter(picks)["small|evaluation"] == 3
+        assert "small|evaluation" not in deficits  # Emptied queues don't bank credit
+
+    def test_ageing_lets_starved_queue_through(self):
+        """Test an old low-weight head outweighs a fresh high-weight queue."""
+        queues = [
+            VirtualQueue("a|high_priority", 4, 100, head_enqueued_at=100),
+            VirtualQueue("a|low_priority", 1, 100, head_enqueued_at=0),
+        ]
+
+        picks, _, _ = plan_dispatch(queues, {}, budget=10, now=100, ageing_seconds=10)
+
+        # Low priority head has waited ten ageing periods: weight 1 * (1 + 10) = 11
+        assert Counter(picks)["a|low_priority"] > Counter(picks)["a|high_priority"]
+
+    def test_empty_input(self):
+        """Test nothing to dispatch or no budget yields nothing."""
+        assert plan_dispatch([], {}, budget=5, now=0)[0] == []
+        assert plan_dispatch([VirtualQueue("a|evaluation", 1, 5)], {}, budget=0, now=0)[0] == []
+
+    def test_names_and_weights(self):
+        """Test virtual queue naming follows Celery routing and weight specs parse."""
+        assert virtual_queue_name("ip:10.0.0.1", 1000) == "ip:10.0.0.1|high_priority"
+        assert virtual_queue_name("key:abc", 0) == "key:abc|low_priority"
+        assert parse_weights("key:abc=4, ip:1.2.3.4=0.5") == {"key:abc": 4.0, "ip:1.2.3.4": 0.5}
+
+
+@pytest.mark.unit
+class TestFairShareQueue:
+    """Test parked evaluations survive a pump that stops between take and publish."""
+
+    @pytest.mark.asyncio
+    async def test_taken_evaluations_stay_in_flight_until_completed(self):
+        """Test take moves evaluations in flight and complete forgets them."""
+        queue = FairShareQueue(fakeredis.FakeAsyncRedis())
+        await queue.enqueue("ip:10.0.0.1", [{"eval_id": f"eval-{i}", "priority": 0} for i in range(3)])
+
+        entries, lost = await queue.take(2)
+
+        assert [entry["submission"]["eval_id"] for entry in entries] == ["eval-0", "eval-1"]
+        assert lost == []
+        assert await queue.size() == 1
+        assert (await queue.stats())["in_flight"] == 2
+
+        await queue.complete(entries)
+        assert (await queue.stats())["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_new_pump_recovers_abandoned_evaluations(self):
+        """Test recover puts a dead pump's evaluations back first and reports expired ones."""
+        redis_client = fakeredis.FakeAsyncRedis()
+        queue = FairShareQueue(redis_client)
+        await queue.enqueue("ip:10.0.0.1", [{"eval_id": f"eval-{i}", "priority": 0} for i in range(3)])
+        await queue.take(2)  # The pump stops here
+        await redis_client.delete(task_key("eval-1"))  # Expired while parked
+
+        assert await queue.recover() == ["eval-1"]
+
+        assert await queue.size() == 2
+        assert (await queue.stats())["in_flight"] == 0
+        entries, lost = await queue.take(5)
+        assert [entry["submission"]["eval_id"] for entry in entries] == ["eval-0", "eval-2"]
+        assert lost == []
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for queue telemetry read from the Celery broker.
+"""
+
+import json
+import time
+
+import pytest
+
+from shared.utils.queue_telemetry import (
+    WORKER_HEARTBEATS_KEY,
+    WORKER_HEARTBEAT_PRUNE_SECONDS,
+    QueueTelemetry,
+)
+
+
+def kombu_message(enqueued_at=None):
+    headers = {"id": "task-1", "task": "celery_worker.tasks.evaluate_code"}
+    if enqueued_at is not None:
+        headers["enqueued_at"] = enqueued_at
+    return json.dumps({"body": "", "headers": headers, "properties": {}})
+
+
+class FakeBroker:
+    """Just enough of an async Redis client for one pipelined snapshot."""
+
+    def __init__(self, lists, unacked, workers):
+        self.lists = lists
+        self.unacked = unacked
+        self.workers = workers
+        self.round_trips = 0
+
+    def pipeline(self, transaction=False):
+        broker = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def llen(self, key):
+                self.calls.append(lambda: len(broker.lists.get(key, [])))
+
+            def lindex(self, key, index):
+                self.calls.append(lambda: broker.lists[key][index] if broker.lists.get(key) else None)
+
+            def hlen(self, key):
+                self.calls.append(lambda: broker.unacked)
+
+            def hgetall(self, key):
+                self.calls.append(lambda: dict(broker.workers))
+
+            async def execute(self):
+                broker.round_trips += 1
+                return [call() for call in self.calls]
+
+        return Pipeline()
+
+    async def hdel(self, key, *fields):
+        assert key == WORKER_HEARTBEATS_KEY
+        for field in fields:
+            self.workers.pop(field, None)
+
+
+@pytest.mark.unit
+class TestQueueTelemetry:
+    """Test depth, oldest-message age and heartbeat collection."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reports_depth_age_and_workers(self):
+        """Test one round trip yields per-queue depth, oldest age and live workers."""
+        now = time.time()
+        broker = FakeBroker(
+            lists={
+                # LPUSH order: newest first, oldest at the tail
+                "high_priority": [kombu_message(now - 1), kombu_message(now - 30)],
+                "evaluation": [kombu_message()],
+            },
+            unacked=4,
+            workers={
+                "celery@a": json.dumps({"active": 2, "last_seen": now - 1}),
+                "celery@b": json.dumps({"active": 0, "last_seen": now - 120}),
+                "celery@gone": json.dumps({"last_seen": now - WORKER_HEARTBEAT_PRUNE_SECONDS - 1}),
+            },
+        )
+        telemetry = QueueTelemetry(broker)
+
+        snapshot = await telemetry.snapshot()
+
+        assert broker.round_trips == 1
+        assert snapshot["queues"]["high_priority"]["depth"] == 2
+        assert 29 <= snapshot["queues"]["high_priority"]["oldest_message_age_seconds"] < 40
+        assert snapshot["queues"]["evaluation"] == {"depth": 1, "oldest_message_age_seconds": None}
+        assert snapshot["queues"]["low_priority"]["depth"] == 0
+        assert snapshot["queued"] == 3
+        assert snapshot["unacked"] == 4
+        assert [w["hostname"] for w in snapshot["workers"]] == ["celery@a", "celery@b"]
+        assert snapshot["workers_online"] == 1
+        assert "celery@gone" not in broker.workers
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_cached(self):
+        """Test repeated reads within the cache window cost no extra round trips."""
+        broker = FakeBroker(lists={"evaluation": [kombu_message()]}, unacked=0, workers={})
+        telemetry = QueueTelemetry(broker, cache_seconds=60)
+
+        await telemetry.snapshot()
+        broker.lists["evaluation"].append(kombu_message())
+        assert (await telemetry.queue_depths(["evaluation"]))["evaluation"] == 1
+        assert broker.round_trips == 1
+
+        assert (await telemetry.queue_depths(["evaluation"], max_age=0))["evaluation"] == 2
+        assert broker.round_trips == 2
@@ -0,0 +1,11 @@
+"""
+Shared setup for the dispatcher's batch mode tests (indexed jobs and packed pods).
+"""
+
+JOB = "batch-20250101-0a1b2c3d"
+
+
+def execute_request(eval_id: str, **overrides):
+    from dispatcher_service.app import ExecuteRequest
+
+    return ExecuteRequest(eval_id=eval_id, code=f"print('{eval_id}')", **overrides)
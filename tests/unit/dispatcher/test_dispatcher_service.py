@@ -5,7 +5,7 @@ Tests job creation, status checking, and log retrieval.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from kubernetes.client import V1Job, V1ObjectMeta, V1JobStatus, V1JobCondition
 from kubernetes.client.rest import ApiException
 from datetime import datetime
@@ -397,4 +397,155 @@ class TestDispatcherService:
         
         # Verify timeout settings (now includes 5 minute buffer)
         assert job.spec.active_deadline_seconds == 330  # 30 + 300 buffer
-        assert job.spec.backoff_limit == 2  # Default retry limit when expect_failure=False
\ No newline at end of file
+        assert job.spec.backoff_limit == 2  # Default retry limit when expect_failure=False
+
+    @patch('dispatcher_service.app.watch.Watch')
+    def test_stream_job_logs_publishes_chunks(self, mock_watch_cls, mock_k8s_core):
+        """Test live pod logs are published as ordered chunks on the log channel."""
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock
+        from dispatcher_service.app import stream_job_logs
+
+        mock_pod = MagicMock()
+        mock_pod.metadata.name = "test-job-pod"
+        mock_pod.status.container_statuses = [MagicMock()]
+        mock_k8s_core.list_namespaced_pod.return_value = MagicMock(items=[mock_pod])
+        mock_watch_cls.return_value.stream.return_value = iter(["line 1", "line 2", "line 3"])
+
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock()
+
+        with patch('dispatcher_service.app.LOG_STREAM_MAX_CHUNK_LINES', 2):
+            result = asyncio.run(stream_job_logs("test-job", "eval-123", redis_client))
+
+        assert result["complete"] is True
+        assert result["lines"] == 3
+
+        published = [json.loads(call.args[1]) for call in redis_client.publish.call_args_list]
+        assert all(call.args[0] == "evaluation:eval-123:logs" for call in redis_client.publish.call_args_list)
+        assert [p["seq"] for p in published] == [0, 1]
+        assert "".join(p["content"] for p in published) == "line 1\nline 2\nline 3\n"
+        assert published[-1]["is_final"] is True
+        assert mock_watch_cls.return_value.stream.call_args.kwargs["_request_timeout"][1] > 0
+
+    @patch('dispatcher_service.app.watch.Watch')
+    def test_idle_log_stream_ends_incomplete(self, mock_watch_cls, mock_k8s_core):
+        """Test a follow read that times out frees the stream and leaves output to the completion capture."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from urllib3.exceptions import ReadTimeoutError
+        from dispatcher_service.app import stream_job_logs
+
+        def quiet_pod(*args, **kwargs):
+            yield "started"
+            raise ReadTimeoutError(None, None, "Read timed out.")
+
+        mock_watch_cls.return_value.stream.side_effect = quiet_pod
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock()
+
+        result = asyncio.run(stream_job_logs("test-job", "eval-123", redis_client, pod_name="test-job-pod"))
+
+        assert result["complete"] is False
+        assert result["lines"] == 1
+
+    def test_capture_job_logs_fetches_once(self, mock_k8s_core):
+        """Test concurrent and repeated log captures for a job share one fetch."""
+        import asyncio
+        from dispatcher_service.app import capture_job_logs, captured_logs
+
+        mock_pod = MagicMock()
+        mock_pod.metadata.name = "capture-job-pod"
+        mock_pod.status.container_statuses = []
+        mock_k8s_core.list_namespaced_pod.return_value = MagicMock(items=[mock_pod])
+        mock_k8s_core.read_namespaced_pod_log.return_value = "full output"
+
+        async def capture_concurrently():
+            results = await asyncio.gather(*(capture_job_logs("capture-job") for _ in range(5)))
+            results.append(await capture_job_logs("capture-job"))
+            return results
+
+        try:
+            results = asyncio.run(capture_concurrently())
+        finally:
+            captured_logs.pop("capture-job", None)
+
+        assert all(r["logs"] == "full output" for r in results)
+        mock_k8s_core.list_namespaced_pod.assert_called_once()
+        mock_k8s_core.read_namespaced_pod_log.assert_called_once_with(
+            name="capture-job-pod",
+            namespace="crucible"
+        )
+
+    @patch('dispatcher_service.app.LOG_CAPTURE_RETRY_DELAY', 0)
+    @patch('dispatcher_service.app.get_job_logs_internal', new_callable=AsyncMock)
+    def test_capture_job_logs_retries_empty_capture(self, mock_get_logs):
+        """Test a capture that finds no logs yet is retried until Loki has them."""
+        import asyncio
+        from dispatcher_service.app import capture_job_logs, captured_logs
+
+        mock_get_logs.side_effect = [
+            {"logs": "", "exit_code": 1, "message": "No pods found for job and no logs in Loki"},
+            {"job_name": "late-job", "pod_name": "deleted", "logs": "late output", "exit_code": 0, "source": "loki"},
+        ]
+
+        try:
+            result = asyncio.run(capture_job_logs("late-job"))
+            assert captured_logs["late-job"] is result
+        finally:
+            captured_logs.pop("late-job", None)
+
+        assert result["logs"] == "late output"
+        assert mock_get_logs.await_count == 2
+
+    @patch('dispatcher_service.app.get_loki_client')
+    def test_loki_query_paginates_and_caches(self, mock_get_client, mock_k8s_batch):
+        """Test Loki fallback is time-bounded, pages past the limit, and caches finished jobs."""
+        import asyncio
+        import json
+        from datetime import timezone
+        from unittest.mock import AsyncMock
+        from dispatcher_service.app import get_logs_from_loki, loki_cache
+
+        started = datetime(2025, 7, 24, 10, 0, tzinfo=timezone.utc)
+        completed = datetime(2025, 7, 24, 10, 5, tzinfo=timezone.utc)
+        mock_k8s_batch.read_namespaced_job_status.return_value = V1Job(
+            metadata=V1ObjectMeta(name="loki-job"),
+            status=V1JobStatus(start_time=started, completion_time=completed)
+        )
+
+        def loki_page(values):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {
+                "status": "success",
+                "data": {"result": [{"stream": {}, "values": values}]}
+            }
+            return response
+
+        def line(msg):
+            return json.dumps({"log": f"2025-07-24T10:00:00Z stdout F {msg}\n"})
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=[
+            loki_page([["100", line("one")], ["200", line("two")]]),
+            loki_page([["200", line("two")], ["300", line("three")]]),
+            loki_page([["300", line("three")]]),
+        ])
+        mock_get_client.return_value = client
+
+        try:
+            with patch('dispatcher_service.app.LOKI_PAGE_LIMIT', 2):
+                logs = asyncio.run(get_logs_from_loki("loki-job"))
+                cached = asyncio.run(get_logs_from_loki("loki-job"))
+        finally:
+            loki_cache.pop("loki-job", None)
+
+        assert logs == "one\ntwo\nthree"
+        assert cached == logs
+        assert client.get.call_count == 3
+
+        first_params = client.get.call_args_list[0].kwargs["params"]
+        assert 'kubernetes_labels_job_name="loki-job"' in first_params["query"]
+        assert first_params["end"] < int(datetime.now(timezone.utc).timestamp() * 1e9)
+        assert client.get.call_args_list[1].kwargs["params"]["start"] == 200
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's executor image catalog.
+Tests resolution from the watched ConfigMap and updates from its events.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+IMAGES_YAML = """
+images:
+  - name: executor-base
+    image: crucible-platform/executor-base
+  - name: executor-ml
+    image: crucible-platform/executor-ml:v2
+    default: true
+  - name: executor-gpu
+    image: crucible-platform/executor-gpu
+    available: false
+"""
+
+
+def config_map_event(event_type: str, images_yaml: str, resource_version: str = "7") -> dict:
+    config_map = MagicMock()
+    config_map.data = {"images.yaml": images_yaml}
+    config_map.metadata.resource_version = resource_version
+    return {"type": event_type, "object": config_map}
+
+
+@pytest.mark.unit
+@patch("dispatcher_service.app.DEFAULT_IMAGE_TAG", "latest")
+@patch("dispatcher_service.app.REGISTRY_PREFIX", "registry.local")
+class TestExecutorImageCatalog:
+    """Test images resolve from the in-memory catalog and follow ConfigMap changes."""
+
+    def test_resolves_names_references_and_unknowns(self):
+        """Test names, full references and unknown names resolve with prefix and tag."""
+        from dispatcher_service.app import ExecutorImageCatalog
+
+        catalog = ExecutorImageCatalog()
+        catalog.apply_event(config_map_event("ADDED", IMAGES_YAML))
+
+        assert catalog.resolve("executor-base") == "registry.local/crucible-platform/executor-base:latest"
+        assert catalog.resolve("crucible-platform/executor-ml:v2") == "registry.local/crucible-platform/executor-ml:v2"
+        assert catalog.resolve("other/image:1.0") == "registry.local/other/image:1.0"
+        # Unavailable and unknown names get the default
+        assert catalog.resolve("executor-gpu") == "registry.local/crucible-platform/executor-ml:v2"
+        assert catalog.resolve("nope") == catalog.resolve("default")
+
+    def test_changes_apply_immediately_and_bad_yaml_is_ignored(self):
+        """Test a modified ConfigMap takes effect at once; invalid YAML keeps the last good catalog."""
+        from dispatcher_service.app import ExecutorImageCatalog
+
+        catalog = ExecutorImageCatalog()
+        catalog.apply_event(config_map_event("ADDED", IMAGES_YAML))
+        catalog.apply_event(config_map_event(
+            "MODIFIED", "images:\n  - name: executor-base\n    image: crucible-platform/executor-base:v3\n", "8"
+        ))
+        assert catalog.resolve("executor-base") == "registry.local/crucible-platform/executor-base:v3"
+        assert catalog.resolve("default") == "registry.local/crucible-platform/executor-base:v3"
+
+        catalog.apply_event(config_map_event("MODIFIED", "images: [", "9"))
+        assert catalog.resource_version == "8"
+        assert catalog.resolve("executor-base") == "registry.local/crucible-platform/executor-base:v3"
+
+        catalog.apply_event(config_map_event("DELETED", IMAGES_YAML, "10"))
+        assert catalog.images == {"default": "executor-ml"}
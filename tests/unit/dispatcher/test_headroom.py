@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for predictive headroom.
+Tests the placeholder target follows backlog and arrival trends, holds
+through lulls, and is applied to the placeholder Deployment.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.utils.headroom import HeadroomController, HeadroomPolicy
+
+
+def policy(**overrides) -> HeadroomPolicy:
+    settings = dict(min_pods=0, max_pods=50, lookahead_seconds=60, scale_down_delay_seconds=120,
+                    rate_smoothing=0.5, trend_smoothing=0.3, safety=0.0)
+    settings.update(overrides)
+    return HeadroomPolicy(**settings)
+
+
+@pytest.mark.unit
+class TestHeadroomController:
+    """Test how the placeholder target is sized from demand samples."""
+
+    def test_target_covers_backlog_and_rising_arrivals(self):
+        """Test a growing arrival rate raises the target beyond the backlog, capped at max_pods."""
+        controller = HeadroomController(policy())
+        assert controller.sample(backlog=0, now=0) == 0
+        assert controller.sample(backlog=3, now=10) >= 3  # Backlog alone
+
+        for now in range(20, 80, 10):
+            for i in range(now // 10):  # More Jobs every interval
+                controller.record_job(f"job-{now}-{i}", created_at=now - 1)
+            controller.sample(backlog=3, now=now)
+
+        assert controller.forecaster.trend > 0
+        assert controller.target > 3 + controller.forecaster.level * 60  # Trend adds to the flat forecast
+        assert HeadroomController(policy(max_pods=4)).sample(backlog=10, now=0) == 4
+
+    def test_completions_and_old_jobs_reduce_demand(self):
+        """Test finished Jobs offset arrivals, and Jobs from before the last sample aren't arrivals."""
+        controller = HeadroomController(policy())
+        controller.sample(backlog=0, now=0)
+        controller.record_job("old-job", created_at=-600)  # Relisted after failover
+        controller.record_job("old-job", created_at=-600)
+        assert controller.created == 0
+
+        for i in range(10):
+            controller.record_job(f"job-{i}", created_at=5)
+            controller.record_finished()
+        controller.sample(backlog=0, now=10)
+
+        assert controller.last_arrival_rate == 1.0
+        assert controller.completion_rate == 1.0
+        assert controller.target == 0
+
+    def test_scale_down_waits_out_the_delay(self):
+        """Test the target holds through a lull and drops once scale_down_delay passes."""
+        controller = HeadroomController(policy(min_pods=1))
+        assert controller.sample(backlog=8, now=0) == 8
+        assert controller.sample(backlog=0, now=60) == 8
+        assert controller.sample(backlog=0, now=130) == 1
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.headroom_state", {"replicas": None, "scaled_at": None, "errors": 0})
+class TestHeadroomScaling:
+    """Test the leader applies the target to the placeholder Deployment."""
+
+    @patch("dispatcher_service.app.scale_headroom_sync")
+    def test_update_scales_only_on_change(self, mock_scale):
+        """Test the Deployment is patched with the target once, and not again while unchanged."""
+        from dispatcher_service.app import update_headroom
+
+        telemetry = MagicMock()
+        telemetry.snapshot = AsyncMock(return_value={"queued": 4, "unacked": 2})
+
+        with patch("dispatcher_service.app.headroom_controller", HeadroomController(policy())):
+            asyncio.run(update_headroom(telemetry))
+            asyncio.run(update_headroom(telemetry))
+
+        mock_scale.assert_called_once_with(6)
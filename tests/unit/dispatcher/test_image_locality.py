@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's node image inventory.
+Tests locality-aware node affinity, pre-pulling onto cold nodes and
+reporting whether an evaluation's image was cached where it ran.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from kubernetes.client import (
+    V1ContainerImage,
+    V1Node,
+    V1NodeCondition,
+    V1NodeSpec,
+    V1NodeStatus,
+    V1ObjectMeta,
+    V1Taint,
+)
+from kubernetes.client.rest import ApiException
+
+IMAGE = "registry.example.com/executor-ml:1.0"
+
+
+def node_event(name: str, images=(), event_type: str = "ADDED", ready: bool = True, taints=None) -> dict:
+    node = V1Node(
+        metadata=V1ObjectMeta(name=name),
+        spec=V1NodeSpec(taints=taints),
+        status=V1NodeStatus(
+            conditions=[V1NodeCondition(type="Ready", status="True" if ready else "False")],
+            images=[V1ContainerImage(names=[image]) for image in images],
+        ),
+    )
+    return {"type": event_type, "object": node}
+
+
+@pytest.mark.unit
+class TestNodeImageInventory:
+    """Test the inventory follows node events and steers placement."""
+
+    def test_inventory_tracks_schedulable_nodes(self):
+        """Test only Ready, untainted nodes are kept, with docker.io short names."""
+        from dispatcher_service.app import NodeImageInventory
+
+        inventory = NodeImageInventory()
+        inventory.apply_event(node_event("node-a", ["docker.io/library/python:3.11-slim", IMAGE]))
+        inventory.apply_event(node_event("node-b"))
+        inventory.apply_event(node_event("node-c", [IMAGE], ready=False))
+        inventory.apply_event(node_event("node-d", [IMAGE], taints=[V1Taint(key="gpu", effect="NoSchedule")]))
+
+        assert sorted(inventory.nodes) == ["node-a", "node-b"]
+        assert inventory.has("node-a", "python:3.11-slim") is True
+        assert inventory.has("node-b", IMAGE) is False
+        assert inventory.has("node-z", IMAGE) is None
+        assert inventory.missing([IMAGE]) == [("node-b", IMAGE)]
+        assert inventory.wakeup.is_set()
+
+        inventory.apply_event(node_event("node-b", event_type="DELETED"))
+        assert inventory.nodes_with(IMAGE) == ["node-a"]
+
+    def test_affinity_prefers_warm_nodes_only_when_it_matters(self):
+        """Test the preferred term lists warm nodes, and is left out when all or none are warm."""
+        from dispatcher_service.app import NodeImageInventory, image_locality_affinity
+
+        inventory = NodeImageInventory()
+        with patch("dispatcher_service.app.node_image_inventory", inventory):
+            inventory.apply_event(node_event("node-a", [IMAGE]))
+            assert image_locality_affinity(IMAGE) is None  # Every node is warm
+
+            inventory.apply_event(node_event("node-b"))
+            term = image_locality_affinity(IMAGE).node_affinity.preferred_during_scheduling_ignored_during_execution[0]
+            assert term.preference.match_fields[0].key == "metadata.name"
+            assert term.preference.match_fields[0].values == ["node-a"]
+
+            assert image_locality_affinity("registry.example.com/other:1.0") is None
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.prewarm_attempts", clear=True)
+@patch.dict("dispatcher_service.app.prewarm_stats", {"created": 0, "already_running": 0, "failed": 0})
+class TestImagePrewarm:
+    """Test catalog images are pre-pulled onto nodes missing them, once."""
+
+    @patch("dispatcher_service.app.create_prepull_job")
+    def test_prewarm_pulls_missing_images_once(self, mock_create):
+        """Test each cold node gets one pre-pull per catalog image; a 409 counts as already running."""
+        from dispatcher_service.app import ExecutorImageCatalog, NodeImageInventory, prewarm_images, prewarm_stats
+
+        catalog = ExecutorImageCatalog()
+        catalog.update(f"images:\n  - name: ml\n    image: {IMAGE}\n")
+        inventory = NodeImageInventory()
+        inventory.apply_event(node_event("node-a", [IMAGE]))
+        inventory.apply_event(node_event("node-b"))
+        inventory.apply_event(node_event("node-c"))
+        mock_create.side_effect = [None, ApiException(status=409)]
+
+        with patch("dispatcher_service.app.executor_image_catalog", catalog), \
+                patch("dispatcher_service.app.node_image_inventory", inventory):
+            started = asyncio.run(prewarm_images())
+            assert asyncio.run(prewarm_images()) == 0  # Retry window not over yet
+
+        assert sorted(call.args for call in mock_create.call_args_list) == [("node-b", IMAGE), ("node-c", IMAGE)]
+        assert started == prewarm_stats["created"]
+        assert prewarm_stats["already_running"] == 1
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.job_pods", clear=True)
+@patch.dict("dispatcher_service.app.job_states", {"job-a": "pending"}, clear=True)
+@patch("dispatcher_service.app.start_log_stream")
+class TestPullWait:
+    """Test evaluation:running reports the node, image cache hit and pull wait."""
+
+    def test_running_event_carries_pull_wait(self, mock_stream):
+        """Test the wait runs from PodScheduled to container start, bucketed by cache hit."""
+        from dispatcher_service.app import NodeImageInventory, process_pod_event
+
+        scheduled_at = datetime.now(timezone.utc)
+        inventory = NodeImageInventory()
+        inventory.apply_event(node_event("node-b"))
+
+        spec_container = MagicMock(image=IMAGE)
+        spec_container.name = "evaluation"
+        container = MagicMock()
+        container.name = "evaluation"
+        container.state.running = MagicMock(started_at=scheduled_at + timedelta(seconds=42))
+        container.state.terminated = None
+        pod = MagicMock()
+        pod.metadata.name = "job-a-xyz"
+        pod.metadata.labels = {"job-name": "job-a", "eval-id": "eval-a", "app": "evaluation"}
+        pod.metadata.annotations = {"active-deadline-seconds": "330"}
+        pod.spec.node_name = "node-b"
+        pod.spec.containers = [spec_container]
+        pod.status.conditions = [MagicMock(type="PodScheduled", status="True", last_transition_time=scheduled_at)]
+        pod.status.container_statuses = [container]
+
+        redis_client = MagicMock()
+        redis_client.setex = AsyncMock()
+        redis_client.publish = AsyncMock()
+        pull_wait = {"cached": MagicMock(), "cold": MagicMock(), "unknown": MagicMock()}
+
+        with patch("dispatcher_service.app.node_image_inventory", inventory), \
+                patch.dict("dispatcher_service.app.image_pull_wait_metrics", pull_wait):
+            asyncio.run(process_pod_event({"type": "MODIFIED", "object": pod}, redis_client))
+
+        metadata = json.loads(redis_client.publish.call_args.args[1])["metadata"]
+        assert metadata == {"node": "node-b", "image_cached": False, "image_pull_wait_seconds": 42.0}
+        pull_wait["cold"].record.assert_called_once_with(42000.0)
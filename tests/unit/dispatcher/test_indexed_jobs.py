@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's indexed batch mode.
+Tests packing batches by profile, the Indexed Job and code ConfigMap it
+creates, and mapping per-index job and pod events back to evaluations.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from kubernetes.client import V1Job, V1JobCondition, V1JobSpec, V1JobStatus, V1ObjectMeta, V1PodTemplateSpec
+
+from tests.unit.dispatcher.batch_helpers import JOB, execute_request
+
+
+def indexed_job_event(event_type: str = "MODIFIED", completed=None, failed=None, job_failed: bool = False) -> dict:
+    job = V1Job(
+        metadata=V1ObjectMeta(name=JOB, annotations={"eval-ids": json.dumps(["eval-0", "eval-1", "eval-2"])}),
+        spec=V1JobSpec(completion_mode="Indexed", template=V1PodTemplateSpec()),
+        status=V1JobStatus(
+            completed_indexes=completed,
+            failed_indexes=failed,
+            conditions=[V1JobCondition(type="Failed", status="True")] if job_failed else None,
+        ),
+    )
+    return {"type": event_type, "object": job}
+
+
+def mock_redis() -> MagicMock:
+    redis_client = MagicMock()
+    redis_client.get = AsyncMock(return_value=None)
+    redis_client.setex = AsyncMock()
+    redis_client.publish = AsyncMock()
+    return redis_client
+
+
+@pytest.mark.unit
+class TestIndexedBatchPacking:
+    """Test evaluation names and how a batch is split into Jobs."""
+
+    def test_index_unit_names_round_trip(self):
+        """Test per-index names parse back, plain job names don't, and index lists expand."""
+        from dispatcher_service.app import index_unit_name, parse_index_unit, parse_indexes, pod_selector
+
+        assert parse_index_unit(index_unit_name(JOB, 12)) == (JOB, 12)
+        assert parse_index_unit("20250101-120000-ab-0a1b2c3d") is None
+        assert pod_selector(index_unit_name(JOB, 3)) == f"job-name={JOB},batch.kubernetes.io/job-completion-index=3"
+        assert parse_indexes("0,3-5,9") == {0, 3, 4, 5, 9}
+        assert parse_indexes(None) == set()
+
+    @patch("dispatcher_service.app.INDEXED_JOB_MAX_COMPLETIONS", 2)
+    def test_batch_packed_by_profile_and_size(self):
+        """Test only matching profiles share a Job, and Jobs are capped in size."""
+        from dispatcher_service.app import pack_batch
+
+        requests = [
+            execute_request("a"),
+            execute_request("big", memory_limit="1Gi"),
+            execute_request("b"),
+            execute_request("c"),
+        ]
+
+        packs = [[request.eval_id for request in pack] for pack in pack_batch(requests)]
+        assert packs == [["a", "b"], ["c"], ["big"]]
+
+
+@pytest.mark.unit
+@patch("dispatcher_service.app.image_locality_affinity", return_value=None)
+@patch("dispatcher_service.app.k8s_api")
+class TestIndexedJobCreation:
+    """Test the Indexed Job reads each index's code from its ConfigMap."""
+
+    def test_indexed_job_manifest(self, mock_k8s, _affinity):
+        """Test the ConfigMap holds the code, the Job owns it and each evaluation gets its index name."""
+        from dispatcher_service.app import create_indexed_job
+
+        mock_k8s.call.side_effect = lambda func, **kwargs: MagicMock(metadata=MagicMock(uid="job-uid"))
+        requests = [execute_request(f"eval-{index}", expect_failure=True) for index in range(3)]
+
+        responses = create_indexed_job(requests, JOB, "batch-1", use_gvisor=True)
+
+        configmap = mock_k8s.call.call_args_list[0].kwargs["body"]
+        job = mock_k8s.call.call_args_list[1].kwargs["body"]
+        owner = mock_k8s.call.call_args_list[2].kwargs["body"]["metadata"]["ownerReferences"][0]
+        assert configmap.data == {f"{index}.py": f"print('eval-{index}')" for index in range(3)}
+        assert job.spec.completion_mode == "Indexed"
+        assert (job.spec.completions, job.spec.parallelism, job.spec.backoff_limit_per_index) == (3, 3, 0)
+        assert json.loads(job.metadata.annotations["eval-ids"]) == ["eval-0", "eval-1", "eval-2"]
+        container = job.spec.template.spec.containers[0]
+        assert container.command[-1] == "/batch/$(EVAL_INDEX).py"
+        assert "batch.kubernetes.io/job-completion-index" in container.env[0].value_from.field_ref.field_path
+        assert owner["uid"] == "job-uid"
+        assert [response.job_name for response in responses] == [f"{JOB}-i0", f"{JOB}-i1", f"{JOB}-i2"]
+
+    def test_failed_owner_patch_keeps_job_created(self, mock_k8s, _affinity):
+        """Test a running Job isn't reported rejected (and resubmitted) because its ConfigMap wasn't adopted."""
+        from kubernetes.client.rest import ApiException
+
+        from dispatcher_service.app import create_indexed_job
+
+        def call(func, **kwargs):
+            if "ownerReferences" in str(kwargs.get("body")):
+                raise ApiException(status=409, reason="Conflict")
+            return MagicMock(metadata=MagicMock(uid="job-uid"))
+
+        mock_k8s.call.side_effect = call
+        requests = [execute_request(f"eval-{index}") for index in range(2)]
+
+        responses = create_indexed_job(requests, JOB, "batch-1", use_gvisor=True)
+
+        assert [response.status for response in responses] == ["created", "created"]
+
+    @patch("dispatcher_service.app.validate_execute_request", return_value=True)
+    @patch("dispatcher_service.app.create_indexed_job")
+    def test_rejected_pack_reported_per_evaluation(self, mock_create, _validate, _k8s, _affinity):
+        """Test a pack that can't start comes back rejected, in request order, without failing the batch."""
+        from dispatcher_service.app import ExecuteBatchRequest, ExecuteResponse, execute_batch
+
+        mock_create.side_effect = [
+            HTTPException(status_code=429, detail="Resource quota exceeded"),
+            [
+                ExecuteResponse(eval_id=eval_id, job_name=f"{JOB}-i{index}", status="created")
+                for index, eval_id in enumerate(["small-0", "small-1"])
+            ],
+        ]
+        batch = ExecuteBatchRequest(
+            batch_id="batch-1",
+            evaluations=[
+                execute_request("big-0", memory_limit="1Gi"),
+                execute_request("small-0"),
+                execute_request("big-1", memory_limit="1Gi"),
+                execute_request("small-1"),
+            ],
+        )
+
+        result = asyncio.run(execute_batch(batch))
+
+        assert [(item.eval_id, item.status) for item in result.evaluations] == [
+            ("big-0", "rejected"), ("small-0", "created"), ("big-1", "rejected"), ("small-1", "created")
+        ]
+        assert len(result.jobs) == 1
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.indexed_jobs", clear=True)
+@patch.dict("dispatcher_service.app.job_states", clear=True)
+@patch.dict("dispatcher_service.app.job_pods", clear=True)
+@patch("dispatcher_service.app.wake_pending_dispatch")
+@patch("dispatcher_service.app.schedule_terminal_event")
+class TestIndexedJobEvents:
+    """Test per-index outcomes reach the right evaluation, once."""
+
+    def test_finished_indexes_publish_their_evaluation(self, mock_terminal, _wake):
+        """Test completed and failed indexes publish once each; a failed Job fails the rest."""
+        from dispatcher_service.app import process_job_event
+
+        redis_client = mock_redis()
+
+        async def run():
+            await process_job_event(indexed_job_event(completed="0", failed="2"), redis_client)
+            await process_job_event(indexed_job_event(completed="0", failed="2"), redis_client)
+            await process_job_event(indexed_job_event(completed="0", failed="2", job_failed=True), redis_client)
+
+        asyncio.run(run())
+
+        published = [call.args[:3] for call in mock_terminal.call_args_list]
+        assert published == [
+            (f"{JOB}-i0", "eval-0", "succeeded"),
+            (f"{JOB}-i2", "eval-2", "failed"),
+            (f"{JOB}-i1", "eval-1", "failed"),
+        ]
+
+    def test_deleting_job_cancels_unfinished_indexes(self, mock_terminal, _wake):
+        """Test only indexes that hadn't finished are cancelled."""
+        from dispatcher_service.app import indexed_jobs, process_job_event
+
+        redis_client = mock_redis()
+        asyncio.run(process_job_event(indexed_job_event("DELETED", completed="1"), redis_client))
+
+        cancelled = [
+            json.loads(call.args[1])["eval_id"]
+            for call in redis_client.publish.call_args_list
+            if call.args[0] == "evaluation:cancelled"
+        ]
+        assert cancelled == ["eval-0", "eval-2"]
+        assert JOB not in indexed_jobs
+
+    @patch("dispatcher_service.app.start_log_stream")
+    def test_pod_event_maps_index_to_evaluation(self, _stream, mock_terminal, _wake):
+        """Test a pod of an Indexed Job publishes for the evaluation at its completion index."""
+        from dispatcher_service.app import job_pods, process_pod_event
+
+        container = MagicMock()
+        container.name = "evaluation"
+        container.state.running = None
+        container.state.terminated = MagicMock(exit_code=0, finished_at=None)
+        pod = MagicMock()
+        pod.metadata.name = f"{JOB}-1-abcde"
+        pod.metadata.labels = {"job-name": JOB, "app": "evaluation"}
+        pod.metadata.annotations = {"batch.kubernetes.io/job-completion-index": "1", "backoff-limit": "2"}
+        pod.spec.node_name = None
+        pod.status.container_statuses = [container]
+
+        redis_client = mock_redis()
+        entry = {"indexes": [["eval-0"], ["eval-1"], ["eval-2"]], "packed": False}
+        with patch.dict("dispatcher_service.app.indexed_jobs", {JOB: entry}):
+            asyncio.run(process_pod_event({"type": "MODIFIED", "object": pod}, redis_client))
+
+        assert mock_terminal.call_args.args[:3] == (f"{JOB}-i1", "eval-1", "succeeded")
+        assert job_pods[f"{JOB}-i1"]["pod_name"] == f"{JOB}-1-abcde"
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's job and pod watches.
+Tests resuming from resourceVersion/bookmarks, in-process job state and
+container start/exit detection from pod events.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+
+def job_event(event_type: str, name: str, resource_version: str) -> dict:
+    job = MagicMock()
+    job.metadata.name = name
+    job.metadata.resource_version = resource_version
+    return {"type": event_type, "object": job, "raw_object": {}}
+
+
+def bookmark(resource_version: str) -> dict:
+    return {"type": "BOOKMARK", "object": {}, "raw_object": {"metadata": {"resourceVersion": resource_version}}}
+
+
+@pytest.mark.unit
+class TestJobWatch:
+    """Test the watch resumes cheaply and dedups state changes in memory."""
+
+    @patch("dispatcher_service.app.watch.Watch")
+    def test_watch_resumes_and_follows_bookmarks(self, mock_watch_cls):
+        """Test the watch starts at the given version and returns the latest, bookmarks included."""
+        from dispatcher_service.app import list_evaluation_jobs_sync, watch_events_sync
+
+        mock_watch_cls.return_value.stream.return_value = iter(
+            [job_event("MODIFIED", "job-a", "101"), bookmark("150")]
+        )
+        loop = MagicMock()
+        dispatch = MagicMock()
+
+        assert watch_events_sync("jobs", list_evaluation_jobs_sync, "100", loop, dispatch) == "150"
+
+        kwargs = mock_watch_cls.return_value.stream.call_args.kwargs
+        assert kwargs["resource_version"] == "100"
+        assert kwargs["allow_watch_bookmarks"] is True
+        # Only real events reach the processing lanes
+        assert loop.call_soon_threadsafe.call_count == 1
+        assert loop.call_soon_threadsafe.call_args.args[1]["object"].metadata.name == "job-a"
+
+    @patch("dispatcher_service.app.watch.Watch")
+    def test_expired_version_asks_for_relist(self, mock_watch_cls):
+        """Test a 410 Gone returns None so the monitor relists."""
+        from dispatcher_service.app import list_evaluation_jobs_sync, watch_events_sync
+
+        mock_watch_cls.return_value.stream.side_effect = ApiException(status=410)
+
+        assert watch_events_sync("jobs", list_evaluation_jobs_sync, "100", MagicMock(), MagicMock()) is None
+
+    def test_each_leadership_term_gets_its_own_watch_threads(self):
+        """Test a new term's watches never queue behind a previous term's blocked reads."""
+        from dispatcher_service.app import job_watch_executor, monitor_job_events
+
+        executors = []
+
+        async def fake_watch(*args, **kwargs):
+            executors.append(kwargs.get("executor", args[5] if len(args) > 5 else None))
+            await asyncio.Event().wait()
+
+        async def two_terms():
+            app = MagicMock()
+            for _ in range(2):
+                term = asyncio.create_task(monitor_job_events(app))
+                await asyncio.sleep(0.01)  # Let its watches start
+                term.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await term
+
+        with patch("dispatcher_service.app.run_watch", fake_watch), \
+                patch("dispatcher_service.app.ENABLE_POD_WATCH", True):
+            asyncio.run(two_terms())
+
+        assert len(executors) == 4
+        assert executors[0] is executors[1] and executors[2] is executors[3]
+        assert executors[0] is not executors[2]
+        assert job_watch_executor not in executors
+        assert executors[0]._shutdown
+
+    @patch.dict("dispatcher_service.app.job_states", clear=True)
+    def test_job_state_read_once_and_only_moves_forward(self):
+        """Test Redis is read only for unseen jobs, written only on transitions, never moved backwards."""
+        from dispatcher_service.app import advance_job_state
+
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value=b"pending")
+        redis_client.setex = AsyncMock()
+
+        async def run():
+            return [
+                await advance_job_state("job-a", "pending", redis_client),
+                await advance_job_state("job-a", "running", redis_client),
+                await advance_job_state("job-a", "pending", redis_client),
+            ]
+
+        assert asyncio.run(run()) == [(False, "pending"), (True, "pending"), (False, "running")]
+        redis_client.get.assert_awaited_once()
+        redis_client.setex.assert_awaited_once()
+        assert redis_client.setex.call_args.args[2] == "running"
+
+
+def pod_event(state: str, exit_code: int = 0, backoff_limit: str = "2") -> dict:
+    container = MagicMock()
+    container.name = "evaluation"
+    container.state.running = MagicMock(started_at=datetime.now(timezone.utc)) if state == "running" else None
+    container.state.terminated = MagicMock(exit_code=exit_code, finished_at=None) if state == "terminated" else None
+    pod = MagicMock()
+    pod.metadata.name = "job-a-xyz"
+    pod.metadata.labels = {"job-name": "job-a", "eval-id": "eval-a", "app": "evaluation"}
+    pod.metadata.annotations = {"backoff-limit": backoff_limit, "active-deadline-seconds": "330"}
+    pod.spec.node_name = None
+    pod.status.container_statuses = [container]
+    return {"type": "MODIFIED", "object": pod}
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.job_pods", clear=True)
+@patch.dict("dispatcher_service.app.job_states", {"job-a": "pending"}, clear=True)
+@patch("dispatcher_service.app.wake_pending_dispatch")
+@patch("dispatcher_service.app.start_log_stream")
+@patch("dispatcher_service.app.schedule_terminal_event")
+class TestPodWatch:
+    """Test running and terminal events come from the evaluation container's state."""
+
+    def redis(self):
+        redis_client = MagicMock()
+        redis_client.setex = AsyncMock()
+        redis_client.publish = AsyncMock()
+        return redis_client
+
+    def test_container_start_publishes_running_once(self, mock_terminal, mock_stream, mock_wake):
+        """Test running is published when the container starts, with the known pod streamed."""
+        from dispatcher_service.app import process_pod_event
+
+        redis_client = self.redis()
+
+        async def run():
+            await process_pod_event(pod_event("running"), redis_client)
+            await process_pod_event(pod_event("running"), redis_client)
+
+        asyncio.run(run())
+
+        redis_client.publish.assert_awaited_once()
+        channel, payload = redis_client.publish.call_args.args
+        assert channel == "evaluation:running"
+        assert json.loads(payload)["timeout"] == 330
+        assert mock_stream.call_args.args[3] == "job-a-xyz"
+
+    def test_exit_publishes_terminal_with_exit_code(self, mock_terminal, mock_stream, mock_wake):
+        """Test a zero exit completes at once; a failed attempt only decides the outcome without retries."""
+        from dispatcher_service.app import job_pods, job_states, process_pod_event
+
+        asyncio.run(process_pod_event(pod_event("terminated", exit_code=3), self.redis()))
+        # Retries left: the Job's Failed condition decides, the exit code is kept for it
+        mock_terminal.assert_not_called()
+        assert job_pods["job-a"]["exit_code"] == 3
+
+        asyncio.run(process_pod_event(pod_event("terminated", exit_code=3, backoff_limit="0"), self.redis()))
+        assert mock_terminal.call_args.args[2] == "failed"
+        assert mock_terminal.call_args.kwargs["exit_code"] == 3
+        assert job_states["job-a"] == "failed"
+        mock_wake.assert_called_once()
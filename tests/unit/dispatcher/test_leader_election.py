@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's leader election.
+Tests acquiring, respecting and taking over the dispatcher Lease.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+
+def lease(holder: str, resource_version: str = "1") -> MagicMock:
+    existing = MagicMock()
+    existing.metadata.resource_version = resource_version
+    existing.spec.holder_identity = holder
+    existing.spec.lease_duration_seconds = 15
+    existing.spec.lease_transitions = 0
+    return existing
+
+
+def written(resource_version: str = "2") -> MagicMock:
+    result = MagicMock()
+    result.metadata.resource_version = resource_version
+    return result
+
+
+@pytest.mark.unit
+@patch("dispatcher_service.app.coordination_v1")
+class TestLeaderElection:
+    """Test one replica holds the lease and a standby takes over only when it lapses."""
+
+    def test_creates_missing_lease(self, mock_coordination):
+        """Test the first replica creates the lease and leads."""
+        from dispatcher_service.app import LeaderElector
+
+        mock_coordination.read_namespaced_lease.side_effect = ApiException(status=404)
+        mock_coordination.create_namespaced_lease.return_value = written()
+
+        assert LeaderElector("replica-a").try_acquire_or_renew() is True
+        body = mock_coordination.create_namespaced_lease.call_args.args[1]
+        assert body.spec.holder_identity == "replica-a"
+
+    @patch("dispatcher_service.app.time.monotonic")
+    def test_standby_waits_for_lease_to_lapse(self, mock_monotonic, mock_coordination):
+        """Test a live holder is respected and an unrenewed lease is taken over."""
+        from dispatcher_service.app import LeaderElector
+
+        elector = LeaderElector("replica-b")
+        mock_coordination.read_namespaced_lease.return_value = lease("replica-a")
+        mock_coordination.replace_namespaced_lease.return_value = written()
+
+        mock_monotonic.return_value = 100.0
+        assert elector.try_acquire_or_renew() is False
+        mock_monotonic.return_value = 110.0
+        assert elector.try_acquire_or_renew() is False  # Unchanged for 10s < 15s
+        mock_monotonic.return_value = 116.0
+        assert elector.try_acquire_or_renew() is True
+
+        body = mock_coordination.replace_namespaced_lease.call_args.args[2]
+        assert body.spec.holder_identity == "replica-b"
+        assert body.spec.lease_transitions == 1
+
+    def test_conflicting_write_loses(self, mock_coordination):
+        """Test a 409 on the compare-and-swap means another replica won."""
+        from dispatcher_service.app import LeaderElector
+
+        mock_coordination.read_namespaced_lease.return_value = lease(None)
+        mock_coordination.replace_namespaced_lease.side_effect = ApiException(status=409)
+
+        assert LeaderElector("replica-b").try_acquire_or_renew() is False
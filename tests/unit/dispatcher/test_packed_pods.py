@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for packed pods: several short evaluations run one after another
+in one pod of an Indexed Job. Tests the runner's framing and isolation, the
+packed Job it runs in, and splitting a pod's log back into per-evaluation
+events.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.utils import packed_runner
+from tests.unit.dispatcher.batch_helpers import JOB, execute_request
+
+
+def run_packed(tmp_path, capsys, codes, timeout: float = 10) -> dict:
+    """Run the runner on codes as index 0 and parse what it printed."""
+    for slot, code in enumerate(codes):
+        (tmp_path / f"0.{slot}.py").write_text(code)
+    assert packed_runner.main([str(tmp_path), "0", "--timeout", str(timeout)]) == 0
+    return packed_runner.parse_packed_output(capsys.readouterr().out)
+
+
+@pytest.mark.unit
+class TestPackedRunner:
+    """Test the runner reports every evaluation separately and contains each one."""
+
+    def test_each_slot_gets_its_own_output_and_exit_code(self, tmp_path, capsys):
+        """Test outputs, exit codes and timeouts come back per slot, in order."""
+        results = run_packed(tmp_path, capsys, [
+            "print('first')",
+            "import sys; print('oops', file=sys.stderr); sys.exit(3)",
+            "import time; time.sleep(30)",
+            "print('after')",
+        ], timeout=1)
+
+        assert (results[0]["stdout"], results[0]["exit_code"]) == ("first\n", 0)
+        assert (results[1]["stderr"], results[1]["exit_code"]) == ("oops\n", 3)
+        assert (results[2]["exit_code"], results[2]["timed_out"]) == (packed_runner.TIMEOUT_EXIT_CODE, True)
+        assert (results[3]["stdout"], results[3]["exit_code"]) == ("after\n", 0)
+
+    def test_evaluations_cannot_forge_frames_or_share_a_directory(self, tmp_path, capsys):
+        """Test a frame printed by an evaluation is just output, and each starts in a fresh directory."""
+        forged = json.dumps({"nonce": None, "slot": 1, "exit_code": 0})
+        results = run_packed(tmp_path, capsys, [
+            f"print({packed_runner.FRAME_PREFIX + forged!r}); open('left-behind', 'w').write('x')",
+            "import os; print(os.listdir('.'))",
+        ])
+
+        assert results[0]["stdout"].startswith(packed_runner.FRAME_PREFIX)
+        assert (results[1]["stdout"], results[1]["exit_code"]) == ("[]\n", 0)
+
+    def test_unfinished_slot_has_no_exit_code(self):
+        """Test a pod killed mid-evaluation leaves that slot without an exit code."""
+        logs = "\n".join(packed_runner.FRAME_PREFIX + json.dumps(frame) for frame in [
+            {"packed_runner": packed_runner.PROTOCOL_VERSION, "nonce": "n"},
+            {"nonce": "n", "slot": 0, "stream": "stdout", "data": "partial"},
+        ])
+
+        assert packed_runner.parse_packed_output(logs)[0]["exit_code"] is None
+
+
+@pytest.mark.unit
+@patch("dispatcher_service.app.image_locality_affinity", return_value=None)
+@patch("dispatcher_service.app.k8s_api")
+class TestPackedJobCreation:
+    """Test packed batches become Indexed Jobs of several evaluations per pod."""
+
+    def test_only_short_evaluations_are_packed(self, _k8s, _affinity):
+        """Test long and debug evaluations keep a pod each."""
+        from dispatcher_service.app import pack_batch
+
+        requests = [
+            execute_request("a"),
+            execute_request("long", timeout=600),
+            execute_request("b"),
+        ]
+
+        packs = [[request.eval_id for request in pack] for pack in pack_batch(requests, evaluations_per_pod=4)]
+        assert packs == [["a", "b"], ["long"]]
+
+    def test_packed_job_manifest(self, mock_k8s, _affinity):
+        """Test the ConfigMap holds the runner and each slot's code, and each evaluation gets its slot name."""
+        from dispatcher_service.app import create_indexed_job
+
+        mock_k8s.call.side_effect = lambda func, **kwargs: MagicMock(metadata=MagicMock(uid="job-uid"))
+        requests = [execute_request(f"eval-{n}", timeout=30) for n in range(5)]
+
+        responses = create_indexed_job(requests, JOB, "batch-1", use_gvisor=True, evaluations_per_pod=2, tenant="key:abc")
+
+        configmap = mock_k8s.call.call_args_list[0].kwargs["body"]
+        job = mock_k8s.call.call_args_list[1].kwargs["body"]
+        assert sorted(configmap.data) == ["0.0.py", "0.1.py", "1.0.py", "1.1.py", "2.0.py", "runner.py"]
+        assert configmap.data["1.1.py"] == "print('eval-3')"
+        assert job.spec.completions == 3
+        assert job.metadata.annotations["evaluations-per-pod"] == "2"
+        assert job.metadata.annotations["tenant"] == "key:abc"
+        assert job.spec.template.spec.containers[0].command[:5] == [
+            "python", "-u", "/batch/runner.py", "/batch", "$(EVAL_INDEX)"
+        ]
+        assert [response.job_name for response in responses] == [
+            f"{JOB}-i0s0", f"{JOB}-i0s1", f"{JOB}-i1s0", f"{JOB}-i1s1", f"{JOB}-i2s0"
+        ]
+
+
+@pytest.mark.unit
+@patch.dict("dispatcher_service.app.job_states", clear=True)
+class TestPackedEvents:
+    """Test a packed pod's log becomes one terminal event per evaluation."""
+
+    @patch("dispatcher_service.app.capture_job_logs")
+    def test_pod_log_demultiplexed_into_events(self, mock_capture):
+        """Test each slot publishes its own outcome, and one the runner never reached fails."""
+        from dispatcher_service.app import index_unit_name, packed_slot, parse_index_unit, publish_packed_terminal_events
+
+        logs = "\n".join(packed_runner.FRAME_PREFIX + json.dumps(frame) for frame in [
+            {"packed_runner": packed_runner.PROTOCOL_VERSION, "nonce": "n"},
+            {"nonce": "n", "slot": 0, "stream": "stdout", "data": "42\n"},
+            {"nonce": "n", "slot": 0, "exit_code": 0, "timed_out": False, "duration_seconds": 0.1},
+            {"nonce": "n", "slot": 1, "stream": "stderr", "data": "Traceback\n"},
+            {"nonce": "n", "slot": 1, "exit_code": 1, "timed_out": False, "duration_seconds": 0.1},
+        ])
+        mock_capture.return_value = {"logs": logs, "source": "kubernetes"}
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value=None)
+        redis_client.setex = AsyncMock()
+        redis_client.publish = AsyncMock()
+
+        asyncio.run(publish_packed_terminal_events(JOB, 1, ["a", "b", "c"], None, redis_client))
+
+        published = [(call.args[0], json.loads(call.args[1])) for call in redis_client.publish.call_args_list]
+        assert [(channel, event["eval_id"]) for channel, event in published] == [
+            ("evaluation:completed", "a"), ("evaluation:failed", "b"), ("evaluation:failed", "c")
+        ]
+        assert published[0][1]["output"] == "42\n"
+        assert published[1][1]["error"] == "Traceback\n"
+        assert published[2][1]["metadata"]["job_name"] == f"{JOB}-i1s2"
+        mock_capture.assert_called_once_with(f"{JOB}-i1")
+        assert parse_index_unit(index_unit_name(JOB, 1, 2)) == (JOB, 1)
+        assert packed_slot(f"{JOB}-i1s2") == 2 and packed_slot(f"{JOB}-i1") is None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dispatcher's pending-dispatch queue.
+Tests parking on hand-off and event-driven draining in priority order.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from dispatcher_service import ExecuteRequest
+from dispatcher_service.app import CapacityResponse, ExecuteResponse
+from shared.utils.pending_dispatch import pending_score
+
+
+def capacity(has_capacity: bool) -> CapacityResponse:
+    return CapacityResponse(
+        has_capacity=has_capacity,
+        available_memory_mb=0,
+        available_cpu_millicores=0,
+        total_memory_mb=0,
+        total_cpu_millicores=0,
+    )
+
+
+def parked(eval_id: str, queued_at: float = None) -> dict:
+    return {
+        "eval_id": eval_id,
+        "job_name": f"{eval_id}-abc12345",
+        "priority": 500,
+        "queued_at": queued_at or time.time(),
+        "request": {"eval_id": eval_id, "code": "print(1)"},
+    }
+
+
+@pytest.mark.unit
+class TestPendingDispatch:
+    """Test how evaluations wait for and get started on released capacity."""
+
+    def test_score_orders_priority_then_age(self):
+        """Test higher priority dispatches first, then earlier submissions."""
+        now = time.time()
+        assert pending_score(1000, now + 600) < pending_score(500, now)
+        assert pending_score(500, now) < pending_score(500, now + 1)
+
+    @patch("dispatcher_service.app.wake_pending_dispatch")
+    @patch("dispatcher_service.app.compute_capacity", return_value=capacity(False))
+    @patch("dispatcher_service.app.validate_execute_request", return_value=True)
+    @patch("dispatcher_service.app.pending_dispatch")
+    def test_execute_parks_when_cluster_full(self, mock_queue, mock_validate, mock_capacity, mock_wake):
+        """Test a hand-off without capacity is parked instead of rejected."""
+        from dispatcher_service.app import execute
+
+        mock_queue.get = AsyncMock(return_value=None)
+        mock_queue.size = AsyncMock(return_value=0)
+        mock_queue.add = AsyncMock(return_value=2)
+
+        response = asyncio.run(execute(ExecuteRequest(eval_id="eval-1", code="print(1)", wait_for_capacity=True)))
+
+        assert response.status == "queued"
+        assert "position 3" in response.message
+        eval_id, job_name, priority, request = mock_queue.add.call_args.args
+        assert (eval_id, request["code"]) == ("eval-1", "print(1)")
+        assert job_name == response.job_name
+        assert "wait_for_capacity" not in request
+        mock_wake.assert_called_once()
+
+    @patch("dispatcher_service.app.check_gvisor_availability", return_value=True)
+    @patch("dispatcher_service.app.create_evaluation_job")
+    @patch("dispatcher_service.app.compute_capacity")
+    @patch("dispatcher_service.app.pending_dispatch")
+    def test_drain_starts_in_order_until_full(self, mock_queue, mock_capacity, mock_create, mock_gvisor):
+        """Test the loop starts parked evaluations until one doesn't fit, then stops."""
+        from dispatcher_service.app import drain_pending_dispatch
+
+        mock_queue.peek = AsyncMock(side_effect=[parked("eval-1"), parked("eval-2"), parked("eval-3")])
+        mock_queue.remove = AsyncMock(return_value=True)
+        mock_capacity.side_effect = [capacity(True), capacity(True), capacity(False)]
+        mock_create.return_value = ExecuteResponse(eval_id="x", job_name="x", status="created")
+        gvisor_threads = []
+        mock_gvisor.side_effect = lambda: gvisor_threads.append(threading.current_thread()) or True
+
+        started = asyncio.run(drain_pending_dispatch(MagicMock()))
+
+        assert started == 2
+        # The RuntimeClass lookup may block on the API rate limiter, so it runs off the loop
+        assert gvisor_threads and threading.main_thread() not in gvisor_threads
+        assert [c.args[1] for c in mock_create.call_args_list] == ["eval-1-abc12345", "eval-2-abc12345"]
+        assert [c.args[0] for c in mock_queue.remove.call_args_list] == ["eval-1", "eval-2"]
+
+    @patch("dispatcher_service.app.check_gvisor_availability", return_value=True)
+    @patch("dispatcher_service.app.create_evaluation_job")
+    @patch("dispatcher_service.app.compute_capacity", return_value=capacity(True))
+    @patch("dispatcher_service.app.pending_dispatch")
+    def test_drain_keeps_evaluation_on_quota_rejection(self, mock_queue, mock_capacity, mock_create, mock_gvisor):
+        """Test a 429 from job creation leaves the evaluation parked for the next release."""
+        from dispatcher_service.app import drain_pending_dispatch
+
+        mock_queue.peek = AsyncMock(return_value=parked("eval-1"))
+        mock_queue.remove = AsyncMock()
+        mock_create.side_effect = HTTPException(status_code=429, detail="quota")
+
+        assert asyncio.run(drain_pending_dispatch(MagicMock())) == 0
+        mock_queue.remove.assert_not_awaited()
+
+    @patch("dispatcher_service.app.compute_capacity")
+    @patch("dispatcher_service.app.pending_dispatch")
+    def test_drain_fails_evaluations_past_max_wait(self, mock_queue, mock_capacity):
+        """Test an evaluation parked too long fails with resource_exhaustion."""
+        from dispatcher_service.app import PENDING_DISPATCH_MAX_WAIT_SECONDS, drain_pending_dispatch
+
+        stale = parked("eval-1", queued_at=time.time() - PENDING_DISPATCH_MAX_WAIT_SECONDS - 1)
+        mock_queue.peek = AsyncMock(side_effect=[stale, None])
+        mock_queue.remove = AsyncMock(return_value=True)
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock()
+
+        assert asyncio.run(drain_pending_dispatch(redis_client)) == 0
+
+        channel, payload = redis_client.publish.call_args.args
+        assert channel == "evaluation:failed"
+        assert json.loads(payload)["metadata"]["reason"] == "resource_exhaustion"
+        mock_capacity.assert_not_called()
@@ -63,6 +63,28 @@ class StorageServiceTestMixin:
         result = self.storage.retrieve_evaluation("nonexistent-id")
         self.assertIsNone(result)
 
+    def test_retrieve_evaluations_bulk(self):
+        """Test bulk retrieval returns found evaluations, projected to the requested fields"""
+        other_id = "test-eval-002"
+        self.storage.store_evaluation(self.test_eval_id, self.test_data)
+        self.storage.store_evaluation(
+            other_id,
+            {"id": other_id, "status": "queued", "code_hash": "abc", "created_at": "2025-01-01T00:00:00"},
+        )
+
+        try:
+            results = self.storage.retrieve_evaluations(
+                [self.test_eval_id, other_id, "missing-eval", other_id],
+                fields=["status", "created_at"],
+            )
+        finally:
+            self.storage.delete_evaluation(other_id)
+
+        self.assertEqual(set(results), {self.test_eval_id, other_id})
+        self.assertEqual(results[self.test_eval_id]["status"], "completed")
+        self.assertNotIn("output", results[self.test_eval_id])
+        self.assertEqual(results[other_id]["created_at"], "2025-01-01T00:00:00")
+
     def test_update_evaluation(self):
         """Test updating existing evaluation"""
         # Store initial
@@ -218,6 +240,42 @@ class StorageServiceTestMixin:
         # Should return False or True depending on implementation
         self.assertIsInstance(result, bool)
 
+    # Log Chunk Tests
+
+    def test_append_and_retrieve_log_chunks(self):
+        """Test log chunks get increasing sequence numbers and read back in order"""
+        self.storage.store_evaluation(self.test_eval_id, self.test_data)
+
+        seqs = [self.storage.append_log_chunk(self.test_eval_id, f"line {i}") for i in range(5)]
+        self.assertEqual(seqs, [0, 1, 2, 3, 4])
+        self.assertEqual(self.storage.count_log_chunks(self.test_eval_id), 5)
+
+        chunks = self.storage.retrieve_log_chunks(self.test_eval_id)
+        self.assertEqual([c["content"] for c in chunks], [f"line {i}" for i in range(5)])
+        self.assertEqual([c["seq"] for c in chunks], seqs)
+
+        # Offset/limit select by sequence position
+        window = self.storage.retrieve_log_chunks(self.test_eval_id, offset=1, limit=2)
+        self.assertEqual([c["content"] for c in window], ["line 1", "line 2"])
+
+    def test_delete_log_chunks(self):
+        """Test deleting log chunks leaves the evaluation intact"""
+        self.storage.store_evaluation(self.test_eval_id, self.test_data)
+        self.storage.append_log_chunk(self.test_eval_id, "hello")
+
+        self.assertTrue(self.storage.delete_log_chunks(self.test_eval_id))
+        self.assertEqual(self.storage.count_log_chunks(self.test_eval_id), 0)
+        self.assertEqual(self.storage.retrieve_log_chunks(self.test_eval_id), [])
+        self.assertIsNotNone(self.storage.retrieve_evaluation(self.test_eval_id))
+
+        # Sequence restarts after deletion
+        self.assertEqual(self.storage.append_log_chunk(self.test_eval_id, "again"), 0)
+
+    def test_log_chunks_nonexistent(self):
+        """Test reading log chunks for an evaluation without any"""
+        self.assertEqual(self.storage.retrieve_log_chunks("nonexistent-id"), [])
+        self.assertEqual(self.storage.count_log_chunks("nonexistent-id"), 0)
+
     # Data Integrity Tests
 
     def test_data_isolation(self):
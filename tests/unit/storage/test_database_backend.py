@@ -59,6 +59,34 @@ class DatabaseStorageTests(StorageServiceTestMixin, unittest.TestCase):
 
     # Database-specific tests
 
+    def test_retrieve_evaluations_single_query(self):
+        """Test bulk retrieval issues one projected IN query per chunk."""
+        storage = self.create_storage()
+        for i in range(5):
+            storage.store_evaluation(
+                f"bulk-{i}", {"code_hash": "h", "status": "completed", "code": "x" * 1000}
+            )
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        from sqlalchemy import event
+        event.listen(storage.engine, "before_cursor_execute", record)
+        try:
+            results = storage.retrieve_evaluations(
+                [f"bulk-{i}" for i in range(5)], fields=["status"]
+            )
+        finally:
+            event.remove(storage.engine, "before_cursor_execute", record)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results["bulk-0"], {"id": "bulk-0", "status": "completed"})
+        self.assertEqual(len(statements), 1)
+        self.assertIn(" IN ", statements[0])
+        self.assertNotIn("metadata", statements[0])
+
     def test_transaction_rollback(self):
         """Test that failed transactions don't leave partial data."""
         eval_id = "test-transaction"
@@ -215,6 +243,36 @@ class DatabaseStorageTests(StorageServiceTestMixin, unittest.TestCase):
             data = self.storage.retrieve_evaluation(eval_id)
             self.assertIsNotNone(data)
 
+    def test_append_log_chunk_retries_taken_seq(self):
+        """Test a seq taken by a concurrent append is retried with the next one."""
+        from contextlib import contextmanager
+        from unittest.mock import MagicMock, patch
+
+        eval_id = "log-chunk-race"
+        self.storage.store_evaluation(eval_id, {"code_hash": "race", "status": "running"})
+        self.assertEqual(self.storage.append_log_chunk(eval_id, "first\n"), 0)
+
+        real_get_session = self.storage.get_session
+        sessions = []
+
+        @contextmanager
+        def racing_session():
+            with real_get_session() as session:
+                if not sessions:
+                    # MAX(seq) read before the other replica's insert landed
+                    session.execute = MagicMock(return_value=MagicMock(scalar=lambda: None))
+                sessions.append(session)
+                yield session
+
+        with patch.object(self.storage, "get_session", racing_session):
+            seq = self.storage.append_log_chunk(eval_id, "second\n")
+
+        self.assertEqual(seq, 1)
+        self.assertEqual(len(sessions), 2)
+        chunks = self.storage.retrieve_log_chunks(eval_id)
+        self.assertEqual([c["content"] for c in chunks], ["first\n", "second\n"])
+        self.storage.delete_log_chunks(eval_id)
+
     def test_query_performance_with_indexes(self):
         """Test that indexed queries perform well."""
         import time
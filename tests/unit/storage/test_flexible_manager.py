@@ -91,6 +91,27 @@ class TestFlexibleStorageManager(unittest.TestCase):
         self.assertIsNotNone(data)
         self.assertEqual(data["id"], eval_id)
 
+    def test_get_evaluations_combines_cache_primary_and_fallback(self):
+        """Test bulk lookup serves cache hits and fetches only the misses."""
+        self.manager.create_evaluation("bulk-cached", "pass")
+        self.primary.store_evaluation("bulk-primary", {"id": "bulk-primary", "status": "running"})
+        self.fallback.store_evaluation("bulk-fallback", {"id": "bulk-fallback", "status": "failed"})
+
+        results = self.manager.get_evaluations(
+            ["bulk-cached", "bulk-primary", "bulk-fallback", "bulk-missing"], fields=["status"]
+        )
+
+        self.assertEqual(
+            results,
+            {
+                "bulk-cached": {"id": "bulk-cached", "status": "queued"},
+                "bulk-primary": {"id": "bulk-primary", "status": "running"},
+                "bulk-fallback": {"id": "bulk-fallback", "status": "failed"},
+            },
+        )
+        # Projected results are not written back to the cache
+        self.assertIsNone(self.cache.retrieve_evaluation("bulk-primary"))
+
     def test_fallback_on_primary_failure(self):
         """Test fallback storage is used when primary fails."""
 
@@ -214,6 +235,47 @@ class TestFlexibleStorageManager(unittest.TestCase):
         events = self.manager.get_events(eval_id)
         self.assertEqual(len(events), 0)
 
+    def test_append_logs_does_not_rewrite_evaluation(self):
+        """Test log appends go to the chunk store, not the evaluation record."""
+        eval_id = "test-logs"
+        self.manager.create_evaluation(eval_id, "print('hi')")
+        self.manager.update_evaluation(eval_id, status="running")
+
+        self.assertEqual(self.manager.append_logs(eval_id, "first"), 0)
+        self.assertEqual(self.manager.append_logs(eval_id, "second"), 1)
+        self.assertEqual(self.manager.append_logs(eval_id, "third"), 2)
+
+        self.assertNotIn("output", self.primary.retrieve_evaluation(eval_id))
+
+        tail = self.manager.get_log_chunks(eval_id, tail=2)
+        self.assertEqual([c["content"] for c in tail], ["second", "third"])
+
+    def test_terminal_status_compacts_log_chunks(self):
+        """Test chunks are folded into output and dropped on completion."""
+        eval_id = "test-compact"
+        self.manager.create_evaluation(eval_id, "print('hi')")
+        self.manager.update_evaluation(eval_id, status="running")
+        self.manager.append_logs(eval_id, "line 1\nline 2\nline ")
+        self.manager.append_logs(eval_id, "3\n")
+
+        self.manager.update_evaluation(eval_id, status="completed", output="")
+
+        data = self.manager.get_evaluation(eval_id)
+        # Chunks concatenate as written, even when one splits a line
+        self.assertEqual(data["output"], "line 1\nline 2\nline 3\n")
+        self.assertEqual(self.manager.count_log_chunks(eval_id), 0)
+
+    def test_explicit_output_wins_over_log_chunks(self):
+        """Test a non-empty final output replaces streamed chunks."""
+        eval_id = "test-compact-explicit"
+        self.manager.create_evaluation(eval_id, "print('hi')")
+        self.manager.append_logs(eval_id, "partial")
+
+        self.manager.update_evaluation(eval_id, status="completed", output="full output")
+
+        self.assertEqual(self.manager.get_evaluation(eval_id)["output"], "full output")
+        self.assertEqual(self.manager.count_log_chunks(eval_id), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -202,7 +202,79 @@ class TestStorageServiceAPI:
         # Check keyword arguments
         assert "status" in call_args[1]
         assert call_args[1]["status"] == "completed"
-    
+
+    def test_append_logs_uses_chunk_store(self, client, mock_storage):
+        """Test log appends for a running evaluation don't rewrite the output."""
+        mock_storage.get_evaluation.return_value = {"id": "test-123", "status": "running"}
+        mock_storage.append_logs.return_value = 7
+
+        response = client.post(
+            "/evaluations/test-123/logs",
+            json={"content": "line", "append": True, "timestamp": "2025-01-01T00:00:00+00:00"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["seq"] == 7
+        mock_storage.append_logs.assert_called_once()
+        mock_storage.update_evaluation.assert_not_called()
+
+    def test_late_append_concatenates_onto_output(self, client, mock_storage):
+        """Test an append after completion extends the compacted output as written."""
+        mock_storage.get_evaluation.return_value = {"id": "test-123", "status": "completed", "output": "eight\n"}
+        mock_storage.update_evaluation.return_value = True
+
+        response = client.post("/evaluations/test-123/logs", json={"content": "nine\n", "append": True})
+
+        assert response.status_code == 200
+        mock_storage.append_logs.assert_not_called()
+        mock_storage.update_evaluation.assert_called_once_with("test-123", output="eight\nnine\n")
+
+    def test_batch_get_evaluations(self, client, mock_storage):
+        """Test batch-get fetches all IDs in one storage call and reports missing ones."""
+        mock_storage.get_evaluations.return_value = {
+            "eval-1": {"id": "eval-1", "status": "completed"},
+        }
+
+        response = client.post(
+            "/evaluations/batch-get",
+            json={"eval_ids": ["eval-1", "eval-2"], "fields": ["status"]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["evaluations"]["eval-1"]["status"] == "completed"
+        assert data["missing"] == ["eval-2"]
+        mock_storage.get_evaluations.assert_called_once_with(["eval-1", "eval-2"], fields=["status"])
+
+    def test_batch_get_rejects_oversized_request(self, client, mock_storage):
+        """Test batch-get enforces its ID limit."""
+        with patch("storage_service.app.MAX_BATCH_GET_IDS", 2):
+            response = client.post("/evaluations/batch-get", json={"eval_ids": ["a", "b", "c"]})
+
+        assert response.status_code == 400
+        mock_storage.get_evaluations.assert_not_called()
+
+    def test_get_logs_from_chunk_store(self, client, mock_storage):
+        """Test log reads page through chunks with tail/next_offset."""
+        mock_storage.count_log_chunks.return_value = 10
+        mock_storage.get_evaluation.return_value = {"id": "test-123", "status": "running"}
+        mock_storage.get_log_chunks.return_value = [
+            {"seq": 8, "content": "eight\n", "timestamp": "t8"},
+            {"seq": 9, "content": "nine\n", "timestamp": "t9"},
+        ]
+
+        response = client.get("/evaluations/test-123/logs?tail=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["output"] == "eight\nnine\n"
+        assert data["source"] == "log_chunks"
+        assert data["next_offset"] == 10
+        assert data["total_chunks"] == 10
+        mock_storage.get_log_chunks.assert_called_once_with(
+            "test-123", offset=0, limit=None, tail=2
+        )
+
     # ========== Additional Tests from Non-Simple Versions ==========
     
     def test_root_endpoint_exists(self, client):
@@ -351,6 +351,102 @@ class TestStorageWorkerSimple:
             timer.cancel()
         await asyncio.sleep(0)  # Let cancelled tasks finish
     
+    @pytest.mark.asyncio
+    async def test_completion_does_not_refetch_logs(self):
+        """Test completions with empty output don't go back to the dispatcher for logs."""
+        worker = StorageWorker()
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json = lambda: {"status": "running"}
+        worker.client = AsyncMock()
+        worker.client.get = AsyncMock(return_value=mock_response)
+        worker.client.put = AsyncMock(return_value=mock_response)
+        worker.redis = AsyncMock()
+
+        await worker.handle_evaluation_completed({
+            "eval_id": "test-123",
+            "output": "",
+            "metadata": {"job_name": "eval-test-123", "log_source": "stream"}
+        })
+        await asyncio.sleep(0)
+
+        assert worker.client.put.called
+        requested_urls = [call.args[0] for call in worker.client.get.call_args_list]
+        assert not any("/logs/" in url for url in requested_urls)
+
+    @pytest.mark.asyncio
+    async def test_completion_counts_batch_progress(self):
+        """Test a batch member's completion updates its batch and tags the confirmation."""
+        worker = StorageWorker()
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json = lambda: {"status": "running"}
+        worker.client = AsyncMock()
+        worker.client.get = AsyncMock(return_value=mock_response)
+        worker.client.put = AsyncMock(return_value=mock_response)
+        worker.redis = AsyncMock()
+        worker.redis.get = AsyncMock(return_value=b"batch-1")
+        worker.redis.eval = AsyncMock(return_value=1)
+
+        await worker.handle_evaluation_completed({"eval_id": "test-123", "output": "done"})
+
+        worker.redis.get.assert_any_await("eval:test-123:batch")
+        script_args = worker.redis.eval.call_args.args
+        assert script_args[2:5] == ("batch:batch-1", "batch:batch-1:states", "batch:batch-1:results")
+        assert script_args[5:7] == ("test-123", "completed")
+        channel, payload = worker.redis.publish.call_args.args
+        assert channel == "storage:evaluation:updated"
+        assert json.loads(payload)["batch_id"] == "batch-1"
+
+    @pytest.mark.asyncio
+    async def test_cancelling_queued_member_finishes_it_in_its_batch(self):
+        """Test a batch member cancelled before it ran leaves the queued count, so the batch can finish."""
+        worker = StorageWorker()
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json = lambda: {"status": "queued"}
+        worker.client = AsyncMock()
+        worker.client.get = AsyncMock(return_value=mock_response)
+        worker.client.put = AsyncMock(return_value=mock_response)
+        worker.redis = AsyncMock()
+        worker.redis.get = AsyncMock(return_value=b"batch-1")
+        worker.redis.eval = AsyncMock(return_value=1)
+        worker.redis.pipeline = MagicMock(return_value=MagicMock(execute=AsyncMock()))
+
+        await worker.handle_evaluation_cancelled({"eval_id": "test-123", "reason": "Cancelled by user"})
+
+        assert worker.client.put.call_args.kwargs["json"]["status"] == "cancelled"
+        assert worker.redis.eval.call_args.args[5:7] == ("test-123", "cancelled")
+        channel, payload = worker.redis.publish.call_args.args
+        assert (channel, json.loads(payload)["batch_id"]) == ("storage:evaluation:updated", "batch-1")
+
+    @pytest.mark.asyncio
+    async def test_terminal_status_releases_admission_slot(self):
+        """Test a failed evaluation frees its client's slot and counts toward the drain rate."""
+        worker = StorageWorker()
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json = lambda: {"status": "running"}
+        worker.client = AsyncMock()
+        worker.client.get = AsyncMock(return_value=mock_response)
+        worker.client.put = AsyncMock(return_value=mock_response)
+        worker.redis = AsyncMock()
+        worker.redis.get = AsyncMock(side_effect=lambda key: b"ip:10.0.0.1" if key == "eval:test-123:client" else None)
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        worker.redis.pipeline = MagicMock(return_value=pipe)
+
+        await worker.handle_evaluation_failed({"eval_id": "test-123", "error": "boom"})
+
+        pipe.zrem.assert_called_once_with("client:ip:10.0.0.1:active", "test-123")
+        pipe.delete.assert_called_once_with("eval:test-123:client")
+        assert pipe.incr.call_args.args[0].startswith("admission:drained:")
+        pipe.execute.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_event_validation(self):
         """Test event validation and error handling."""